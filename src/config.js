@@ -77,7 +77,12 @@ const config = {
       /[?&]cat=/i // Category filter params
     ],
     // Domains that are aggregators/directories, not news sources
-    blockedDomains: ['10times.com', 'researchgate.net']
+    blockedDomains: ['10times.com', 'researchgate.net'],
+    // Keep every rejected search result for offline recall analysis
+    logRejections: process.env.FILTER_LOG_REJECTIONS !== 'false',
+    // Directory for the rejection log (gzipped JSONL per UTC day)
+    rejectionLogDir:
+      process.env.REJECTION_LOG_DIR || path.join(__dirname, '..', 'data', 'rejections')
   },
   verification: {
     // Rate limit between verification requests (ms)
@@ -94,6 +99,21 @@ const config = {
     retryDelayMs: Number(process.env.VERIFY_RETRY_DELAY_MS) || 1000,
     // Minimum content length to consider valid (chars) - shorter is likely a block page
     minContentLength: Number(process.env.VERIFY_MIN_CONTENT_LENGTH) || 1000,
+    // Keep the extracted text of every checked page for offline re-verification
+    cacheArticleText: process.env.VERIFY_CACHE_ARTICLE_TEXT !== 'false',
+    // Directory for the article text cache (gzipped JSON per URL)
+    articleCacheDir:
+      process.env.ARTICLE_CACHE_DIR || path.join(__dirname, '..', 'data', 'article-cache'),
+    // Article text cache size cap (MB); the oldest entries are deleted past it
+    articleCacheMaxMb: Number(process.env.ARTICLE_CACHE_MAX_MB) || 512,
+    // Log every verification attempt (domain, method, duration, status, blocked, retry)
+    logAttempts: process.env.VERIFY_LOG_ATTEMPTS !== 'false',
+    // Directory for the attempt log (gzipped JSONL per UTC day)
+    attemptLogDir:
+      process.env.VERIFY_ATTEMPT_LOG_DIR ||
+      path.join(__dirname, '..', 'data', 'verification-events'),
+    // Prioritised work order from temp/analysis/toolkit/verify_plan.py (unset: id order)
+    workOrderPath: process.env.VERIFY_WORK_ORDER || null,
     // Number of concurrent verification requests
     concurrentRequests: Number(process.env.VERIFY_CONCURRENT_REQUESTS) || 5,
     // HTTP status codes that should trigger browser fallback
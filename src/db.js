@@ -177,6 +177,11 @@ function initializeDatabase() {
   ensureColumn('mediaMentions', 'sentiment', 'TEXT');
   ensureColumn('mediaMentions', 'status', 'TEXT');
   ensureColumn('mediaMentions', 'verified', 'INTEGER DEFAULT 0');
+  ensureColumn('mediaMentions', 'provider', 'TEXT');
+  ensureColumn('mediaMentions', 'searchJobId', 'INTEGER');
+  ensureColumn('searchJobs', 'provider', 'TEXT');
+  ensureColumn('searchJobs', 'label', 'TEXT');
+  ensureColumn('searchJobs', 'resultCount', 'INTEGER');
   ensureColumn('clients', 'alertsRssFeedUrl', 'TEXT');
 
   // Create indices for performance and unique constraints
@@ -189,6 +194,9 @@ function initializeDatabase() {
     'CREATE INDEX IF NOT EXISTS idx_feedback_client ON feedbackSummaries(clientId);',
     'CREATE INDEX IF NOT EXISTS idx_search_jobs_client ON searchJobs(clientId);',
     'CREATE INDEX IF NOT EXISTS idx_search_jobs_status ON searchJobs(status);',
+    'CREATE INDEX IF NOT EXISTS idx_mentions_search_job ON mediaMentions(searchJobId);',
+    'CREATE INDEX IF NOT EXISTS idx_mentions_updated ON mediaMentions(updatedAt);',
+    'CREATE INDEX IF NOT EXISTS idx_deleted_mentions_deleted_at ON deletedMentions(deletedAt);',
     'CREATE UNIQUE INDEX IF NOT EXISTS idx_clients_name_unique ON clients(LOWER(name));',
     'CREATE UNIQUE INDEX IF NOT EXISTS idx_mentions_url_client_unique ON mediaMentions(link, clientId);'
   ];
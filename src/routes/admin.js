@@ -3,10 +3,11 @@
  */
 
 const { runQuery, runExecute } = require('../db');
-const { sendJson } = require('../utils/http');
+const { parseJsonBody, sendJson } = require('../utils/http');
 const { getStatus: getVerificationStatus } = require('../services/verificationStatus');
 const { pollRssFeeds, loadClientsWithRssFeeds } = require('../services/rssService');
 const { normalizeUrlForComparison } = require('../utils/mentions');
+const { broadcast } = require('../services/websocket');
 
 // ============================================================================
 // HEALTH CHECK
@@ -65,7 +66,10 @@ function acceptPendingReview(req, res, params) {
     return sendJson(res, 400, { error: 'Mention is not pending review' });
   }
 
-  runQuery('UPDATE mediaMentions SET verified = 1 WHERE id = @p0', [id]);
+  runQuery('UPDATE mediaMentions SET verified = 1, updatedAt = @p1 WHERE id = @p0', [
+    id,
+    new Date().toISOString()
+  ]);
   sendJson(res, 200, { success: true, id, verified: 1 });
 }
 
@@ -120,7 +124,10 @@ function rejectPendingReview(req, res, params) {
     ]
   );
 
-  runQuery('UPDATE mediaMentions SET verified = 0 WHERE id = @p0', [id]);
+  runQuery('UPDATE mediaMentions SET verified = 0, updatedAt = @p1 WHERE id = @p0', [
+    id,
+    new Date().toISOString()
+  ]);
   sendJson(res, 200, { success: true, id, verified: 0 });
 }
 
@@ -155,6 +162,34 @@ function getRssFeedStatus(req, res) {
   });
 }
 
+// ============================================================================
+// COVERAGE UPDATES
+// ============================================================================
+
+/**
+ * Relay coverage summaries from the analysis toolkit's watch mode to
+ * connected dashboards as a 'coverage_update' websocket message
+ */
+async function publishCoverage(req, res) {
+  let body;
+  try {
+    body = await parseJsonBody(req);
+  } catch {
+    return sendJson(res, 400, { error: 'Invalid JSON body' });
+  }
+
+  const { clients, generatedAt } = body;
+  if (!Array.isArray(clients) || clients.some((c) => !c || typeof c.client !== 'string')) {
+    return sendJson(res, 400, { error: 'clients must be an array of coverage summaries' });
+  }
+
+  broadcast('coverage_update', {
+    clients,
+    generatedAt: generatedAt || new Date().toISOString()
+  });
+  sendJson(res, 202, { success: true, clients: clients.length });
+}
+
 // ============================================================================
 // CLEANUP DUPLICATES
 // ============================================================================
@@ -285,7 +320,11 @@ function cleanupDuplicates(_req, res) {
     for (const mention of remainingMentions) {
       const normalized = normalizeUrlForComparison(mention.link);
       if (normalized && normalized !== mention.link) {
-        runExecute('UPDATE mediaMentions SET link = @p0 WHERE id = @p1', [normalized, mention.id]);
+        runExecute('UPDATE mediaMentions SET link = @p0, updatedAt = @p1 WHERE id = @p2', [
+          normalized,
+          new Date().toISOString(),
+          mention.id
+        ]);
         result.urlsNormalized++;
       }
     }
@@ -329,6 +368,8 @@ const routes = [
   { method: 'GET', pattern: '/admin/rss-feeds', handler: getRssFeedStatus },
   { method: 'POST', pattern: '/admin/rss-feeds/poll', handler: triggerRssPoll },
 
+  { method: 'POST', pattern: '/admin/coverage', handler: publishCoverage },
+
   { method: 'GET', pattern: '/admin/duplicates/inspect', handler: inspectDuplicates },
   { method: 'POST', pattern: '/admin/cleanup-duplicates', handler: cleanupDuplicates }
 ];
@@ -343,6 +384,7 @@ module.exports = {
   getPendingReviewCount,
   triggerRssPoll,
   getRssFeedStatus,
+  publishCoverage,
   inspectDuplicates,
   cleanupDuplicates
 };
@@ -5,7 +5,8 @@ const {
   acceptPendingReview,
   rejectPendingReview,
   getPendingReviewCount,
-  getRssFeedStatus
+  getRssFeedStatus,
+  publishCoverage
 } = require('./admin');
 
 // Mock dependencies
@@ -15,6 +16,7 @@ jest.mock('../db', () => ({
 }));
 
 jest.mock('../utils/http', () => ({
+  parseJsonBody: jest.fn(),
   sendJson: jest.fn()
 }));
 
@@ -27,8 +29,13 @@ jest.mock('../services/rssService', () => ({
   loadClientsWithRssFeeds: jest.fn()
 }));
 
+jest.mock('../services/websocket', () => ({
+  broadcast: jest.fn()
+}));
+
 const { runQuery } = require('../db');
-const { sendJson } = require('../utils/http');
+const { parseJsonBody, sendJson } = require('../utils/http');
+const { broadcast } = require('../services/websocket');
 const { getStatus } = require('../services/verificationStatus');
 const { loadClientsWithRssFeeds } = require('../services/rssService');
 
@@ -245,4 +252,30 @@ describe('Admin Routes', () => {
       });
     });
   });
+
+  describe('publishCoverage', () => {
+    test('broadcasts coverage summaries to dashboards', async () => {
+      const clients = [{ client: 'EFI', manual: 10, matched: 7, coverageRate: 0.7 }];
+      parseJsonBody.mockResolvedValue({ clients, generatedAt: '2025-12-04T10:00:00Z' });
+
+      await publishCoverage({}, mockRes);
+
+      expect(broadcast).toHaveBeenCalledWith('coverage_update', {
+        clients,
+        generatedAt: '2025-12-04T10:00:00Z'
+      });
+      expect(sendJson).toHaveBeenCalledWith(mockRes, 202, { success: true, clients: 1 });
+    });
+
+    test('rejects bodies without client summaries', async () => {
+      parseJsonBody.mockResolvedValue({ clients: [{ matched: 1 }] });
+
+      await publishCoverage({}, mockRes);
+
+      expect(broadcast).not.toHaveBeenCalled();
+      expect(sendJson).toHaveBeenCalledWith(mockRes, 400, {
+        error: 'clients must be an array of coverage summaries'
+      });
+    });
+  });
 });
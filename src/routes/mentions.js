@@ -114,8 +114,27 @@ async function listMediaMentions(req, res) {
     filters.push(`subjectMatter LIKE @p${params.length - 1}`);
   }
   const whereClause = filters.length ? `WHERE ${filters.join(' AND ')}` : '';
+
+  // Optional paging; the total row count is returned in X-Total-Count
+  let pageClause = '';
+  if (url.searchParams.has('limit') || url.searchParams.has('offset')) {
+    const limit = Number(url.searchParams.get('limit') || 100);
+    const offset = Number(url.searchParams.get('offset') || 0);
+    if (!Number.isInteger(limit) || limit < 1 || !Number.isInteger(offset) || offset < 0) {
+      sendJson(res, 400, { error: 'limit must be a positive integer and offset non-negative' });
+      return;
+    }
+    const [{ total }] = runQuery(
+      `SELECT COUNT(*) as total FROM mediaMentions ${whereClause};`,
+      params
+    );
+    res.setHeader('X-Total-Count', total);
+    params.push(limit, offset);
+    pageClause = ` LIMIT @p${params.length - 2} OFFSET @p${params.length - 1}`;
+  }
+
   const mentions = runQuery(
-    `SELECT * FROM mediaMentions ${whereClause} ORDER BY mentionDate DESC, id DESC;`,
+    `SELECT * FROM mediaMentions ${whereClause} ORDER BY mentionDate DESC, id DESC${pageClause};`,
     params
   );
   sendJson(res, 200, mentions);
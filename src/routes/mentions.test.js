@@ -108,6 +108,32 @@ describe('Media Mention Routes', () => {
         expect.arrayContaining([1, 2])
       );
     });
+
+    test('pages results and reports the total count', async () => {
+      const mockReq = { url: '/media-mentions?clientId=1&limit=2&offset=4' };
+      mockRes.setHeader = jest.fn();
+      runQuery.mockReturnValueOnce([{ total: 9 }]).mockReturnValueOnce([{ id: 5 }, { id: 6 }]);
+
+      await listMediaMentions(mockReq, mockRes);
+
+      expect(runQuery).toHaveBeenNthCalledWith(1, expect.stringContaining('COUNT(*)'), [1]);
+      expect(runQuery).toHaveBeenNthCalledWith(
+        2,
+        expect.stringContaining('LIMIT @p1 OFFSET @p2'),
+        [1, 2, 4]
+      );
+      expect(mockRes.setHeader).toHaveBeenCalledWith('X-Total-Count', 9);
+      expect(sendJson).toHaveBeenCalledWith(mockRes, 200, [{ id: 5 }, { id: 6 }]);
+    });
+
+    test('returns 400 for invalid paging parameters', async () => {
+      const mockReq = { url: '/media-mentions?limit=0' };
+
+      await listMediaMentions(mockReq, mockRes);
+
+      expect(sendJson).toHaveBeenCalledWith(mockRes, 400, expect.any(Object));
+      expect(runQuery).not.toHaveBeenCalled();
+    });
   });
 
   describe('createMediaMention', () => {
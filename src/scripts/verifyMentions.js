@@ -19,6 +19,12 @@ const {
   isDocumentContentType,
   truncateTitle
 } = require('../utils/contentAnalysis');
+const { cacheArticleText } = require('../utils/articleCache');
+const {
+  flushVerificationEvents,
+  recordVerificationAttempt
+} = require('../utils/verificationEvents');
+const { loadWorkOrder, orderByWorkOrder } = require('../utils/verificationWorkOrder');
 const {
   createBrowserGetter,
   verifyWithBrowser,
@@ -29,14 +35,16 @@ const {
  * Verify a mention by fetching its URL and checking for client name
  * @param {Object} mention - Mention object with id, link, clientName
  * @param {Function} getBrowser - Function to lazily get browser instance
+ * @param {Object} attempt - Filled in with { method, status, fetchStatus } for the event log
  * @returns {Promise<Object>} - Verification result
  */
-async function verifyMention(mention, getBrowser = null) {
+async function verifyMention(mention, getBrowser = null, attempt = {}) {
   const { id, link, clientName, subjectMatter } = mention;
 
   // Helper to check snippet as fallback
   const trySnippetFallback = () => {
     if (subjectMatter && checkClientNameInContent(subjectMatter.toLowerCase(), clientName)) {
+      attempt.method = 'snippet';
       return { id, verified: 1, reason: 'verified_snippet', error: null };
     }
     return null;
@@ -53,6 +61,7 @@ async function verifyMention(mention, getBrowser = null) {
 
   try {
     // Try regular fetch first (faster)
+    attempt.method = 'fetch';
     const response = await fetch(link, {
       headers: {
         'User-Agent':
@@ -66,16 +75,23 @@ async function verifyMention(mention, getBrowser = null) {
       redirect: 'follow',
       signal: AbortSignal.timeout(config.verification.fetchTimeoutMs)
     });
+    attempt.status = response.status;
 
     // Check if status should trigger browser fallback
     const browserFallbackStatuses = config.verification.browserFallbackStatuses || [403];
     if (browserFallbackStatuses.includes(response.status) && getBrowser) {
       const browser = await getBrowser();
       if (browser) {
-        return await verifyWithBrowser(mention, browser);
+        attempt.fetchStatus = response.status;
+        return await verifyWithBrowser(mention, browser, attempt);
       }
     }
 
+    const contentType = response.headers.get('content-type') || '';
+    if (!response.ok) {
+      cacheArticleText(link, { method: 'fetch', status: response.status, contentType });
+    }
+
     // Handle blocked responses
     if (response.status === 403 || response.status === 401 || response.status === 429) {
       const snippetResult = trySnippetFallback();
@@ -109,12 +125,16 @@ async function verifyMention(mention, getBrowser = null) {
       return { id, verified: 0, reason: 'http_error', error: `HTTP ${response.status}` };
     }
 
-    const contentType = response.headers.get('content-type') || '';
-
     // Handle HTML content
     if (isHtmlContentType(contentType)) {
       const html = await response.text();
       const textContent = extractTextFromHtml(html);
+      cacheArticleText(link, {
+        method: 'fetch',
+        status: response.status,
+        contentType,
+        text: textContent
+      });
       const verified = checkClientNameInContent(textContent, clientName) ? 1 : 0;
       return {
         id,
@@ -124,6 +144,8 @@ async function verifyMention(mention, getBrowser = null) {
       };
     }
 
+    cacheArticleText(link, { method: 'fetch', status: response.status, contentType });
+
     // Handle documents (PDF, Word, etc.)
     if (isDocumentContentType(contentType)) {
       const titleLower = (mention.title || '').toLowerCase();
@@ -163,7 +185,10 @@ async function verifyMentionWithRetry(mention, getBrowser) {
   let lastResult = null;
 
   for (let attempt = 1; attempt <= maxRetries; attempt++) {
-    const result = await verifyMention(mention, getBrowser);
+    const trace = {};
+    const startedAt = Date.now();
+    const result = await verifyMention(mention, getBrowser, trace);
+    recordVerificationAttempt(mention, trace, result, Date.now() - startedAt, attempt - 1);
 
     // Don't retry for definitive results
     const noRetryReasons = [
@@ -208,8 +233,9 @@ async function verifyMentionWithRetry(mention, getBrowser) {
  */
 function updateVerificationInDb(result) {
   try {
-    runExecute('UPDATE mediaMentions SET verified = @p0 WHERE id = @p1', [
+    runExecute('UPDATE mediaMentions SET verified = @p0, updatedAt = @p1 WHERE id = @p2', [
       result.verified,
+      new Date().toISOString(),
       result.id
     ]);
     return true;
@@ -402,9 +428,15 @@ async function verifyAllMentions({ silent = false, broadcast = !silent } = {}) {
 
     // Concurrent processing
     let currentIndex = 0;
-    const mentionsToProcess = mentions
-      .map((m, i) => ({ mention: m, index: i }))
-      .filter(({ mention }) => mention.verified !== 1);
+    const workOrder = loadWorkOrder();
+    const mentionsToProcess = orderByWorkOrder(
+      mentions
+        .map((m, i) => ({ mention: m, index: i }))
+        .filter(({ mention }) => mention.verified !== 1),
+      workOrder,
+      ({ mention }) => mention.id
+    );
+    if (workOrder) log(`Following work order of ${workOrder.size} mentions\n`);
 
     const worker = async () => {
       while (currentIndex < mentionsToProcess.length) {
@@ -459,6 +491,7 @@ async function verifyAllMentions({ silent = false, broadcast = !silent } = {}) {
     }
   } finally {
     await closeBrowser();
+    flushVerificationEvents();
   }
 
   // Print summary
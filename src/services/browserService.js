@@ -11,6 +11,7 @@ const {
   isBlockedPage,
   isSuspiciouslyShortContent
 } = require('../utils/contentAnalysis');
+const { cacheArticleText } = require('../utils/articleCache');
 
 // Use stealth plugin to avoid Cloudflare detection
 puppeteer.use(StealthPlugin());
@@ -153,11 +154,14 @@ async function analyzeCardItemPage(page, clientName, siteConfig) {
  * Used for sites that block regular fetch requests
  * @param {Object} mention - Mention object with id, link, clientName, clientId
  * @param {Object} browser - Puppeteer browser instance
+ * @param {Object} attempt - Filled in with { method, status } for the verification event log
  * @returns {Promise<Object>} - Verification result
  */
-async function verifyWithBrowser(mention, browser) {
+async function verifyWithBrowser(mention, browser, attempt = {}) {
   const { id, link, clientName, clientId } = mention;
   let page = null;
+  attempt.method = 'browser';
+  attempt.status = null;
 
   try {
     page = await browser.newPage();
@@ -169,10 +173,11 @@ async function verifyWithBrowser(mention, browser) {
     );
 
     // Navigate with faster wait strategy
-    await page.goto(link, {
+    const response = await page.goto(link, {
       waitUntil: 'domcontentloaded',
       timeout: config.verification.browserTimeoutMs
     });
+    attempt.status = response ? response.status() : null;
 
     // Wait for dynamic content
     await new Promise((resolve) => setTimeout(resolve, config.verification.dynamicContentDelayMs));
@@ -184,6 +189,12 @@ async function verifyWithBrowser(mention, browser) {
     // eslint-disable-next-line no-undef
     const rawTextContent = await page.evaluate(() => document.body?.innerText || '');
     const textContent = rawTextContent.toLowerCase();
+    cacheArticleText(link, {
+      method: 'browser',
+      status: attempt.status,
+      text: textContent,
+      cardItemSite: Boolean(cardItemSiteConfig)
+    });
 
     // Detect block pages
     if (isBlockedPage(textContent) || isSuspiciouslyShortContent(textContent)) {
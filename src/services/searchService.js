@@ -13,7 +13,7 @@ function buildQueries(client, profile) {
   const queries = [];
 
   // Base query (general search)
-  const base = buildSearchRequest(client, profile);
+  const base = buildSearchRequest(client, profile, { label: 'base' });
   queries.push(base);
 
   // If client has priority publications, add a site-restricted query
@@ -37,13 +37,40 @@ function loadClients() {
   return runQuery('SELECT id, name FROM clients ORDER BY id;');
 }
 
-async function runProvider(providerName, searchRequest, jobLog) {
+/**
+ * Record a single provider call in searchJobs so query yield can be measured
+ * Mentions created from the call reference the row via mediaMentions.searchJobId
+ * @param {Object} client - Client being searched
+ * @param {string} providerName - Provider name (e.g., 'google')
+ * @param {string} query - Query string sent to the provider
+ * @param {string|null} label - Query variant label from buildQueries
+ * @param {string} status - 'completed' or 'failed'
+ * @param {number} resultCount - Number of results returned
+ * @param {string} scheduledAt - ISO timestamp when the call started
+ * @returns {number|null} - searchJobs row id, or null if it could not be recorded
+ */
+function recordSearchCall(client, providerName, query, label, status, resultCount, scheduledAt) {
+  try {
+    const now = new Date().toISOString();
+    const [job] = runQuery(
+      'INSERT INTO searchJobs (clientId, query, status, scheduledAt, completedAt, provider, label, resultCount, createdAt, updatedAt) VALUES (@p0, @p1, @p2, @p3, @p4, @p5, @p6, @p7, @p4, @p4) RETURNING id;',
+      [client.id, query, status, scheduledAt, now, providerName, label, resultCount]
+    );
+    return job ? job.id : null;
+  } catch (err) {
+    console.warn(`[search] unable to record search call for "${query}": ${err.message}`);
+    return null;
+  }
+}
+
+async function runProvider(providerName, searchRequest, jobLog, client) {
   const provider = providerLookup[providerName];
   if (!provider) {
     throw new Error(`Unknown provider: ${providerName}`);
   }
   const query = typeof searchRequest === 'string' ? searchRequest : searchRequest.query;
-  const label = typeof searchRequest === 'object' ? searchRequest.label : null;
+  const label = typeof searchRequest === 'object' ? searchRequest.label || null : null;
+  const startedAt = new Date().toISOString();
   try {
     const results = await provider(searchRequest, {
       maxResults: searchConfig.maxResultsPerProvider
@@ -55,7 +82,16 @@ async function runProvider(providerName, searchRequest, jobLog) {
       status: 'success',
       results: results.length
     });
-    return results;
+    const searchJobId = recordSearchCall(
+      client,
+      providerName,
+      query,
+      label,
+      'completed',
+      results.length,
+      startedAt
+    );
+    return results.map((result) => ({ ...result, searchJobId }));
   } catch (err) {
     console.warn(`[providers] ${providerName} ✗ failed for "${query}": ${err.message}`);
     jobLog.errors.push({ provider: providerName, query, message: err.message });
@@ -65,6 +101,7 @@ async function runProvider(providerName, searchRequest, jobLog) {
       status: 'failed',
       error: err.message
     });
+    recordSearchCall(client, providerName, query, label, 'failed', 0, startedAt);
     return [];
   }
 }
@@ -90,7 +127,7 @@ async function runSearchJob() {
 
     for (const providerName of searchConfig.providers) {
       for (const searchRequest of queries) {
-        const results = await runProvider(providerName, searchRequest, jobLog);
+        const results = await runProvider(providerName, searchRequest, jobLog, client);
         const filtered = filterResultsForClient(results, profile, client);
         filtered.forEach((result) => providerResults.push(normalizeResult(result, client)));
       }
@@ -151,6 +151,32 @@ describe('searchService', () => {
       expect(providerLookup.google).toHaveBeenCalledTimes(2);
     });
 
+    it('records each provider call as a search job', async () => {
+      await runSearchJob();
+
+      const insertCall = runQuery.mock.calls.find((call) =>
+        call[0].includes('INSERT INTO searchJobs')
+      );
+      expect(insertCall).toBeDefined();
+      expect(insertCall[1]).toEqual(
+        expect.arrayContaining([1, 'completed', 'google', 'base', 1])
+      );
+    });
+
+    it('tags results with the search job that produced them', async () => {
+      runQuery.mockImplementation((sql) =>
+        sql.includes('INSERT INTO searchJobs') ? [{ id: 42 }] : [{ id: 1, name: 'Test Client' }]
+      );
+
+      await runSearchJob();
+
+      expect(filterResultsForClient).toHaveBeenCalledWith(
+        [expect.objectContaining({ searchJobId: 42 })],
+        expect.anything(),
+        expect.anything()
+      );
+    });
+
     it('sets searching status at start', async () => {
       await runSearchJob();
 
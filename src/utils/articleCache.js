@@ -0,0 +1,171 @@
+/**
+ * @fileoverview Article text cache for offline re-verification
+ * Keeps the text each verification decided on, one gzipped JSON file per URL,
+ * so rule changes can be replayed by temp/analysis/toolkit/reverify.py
+ * without refetching pages or launching a browser. The cache is capped at
+ * config.verification.articleCacheMaxMb: once a write takes it over, the
+ * oldest entries are deleted until it is back under PRUNE_TARGET of the cap.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const { config } = require('../config');
+
+// Pruning frees space down to this share of the cap, so it does not run on every write
+const PRUNE_TARGET = 0.9;
+
+// Bytes in the cache directory: scanned on the first write, then kept up to date
+let cacheBytes = null;
+
+/**
+ * Cache key for a mention link (sha1 of the link as stored in mediaMentions)
+ * @param {string} link - Mention URL
+ * @returns {string} - Hex digest
+ */
+function articleCacheKey(link) {
+  return crypto.createHash('sha1').update(link).digest('hex');
+}
+
+/**
+ * Path of the cache file for a link
+ * @param {string} link - Mention URL
+ * @param {string} dir - Cache directory (default: config.verification.articleCacheDir)
+ * @returns {string} - File path
+ */
+function articleCachePath(link, dir = config.verification.articleCacheDir) {
+  const key = articleCacheKey(link);
+  return path.join(dir, key.slice(0, 2), `${key}.json.gz`);
+}
+
+/**
+ * Cache size cap in bytes
+ * @returns {number}
+ */
+function articleCacheMaxBytes() {
+  return config.verification.articleCacheMaxMb * 1024 * 1024;
+}
+
+/**
+ * Every entry in the cache directory
+ * @param {string} dir - Cache directory
+ * @returns {Array<Object>} - [{ file, size, mtimeMs }]
+ */
+function listCachedArticles(dir) {
+  const entries = [];
+  let shards;
+  try {
+    shards = fs.readdirSync(dir, { withFileTypes: true });
+  } catch {
+    return entries;
+  }
+  for (const shard of shards) {
+    if (!shard.isDirectory()) continue;
+    for (const name of fs.readdirSync(path.join(dir, shard.name))) {
+      if (!name.endsWith('.json.gz')) continue;
+      const file = path.join(dir, shard.name, name);
+      try {
+        const { size, mtimeMs } = fs.statSync(file);
+        entries.push({ file, size, mtimeMs });
+      } catch {
+        // Replaced or pruned by another process
+      }
+    }
+  }
+  return entries;
+}
+
+/**
+ * Delete the oldest entries until the cache is no larger than targetBytes
+ * @param {number} targetBytes - Size to prune down to
+ * @param {Object} options - { dir, keep } (keep: a file that is never deleted)
+ * @returns {number} - Bytes freed
+ */
+function pruneArticleCache(
+  targetBytes = articleCacheMaxBytes() * PRUNE_TARGET,
+  { dir = config.verification.articleCacheDir, keep = null } = {}
+) {
+  const entries = listCachedArticles(dir).sort((a, b) => a.mtimeMs - b.mtimeMs);
+  let total = entries.reduce((sum, entry) => sum + entry.size, 0);
+  let freed = 0;
+  for (const entry of entries) {
+    if (total <= targetBytes) break;
+    if (entry.file === keep) continue;
+    try {
+      fs.unlinkSync(entry.file);
+    } catch {
+      continue;
+    }
+    total -= entry.size;
+    freed += entry.size;
+  }
+  if (dir === config.verification.articleCacheDir) cacheBytes = total;
+  return freed;
+}
+
+/**
+ * Store what a verification attempt saw for a link
+ * Caching is best effort: failures are logged and never affect verification.
+ * A write that takes the cache over its cap prunes the oldest entries.
+ * @param {string} link - Mention URL
+ * @param {Object} entry - { method: 'fetch'|'browser', status, contentType, text, cardItemSite }
+ * @returns {boolean} - True if the entry was written
+ */
+function cacheArticleText(link, entry) {
+  if (!config.verification.cacheArticleText || !link) return false;
+
+  try {
+    const file = articleCachePath(link);
+    const record = {
+      url: link,
+      fetchedAt: new Date().toISOString(),
+      method: entry.method,
+      status: entry.status ?? null,
+      contentType: entry.contentType ?? null,
+      text: entry.text ?? null,
+      cardItemSite: Boolean(entry.cardItemSite)
+    };
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    const data = zlib.gzipSync(JSON.stringify(record));
+    let replaced = 0;
+    try {
+      replaced = fs.statSync(file).size;
+    } catch {
+      // New entry
+    }
+    const tmp = `${file}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, data);
+    fs.renameSync(tmp, file);
+
+    if (cacheBytes === null) pruneArticleCache(Infinity);
+    else cacheBytes += data.length - replaced;
+    if (cacheBytes > articleCacheMaxBytes()) pruneArticleCache(undefined, { keep: file });
+    return true;
+  } catch (error) {
+    console.warn(`Failed to cache article text for ${link}: ${error.message}`);
+    return false;
+  }
+}
+
+/**
+ * Read the cached entry for a link
+ * @param {string} link - Mention URL
+ * @returns {Object|null} - Cached record, or null when missing or unreadable
+ */
+function readCachedArticle(link) {
+  if (!link) return null;
+  try {
+    return JSON.parse(zlib.gunzipSync(fs.readFileSync(articleCachePath(link))).toString('utf8'));
+  } catch {
+    return null;
+  }
+}
+
+module.exports = {
+  articleCacheKey,
+  articleCachePath,
+  cacheArticleText,
+  pruneArticleCache,
+  readCachedArticle
+};
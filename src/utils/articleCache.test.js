@@ -0,0 +1,100 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const cacheDir = fs.mkdtempSync(path.join(os.tmpdir(), 'article-cache-'));
+process.env.ARTICLE_CACHE_DIR = cacheDir;
+
+const { config } = require('../config');
+const {
+  articleCacheKey,
+  articleCachePath,
+  cacheArticleText,
+  pruneArticleCache,
+  readCachedArticle
+} = require('./articleCache');
+
+describe('articleCache', () => {
+  afterAll(() => {
+    fs.rmSync(cacheDir, { recursive: true, force: true });
+  });
+
+  test('keys files by sha1 of the link in two-character shards', () => {
+    const link = 'https://example.com/story';
+    const key = articleCacheKey(link);
+
+    expect(key).toMatch(/^[0-9a-f]{40}$/);
+    expect(articleCachePath(link)).toBe(path.join(cacheDir, key.slice(0, 2), `${key}.json.gz`));
+  });
+
+  test('round-trips an entry', () => {
+    const link = 'https://example.com/article';
+
+    expect(
+      cacheArticleText(link, {
+        method: 'fetch',
+        status: 200,
+        contentType: 'text/html',
+        text: 'florida tomato committee news'
+      })
+    ).toBe(true);
+
+    const cached = readCachedArticle(link);
+    expect(cached).toMatchObject({
+      url: link,
+      method: 'fetch',
+      status: 200,
+      contentType: 'text/html',
+      text: 'florida tomato committee news',
+      cardItemSite: false
+    });
+    expect(cached.fetchedAt).toBeTruthy();
+  });
+
+  test('returns null for links that were never cached', () => {
+    expect(readCachedArticle('https://example.com/missing')).toBeNull();
+    expect(readCachedArticle(null)).toBeNull();
+  });
+
+  test('prunes the oldest entries down to the target size', () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'article-prune-'));
+    const files = ['a', 'b', 'c'].map((name, i) => {
+      const file = path.join(dir, 'ab', `${name}.json.gz`);
+      fs.mkdirSync(path.dirname(file), { recursive: true });
+      fs.writeFileSync(file, Buffer.alloc(100));
+      const writtenAt = new Date(Date.UTC(2025, 0, i + 1));
+      fs.utimesSync(file, writtenAt, writtenAt);
+      return file;
+    });
+    try {
+      expect(pruneArticleCache(150, { dir, keep: files[0] })).toBe(200);
+      expect(files.map((file) => fs.existsSync(file))).toEqual([true, false, false]);
+    } finally {
+      fs.rmSync(dir, { recursive: true, force: true });
+    }
+  });
+
+  test('a write over the cap prunes older entries and keeps the new one', () => {
+    const maxMb = config.verification.articleCacheMaxMb;
+    config.verification.articleCacheMaxMb = 0.0001;
+    try {
+      const link = 'https://example.com/newest';
+      expect(cacheArticleText(link, { method: 'fetch', status: 200, text: 'news' })).toBe(true);
+      expect(readCachedArticle(link)).not.toBeNull();
+      expect(readCachedArticle('https://example.com/article')).toBeNull();
+    } finally {
+      config.verification.articleCacheMaxMb = maxMb;
+    }
+  });
+
+  test('does nothing when caching is disabled', () => {
+    const link = 'https://example.com/disabled';
+    config.verification.cacheArticleText = false;
+    try {
+      expect(cacheArticleText(link, { method: 'fetch', status: 404 })).toBe(false);
+    } finally {
+      config.verification.cacheArticleText = true;
+    }
+    expect(readCachedArticle(link)).toBeNull();
+  });
+});
@@ -214,7 +214,7 @@ function recordMentions(results, status) {
 
     const cleanedSnippet = cleanSnippet(result.snippet);
     const [mention] = runQuery(
-      'INSERT INTO mediaMentions (title, subjectMatter, mentionDate, reMentionDate, link, source, sentiment, status, clientId, publicationId, verified, createdAt, updatedAt) VALUES (@p0, @p1, @p2, @p3, @p4, @p5, @p6, @p7, @p8, @p9, @p10, @p11, @p11) RETURNING *;',
+      'INSERT INTO mediaMentions (title, subjectMatter, mentionDate, reMentionDate, link, source, sentiment, status, clientId, publicationId, verified, createdAt, updatedAt, provider, searchJobId) VALUES (@p0, @p1, @p2, @p3, @p4, @p5, @p6, @p7, @p8, @p9, @p10, @p11, @p11, @p12, @p13) RETURNING *;',
       [
         result.title,
         cleanedSnippet || status || 'Mention',
@@ -227,7 +227,9 @@ function recordMentions(results, status) {
         result.clientId,
         publicationId,
         null, // verified = NULL means pending until auto-verification runs
-        now
+        now,
+        result.provider || null, // Discovery path: 'google', 'google-alerts-rss', 'card-item-discovery'
+        result.searchJobId || null // searchJobs row for the query call that found it
       ]
     );
 
@@ -73,6 +73,39 @@ describe('recordMentions', () => {
     expect(insertCall[1][10]).toBeNull();
   });
 
+  test('stores the discovery provider with the mention', () => {
+    runQuery.mockImplementation((sql) => {
+      if (sql.includes('SELECT id FROM publications WHERE LOWER(website)')) {
+        return [{ id: 1 }];
+      }
+      if (sql.includes('INSERT INTO mediaMentions')) {
+        return [{ id: 1, title: 'Test Article', provider: 'google-alerts-rss' }];
+      }
+      return [];
+    });
+
+    recordMentions(
+      [
+        {
+          title: 'Test Article',
+          url: 'https://example.com/article',
+          snippet: 'Test snippet',
+          source: 'example.com',
+          clientId: 1,
+          provider: 'google-alerts-rss',
+          normalizedUrl: 'https://example.com/article'
+        }
+      ],
+      'new'
+    );
+
+    const insertCall = runQuery.mock.calls.find((call) =>
+      call[0].includes('INSERT INTO mediaMentions')
+    );
+    expect(insertCall[0]).toContain('provider');
+    expect(insertCall[1][12]).toBe('google-alerts-rss');
+  });
+
   test('broadcasts new mention after creation', () => {
     runQuery.mockImplementation((sql) => {
       if (sql.includes('SELECT link FROM mediaMentions')) {
@@ -0,0 +1,54 @@
+/**
+ * @fileoverview Persistent rejection log for search result filtering
+ * Appends the rejectionLog built by filterResultsForClient to one gzipped JSONL
+ * segment per UTC day, so temp/analysis/toolkit/rejections.py can answer
+ * "was this URL ever rejected, and why?" across months of search runs
+ */
+
+const { config } = require('../config');
+const { appendSegment, segmentLogPath } = require('./segmentLog');
+
+/**
+ * Segment file for a timestamp (one per UTC day)
+ * @param {Date} date - When the rejections were logged
+ * @param {string} dir - Log directory (default: config.filters.rejectionLogDir)
+ * @returns {string} - File path, e.g. data/rejections/2025-11-01.jsonl.gz
+ */
+function rejectionLogPath(date = new Date(), dir = config.filters.rejectionLogDir) {
+  return segmentLogPath(dir, date);
+}
+
+/**
+ * Append rejections for one client to today's segment
+ * Each call writes a single gzip member (segmentLog.js). Logging is best
+ * effort: failures are logged and never affect search.
+ * @param {Array} rejections - rejectionLog entries from filterResultsForClient
+ * @param {Object} client - Client object ({ id, name })
+ * @param {Object} context - Optional { provider, searchJobId } of the search call
+ * @returns {number} - Number of rejections written
+ */
+function appendRejections(rejections, client, context = {}) {
+  if (!config.filters.logRejections || !rejections || rejections.length === 0) return 0;
+
+  try {
+    const now = new Date();
+    const loggedAt = now.toISOString();
+    const records = rejections.map((entry) => ({
+      loggedAt,
+      clientId: client.id ?? null,
+      client: client.name,
+      provider: context.provider ?? null,
+      searchJobId: context.searchJobId ?? null,
+      ...entry
+    }));
+    return appendSegment(config.filters.rejectionLogDir, records, now);
+  } catch (error) {
+    console.warn(`Failed to log rejections for ${client.name}: ${error.message}`);
+    return 0;
+  }
+}
+
+module.exports = {
+  appendRejections,
+  rejectionLogPath
+};
@@ -0,0 +1,69 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+
+const logDir = fs.mkdtempSync(path.join(os.tmpdir(), 'rejections-'));
+process.env.REJECTION_LOG_DIR = logDir;
+
+const { config } = require('../config');
+const { appendRejections, rejectionLogPath } = require('./rejectionLog');
+
+function readSegment(file) {
+  return zlib
+    .gunzipSync(fs.readFileSync(file))
+    .toString('utf8')
+    .trim()
+    .split('\n')
+    .map((line) => JSON.parse(line));
+}
+
+describe('rejectionLog', () => {
+  const client = { id: 3, name: 'Florida Tomato Committee' };
+
+  afterAll(() => {
+    fs.rmSync(logDir, { recursive: true, force: true });
+  });
+
+  test('partitions segments by UTC day', () => {
+    expect(rejectionLogPath(new Date('2025-11-01T23:30:00.000Z'))).toBe(
+      path.join(logDir, '2025-11-01.jsonl.gz')
+    );
+  });
+
+  test('appends gzip members that read back as one stream', () => {
+    appendRejections([{ reason: 'own_domain', url: 'https://a.com/1' }], client, {
+      provider: 'google',
+      searchJobId: 12
+    });
+    appendRejections(
+      [
+        { reason: 'social_media', url: 'https://x.com/2' },
+        { reason: 'article_too_old', url: 'https://b.com/3', daysOld: 400 }
+      ],
+      client
+    );
+
+    const rows = readSegment(rejectionLogPath());
+    expect(rows.map((row) => row.reason)).toEqual([
+      'own_domain',
+      'social_media',
+      'article_too_old'
+    ]);
+    expect(rows[0]).toMatchObject({
+      clientId: 3,
+      client: 'Florida Tomato Committee',
+      provider: 'google',
+      searchJobId: 12
+    });
+    expect(rows[2]).toMatchObject({ provider: null, daysOld: 400 });
+    expect(rows[0].loggedAt).toBeTruthy();
+  });
+
+  test('does nothing when logging is disabled or there is nothing to log', () => {
+    expect(appendRejections([], client)).toBe(0);
+    config.filters.logRejections = false;
+    expect(appendRejections([{ reason: 'own_domain' }], client)).toBe(0);
+    config.filters.logRejections = true;
+  });
+});
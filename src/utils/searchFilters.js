@@ -1,5 +1,6 @@
 const { extractDomain } = require('./mentions');
 const { config } = require('../config');
+const { appendRejections } = require('./rejectionLog');
 
 /**
  * Generate common variations of a client name for fuzzy matching
@@ -301,6 +302,7 @@ const SOCIAL_MEDIA_DOMAINS = config.filters.socialMediaDomains;
  *
  * Note: ~80% of mentions will come from tiered publication scraping later
  * This phase prioritizes precision over recall
+ * Every rejection, with its reason, is appended to the rejection log (utils/rejectionLog)
  *
  * @param {Array} results - Search results to filter
  * @param {Object} profile - Client search profile
@@ -509,6 +511,12 @@ function filterResultsForClient(results, profile, client) {
     return true;
   });
 
+  const first = results[0] || {};
+  appendRejections(rejectionLog, client, {
+    provider: first.provider,
+    searchJobId: first.searchJobId
+  });
+
   return filtered;
 }
 
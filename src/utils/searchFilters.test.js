@@ -1,4 +1,7 @@
+jest.mock('./rejectionLog');
+
 const { filterResultsForClient } = require('./searchFilters');
+const { appendRejections } = require('./rejectionLog');
 
 describe('filterResultsForClient', () => {
   const client = { name: 'Bushwick Commission' };
@@ -62,4 +65,24 @@ describe('filterResultsForClient', () => {
 
     expect(filtered).toEqual([]);
   });
+
+  test('hands rejections to the rejection log with the search call context', () => {
+    const results = [
+      {
+        title: 'Unrelated article',
+        snippet: 'No mention of client',
+        url: 'https://example.com/a',
+        provider: 'google',
+        searchJobId: 7
+      }
+    ];
+
+    filterResultsForClient(results, {}, client);
+
+    expect(appendRejections).toHaveBeenCalledWith(
+      [expect.objectContaining({ reason: 'name_not_in_snippet', url: 'https://example.com/a' })],
+      client,
+      { provider: 'google', searchJobId: 7 }
+    );
+  });
 });
@@ -0,0 +1,43 @@
+/**
+ * @fileoverview Day-segmented gzipped JSONL logs
+ * Shared writer for the append-only logs the analysis toolkit reads
+ * (rejectionLog.js, verificationEvents.js): one segment per UTC day,
+ * YYYY-MM-DD.jsonl.gz, and one gzip member per append. Concatenated members
+ * read back as one stream, so a segment is never rewritten.
+ */
+
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+/**
+ * Segment file for a timestamp (one per UTC day)
+ * @param {string} dir - Log directory
+ * @param {Date} date - When the records were written
+ * @returns {string} - File path, e.g. data/rejections/2025-11-01.jsonl.gz
+ */
+function segmentLogPath(dir, date = new Date()) {
+  return path.join(dir, `${date.toISOString().slice(0, 10)}.jsonl.gz`);
+}
+
+/**
+ * Append records to the segment for `date` as one gzip member
+ * Throws on write errors; callers decide how best-effort their log is.
+ * @param {string} dir - Log directory (created if missing)
+ * @param {Array<Object>} records - Records to write, one JSON line each
+ * @param {Date} date - Timestamp that picks the segment
+ * @returns {number} - Number of records written
+ */
+function appendSegment(dir, records, date = new Date()) {
+  if (records.length === 0) return 0;
+  const file = segmentLogPath(dir, date);
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  const lines = records.map((record) => JSON.stringify(record)).join('\n');
+  fs.appendFileSync(file, zlib.gzipSync(`${lines}\n`));
+  return records.length;
+}
+
+module.exports = {
+  appendSegment,
+  segmentLogPath
+};
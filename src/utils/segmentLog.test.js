@@ -0,0 +1,35 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+
+const { appendSegment, segmentLogPath } = require('./segmentLog');
+
+describe('segmentLog', () => {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'segment-log-'));
+
+  afterAll(() => {
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  test('partitions segments by UTC day', () => {
+    expect(segmentLogPath(dir, new Date('2025-11-01T23:30:00.000Z'))).toBe(
+      path.join(dir, '2025-11-01.jsonl.gz')
+    );
+  });
+
+  test('appends one gzip member per call', () => {
+    const day = new Date('2025-11-02T08:00:00.000Z');
+    expect(appendSegment(path.join(dir, 'nested'), [{ n: 1 }, { n: 2 }], day)).toBe(2);
+    expect(appendSegment(path.join(dir, 'nested'), [{ n: 3 }], day)).toBe(1);
+    expect(appendSegment(path.join(dir, 'nested'), [], day)).toBe(0);
+
+    const rows = zlib
+      .gunzipSync(fs.readFileSync(segmentLogPath(path.join(dir, 'nested'), day)))
+      .toString('utf8')
+      .trim()
+      .split('\n')
+      .map((line) => JSON.parse(line));
+    expect(rows.map((row) => row.n)).toEqual([1, 2, 3]);
+  });
+});
@@ -0,0 +1,99 @@
+/**
+ * @fileoverview Verification attempt event log
+ * Records every verification attempt (domain, method, duration, HTTP status,
+ * blocked, retry) to one gzipped JSONL segment per UTC day, so
+ * temp/analysis/toolkit/verify_events.py can measure per-domain latency and
+ * block rates. Events are buffered and written in batches, one gzip member
+ * per batch.
+ */
+
+const { config } = require('../config');
+const { extractDomain } = require('./mentions');
+const { appendSegment, segmentLogPath } = require('./segmentLog');
+
+// Events buffered before a batch is written
+const FLUSH_SIZE = 200;
+
+// Outcomes that mean the site refused us rather than answered
+const BLOCKED_REASONS = ['blocked', 'blocked_page_detected'];
+const BLOCKED_STATUSES = [401, 403, 429];
+
+const pending = [];
+
+/**
+ * Segment file for a timestamp (one per UTC day)
+ * @param {Date} date - When the events were written
+ * @param {string} dir - Log directory (default: config.verification.attemptLogDir)
+ * @returns {string} - File path, e.g. data/verification-events/2025-11-01.jsonl.gz
+ */
+function verificationEventLogPath(date = new Date(), dir = config.verification.attemptLogDir) {
+  return segmentLogPath(dir, date);
+}
+
+/**
+ * Whether the attempt's final method was refused by the site (HTTP status or block page)
+ * A fetch refusal that fell back to the browser is kept in fetchStatus and
+ * counted against fetch by verify_events.py; it does not make a browser
+ * attempt that got through blocked.
+ * @param {Object} attempt - { status } filled in by verifyMention
+ * @param {Object} result - Verification result
+ * @returns {boolean}
+ */
+function isBlockedAttempt(attempt, result) {
+  return BLOCKED_REASONS.includes(result.reason) || BLOCKED_STATUSES.includes(attempt.status);
+}
+
+/**
+ * Buffer one verification attempt
+ * @param {Object} mention - Mention being verified ({ id, clientId, link })
+ * @param {Object} attempt - { method, status, fetchStatus } filled in by verifyMention
+ * @param {Object} result - Verification result for this attempt
+ * @param {number} durationMs - Wall time of the attempt
+ * @param {number} retry - Retry count (0 for the first attempt)
+ * @returns {Object|null} - The event, or null when logging is disabled
+ */
+function recordVerificationAttempt(mention, attempt, result, durationMs, retry) {
+  if (!config.verification.logAttempts) return null;
+
+  const event = {
+    at: new Date().toISOString(),
+    mentionId: mention.id ?? null,
+    clientId: mention.clientId ?? null,
+    domain: mention.link ? extractDomain(mention.link) : null,
+    method: attempt.method || 'none',
+    durationMs: Math.round(durationMs),
+    status: attempt.status ?? null,
+    fetchStatus: attempt.fetchStatus ?? null,
+    blocked: isBlockedAttempt(attempt, result),
+    retry,
+    reason: result.reason,
+    verified: result.verified ?? null
+  };
+  pending.push(event);
+  if (pending.length >= FLUSH_SIZE) flushVerificationEvents();
+  return event;
+}
+
+/**
+ * Write buffered events to today's segment
+ * Logging is best effort: failures are logged and never affect verification.
+ * @returns {number} - Number of events written
+ */
+function flushVerificationEvents() {
+  if (pending.length === 0) return 0;
+  const events = pending.splice(0, pending.length);
+
+  try {
+    return appendSegment(config.verification.attemptLogDir, events);
+  } catch (error) {
+    console.warn(`Failed to write ${events.length} verification events: ${error.message}`);
+    return 0;
+  }
+}
+
+module.exports = {
+  flushVerificationEvents,
+  isBlockedAttempt,
+  recordVerificationAttempt,
+  verificationEventLogPath
+};
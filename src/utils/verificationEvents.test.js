@@ -0,0 +1,77 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+
+const logDir = fs.mkdtempSync(path.join(os.tmpdir(), 'verification-events-'));
+process.env.VERIFY_ATTEMPT_LOG_DIR = logDir;
+
+const { config } = require('../config');
+const {
+  flushVerificationEvents,
+  isBlockedAttempt,
+  recordVerificationAttempt,
+  verificationEventLogPath
+} = require('./verificationEvents');
+
+describe('verificationEvents', () => {
+  const mention = { id: 5, clientId: 2, link: 'https://www.thepacker.com/story' };
+
+  afterAll(() => {
+    fs.rmSync(logDir, { recursive: true, force: true });
+  });
+
+  test('flags refused attempts as blocked', () => {
+    expect(isBlockedAttempt({ status: 403 }, { reason: 'blocked' })).toBe(true);
+    // A refused fetch the browser got past is not a blocked attempt
+    expect(
+      isBlockedAttempt({ fetchStatus: 403, status: 200 }, { reason: 'verified_browser' })
+    ).toBe(false);
+    expect(isBlockedAttempt({ fetchStatus: 403, status: 403 }, { reason: 'blocked' })).toBe(true);
+    expect(isBlockedAttempt({ status: 200 }, { reason: 'blocked_page_detected' })).toBe(true);
+    expect(isBlockedAttempt({ status: 200 }, { reason: 'name_not_found' })).toBe(false);
+  });
+
+  test('buffers attempts and writes them as one batch', () => {
+    const event = recordVerificationAttempt(
+      mention,
+      { method: 'browser', status: 200, fetchStatus: 403 },
+      { verified: 1, reason: 'verified_browser' },
+      1234.4,
+      1
+    );
+    expect(event).toMatchObject({
+      mentionId: 5,
+      clientId: 2,
+      domain: 'www.thepacker.com',
+      method: 'browser',
+      durationMs: 1234,
+      status: 200,
+      fetchStatus: 403,
+      blocked: false,
+      retry: 1
+    });
+    recordVerificationAttempt(mention, {}, { verified: 0, reason: 'no_url' }, 1, 0);
+
+    expect(flushVerificationEvents()).toBe(2);
+    expect(flushVerificationEvents()).toBe(0);
+
+    const rows = zlib
+      .gunzipSync(fs.readFileSync(verificationEventLogPath()))
+      .toString('utf8')
+      .trim()
+      .split('\n')
+      .map((line) => JSON.parse(line));
+    expect(rows.map((row) => [row.method, row.reason])).toEqual([
+      ['browser', 'verified_browser'],
+      ['none', 'no_url']
+    ]);
+  });
+
+  test('records nothing when logging is disabled', () => {
+    config.verification.logAttempts = false;
+    expect(recordVerificationAttempt(mention, {}, { reason: 'verified' }, 1, 0)).toBeNull();
+    expect(flushVerificationEvents()).toBe(0);
+    config.verification.logAttempts = true;
+  });
+});
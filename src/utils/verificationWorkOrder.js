@@ -0,0 +1,50 @@
+/**
+ * @fileoverview Verification work order
+ * Reads the prioritised work order written by
+ * temp/analysis/toolkit/verify_plan.py ({ "ids": [...] }) and sorts the
+ * verification queue by it, so mentions that are most likely to verify per
+ * second of browser time are processed first. Mentions missing from the
+ * work order keep their original order after the listed ones.
+ */
+
+const fs = require('fs');
+const { config } = require('../config');
+
+/**
+ * Load the work order as a map of mention id to rank
+ * A missing or unreadable file is logged and ignored.
+ * @param {string} file - Work order path (default: config.verification.workOrderPath)
+ * @returns {Map<number, number>|null} - Rank per mention id, or null when there is none
+ */
+function loadWorkOrder(file = config.verification.workOrderPath) {
+  if (!file) return null;
+  try {
+    const { ids } = JSON.parse(fs.readFileSync(file, 'utf8'));
+    if (!Array.isArray(ids)) throw new Error('missing "ids" array');
+    return new Map(ids.map((id, rank) => [id, rank]));
+  } catch (error) {
+    console.warn(`Ignoring verification work order ${file}: ${error.message}`);
+    return null;
+  }
+}
+
+/**
+ * Sort items by work order rank (stable, unlisted items last in their original order)
+ * @param {Array} items - Queue items
+ * @param {Map<number, number>|null} ranks - From loadWorkOrder
+ * @param {Function} getId - Mention id of an item
+ * @returns {Array} - A new, sorted array (a copy of items when ranks is null)
+ */
+function orderByWorkOrder(items, ranks, getId = (item) => item.id) {
+  if (!ranks) return items.slice();
+  const rankOf = (item) => ranks.get(getId(item)) ?? Infinity;
+  return items
+    .map((item, index) => ({ item, index, rank: rankOf(item) }))
+    .sort((a, b) => (a.rank === b.rank ? a.index - b.index : a.rank - b.rank))
+    .map(({ item }) => item);
+}
+
+module.exports = {
+  loadWorkOrder,
+  orderByWorkOrder
+};
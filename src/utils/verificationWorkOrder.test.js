@@ -0,0 +1,40 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const { loadWorkOrder, orderByWorkOrder } = require('./verificationWorkOrder');
+
+describe('verificationWorkOrder', () => {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'work-order-'));
+
+  afterAll(() => {
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  test('loads ranks from the planner output', () => {
+    const file = path.join(dir, 'work-order.json');
+    fs.writeFileSync(file, JSON.stringify({ budgetSeconds: 600, ids: [7, 3, 9] }));
+    const ranks = loadWorkOrder(file);
+    expect(ranks.get(7)).toBe(0);
+    expect(ranks.get(9)).toBe(2);
+  });
+
+  test('ignores a missing or malformed work order', () => {
+    const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+    const bad = path.join(dir, 'bad.json');
+    fs.writeFileSync(bad, '{"order": []}');
+    expect(loadWorkOrder(path.join(dir, 'missing.json'))).toBeNull();
+    expect(loadWorkOrder(bad)).toBeNull();
+    expect(loadWorkOrder(null)).toBeNull();
+    expect(warn).toHaveBeenCalledTimes(2);
+    warn.mockRestore();
+  });
+
+  test('orders listed mentions first and keeps the rest in place', () => {
+    const items = [1, 2, 3, 4, 5].map((id) => ({ mention: { id } }));
+    const ranks = new Map([4, 2].map((id, rank) => [id, rank]));
+    const ordered = orderByWorkOrder(items, ranks, (item) => item.mention.id);
+    expect(ordered.map((item) => item.mention.id)).toEqual([4, 2, 1, 3, 5]);
+    expect(orderByWorkOrder(items, null)).toEqual(items);
+  });
+});
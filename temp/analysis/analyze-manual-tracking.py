@@ -1,21 +1,14 @@
-import csv
 from collections import defaultdict
-from datetime import datetime
 
-csv_file = '/Users/jaredhensley/Code/mediamentions/manual-tracking-efi.csv'
+from toolkit.manual import iter_manual_csv
 
-with open(csv_file, 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    rows = list(reader)
+csv_file = '/Users/jaredhensley/Code/mediamentions/manual-tracking-efi.csv'
 
-# Skip header rows (first 4 rows are headers/examples)
-data_rows = []
-for row in rows[4:]:
-    if not row or not row[0]:
-        continue
-    if row[0] == 'example' or 'EFI Media Mentions' in str(row[0]):
-        continue
-    data_rows.append(row)
+# Header, example and section rows are skipped by the shared ingest
+data_rows = [
+    [m.date_str, m.publication, m.title, m.topic, '', m.link]
+    for m in iter_manual_csv(csv_file)
+]
 
 print(f'Total manually tracked mentions: {len(data_rows)}')
 print()
@@ -1,33 +1,22 @@
 #!/usr/bin/env python3
-import csv
 import subprocess
 import json
 from collections import defaultdict
-from urllib.parse import urlparse
-
-# Read manual tracking CSV
-manual_mentions = []
-with open('/Users/jaredhensley/Code/mediamentions/manual-tracking-efi.csv', 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    rows = list(reader)
-
-    for i, row in enumerate(rows[4:], start=4):  # Skip header rows
-        if not row or not row[0]:
-            continue
-        if row[0] in ('example', 'JULY') or 'EFI Media Mentions' in str(row[0]) or row[0].startswith('5/12/20'):
-            continue
-
-        date = row[0][:10] if len(row[0]) >= 10 else row[0]
-        publication = row[1] if len(row) > 1 else ''
-        title = row[2] if len(row) > 2 else ''
-        link = row[5] if len(row) > 5 else ''
-
-        manual_mentions.append({
-            'date': date,
-            'publication': publication.strip(),
-            'title': title.strip(),
-            'link': link.strip()
-        })
+
+from toolkit.domains import outlet_counts
+from toolkit.manual import iter_manual_csv
+from toolkit.urls import url_key
+
+# Read manual tracking CSV (header, example and section rows are skipped by the shared ingest)
+manual_mentions = [
+    {
+        'date': m.date_str,
+        'publication': m.publication,
+        'title': m.title,
+        'link': m.link
+    }
+    for m in iter_manual_csv('/Users/jaredhensley/Code/mediamentions/manual-tracking-efi.csv')
+]
 
 # Get automated mentions from database
 result = subprocess.run([
@@ -52,14 +41,9 @@ print(f"Automated system: {len(auto_mentions)} total mentions")
 print(f"  - Verified: {len([m for m in auto_mentions if m['verified'] == 1])}")
 print(f"  - False positives: {len([m for m in auto_mentions if m['verified'] == 0])}")
 
-# Normalize URLs for comparison
+# Normalize URLs for comparison (same join key as toolkit.coverage)
 def normalize_url(url):
-    if not url:
-        return ''
-    url = url.lower().strip()
-    # Remove common URL parameters and fragments
-    parsed = urlparse(url)
-    return f"{parsed.netloc}{parsed.path}".rstrip('/')
+    return url_key(url) or ''
 
 # Build lookup maps
 manual_by_url = {}
@@ -105,6 +89,11 @@ sorted_pubs = sorted(by_pub.items(), key=lambda x: len(x[1]), reverse=True)
 for pub, mentions in sorted_pubs[:15]:
     print(f"  {pub}: {len(mentions)} mentions")
 
+# Group by outlet (registered domain of the link)
+print("\nTop outlets we missed:")
+for outlet, count in outlet_counts(m['link'] for m in missed).most_common(15):
+    print(f"  {outlet}: {count} mentions")
+
 # Group by month
 by_month = defaultdict(list)
 for m in missed:
@@ -1,37 +1,20 @@
 #!/usr/bin/env python3
-import csv
 from datetime import datetime
 
-# Read manual tracking CSV
-manual_mentions = []
-with open('/Users/jaredhensley/Code/mediamentions/manual-tracking-efi.csv', 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    rows = list(reader)
-
-    for row in rows[4:]:  # Skip header rows
-        if not row or not row[0]:
-            continue
-        if row[0] in ('example', 'JULY') or 'EFI Media Mentions' in str(row[0]) or row[0].startswith('5/12/20'):
-            continue
-
-        date_str = row[0][:10] if len(row[0]) >= 10 else row[0]
-
-        try:
-            date = datetime.strptime(date_str, '%Y-%m-%d')
-        except:
-            continue
-
-        publication = row[1] if len(row) > 1 else ''
-        title = row[2] if len(row) > 2 else ''
-        link = row[5] if len(row) > 5 else ''
-
-        manual_mentions.append({
-            'date': date,
-            'date_str': date_str,
-            'publication': publication.strip(),
-            'title': title.strip(),
-            'link': link.strip()
-        })
+from toolkit.manual import iter_manual_csv
+
+# Read manual tracking CSV (header, example and section rows are skipped by the shared ingest)
+manual_mentions = [
+    {
+        'date': datetime.combine(m.date, datetime.min.time()),
+        'date_str': m.date.isoformat(),
+        'publication': m.publication,
+        'title': m.title,
+        'link': m.link
+    }
+    for m in iter_manual_csv('/Users/jaredhensley/Code/mediamentions/manual-tracking-efi.csv')
+    if m.date
+]
 
 # Filter to 180-day window (Jun 7 - Dec 4, 2025)
 window_start = datetime(2025, 6, 7)
@@ -0,0 +1,9 @@
+"""
+MediaMentions analysis toolkit
+
+Reusable building blocks for the coverage and pipeline analyses in
+temp/analysis. Modules read the same SQLite database as the Node backend
+(see src/db.js) and can be run as scripts from temp/analysis, e.g.
+
+    python -m toolkit.latency --json latency.json
+"""
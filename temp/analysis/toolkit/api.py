@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Client for the MediaMentions HTTP API
+
+For analysts who can reach a deployed instance but not its SQLite file. The
+client covers the routes in src/routes/clients.js, mentions.js and
+exports.js, and returns mentions as the toolkit's AutoMention records, so
+every analysis that takes load_mentions() output also works on a remote pull.
+
+- Connections are kept alive and pooled, one per worker thread.
+- The key is sent as x-api-key (src/middleware/auth.js). It comes from
+  --api-key or the API_KEY environment variable.
+- /media-mentions is read in pages of --page-size (limit/offset, with the
+  total in X-Total-Count). After the first page, the rest are fetched
+  concurrently.
+- 429 responses from src/middleware/rateLimit.js are retried after the
+  server's retryAfter. When X-RateLimit-Remaining reaches 0, every worker
+  waits for the window to reset. 5xx responses and dropped connections are
+  retried with exponential backoff.
+
+Usage:
+    python -m toolkit.api --url https://mentions.example.com [--api-key KEY] \\
+        [--client-id N] [--start 2025-06-07] [--end 2025-12-04] [--page-size 500] \\
+        [--workers 4] [--json mentions.json]
+"""
+
+import argparse
+import csv
+import http.client
+import io
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import date
+from urllib.parse import urlencode, urlsplit
+
+from .records import AutoMention
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_RETRIES = 5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class ApiError(Exception):
+    """Non-retryable or exhausted API failure"""
+
+    def __init__(self, status, message, path=None):
+        prefix = f'HTTP {status} for {path}' if status else path
+        super().__init__(f'{prefix}: {message}' if prefix else message)
+        self.status = status
+
+
+class ConnectionPool:
+    """Keep-alive connections to one host, reused across threads"""
+
+    def __init__(self, base_url, size=DEFAULT_WORKERS, timeout=30):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'Not an http(s) URL: {base_url}')
+        self.scheme, self.host, self.port = parts.scheme, parts.hostname, parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _new_connection(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method, path, headers):
+        """Return (status, headers, body); a broken idle connection is replaced once"""
+        try:
+            conn, reused = self._idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._new_connection(), False
+        try:
+            conn.request(method, self.prefix + path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry on a fresh one
+            return self.request(method, path, headers)
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        return response.status, response.headers, body
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class MediaMentionsClient:
+    """Paginated, rate-limit aware access to a MediaMentions server"""
+
+    def __init__(self, base_url, api_key=None, page_size=DEFAULT_PAGE_SIZE,
+                 workers=DEFAULT_WORKERS, max_retries=DEFAULT_MAX_RETRIES, timeout=30,
+                 backoff=0.5):
+        self.api_key = api_key if api_key is not None else os.environ.get('API_KEY')
+        self.page_size = page_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pool = ConnectionPool(base_url, workers, timeout)
+        self._lock = threading.Lock()
+        self._not_before = 0.0      # monotonic time before which no request is sent
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _wait_for_window(self):
+        with self._lock:
+            delay = self._not_before - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _pause(self, seconds):
+        with self._lock:
+            self._not_before = max(self._not_before, time.monotonic() + seconds)
+
+    def _retry_delay(self, attempt, status, headers, body):
+        if status == 429:
+            try:
+                return float(json.loads(body).get('retryAfter'))
+            except (ValueError, TypeError, AttributeError):
+                return float(headers.get('X-RateLimit-Reset') or 1)
+        return self.backoff * 2 ** attempt * (1 + random.random())
+
+    def request(self, path, params=None):
+        """GET path; returns (headers, body bytes)"""
+        if params:
+            path = f'{path}?{urlencode({k: v for k, v in params.items() if v is not None})}'
+        headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if self.api_key:
+            headers['x-api-key'] = self.api_key
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_window()
+            try:
+                status, response_headers, body = self.pool.request('GET', path, headers)
+            except (OSError, http.client.HTTPException) as e:
+                if attempt == self.max_retries:
+                    raise ApiError(None, str(e), path) from e
+                time.sleep(self._retry_delay(attempt, None, {}, b''))
+                continue
+
+            if response_headers.get('X-RateLimit-Remaining') == '0':
+                # The limiter's window is spent: hold every worker until it resets
+                self._pause(float(response_headers.get('X-RateLimit-Reset') or 1))
+            if status < 300:
+                return response_headers, body
+            if status not in RETRY_STATUSES or attempt == self.max_retries:
+                raise ApiError(status, body.decode('utf-8', 'replace')[:200], path)
+            delay = self._retry_delay(attempt, status, response_headers, body)
+            if status == 429:
+                self._pause(delay)
+            else:
+                time.sleep(delay)
+
+    def get_json(self, path, params=None):
+        _, body = self.request(path, params)
+        return json.loads(body)
+
+    def clients(self):
+        return self.get_json('/clients')
+
+    def mention_rows(self, client_id=None, start=None, end=None):
+        """Raw /media-mentions rows, fetched page by page"""
+        filters = {'clientId': client_id, 'startDate': start and str(start),
+                   'endDate': end and f'{end}T23:59:59.999Z'}
+        headers, body = self.request('/media-mentions',
+                                     {**filters, 'limit': self.page_size, 'offset': 0})
+        rows = json.loads(body)
+        total = headers.get('X-Total-Count')
+        if total is None:
+            # A server without paging returned everything at once
+            return rows
+
+        offsets = range(self.page_size, int(total), self.page_size)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pages = executor.map(
+                lambda offset: self.get_json('/media-mentions', {
+                    **filters, 'limit': self.page_size, 'offset': offset}),
+                offsets)
+            for page in pages:
+                rows.extend(page)
+
+        # Rows inserted during the pull shift later pages; keep one copy of each
+        unique = {row['id']: row for row in rows}
+        return [unique[key] for key in sorted(unique)]
+
+    def mentions(self, client_id=None, start=None, end=None):
+        """Mentions as AutoMention records, ordered by id like load_mentions()"""
+        names = {c['id']: c['name'] for c in self.clients()}
+        return [to_auto_mention(row, names) for row in self.mention_rows(client_id, start, end)]
+
+    def _csv_export(self, path):
+        _, body = self.request(path)
+        return list(csv.DictReader(io.StringIO(body.decode('utf-8'))))
+
+    def false_positives(self):
+        """Rows of /admin/false-positives/export"""
+        return self._csv_export('/admin/false-positives/export')
+
+    def deleted_mentions(self):
+        """Rows of /admin/deleted-mentions/export"""
+        return self._csv_export('/admin/deleted-mentions/export')
+
+
+def to_auto_mention(row, client_names):
+    return AutoMention(
+        id=row['id'], client_id=row['clientId'],
+        client_name=client_names.get(row['clientId'], f"#{row['clientId']}"),
+        title=row.get('title'), link=row.get('link'), source=row.get('source'),
+        mention_date=row.get('mentionDate'), created_at=row.get('createdAt'),
+        verified=row.get('verified'), subject_matter=row.get('subjectMatter'),
+        provider=row.get('provider'), search_job_id=row.get('searchJobId')
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--url', required=True, help='Server base URL')
+    parser.add_argument('--api-key', help='API key (default: API_KEY)')
+    parser.add_argument('--client-id', type=int, help='Only pull one client')
+    parser.add_argument('--start', type=date.fromisoformat, help='First mention date')
+    parser.add_argument('--end', type=date.fromisoformat, help='Last mention date')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Concurrent page requests')
+    parser.add_argument('--json', help='Write the pulled mentions to this JSON file')
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    with MediaMentionsClient(args.url, args.api_key, args.page_size, args.workers) as client:
+        mentions = client.mentions(args.client_id, args.start, args.end)
+    elapsed = time.monotonic() - started
+
+    by_client = {}
+    for m in mentions:
+        by_client.setdefault(m.client_name, []).append(m)
+    print(f"Pulled {len(mentions)} mentions in {elapsed:.1f}s")
+    for name, rows in sorted(by_client.items()):
+        verified = sum(1 for m in rows if m.verified == 1)
+        print(f"  {name}: {len(rows)} mentions, {verified} verified")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(m) for m in mentions], f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from .api import ApiError, MediaMentionsClient
+
+API_KEY = 'mm_test'
+
+
+class FakeServer(ThreadingHTTPServer):
+    """Serves /clients and a paged /media-mentions like src/routes"""
+
+    daemon_threads = True
+
+    def __init__(self, mentions):
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.mentions = mentions
+        self.connections = set()
+        self.throttle_next = 0
+        self.lock = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            throttled = server.throttle_next > 0
+            server.throttle_next -= throttled
+        if self.headers.get('x-api-key') != API_KEY:
+            return self.send(401, {'error': 'Unauthorized: Invalid or missing API key'})
+        if throttled:
+            return self.send(429, {'error': 'Too many requests', 'retryAfter': 0.01})
+
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == '/clients':
+            return self.send(200, [{'id': 1, 'name': 'Florida Tomato Committee'}])
+        if url.path == '/media-mentions':
+            rows = [m for m in server.mentions
+                    if 'clientId' not in query or m['clientId'] == int(query['clientId'])]
+            rows.sort(key=lambda m: (m['mentionDate'], m['id']), reverse=True)
+            offset, limit = int(query.get('offset', 0)), int(query.get('limit', len(rows)))
+            return self.send(200, rows[offset:offset + limit],
+                             [('X-Total-Count', str(len(rows)))])
+        self.send(404, {'error': 'Route not found'})
+
+
+@pytest.fixture
+def server():
+    mentions = [{'id': i, 'clientId': 1, 'title': f'Story {i}', 'link': f'https://a.com/{i}',
+                 'mentionDate': f'2025-11-{i % 28 + 1:02d}T00:00:00.000Z', 'verified': i % 2}
+                for i in range(1, 48)]
+    server = FakeServer(mentions)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def base_url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_pulls_all_pages_over_pooled_connections(server):
+    with MediaMentionsClient(base_url(server), API_KEY, page_size=5, workers=3) as client:
+        mentions = client.mentions()
+
+    assert [m.id for m in mentions] == list(range(1, 48))
+    assert mentions[0].client_name == 'Florida Tomato Committee'
+    assert mentions[0].verified == 1
+    # Ten page requests plus /clients share at most one connection per worker
+    assert len(server.connections) <= 3
+
+
+def test_backs_off_on_rate_limit(server):
+    server.throttle_next = 2
+    with MediaMentionsClient(base_url(server), API_KEY, page_size=50, workers=1) as client:
+        assert len(client.mention_rows(client_id=1)) == 47
+
+
+def test_rejected_api_key_raises(server):
+    with MediaMentionsClient(base_url(server), 'wrong', workers=1) as client:
+        with pytest.raises(ApiError) as error:
+            client.clients()
+    assert error.value.status == 401
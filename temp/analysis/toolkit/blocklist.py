@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Blocklist suggestions from false positives and deletions
+
+Reads stored mentions and the deletedMentions archive in one pass and counts
+outcomes along a trie of host and URL path segments. Each URL is reduced to
+host_key plus at most --depth path segments. A mention counts as a false
+positive when verified = 0 or when it was deleted (an archived row whose
+mention no longer exists). It counts as good when verified = 1.
+
+Every domain or path prefix with enough support and a high false-positive
+rate becomes a candidate for config.filters (blockedDomains or
+blockedUrlPatterns in src/config.js). To keep small samples from looking
+certain, the rate is judged by its Wilson lower bound. A prefix is not
+listed when an ancestor already qualifies. Candidates are ranked by
+expected precision gain: the change in verified / (verified + false
+positives) if every stored mention under the prefix had been filtered out
+before verification. Each suggestion also shows how many verification
+fetches it would have saved and how many verified mentions it would have
+lost.
+
+Usage:
+    python -m toolkit.blocklist [--db PATH] [--min-support 5] [--min-fp-rate 0.8] \\
+        [--depth 3] [--top 25] [--json suggestions.json]
+"""
+
+import argparse
+import json
+import math
+import re
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit
+
+from .db import REPO_ROOT, connect
+from .urls import host_key
+
+CONFIG_JS = REPO_ROOT / 'src' / 'config.js'
+
+DEFAULT_MIN_SUPPORT = 5
+DEFAULT_MIN_FP_RATE = 0.8
+DEFAULT_DEPTH = 3
+Z_95 = 1.96
+
+# Stored mentions plus archived deletions whose mention is gone (rejected
+# pending-review mentions are archived but keep their mediaMentions row)
+OUTCOMES_SQL = """
+    SELECT link, source, verified, 0 AS deleted FROM mediaMentions
+    UNION ALL
+    SELECT d.link, d.source, 0, 1 FROM deletedMentions d
+    WHERE NOT EXISTS (SELECT 1 FROM mediaMentions m WHERE m.id = d.originalMentionId)
+"""
+
+_JS_BLOCKED_DOMAINS = re.compile(r'blockedDomains:\s*\[(.*?)\]', re.S)
+_JS_BLOCKED_PATTERNS = re.compile(r'blockedUrlPatterns:\s*\[(.*?)\n\s*\]', re.S)
+_JS_REGEX = re.compile(r'^\s*/(.+)/([a-z]*),?\s*(?://.*)?$', re.M)
+_JS_STRING = re.compile(r"'((?:[^'\\]|\\.)*)'")
+
+
+class TrieNode:
+    __slots__ = ('children', 'false_positives', 'verified', 'pending')
+
+    def __init__(self):
+        self.children = {}
+        self.false_positives = 0
+        self.verified = 0
+        self.pending = 0
+
+
+class PathTrie:
+    """Outcome counts for every host and path prefix"""
+
+    def __init__(self, depth=DEFAULT_DEPTH):
+        self.depth = depth
+        self.root = TrieNode()
+
+    def add(self, segments, outcome):
+        node = self.root
+        self._count(node, outcome)
+        for segment in segments[:self.depth + 1]:
+            node = node.children.setdefault(segment, TrieNode())
+            self._count(node, outcome)
+
+    @staticmethod
+    def _count(node, outcome):
+        if outcome == 0:
+            node.false_positives += 1
+        elif outcome == 1:
+            node.verified += 1
+        else:
+            node.pending += 1
+
+    def walk(self):
+        """Yield (segments, node) breadth-first, hosts before their paths"""
+        level = [((segment,), child) for segment, child in self.root.children.items()]
+        while level:
+            following = []
+            for segments, node in level:
+                yield segments, node
+                following.extend((segments + (s,), c) for s, c in node.children.items())
+            level = following
+
+
+def url_segments(link, source=None):
+    """[host, path segment, ...] for a stored link, or None without a host"""
+    host = host_key(link) or host_key(source)
+    if not host:
+        return None
+    try:
+        path = urlsplit(str(link or '')).path
+    except ValueError:
+        path = ''
+    return [host] + [s.lower() for s in path.split('/') if s]
+
+
+def wilson_lower_bound(successes, n, z=Z_95):
+    if not n:
+        return 0.0
+    p = successes / n
+    centre = p + z * z / (2 * n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    return (centre - margin) / (1 + z * z / n)
+
+
+def load_current_filters(path=CONFIG_JS):
+    """(blockedDomains, compiled blockedUrlPatterns) from src/config.js"""
+    text = path.read_text(encoding='utf-8')
+    domains = _JS_STRING.findall(_JS_BLOCKED_DOMAINS.search(text).group(1))
+    patterns = []
+    for source, flags in _JS_REGEX.findall(_JS_BLOCKED_PATTERNS.search(text).group(1)):
+        patterns.append(re.compile(source, re.I if 'i' in flags else 0))
+    return domains, patterns
+
+
+def path_pattern(segments):
+    """blockedUrlPatterns regex source (JS syntax) for a host and path prefix"""
+    parts = [re.escape(segment) for segment in segments]
+    return r'\/'.join(parts) + r'(\/|\?|$)'
+
+
+@dataclass
+class Suggestion:
+    kind: str                  # domain | path
+    prefix: str                # example.com or example.com/events/
+    entry: str                 # value for blockedDomains or a blockedUrlPatterns regex
+    false_positives: int
+    verified: int
+    pending: int
+    fp_rate: float
+    fp_rate_lower: float
+    precision_gain: float
+    fetches_saved: int
+    verified_lost: int
+    already_blocked: bool = False
+
+
+def build_trie(rows, depth=DEFAULT_DEPTH):
+    """Trie over (link, source, verified, deleted) rows; returns (trie, skipped)"""
+    trie = PathTrie(depth)
+    skipped = 0
+    for link, source, verified, deleted in rows:
+        segments = url_segments(link, source)
+        if segments is None:
+            skipped += 1
+            continue
+        trie.add(segments, 0 if deleted else verified)
+    return trie, skipped
+
+
+def suggest(trie, min_support=DEFAULT_MIN_SUPPORT, min_fp_rate=DEFAULT_MIN_FP_RATE,
+            current_filters=((), ())):
+    """Ranked Suggestions, most precision gained first"""
+    total_fp, total_verified = trie.root.false_positives, trie.root.verified
+    decided = total_fp + total_verified
+    baseline = total_verified / decided if decided else 0.0
+    blocked_domains, blocked_patterns = current_filters
+
+    selected = []
+    covered = set()
+    for segments, node in trie.walk():
+        if any(segments[:i] in covered for i in range(1, len(segments))):
+            continue
+        n = node.false_positives + node.verified
+        if n < min_support:
+            continue
+        lower = wilson_lower_bound(node.false_positives, n)
+        if lower < min_fp_rate:
+            continue
+        covered.add(segments)
+
+        remaining = decided - n
+        precision = (total_verified - node.verified) / remaining if remaining else 1.0
+        host = segments[0]
+        if len(segments) == 1:
+            kind, prefix, entry = 'domain', host, host
+        else:
+            kind = 'path'
+            prefix = f"{host}/{'/'.join(segments[1:])}/"
+            entry = path_pattern(segments)
+        already = any(d in host for d in blocked_domains) or \
+            any(p.search(f'https://{prefix}') for p in blocked_patterns)
+        selected.append(Suggestion(
+            kind, prefix, entry, node.false_positives, node.verified, node.pending,
+            node.false_positives / n, lower, precision - baseline,
+            n + node.pending, node.verified, already
+        ))
+    selected.sort(key=lambda s: (s.already_blocked, -s.precision_gain, -s.fetches_saved))
+    return selected
+
+
+def print_report(suggestions, trie, skipped, top):
+    root = trie.root
+    decided = root.false_positives + root.verified
+    print('=' * 80)
+    print('BLOCKLIST SUGGESTIONS: False positives and deletions by URL prefix')
+    print('=' * 80)
+    print(f"\nOutcomes: {root.verified} verified, {root.false_positives} false positives or "
+          f"deleted, {root.pending} pending ({skipped} without a host)")
+    if decided:
+        print(f"Current precision: {root.verified / decided * 100:.1f}%")
+
+    if not suggestions:
+        print('\nNo domain or path prefix meets the support and false-positive thresholds')
+        return
+
+    print(f"\n{'Prefix':<48} {'FP':>5} {'OK':>4} {'FP rate':>8} {'Gain':>7} {'Saved':>6}")
+    for s in suggestions[:top]:
+        flag = ' (already blocked)' if s.already_blocked else ''
+        print(f"{s.prefix[:48]:<48} {s.false_positives:>5} {s.verified:>4} "
+              f"{s.fp_rate * 100:>7.1f}% {s.precision_gain * 100:>+6.2f}% {s.fetches_saved:>6}{flag}")
+
+    domains = [s.entry for s in suggestions[:top] if s.kind == 'domain' and not s.already_blocked]
+    patterns = [s.entry for s in suggestions[:top] if s.kind == 'path' and not s.already_blocked]
+    if domains:
+        print(f"\nblockedDomains additions: {', '.join(repr(d) for d in domains)}")
+    if patterns:
+        print('blockedUrlPatterns additions:')
+        for pattern in patterns:
+            print(f"  /{pattern}/i")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--min-support', type=int, default=DEFAULT_MIN_SUPPORT,
+                        help='Decided mentions a prefix needs before it is judged')
+    parser.add_argument('--min-fp-rate', type=float, default=DEFAULT_MIN_FP_RATE,
+                        help='Required lower bound of the false-positive rate')
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH,
+                        help='Path segments below the host to consider')
+    parser.add_argument('--top', type=int, default=25, help='Suggestions to print')
+    parser.add_argument('--json', help='Write all suggestions to this JSON file')
+    args = parser.parse_args(argv)
+
+    with closing(connect(args.db)) as conn:
+        trie, skipped = build_trie(conn.execute(OUTCOMES_SQL), args.depth)
+    suggestions = suggest(trie, args.min_support, args.min_fp_rate, load_current_filters())
+    print_report(suggestions, trie, skipped, args.top)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(s) for s in suggestions], f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Resolve manual-tracking client labels to clients rows
+
+Manual sheets name a client by a label: the sheet title or the
+"<X> Media Mentions" title row. The label is often an acronym ("EFI"),
+while stored mentions, the rejection log and the verification log carry
+clients.name ("Equitable Food Initiative"). Every join between manual and
+automated data goes through ClientResolver.key, which maps both kinds of
+name to the client id.
+
+A label resolves when, ignoring case, spacing and punctuation, it is:
+- the client's name
+- an explicit alias
+- the unique acronym of one client's name, with or without the
+  stop words (NCSPC or NCSC for "North Carolina SweetPotato Commission")
+
+Labels that resolve to no client keep a normalized label key, so two
+unresolved sources with the same label still meet.
+"""
+
+import re
+from dataclasses import dataclass
+
+STOP_WORDS = frozenset({'of', 'the', 'and', 'for', 'a', 'an'})
+
+_WORD = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+
+
+@dataclass(frozen=True)
+class Client:
+    id: int
+    name: str
+
+
+def label_key(label):
+    """Case-, spacing- and punctuation-insensitive form of a name"""
+    return re.sub(r'[^a-z0-9]', '', (label or '').lower())
+
+
+def acronyms(name):
+    """Acronyms a sheet may use for a client name"""
+    words = (name or '').replace('&', ' and ').split()
+    found = set()
+    for skip in (frozenset(), STOP_WORDS):
+        kept = [w for w in words if w.lower() not in skip]
+        found.add(''.join(w[0] for w in kept if w[0].isalnum()).lower())
+        # CamelCase words contribute one letter per part (SweetPotato -> SP)
+        found.add(''.join(part[0] for w in kept for part in _WORD.findall(w)).lower())
+    return {a for a in found if len(a) > 1}
+
+
+class ClientResolver:
+    """Maps client names and sheet labels to Client records"""
+
+    def __init__(self, clients, aliases=None):
+        self.clients = {}
+        self._by_key = {}
+        acronym_owners = {}
+        for client_id, name in clients:
+            client = Client(client_id, name)
+            self.clients[client_id] = client
+            self._by_key[label_key(name)] = client
+            for acronym in acronyms(name):
+                acronym_owners.setdefault(acronym, set()).add(client)
+        self._by_acronym = {a: next(iter(owners)) for a, owners in acronym_owners.items()
+                            if len(owners) == 1}
+        for alias, name in (aliases or {}).items():
+            target = self._by_key.get(label_key(name))
+            if target is not None:
+                self._by_key[label_key(alias)] = target
+
+    @classmethod
+    def from_db(cls, conn, aliases=None):
+        return cls(conn.execute('SELECT id, name FROM clients ORDER BY id').fetchall(), aliases)
+
+    @classmethod
+    def from_mentions(cls, mentions, aliases=None):
+        """Resolver over the clients of AutoMention records"""
+        return cls(sorted({(m.client_id, m.client_name) for m in mentions}), aliases)
+
+    def resolve(self, label):
+        """Client for a name or label, or None"""
+        key = label_key(label)
+        if not key:
+            return None
+        return self._by_key.get(key) or self._by_acronym.get(key)
+
+    def key(self, label):
+        """Join key: the client id, or the normalized label when it does not resolve"""
+        client = self.resolve(label)
+        return client.id if client else label_key(label)
+
+    def name(self, label):
+        """clients.name for a label, or the label itself"""
+        client = self.resolve(label)
+        return client.name if client else (label or '')
@@ -0,0 +1,27 @@
+from .clients import ClientResolver, acronyms, label_key
+
+CLIENTS = [(1, 'Equitable Food Initiative'), (2, 'North Carolina SweetPotato Commission'),
+           (3, 'Viva Fresh')]
+
+
+def test_label_key_and_acronyms():
+    assert label_key(' Viva-Fresh ') == 'vivafresh'
+    assert 'efi' in acronyms('Equitable Food Initiative')
+    assert {'ncsc', 'ncspc'} <= acronyms('North Carolina SweetPotato Commission')
+
+
+def test_resolves_names_acronyms_and_aliases():
+    resolver = ClientResolver(CLIENTS,
+                              aliases={'Sweet Potatoes': 'North Carolina SweetPotato Commission'})
+
+    assert resolver.key('EFI') == resolver.key('equitable food initiative') == 1
+    assert resolver.key('NCSPC') == resolver.key('Sweet Potatoes') == 2
+    assert resolver.name('viva fresh') == 'Viva Fresh'
+
+
+def test_unresolved_and_ambiguous_labels_keep_the_label():
+    resolver = ClientResolver(CLIENTS + [(4, 'Viva Farms')])
+
+    assert resolver.resolve('VF') is None
+    assert resolver.key('VF') == 'vf'
+    assert resolver.name('Unknown Co') == 'Unknown Co'
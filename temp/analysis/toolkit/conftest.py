@@ -0,0 +1,121 @@
+"""
+Shared pytest fixtures: a throwaway database with the backend schema
+"""
+
+import sqlite3
+
+import pytest
+
+# Schema from initializeDatabase() in src/db.js, including migrated columns
+SCHEMA = """
+CREATE TABLE clients (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  contactEmail TEXT NOT NULL,
+  alertsRssFeedUrl TEXT,
+  createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+  updatedAt TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE publications (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  website TEXT,
+  clientId INTEGER,
+  createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+  updatedAt TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE mediaMentions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  title TEXT NOT NULL,
+  subjectMatter TEXT,
+  mentionDate TEXT NOT NULL,
+  reMentionDate TEXT,
+  link TEXT,
+  source TEXT,
+  sentiment TEXT,
+  status TEXT,
+  clientId INTEGER NOT NULL,
+  publicationId INTEGER NOT NULL,
+  verified INTEGER DEFAULT 0,
+  provider TEXT,
+  searchJobId INTEGER,
+  createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+  updatedAt TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE searchJobs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  clientId INTEGER NOT NULL,
+  query TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'pending',
+  scheduledAt TEXT NOT NULL,
+  completedAt TEXT,
+  provider TEXT,
+  label TEXT,
+  resultCount INTEGER,
+  createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+  updatedAt TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE deletedMentions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  originalMentionId INTEGER NOT NULL,
+  title TEXT NOT NULL,
+  subjectMatter TEXT,
+  mentionDate TEXT NOT NULL,
+  reMentionDate TEXT,
+  link TEXT,
+  source TEXT,
+  sentiment TEXT,
+  status TEXT,
+  verified INTEGER,
+  clientId INTEGER NOT NULL,
+  clientName TEXT NOT NULL,
+  publicationId INTEGER NOT NULL,
+  publicationName TEXT NOT NULL,
+  deletedAt TEXT NOT NULL DEFAULT (datetime('now'))
+);
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path to an empty database with the backend schema"""
+    path = tmp_path / 'mediamentions.db'
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def db(db_path):
+    """Writable connection to the fixture database"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+def insert_mention(conn, client_id=1, **fields):
+    """Insert a mediaMentions row with sensible defaults; returns its id"""
+    row = {
+        'title': 'Untitled',
+        'mentionDate': '2025-11-01T00:00:00.000Z',
+        'link': None,
+        'source': None,
+        'clientId': client_id,
+        'publicationId': 1,
+        'verified': None,
+        'createdAt': '2025-11-01T12:00:00.000Z',
+        **fields
+    }
+    row.setdefault('updatedAt', row['createdAt'])
+    columns = ', '.join(row)
+    placeholders = ', '.join('?' for _ in row)
+    cur = conn.execute(f'INSERT INTO mediaMentions ({columns}) VALUES ({placeholders})',
+                       list(row.values()))
+    conn.commit()
+    return cur.lastrowid
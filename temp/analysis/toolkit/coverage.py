@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Manual-tracking vs automated coverage comparison
+
+The toolkit version of compare-tracking.py: joins manual mentions to stored
+mentions by canonical URL and splits them into matched, missed (manual
+only) and auto-only (verified, not tracked manually), per client.
+
+Usage:
+    python -m toolkit.coverage --manual manual-tracking-efi.csv --client "Equitable Food Initiative" \\
+        [--start 2025-06-07] [--end 2025-12-04] [--db PATH] [--xlsx report.xlsx] [--no-cache]
+
+Comparisons go through the stage cache (toolkit.stage_cache): an unchanged
+export, database and window return the previous result immediately.
+"""
+
+import argparse
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import chain
+
+from .clients import ClientResolver
+from .db import connect
+from .manual import iter_manual_sources
+from .records import load_mentions
+from .stage_cache import StageCache
+from .urls import url_key
+from .xlsx import ReportWorkbook
+
+
+@dataclass
+class CoverageResult:
+    client: str
+    matched: list = field(default_factory=list)    # (ManualMention, AutoMention) pairs
+    missed: list = field(default_factory=list)     # ManualMention
+    auto_only: list = field(default_factory=list)  # verified AutoMention
+    unlinked: int = 0                              # manual rows without a usable link
+
+    @property
+    def manual_total(self):
+        return len(self.matched) + len(self.missed)
+
+    @property
+    def coverage_rate(self):
+        return len(self.matched) / self.manual_total if self.manual_total else 0.0
+
+    def summary(self):
+        return {
+            'client': self.client,
+            'manual': self.manual_total,
+            'matched': len(self.matched),
+            'missed': len(self.missed),
+            'autoOnly': len(self.auto_only),
+            'unlinked': self.unlinked,
+            'coverageRate': self.coverage_rate
+        }
+
+
+def _in_window(day, start, end):
+    if day is None:
+        return start is None and end is None
+    return (start is None or day >= start) and (end is None or day <= end)
+
+
+def compare(client, manual, auto, start=None, end=None):
+    """Compare one client's manual mentions with its stored mentions"""
+    return compare_keyed(client, ((m, m.date, url_key(m.link)) for m in manual), auto,
+                         start, end)
+
+
+def compare_keyed(client, manual, auto, start=None, end=None):
+    """compare() over (item, date, url_key) triples; matched and missed hold the items
+
+    For callers that hold the manual data as columns (toolkit.regression)
+    rather than ManualMention records.
+    """
+    result = CoverageResult(client)
+    manual_by_key = {}
+    for m, day, key in manual:
+        if not _in_window(day, start, end):
+            continue
+        if key is None:
+            result.unlinked += 1
+        else:
+            manual_by_key.setdefault(key, m)
+
+    auto_by_key = {}
+    for a in auto:
+        key = url_key(a.link)
+        if key is not None:
+            auto_by_key.setdefault(key, a)
+
+    for key, m in manual_by_key.items():
+        a = auto_by_key.get(key)
+        if a is None:
+            result.missed.append(m)
+        else:
+            result.matched.append((m, a))
+
+    for key, a in auto_by_key.items():
+        if key in manual_by_key or a.verified != 1:
+            continue
+        published = (a.mention_date or '')[:10]
+        day = date.fromisoformat(published) if len(published) == 10 else None
+        if _in_window(day, start, end):
+            result.auto_only.append(a)
+
+    return result
+
+
+def compare_by_client(manual, auto, start=None, end=None, resolver=None):
+    """Compare every client present in the manual data; keyed by client name
+
+    Manual labels ("EFI") are resolved to clients rows (toolkit.clients)
+    before they are matched to stored mentions, by client id. Results are
+    named by clients.name when the label resolves. Without a resolver, the
+    clients of the stored mentions are used.
+    """
+    resolver = resolver or ClientResolver.from_mentions(auto)
+    manual_groups, auto_groups = {}, {}
+    for m in manual:
+        manual_groups.setdefault(resolver.key(m.client), []).append(m)
+    for a in auto:
+        auto_groups.setdefault(a.client_id, []).append(a)
+
+    results = {}
+    for key, mentions in manual_groups.items():
+        name = resolver.name(mentions[0].client)
+        results[name] = compare(name, mentions, auto_groups.get(key, []), start, end)
+    return results
+
+
+def compare_sources(workbooks=(), csvs=(), client=None, start=None, end=None, db_path=None,
+                    cache=None):
+    """compare_by_client over manual inputs and the database
+
+    With a StageCache the result is keyed by the input files' contents, the
+    database watermark, the client and the window.
+    """
+    def compute():
+        manual = list(iter_manual_sources(workbooks, csvs, client))
+        with closing(connect(db_path)) as conn:
+            auto = load_mentions(conn)
+            resolver = ClientResolver.from_db(conn)
+        return compare_by_client(manual, auto, start, end, resolver)
+
+    if cache is None:
+        return compute()
+    return cache.run('coverage', compute, files=[*workbooks, *csvs], db=True, db_path=db_path,
+                     client=client, start=start, end=end)
+
+
+MANUAL_COLUMNS = [
+    ('Client', 'client'), ('Date', 'date'), ('Publication', 'publication'),
+    ('Title', 'title'), ('Topic', 'topic'), ('Link', 'link')
+]
+AUTO_COLUMNS = [
+    ('Client', 'client_name'), ('Date', 'mention_date'), ('Source', 'source'),
+    ('Title', 'title'), ('Discovery', 'discovery_path'), ('Link', 'link')
+]
+MATCHED_COLUMNS = [
+    ('Client', 'client'), ('Date', 'date'), ('Publication', 'publication'),
+    ('Title', 'title'), ('Verified', 'verified'), ('Discovery', 'discovery'),
+    ('Link', 'link')
+]
+SUMMARY_COLUMNS = [
+    ('Client', 'client'), ('Manual', 'manual'), ('Matched', 'matched'),
+    ('Missed', 'missed'), ('Auto only', 'autoOnly'), ('No link', 'unlinked'),
+    ('Coverage', 'coverageRate')
+]
+
+
+def _auto_row(a):
+    return {key: getattr(a, key) for _, key in AUTO_COLUMNS}
+
+
+def _matched_row(pair):
+    m, a = pair
+    return {
+        'client': m.client, 'date': m.date, 'publication': m.publication, 'title': m.title,
+        'verified': a.verified, 'discovery': a.discovery_path, 'link': m.link
+    }
+
+
+def write_coverage_xlsx(path, results):
+    """Write summary, matched, missed and auto-only sheets in one streaming pass"""
+    results = list(results)
+    with ReportWorkbook(path) as wb:
+        wb.add_sheet('Summary', SUMMARY_COLUMNS, widths=[36, 10, 10, 10, 10, 10, 10]).write_all(
+            r.summary() for r in results)
+        wb.add_sheet('Matched', MATCHED_COLUMNS, widths=[30, 12, 28, 70, 10, 20, 60]).write_all(
+            _matched_row(pair) for pair in chain.from_iterable(r.matched for r in results))
+        wb.add_sheet('Missed', MANUAL_COLUMNS, widths=[30, 12, 28, 70, 24, 60]).write_all(
+            chain.from_iterable(r.missed for r in results))
+        wb.add_sheet('Auto only', AUTO_COLUMNS, widths=[30, 24, 28, 70, 20, 60]).write_all(
+            _auto_row(a) for a in chain.from_iterable(r.auto_only for r in results))
+
+
+def print_summary(results):
+    print('=' * 80)
+    print('COVERAGE: Manual Tracking vs Automated System')
+    print('=' * 80)
+    for r in results:
+        print(f"\n{r.client}")
+        print(f"  Manual mentions with links: {r.manual_total} ({r.unlinked} without a link)")
+        print(f"  Matched: {len(r.matched)}  Missed: {len(r.missed)}  "
+              f"Auto only: {len(r.auto_only)}")
+        print(f"  Coverage rate: {r.coverage_rate * 100:.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--manual', required=True, help='Manual tracking CSV export')
+    parser.add_argument('--client', required=True, help='Client name the export belongs to')
+    parser.add_argument('--start', type=date.fromisoformat, help='Window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Window end (YYYY-MM-DD)')
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--xlsx', help='Write matched/missed/auto-only sheets to this workbook')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute, bypassing the cache')
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else StageCache()
+    results = list(compare_sources(csvs=[args.manual], client=args.client, start=args.start,
+                                   end=args.end, db_path=args.db, cache=cache).values())
+    print_summary(results)
+
+    if args.xlsx:
+        write_coverage_xlsx(args.xlsx, results)
+        print(f"\nWrote {args.xlsx}")
+
+
+if __name__ == '__main__':
+    main()
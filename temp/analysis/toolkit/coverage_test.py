@@ -0,0 +1,74 @@
+from datetime import date
+
+import openpyxl
+
+from .conftest import insert_mention
+from .coverage import compare_by_client, compare_sources, write_coverage_xlsx
+from .records import AutoMention, ManualMention
+
+
+def manual(title, link, day, client='EFI'):
+    return ManualMention(client, day, str(day), 'The Packer', title, '', link, 5)
+
+
+def auto(id, link, verified=1, mention_date='2025-11-02T00:00:00.000Z',
+         client='Equitable Food Initiative'):
+    return AutoMention(id, 1, client, f'Auto {id}', link, 'thepacker.com', mention_date,
+                       None, verified, provider='google')
+
+
+def test_compare_splits_matched_missed_and_auto_only():
+    manual_rows = [
+        manual('Found', 'https://www.thepacker.com/a/', date(2025, 11, 1)),
+        manual('Missed', 'https://thepacker.com/b', date(2025, 11, 3)),
+        manual('No link', '', date(2025, 11, 3)),
+        manual('Too old', 'https://thepacker.com/c', date(2024, 1, 1))
+    ]
+    auto_rows = [
+        auto(1, 'https://thepacker.com/a'),
+        auto(2, 'https://thepacker.com/new'),
+        auto(3, 'https://thepacker.com/fp', verified=0),
+        auto(4, 'https://thepacker.com/old', mention_date='2024-01-01T00:00:00Z')
+    ]
+
+    [result] = compare_by_client(manual_rows, auto_rows, start=date(2025, 6, 7)).values()
+
+    assert [m.title for m, _ in result.matched] == ['Found']
+    assert [m.title for m in result.missed] == ['Missed']
+    assert [a.id for a in result.auto_only] == [2]
+    assert result.unlinked == 1
+    assert result.coverage_rate == 0.5
+
+
+def test_write_coverage_xlsx(tmp_path):
+    result = compare_by_client(
+        [manual('=Formula-looking title', 'https://thepacker.com/b', date(2025, 11, 3))],
+        [auto(2, 'https://thepacker.com/new')]
+    )
+    path = tmp_path / 'coverage.xlsx'
+
+    write_coverage_xlsx(path, result.values())
+
+    wb = openpyxl.load_workbook(path)
+    assert wb.sheetnames == ['Summary', 'Matched', 'Missed', 'Auto only']
+    assert [c.value for c in wb['Summary'][2]][:5] == ['Equitable Food Initiative', 1, 0, 1, 1]
+    missed = wb['Missed'][2]
+    assert missed[3].value == '=Formula-looking title'
+    assert missed[3].data_type == 's'
+    assert missed[5].value.startswith('=HYPERLINK("https://thepacker.com/b"')
+    assert wb['Auto only'].max_row == 2
+
+
+def test_title_row_label_resolves_to_the_explicit_client(db_path, db, tmp_path):
+    db.execute("INSERT INTO clients (name, contactEmail) VALUES ('Equitable Food Initiative', 'x')")
+    insert_mention(db, link='https://thepacker.com/a', verified=1)
+    path = tmp_path / 'manual-tracking-efi.csv'
+    path.write_text('EFI Media Mentions,,,,,\nDate,Publication,Title,Topic,,Link\n'
+                    '2025-11-01,The Packer,Found,,,https://thepacker.com/a\n', encoding='utf-8')
+
+    results = compare_sources(csvs=[path], client='Equitable Food Initiative', db_path=db_path)
+
+    assert list(results) == ['Equitable Food Initiative']
+    assert results['Equitable Food Initiative'].coverage_rate == 1.0
+    # Without --client the sheet's "EFI" label resolves by acronym
+    assert compare_sources(csvs=[path], db_path=db_path)['Equitable Food Initiative'].matched
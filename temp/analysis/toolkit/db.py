@@ -0,0 +1,57 @@
+"""
+SQLite access for the analysis toolkit
+
+Mirrors src/db.js: the database path comes from DATABASE_URL and falls back
+to data/mediamentions.db at the repository root.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_DATABASE_PATH = REPO_ROOT / 'data' / 'mediamentions.db'
+
+
+def database_path():
+    """Resolve the database path the same way the backend does"""
+    return os.environ.get('DATABASE_URL') or str(DEFAULT_DATABASE_PATH)
+
+
+def connect(path=None, readonly=True):
+    """Open the mentions database with dict-like rows
+
+    Analyses open the file read-only so they can run next to the live
+    scheduler without taking write locks.
+    """
+    path = str(path or database_path())
+    if readonly:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    else:
+        conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def column_names(conn, table):
+    """Return the column names of a table (columns are added by migrations)"""
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def parse_timestamp(value):
+    """Parse a stored timestamp into epoch seconds (UTC)
+
+    Handles both ISO strings written by the backend ("2025-11-10T00:00:00.000Z")
+    and SQLite's datetime('now') default ("2025-11-10 03:00:12").
+    Returns None for empty or unparseable values.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
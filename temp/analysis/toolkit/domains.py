@@ -0,0 +1,158 @@
+"""
+Registered-domain extraction and outlet grouping
+
+Reduces a link to the outlet that published it. The outlet is the
+registered domain: the public suffix plus one label, following the Public
+Suffix List rules (normal, wildcard "*." and exception "!" rules). Mobile,
+AMP and regional editions of one outlet (m.example.com, amp.example.com,
+uk.example.com) therefore group together, while example.co.uk stays
+distinct from co.uk.
+
+The suffix rules come from the bundled public_suffix_list.dat, a subset of
+the list. Set PUBLIC_SUFFIX_LIST to a downloaded public_suffix_list.dat to
+use the full list.
+
+domain_parts() is memoized per link. registered_domains() and
+outlet_counts() work over a whole URL column: each distinct link is parsed
+once and the results are broadcast back with numpy.
+"""
+
+import os
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .urls import HOST_PREFIXES
+
+BUNDLED_LIST = Path(__file__).with_name('public_suffix_list.dat')
+CACHE_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class DomainParts:
+    host: str                # lowercased host without www./m./amp./mobile.
+    registered_domain: str   # outlet, e.g. thepacker.com or bbc.co.uk
+    suffix: str              # public suffix, e.g. com or co.uk
+    subdomain: str           # labels left of the registered domain ('' if none)
+
+
+@dataclass(frozen=True)
+class SuffixRules:
+    exact: frozenset
+    wildcard: frozenset      # parents of "*." rules, e.g. ck for *.ck
+    exceptions: frozenset    # "!" rules without the "!", e.g. www.ck
+
+    @classmethod
+    def parse(cls, lines):
+        exact, wildcard, exceptions = set(), set(), set()
+        for line in lines:
+            rule = line.strip().split(' ', 1)[0].lower()
+            if not rule or rule.startswith('//'):
+                continue
+            rule = rule.encode('idna').decode('ascii') if not rule.isascii() else rule
+            if rule.startswith('!'):
+                exceptions.add(rule[1:])
+            elif rule.startswith('*.'):
+                wildcard.add(rule[2:])
+            else:
+                exact.add(rule)
+        return cls(frozenset(exact), frozenset(wildcard), frozenset(exceptions))
+
+    def suffix_length(self, labels):
+        """Number of trailing labels that form the public suffix"""
+        # Longest match wins, so walk from the full host down to the TLD
+        for i in range(len(labels)):
+            candidate = '.'.join(labels[i:])
+            if candidate in self.exceptions:
+                return len(labels) - i - 1
+            if candidate in self.exact or '.'.join(labels[i + 1:]) in self.wildcard:
+                return len(labels) - i
+        # Default rule "*": the last label is the suffix
+        return 1
+
+
+@lru_cache(maxsize=None)
+def suffix_rules(path=None):
+    """Rules from PUBLIC_SUFFIX_LIST, or the bundled subset"""
+    path = path or os.environ.get('PUBLIC_SUFFIX_LIST') or BUNDLED_LIST
+    with open(path, encoding='utf-8') as f:
+        return SuffixRules.parse(f)
+
+
+def _hostname(value):
+    value = str(value).strip().lower()
+    if '://' not in value:
+        value = f'//{value}'
+    try:
+        host = urlsplit(value).hostname
+    except ValueError:
+        return None
+    if not host or '.' not in host:
+        return None
+    return host.rstrip('.')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def domain_parts(value):
+    """DomainParts for a URL or bare host, or None when there is no host"""
+    if not value:
+        return None
+    host = _hostname(value)
+    if host is None:
+        return None
+    labels = host.split('.')
+    if all(label.isdigit() for label in labels):
+        return DomainParts(host, host, '', '')    # IPv4 address
+
+    size = suffix_rules().suffix_length(labels)
+    if size >= len(labels):
+        # The host is itself a public suffix (e.g. blogspot.com)
+        return DomainParts(host, host, host, '')
+    registered = '.'.join(labels[-size - 1:])
+    subdomain = '.'.join(labels[:-size - 1])
+    for prefix in HOST_PREFIXES:
+        if f'{subdomain}.'.startswith(prefix):
+            subdomain = subdomain[len(prefix):]
+            break
+    host = f'{subdomain}.{registered}' if subdomain else registered
+    return DomainParts(host, registered, '.'.join(labels[-size:]), subdomain)
+
+
+def registered_domain(value):
+    """Outlet for a URL or bare host, or None"""
+    parts = domain_parts(value)
+    return parts.registered_domain if parts else None
+
+
+def _factorize(values):
+    """(codes, distinct values) for a column, with None/'' mapped to one code"""
+    index = {}
+    codes = np.fromiter((index.setdefault(v or None, len(index)) for v in values),
+                        dtype=np.int64)
+    return codes, list(index)
+
+
+def registered_domains(values):
+    """Registered domain for every value in a URL column, as a numpy object array"""
+    codes, distinct = _factorize(values)
+    domains = np.empty(len(distinct), dtype=object)
+    domains[:] = [registered_domain(v) for v in distinct]
+    return domains[codes]
+
+
+def outlet_counts(values):
+    """Counter of registered domain -> links, skipping values without a host"""
+    codes, distinct = _factorize(values)
+    if not len(codes):
+        return Counter()
+    per_value = np.bincount(codes, minlength=len(distinct))
+    counts = Counter()
+    for value, n in zip(distinct, per_value.tolist()):
+        domain = registered_domain(value)
+        if domain is not None:
+            counts[domain] += n
+    return counts
@@ -0,0 +1,38 @@
+import numpy as np
+
+from .domains import SuffixRules, domain_parts, outlet_counts, registered_domain, \
+    registered_domains
+
+
+def test_registered_domain_follows_suffix_rules():
+    assert registered_domain('https://www.thepacker.com/news/story') == 'thepacker.com'
+    assert registered_domain('https://m.bbc.co.uk/news') == 'bbc.co.uk'
+    assert registered_domain('co.uk') == 'co.uk'
+    assert registered_domain('https://growers.blogspot.com/post') == 'growers.blogspot.com'
+    assert registered_domain('not a url') is None
+    assert registered_domain(None) is None
+
+
+def test_wildcard_and_exception_rules():
+    rules = SuffixRules.parse(['// comment', 'com', '*.ck', '!www.ck', ''])
+    assert rules.suffix_length(['a', 'b', 'ck']) == 2
+    assert rules.suffix_length(['www', 'ck']) == 1
+    assert rules.suffix_length(['example', 'com']) == 1
+    assert rules.suffix_length(['example', 'unlisted']) == 1
+
+
+def test_mobile_amp_and_regional_editions_share_an_outlet():
+    parts = domain_parts('https://amp.eu.usatoday.com/story')
+    assert (parts.host, parts.registered_domain, parts.subdomain) == \
+        ('eu.usatoday.com', 'usatoday.com', 'eu')
+    assert domain_parts('https://m.freshplaza.com').host == 'freshplaza.com'
+    assert registered_domain('https://uk.reuters.com/a') == 'reuters.com'
+
+
+def test_bulk_mode_over_url_columns():
+    links = ['https://m.x.com/a', None, 'https://x.com/b', '', 'https://y.co.uk/c']
+    domains = registered_domains(links)
+    assert isinstance(domains, np.ndarray)
+    assert domains.tolist() == ['x.com', None, 'x.com', None, 'y.co.uk']
+    assert registered_domains([]).tolist() == []
+    assert outlet_counts(links) == {'x.com': 2, 'y.co.uk': 1}
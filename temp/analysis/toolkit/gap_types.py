@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Gap-type classifier for missed mentions
+
+Replaces the per-client keyword chains in efi_gap_analysis.py with a
+multinomial naive Bayes model trained on the gap types analysts have already
+assigned (full name, acronym, program, certification, indirect, unclear, or
+whatever labels the file uses). Titles and topics are turned into hashed
+sparse features in which the client's own name and acronym become
+placeholder tokens, so one model covers every client. All missed mentions
+are featurized and scored in one vectorized batch.
+
+Labels file: CSV with client, title, topic and gap_type columns.
+
+Usage:
+    python -m toolkit.gap_types --labels gap-labels.csv [--workbook tracking.xlsx] \\
+        [--manual manual-tracking-efi.csv --client NAME] [--start 2025-06-07] [--end 2025-12-04] \\
+        [--db PATH] [--min-confidence 0.6] [--csv classified.csv] [--folds 5] [--no-cache]
+"""
+
+import argparse
+import csv
+import re
+import zlib
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from .clients import ClientResolver
+from .coverage import compare_sources
+from .db import connect
+from .stage_cache import StageCache
+
+DEFAULT_FEATURES = 2 ** 18
+TOKEN_RE = re.compile(r'[a-z0-9_]+')
+
+# Placeholders for the client's own name, so features transfer across clients
+NAME_TOKEN = '__client_name__'
+ACRONYM_TOKEN = '__client_acronym__'
+NAME_WORD_TOKEN = '__client_word__'
+
+
+def client_terms(client):
+    """(full name, acronym, name words) used to rewrite a client's mentions"""
+    name = ' '.join(TOKEN_RE.findall((client or '').lower()))
+    words = name.split()
+    acronym = ''.join(w[0] for w in words) if len(words) > 1 else ''
+    return name, acronym, frozenset(w for w in words if len(w) > 3)
+
+
+def tokenize(text, terms):
+    name, acronym, name_words = terms
+    text = ' '.join(TOKEN_RE.findall((text or '').lower()))
+    if name:
+        text = re.sub(rf'\b{re.escape(name)}\b', NAME_TOKEN, text)
+    tokens = []
+    for token in text.split():
+        if acronym and token == acronym:
+            token = ACRONYM_TOKEN
+        elif token in name_words:
+            token = NAME_WORD_TOKEN
+        tokens.append(token)
+    return tokens
+
+
+def features(client, title, topic, terms_cache=None):
+    """Feature strings for one mention: title words and bigrams, topic words"""
+    terms = terms_cache.get(client) if terms_cache is not None else None
+    if terms is None:
+        terms = client_terms(client)
+        if terms_cache is not None:
+            terms_cache[client] = terms
+    words = tokenize(title, terms)
+    feats = {f'w:{w}' for w in words}
+    feats.update(f'b:{a} {b}' for a, b in zip(words, words[1:]))
+    feats.update(f't:{w}' for w in tokenize(topic, terms))
+    return feats
+
+
+def hash_features(rows, n_features=DEFAULT_FEATURES):
+    """Hash (client, title, topic) rows into CSR-style (indptr, indices) arrays
+
+    Features are binary; crc32 keeps the hashing stable across processes,
+    unlike hash().
+    """
+    cache = {}
+    indptr = [0]
+    indices = []
+    for client, title, topic in rows:
+        indices.extend(zlib.crc32(f.encode()) % n_features
+                       for f in features(client, title, topic, cache))
+        indptr.append(len(indices))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+
+@dataclass
+class GapClassifier:
+    classes: list
+    class_log_prior: np.ndarray     # (n_classes,)
+    feature_log_prob: np.ndarray    # (n_classes, n_features)
+
+    @property
+    def n_features(self):
+        return self.feature_log_prob.shape[1]
+
+    def predict_log_proba(self, rows):
+        indptr, indices = hash_features(rows, self.n_features)
+        # Row sums of the gathered log-probabilities via a cumulative sum,
+        # which (unlike np.add.reduceat) handles rows with no features
+        gathered = self.feature_log_prob[:, indices]
+        cumulative = np.zeros((len(self.classes), len(indices) + 1))
+        np.cumsum(gathered, axis=1, out=cumulative[:, 1:])
+        joint = (cumulative[:, indptr[1:]] - cumulative[:, indptr[:-1]]).T + self.class_log_prior
+        return joint - np.logaddexp.reduce(joint, axis=1, keepdims=True)
+
+    def predict(self, rows):
+        """Return (labels, confidences) for a batch of (client, title, topic) rows"""
+        rows = list(rows)
+        if not rows:
+            return [], np.zeros(0)
+        log_proba = self.predict_log_proba(rows)
+        best = log_proba.argmax(axis=1)
+        return [self.classes[i] for i in best], np.exp(log_proba.max(axis=1))
+
+
+def train(rows, labels, n_features=DEFAULT_FEATURES, alpha=1.0):
+    """Fit a multinomial naive Bayes model with Laplace smoothing"""
+    classes = sorted(set(labels))
+    if not classes:
+        raise ValueError('No labelled rows to train on')
+    y = np.array([classes.index(label) for label in labels])
+    indptr, indices = hash_features(rows, n_features)
+
+    counts = np.zeros((len(classes), n_features))
+    np.add.at(counts, (np.repeat(y, np.diff(indptr)), indices), 1)
+    smoothed = counts + alpha
+    feature_log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+    class_log_prior = np.log(np.bincount(y, minlength=len(classes)) / len(y))
+    return GapClassifier(classes, class_log_prior, feature_log_prob)
+
+
+def cross_validate(rows, labels, folds=5, n_features=DEFAULT_FEATURES, seed=0):
+    """Mean held-out accuracy over k folds (None when there are too few rows)"""
+    rows, labels = list(rows), list(labels)
+    if len(rows) < folds:
+        return None
+    order = np.random.default_rng(seed).permutation(len(rows))
+    correct = 0
+    for fold in np.array_split(order, folds):
+        held_out = set(fold.tolist())
+        model = train([rows[i] for i in order if i not in held_out],
+                      [labels[i] for i in order if i not in held_out], n_features)
+        predicted, _ = model.predict(rows[i] for i in fold)
+        correct += sum(p == labels[i] for p, i in zip(predicted, fold))
+    return correct / len(rows)
+
+
+def load_labels(path):
+    """Read analyst labels; returns ([(client, title, topic)], [gap_type])"""
+    rows, labels = [], []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for record in csv.DictReader(f):
+            label = (record.get('gap_type') or '').strip()
+            if not label:
+                continue
+            rows.append((record.get('client', ''), record.get('title', ''),
+                         record.get('topic', '')))
+            labels.append(label)
+    return rows, labels
+
+
+def classify_missed(model, results, min_confidence=0.0):
+    """Label every missed manual mention across all coverage results in one batch
+
+    Client terms come from CoverageResult.client, the clients.name the
+    manual label resolved to, not from the label itself (often an acronym).
+    """
+    missed = [(r.client, m) for r in results for m in r.missed]
+    labels, confidence = model.predict((client, m.title, m.topic) for client, m in missed)
+    return [
+        {
+            'client': client, 'date': m.date_str, 'publication': m.publication,
+            'title': m.title, 'topic': m.topic, 'link': m.link,
+            'gapType': label if p >= min_confidence else 'unclassified',
+            'confidence': round(float(p), 3)
+        }
+        for (client, m), label, p in zip(missed, labels, confidence)
+    ]
+
+
+def print_report(classified, classes, accuracy=None, training_size=0):
+    print('=' * 80)
+    print('GAP TYPES: Why manual mentions were missed')
+    print('=' * 80)
+    print(f"\nTrained on {training_size} labelled mentions")
+    if accuracy is not None:
+        print(f"Cross-validated accuracy: {accuracy * 100:.1f}%")
+
+    columns = list(classes) + (['unclassified']
+                               if any(c['gapType'] == 'unclassified' for c in classified) else [])
+    by_client = {}
+    for c in classified:
+        by_client.setdefault(c['client'], Counter())[c['gapType']] += 1
+    total = Counter(c['gapType'] for c in classified)
+
+    print(f"\nMissed mentions classified: {len(classified)}")
+    for label in columns:
+        pct = total[label] / len(classified) * 100 if classified else 0
+        print(f"  {label:<24} {total[label]:>6}  ({pct:.1f}%)")
+
+    print('\nBy client:')
+    for client, counts in sorted(by_client.items(), key=lambda item: -sum(item[1].values())):
+        breakdown = ', '.join(f"{label} {counts[label]}" for label in columns if counts[label])
+        print(f"  {client}: {sum(counts.values())} missed ({breakdown})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--labels', required=True, help='CSV of analyst-assigned gap types')
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Tracking workbook (one sheet per client); repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports without a title row')
+    parser.add_argument('--start', type=date.fromisoformat, help='Window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Window end (YYYY-MM-DD)')
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--min-confidence', type=float, default=0.0,
+                        help='Report predictions below this probability as unclassified')
+    parser.add_argument('--folds', type=int, default=5, help='Cross-validation folds (0 to skip)')
+    parser.add_argument('--csv', help='Write every classified missed mention to this CSV')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recompute the coverage comparison, bypassing the stage cache')
+    args = parser.parse_args(argv)
+
+    if not (args.workbook or args.manual):
+        parser.error('pass at least one --workbook or --manual input')
+
+    rows, labels = load_labels(args.labels)
+    with closing(connect(args.db)) as conn:
+        resolver = ClientResolver.from_db(conn)
+    # Labelled rows may name the client by its sheet label too
+    rows = [(resolver.name(client), title, topic) for client, title, topic in rows]
+    model = train(rows, labels)
+    accuracy = cross_validate(rows, labels, args.folds) if args.folds > 1 else None
+
+    cache = None if args.no_cache else StageCache()
+    results = compare_sources(args.workbook, args.manual, args.client, args.start, args.end,
+                              args.db, cache).values()
+
+    classified = classify_missed(model, results, args.min_confidence)
+    print_report(classified, model.classes, accuracy, len(rows))
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(classified[0]) if classified else ['client'])
+            writer.writeheader()
+            writer.writerows(classified)
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+from datetime import date
+
+from .coverage import CoverageResult
+from .gap_types import (ACRONYM_TOKEN, NAME_TOKEN, classify_missed, client_terms,
+                        cross_validate, tokenize, train)
+from .records import ManualMention
+
+LABELLED = [
+    (('Equitable Food Initiative', 'Equitable Food Initiative names new CEO', ''), 'full_name'),
+    (('Equitable Food Initiative', 'Equitable Food Initiative expands training', ''), 'full_name'),
+    (('Produce Safety Alliance', 'Produce Safety Alliance launches course', ''), 'full_name'),
+    (('Equitable Food Initiative', 'EFI adds grower members', ''), 'acronym'),
+    (('Produce Safety Alliance', 'PSA adds new trainers', ''), 'acronym'),
+    (('Equitable Food Initiative', 'Berry farm earns certification', 'Certified'), 'certification'),
+    (('Produce Safety Alliance', 'Grower achieves certification', 'Certification'), 'certification'),
+    (('Equitable Food Initiative', 'Farmworkers see wage gains', ''), 'indirect'),
+    (('Produce Safety Alliance', 'Labor shortage hits workers', ''), 'indirect'),
+]
+
+
+def test_tokenize_replaces_client_name_and_acronym():
+    terms = client_terms('Viva Fresh Expo')
+    assert tokenize('VFE returns; Viva Fresh Expo sells out', terms) == [
+        ACRONYM_TOKEN, 'returns', NAME_TOKEN, 'sells', 'out'
+    ]
+
+
+def test_classifier_transfers_to_unseen_clients():
+    rows, labels = zip(*LABELLED)
+    model = train(rows, labels)
+
+    predicted, confidence = model.predict([
+        ('Viva Fresh Expo', 'Viva Fresh Expo announces speakers', ''),
+        ('Viva Fresh Expo', 'VFE adds new exhibitors', ''),
+        ('Viva Fresh Expo', 'Packer earns certification', 'Certified'),
+        ('Viva Fresh Expo', '', '')
+    ])
+
+    assert predicted[:3] == ['full_name', 'acronym', 'certification']
+    assert all(0 < p <= 1 for p in confidence)
+
+
+def test_classify_missed_batches_every_client():
+    rows, labels = zip(*LABELLED)
+    model = train(rows, labels)
+    # Results are named by clients.name; the sheets use short labels
+    results = [
+        CoverageResult('Equitable Food Initiative', missed=[ManualMention(
+            'EFI', date(2025, 7, 1), '2025-07-01', 'The Packer',
+            'EFI adds ten farms', '', 'https://thepacker.com/1', 5)]),
+        CoverageResult('Viva Fresh Expo', missed=[ManualMention(
+            'Viva', date(2025, 7, 2), '2025-07-02', 'Produce News',
+            'Workers rally for labor reform', '', 'https://producenews.com/2', 6)])
+    ]
+
+    assert [c['gapType'] for c in classify_missed(model, results)] == ['acronym', 'indirect']
+    classified = classify_missed(model, results, min_confidence=0.8)
+
+    assert [c['client'] for c in classified] == ['Equitable Food Initiative', 'Viva Fresh Expo']
+    # The indirect guess is not confident enough to report
+    assert [c['gapType'] for c in classified] == ['acronym', 'unclassified']
+    assert classified[0]['confidence'] >= 0.8 > classified[1]['confidence']
+
+
+def separable_rows():
+    """Four clients x four gap types, one distinct title pattern per type"""
+    clients = ['Equitable Food Initiative', 'Produce Safety Alliance', 'Viva Fresh Expo',
+               'Florida Tomato Committee']
+    rows, labels = [], []
+    for client in clients:
+        acronym = ''.join(word[0] for word in client.split())
+        for subject in ('training', 'members', 'board', 'awards', 'program'):
+            rows += [(client, f'{client} expands {subject}', ''),
+                     (client, f'{acronym} expands {subject}', ''),
+                     (client, f'Grower earns certification for {subject}', 'Certified'),
+                     (client, f'Farmworkers see wage gains in {subject}', '')]
+            labels += ['full_name', 'acronym', 'certification', 'indirect']
+    return rows, labels
+
+
+def test_cross_validate():
+    rows, labels = separable_rows()
+    # Held-out rows are classified by their title pattern
+    assert cross_validate(rows, labels, folds=5) >= 0.95
+    assert cross_validate(rows[:2], labels[:2], folds=3) is None
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Detection-latency analysis
+
+Measures how long the pipeline takes to find a mention: the delay between
+the article's mentionDate and the row's createdAt, broken down per client,
+per source domain and per discovery path (search provider, RSS,
+card-item-discovery). Use it to judge whether changing the polling
+intervals in src/services/scheduler.js would shorten time-to-detection.
+
+Usage:
+    python -m toolkit.latency [--db PATH] [--client-id ID] [--verified-only] [--json OUT]
+"""
+
+import argparse
+import json
+from contextlib import closing
+
+import numpy as np
+
+from .db import connect, parse_timestamp
+from .records import load_mentions
+
+# Histogram bin edges in hours; the last bin is open-ended
+DEFAULT_BIN_EDGES_HOURS = (0, 2, 6, 12, 24, 48, 72, 168, 336, 720)
+DEFAULT_PERCENTILES = (50, 75, 90, 95, 99)
+
+# How often each discovery path runs (src/services/scheduler.js)
+POLLING_INTERVAL_HOURS = {
+    'google': 24,
+    'google-alerts-rss': 2
+}
+
+
+def latency_arrays(mentions):
+    """Convert mentions into parallel latency/label arrays
+
+    Mentions whose mentionDate could not be determined are stored with
+    mentionDate == createdAt (recordMentions falls back to "now"); they would
+    report a zero delay, so they are counted as undated and left out. Negative
+    delays (article dated after it was stored) are counted separately.
+    """
+    hours, clients, sources, paths = [], [], [], []
+    undated = 0
+    negative = 0
+    for m in mentions:
+        created = parse_timestamp(m.created_at)
+        published = parse_timestamp(m.mention_date)
+        if created is None or published is None or m.mention_date == m.created_at:
+            undated += 1
+            continue
+        delay = (created - published) / 3600
+        if delay < 0:
+            negative += 1
+            continue
+        hours.append(delay)
+        clients.append(m.client_name)
+        sources.append(m.source or 'Unknown source')
+        paths.append(m.discovery_path)
+
+    return {
+        'hours': np.asarray(hours, dtype=np.float64),
+        'client': np.asarray(clients, dtype=object),
+        'source': np.asarray(sources, dtype=object),
+        'path': np.asarray(paths, dtype=object),
+        'undated': undated,
+        'negative': negative
+    }
+
+
+def group_latency_stats(hours, labels, edges=DEFAULT_BIN_EDGES_HOURS,
+                        percentiles=DEFAULT_PERCENTILES):
+    """Per-group counts, mean, percentiles and histograms in one pass
+
+    Values are sorted once by (group, latency) so every group's percentiles
+    come from a single fancy-indexing step, and histograms are a single
+    bincount over (group, bin) pairs.
+    """
+    if len(hours) == 0:
+        return []
+
+    edges = np.asarray(edges, dtype=np.float64)
+    q = np.asarray(percentiles, dtype=np.float64) / 100
+    keys, inverse = np.unique(labels.astype(str), return_inverse=True)
+    n_groups = len(keys)
+    n_bins = len(edges)
+
+    counts = np.bincount(inverse, minlength=n_groups)
+    means = np.bincount(inverse, weights=hours, minlength=n_groups) / counts
+
+    order = np.lexsort((hours, inverse))
+    sorted_hours = hours[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Linear interpolation between closest ranks (numpy's default method)
+    positions = starts[:, None] + (counts[:, None] - 1) * q[None, :]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    fraction = positions - lower
+    values = sorted_hours[lower] + (sorted_hours[upper] - sorted_hours[lower]) * fraction
+
+    bins = np.clip(np.searchsorted(edges, hours, side='right') - 1, 0, n_bins - 1)
+    histograms = np.bincount(inverse * n_bins + bins, minlength=n_groups * n_bins)
+    histograms = histograms.reshape(n_groups, n_bins)
+
+    stats = []
+    for i, key in enumerate(keys):
+        stats.append({
+            'group': key,
+            'count': int(counts[i]),
+            'mean_hours': float(means[i]),
+            'percentiles': {f'p{int(p)}': float(v) for p, v in zip(percentiles, values[i])},
+            'histogram': histograms[i].tolist()
+        })
+    stats.sort(key=lambda s: s['count'], reverse=True)
+    return stats
+
+
+def bin_labels(edges=DEFAULT_BIN_EDGES_HOURS):
+    """Human-readable labels for histogram bins"""
+    labels = [f'{lo}-{hi}h' for lo, hi in zip(edges[:-1], edges[1:])]
+    labels.append(f'>={edges[-1]}h')
+    return labels
+
+
+def analyze_latency(mentions, edges=DEFAULT_BIN_EDGES_HOURS, percentiles=DEFAULT_PERCENTILES,
+                    verified_only=False):
+    """Build the full latency report for a list of AutoMention records"""
+    if verified_only:
+        mentions = [m for m in mentions if m.verified == 1]
+
+    arrays = latency_arrays(mentions)
+    hours = arrays['hours']
+    everything = np.full(len(hours), 'all', dtype=object)
+
+    by_path = group_latency_stats(hours, arrays['path'], edges, percentiles)
+    for stat in by_path:
+        interval = POLLING_INTERVAL_HOURS.get(stat['group'])
+        if interval is None:
+            continue
+        in_path = hours[arrays['path'] == stat['group']]
+        stat['polling_interval_hours'] = interval
+        # Share of mentions found within one polling cycle of publication;
+        # a low value means the delay comes from indexing, not from polling
+        stat['within_polling_interval'] = float(np.mean(in_path <= interval))
+
+    overall = group_latency_stats(hours, everything, edges, percentiles)
+    return {
+        'total': len(mentions),
+        'measured': int(len(hours)),
+        'undated': arrays['undated'],
+        'negative': arrays['negative'],
+        'bins': bin_labels(edges),
+        'overall': overall[0] if overall else None,
+        'by_path': by_path,
+        'by_client': group_latency_stats(hours, arrays['client'], edges, percentiles),
+        'by_source': group_latency_stats(hours, arrays['source'], edges, percentiles)
+    }
+
+
+def _print_groups(title, stats, top):
+    print(f"\n{'=' * 80}")
+    print(title)
+    print('=' * 80)
+    for stat in stats[:top]:
+        pct = stat['percentiles']
+        print(f"{stat['group'][:40]:40s} n={stat['count']:5d}  "
+              f"p50={pct.get('p50', 0):7.1f}h  p90={pct.get('p90', 0):7.1f}h  "
+              f"mean={stat['mean_hours']:7.1f}h")
+        if 'within_polling_interval' in stat:
+            print(f"{'':40s} within {stat['polling_interval_hours']}h polling interval: "
+                  f"{stat['within_polling_interval'] * 100:.1f}%")
+
+
+def print_report(report, top=15):
+    print('=' * 80)
+    print('DETECTION LATENCY (createdAt - mentionDate)')
+    print('=' * 80)
+    print(f"\nMentions: {report['total']}")
+    print(f"  Measured: {report['measured']}")
+    print(f"  Undated (mentionDate fell back to createdAt): {report['undated']}")
+    print(f"  Dated after detection (ignored): {report['negative']}")
+
+    overall = report['overall']
+    if not overall:
+        return
+
+    print('\nOverall histogram:')
+    for label, count in zip(report['bins'], overall['histogram']):
+        pct = count / overall['count'] * 100
+        print(f"  {label:>10s}: {count:5d} ({pct:5.1f}%)")
+
+    _print_groups('BY DISCOVERY PATH', report['by_path'], top)
+    _print_groups('BY CLIENT', report['by_client'], top)
+    _print_groups('BY SOURCE DOMAIN', report['by_source'], top)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--client-id', type=int, help='Only analyze one client')
+    parser.add_argument('--verified-only', action='store_true', help='Only verified mentions')
+    parser.add_argument('--json', help='Write the full report as JSON to this path')
+    args = parser.parse_args(argv)
+
+    with closing(connect(args.db)) as conn:
+        mentions = load_mentions(conn, args.client_id)
+
+    report = analyze_latency(mentions, verified_only=args.verified_only)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from .conftest import insert_mention
+from .db import connect
+from .latency import analyze_latency, group_latency_stats
+from .records import CARD_ITEM_SNIPPET, load_mentions
+
+
+def test_group_stats_match_numpy_percentiles():
+    rng = np.random.default_rng(0)
+    hours = rng.exponential(24, size=500)
+    labels = rng.choice(np.array(['a', 'b', 'c'], dtype=object), size=500)
+
+    stats = {s['group']: s for s in group_latency_stats(hours, labels)}
+
+    for label in ('a', 'b', 'c'):
+        subset = hours[labels == label]
+        assert stats[label]['count'] == len(subset)
+        assert stats[label]['percentiles']['p90'] == pytest.approx(np.percentile(subset, 90))
+        assert sum(stats[label]['histogram']) == len(subset)
+
+
+def test_analyze_latency_groups_by_discovery_path(db, db_path):
+    db.execute("INSERT INTO clients (name, contactEmail) VALUES ('EFI', 'a@b.c')")
+    insert_mention(db, link='https://a.com/1', source='a.com', provider='google-alerts-rss',
+                   mentionDate='2025-11-01T00:00:00.000Z', createdAt='2025-11-01T01:00:00.000Z')
+    insert_mention(db, link='https://b.com/1', source='b.com', provider='google',
+                   mentionDate='2025-11-01T00:00:00.000Z', createdAt='2025-11-03T00:00:00.000Z')
+    insert_mention(db, link='https://c.com/1', source='c.com', subjectMatter=CARD_ITEM_SNIPPET,
+                   mentionDate='2025-11-01T00:00:00.000Z', createdAt='2025-11-01 06:00:00')
+    # Undated: mentionDate fell back to createdAt
+    insert_mention(db, link='https://d.com/1', source='d.com',
+                   mentionDate='2025-11-05T00:00:00.000Z', createdAt='2025-11-05T00:00:00.000Z')
+
+    with connect(db_path) as conn:
+        report = analyze_latency(load_mentions(conn))
+
+    assert report['measured'] == 3
+    assert report['undated'] == 1
+    paths = {s['group']: s for s in report['by_path']}
+    assert paths['google-alerts-rss']['percentiles']['p50'] == 1
+    assert paths['google-alerts-rss']['within_polling_interval'] == 1
+    assert paths['google']['percentiles']['p50'] == 48
+    assert paths['google']['within_polling_interval'] == 0
+    assert paths['card-item-discovery']['percentiles']['p50'] == 6
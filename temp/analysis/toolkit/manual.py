@@ -0,0 +1,210 @@
+"""
+Streaming ingest for manual-tracking CSV exports and the tracking workbook
+
+Manual exports start with a title row ("EFI Media Mentions"), a header row,
+an example row and a template row, and contain month section markers
+("JULY") between data rows. Exports are often concatenated, so those rows
+can appear anywhere. iter_manual_csv classifies every row with
+IngestRules instead of skipping a fixed number of lines, and yields typed
+ManualMention records one at a time, so memory stays constant however
+large the input is. iter_manual_workbook applies the same rules to each
+sheet of the workbook.
+"""
+
+import csv
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+import openpyxl
+
+from .records import ManualMention
+
+# Formats seen in manual date cells besides ISO (validate_efi_analysis.py)
+DATE_FORMATS = ('%m/%d/%Y', '%m/%d/%y', '%d-%b-%y', '%b %d, %Y', '%B %d, %Y')
+
+_MONTHS = (r'jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|june?|july?|aug(ust)?'
+           r'|sep(t(ember)?)?|oct(ober)?|nov(ember)?|dec(ember)?')
+
+
+@dataclass(frozen=True)
+class IngestRules:
+    """How to recognise non-data rows and where the fields live
+
+    Field columns other than the date may be None when a sheet lacks them.
+    """
+    date_column: int = 0
+    publication_column: int = 1
+    title_column: int = 2
+    topic_column: int = 3
+    link_column: int = 5
+    # Rows above this one are never data (detected by toolkit.sheet_schema)
+    first_data_row: int = 1
+    # Title row; the captured name becomes the client for the rows after it
+    title_pattern: re.Pattern = re.compile(r'^\s*(?P<client>.+?)\s+media mentions\b', re.I)
+    # Header row: first cell equals one of these (lowercased)
+    header_cells: frozenset = frozenset({'date', 'date published', 'publish date'})
+    example_cells: frozenset = frozenset({'example'})
+    # Month section markers, optionally with a year ("JULY", "Aug 2025")
+    section_pattern: re.Pattern = re.compile(rf'^\s*({_MONTHS})(\s+\d{{4}})?\s*$', re.I)
+    # Placeholder dates on the template row under the example (only on rows
+    # without a title or link, so real mentions with such a date are kept)
+    template_date_prefixes: tuple = ('5/12/20',)
+
+
+DEFAULT_RULES = IngestRules()
+
+
+def parse_manual_date(value):
+    """Parse a manual date cell; returns a date or None"""
+    if isinstance(value, datetime):
+        return value.date()
+    text = str(value or '').strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _cell(row, column):
+    return row[column].strip() if column is not None and len(row) > column else ''
+
+
+def classify_row(row, rules=DEFAULT_RULES):
+    """Return 'data' or the reason a row is skipped
+
+    Reasons: blank, title, header, example, template, section, malformed.
+    Template and malformed rows have neither a title nor a link: a template
+    row carries a placeholder date, a malformed one a first cell that is not
+    a date at all.
+    """
+    first = _cell(row, rules.date_column)
+    if not first:
+        return 'blank'
+    lowered = first.lower()
+    if lowered in rules.header_cells:
+        return 'header'
+    if lowered in rules.example_cells:
+        return 'example'
+    if rules.section_pattern.match(first):
+        return 'section'
+    if rules.title_pattern.match(first):
+        return 'title'
+    has_content = _cell(row, rules.title_column) or _cell(row, rules.link_column)
+    if not has_content and first.startswith(rules.template_date_prefixes):
+        return 'template'
+    if not has_content and parse_manual_date(first) is None:
+        return 'malformed'
+    return 'data'
+
+
+def _iter_records(rows, client, rules, stats, fixed=False, undated=False):
+    """Classify (row_number, cells) pairs and yield the data rows as ManualMention
+
+    Title rows name the client for the rows after them unless fixed is set,
+    which keeps a client the caller gave explicitly. With undated, rows whose
+    date cell is blank but that have a title or link are yielded too (with
+    date None), instead of being skipped as blank.
+    """
+    stats = stats if stats is not None else Counter()
+    columns = (rules.date_column, rules.publication_column, rules.title_column,
+               rules.topic_column, rules.link_column)
+    width = max(c for c in columns if c is not None) + 1
+    title_match = rules.title_pattern.match
+
+    def field(row, column):
+        return row[column].strip() if column is not None else ''
+
+    for row_number, row in rows:
+        kind = classify_row(row, rules) if row else 'blank'
+        if kind == 'blank' and undated and row:
+            padded = row + [''] * (width - len(row))
+            if field(padded, rules.title_column) or field(padded, rules.link_column):
+                kind = 'data'
+        if kind == 'data' and row_number < rules.first_data_row:
+            kind = 'preamble'
+        if kind != 'data':
+            stats[kind] += 1
+            if kind == 'title' and not fixed:
+                client = title_match(row[rules.date_column]).group('client').strip()
+            continue
+
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        raw_date = row[rules.date_column].strip()
+        stats['data'] += 1
+        yield ManualMention(
+            client=client,
+            date=parse_manual_date(raw_date),
+            date_str=raw_date[:10],
+            publication=field(row, rules.publication_column),
+            title=field(row, rules.title_column),
+            topic=field(row, rules.topic_column),
+            link=field(row, rules.link_column),
+            row=row_number
+        )
+
+
+def iter_manual_csv(path, client=None, rules=DEFAULT_RULES, stats=None, undated=False):
+    """Yield ManualMention records from a CSV export, one row at a time
+
+    An explicit client applies to every row; without one, title rows name
+    the client. Pass a Counter as stats to receive counts of yielded and
+    skipped rows by reason. undated also yields rows with content but no
+    date (see _iter_records).
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        yield from _iter_records(enumerate(csv.reader(f), start=1), client, rules, stats,
+                                 fixed=client is not None, undated=undated)
+
+
+def cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return str(value)
+
+
+def iter_manual_workbook(path, rules=DEFAULT_RULES, stats=None, undated=False):
+    """Yield ManualMention records from every sheet of the tracking workbook
+
+    Each sheet is one client's tracker; the sheet name is the client until a
+    title row names one. rules may also be a dict of per-sheet IngestRules
+    keyed by sheet title (see toolkit.sheet_schema); other sheets use the
+    defaults. The workbook is opened read-only so rows stream.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in wb.worksheets:
+            sheet_rules = rules.get(sheet.title, DEFAULT_RULES) if isinstance(rules, dict) else rules
+            rows = (
+                (row_number, [cell_text(value) for value in values])
+                for row_number, values in enumerate(sheet.iter_rows(values_only=True), start=1)
+            )
+            yield from _iter_records(rows, sheet.title.strip(), sheet_rules, stats,
+                                     undated=undated)
+    finally:
+        wb.close()
+
+
+def iter_manual_sources(workbooks=(), csvs=(), client=None, rules=DEFAULT_RULES, stats=None):
+    """Chain every workbook and CSV export into one stream of ManualMention"""
+    for path in workbooks:
+        yield from iter_manual_workbook(path, rules, stats)
+    for path in csvs:
+        yield from iter_manual_csv(path, client, rules, stats)
+
+
+def read_manual_csv(path, client=None, rules=DEFAULT_RULES):
+    """Read a whole CSV export into a list (for small inputs)"""
+    return list(iter_manual_csv(path, client, rules))
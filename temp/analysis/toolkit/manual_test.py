@@ -0,0 +1,109 @@
+from collections import Counter
+from datetime import date, datetime
+
+import openpyxl
+
+from .manual import (IngestRules, classify_row, iter_manual_csv, iter_manual_workbook,
+                     parse_manual_date)
+
+EXPORT = """EFI Media Mentions,,,,,
+Date,Publication Name,Title,Topic,Additional Mentions,Link
+example,The Packer,Example title,,,https://example.com
+5/12/2025,Template,,,,
+2025-06-10,The Packer,First,Certification,,https://thepacker.com/1
+JULY,,,,,
+7/2/2025,Produce News,Second,,,https://producenews.com/2
+,,,,,
+Short row,only
+"""
+
+
+def test_classify_row():
+    assert classify_row(['EFI Media Mentions']) == 'title'
+    assert classify_row(['Date', 'Publication Name']) == 'header'
+    assert classify_row(['example']) == 'example'
+    assert classify_row(['5/12/2025', 'Template', '', '', '', '']) == 'template'
+    assert classify_row(['JULY']) == 'section'
+    assert classify_row(['Aug 2025']) == 'section'
+    assert classify_row(['', 'x']) == 'blank'
+    assert classify_row(['Short row', 'only']) == 'malformed'
+    # An unparseable date on a real mention is kept for the linter
+    assert classify_row(['TBD', 'Pub', 'Title']) == 'data'
+    assert classify_row(['2025-06-10']) == 'data'
+
+
+def test_parse_manual_date():
+    assert parse_manual_date('2025-06-10 00:00:00') == date(2025, 6, 10)
+    assert parse_manual_date('7/2/2025') == date(2025, 7, 2)
+    assert parse_manual_date('Jul 2, 2025') == date(2025, 7, 2)
+    assert parse_manual_date('TBD') is None
+
+
+def test_streams_concatenated_exports(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text(EXPORT + EXPORT.replace('EFI Media', 'Viva Media'), encoding='utf-8')
+    stats = Counter()
+
+    mentions = list(iter_manual_csv(path, stats=stats))
+
+    assert [(m.client, m.title) for m in mentions] == [
+        ('EFI', 'First'), ('EFI', 'Second'), ('Viva', 'First'), ('Viva', 'Second')
+    ]
+    assert mentions[1].date == date(2025, 7, 2)
+    assert mentions[1].link == 'https://producenews.com/2'
+    assert stats == Counter(data=4, title=2, header=2, example=2, template=2, section=2, blank=2,
+                            malformed=2)
+
+
+def test_real_mentions_on_the_template_date_are_kept(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text('5/12/2025,The Packer,Real story,,,https://thepacker.com/real\n',
+                    encoding='utf-8')
+    stats = Counter()
+
+    [mention] = iter_manual_csv(path, client='EFI', stats=stats)
+
+    assert (mention.title, mention.date) == ('Real story', date(2025, 5, 12))
+    assert stats == Counter(data=1)
+
+
+def test_explicit_client_wins_over_title_rows(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text(EXPORT, encoding='utf-8')
+
+    mentions = list(iter_manual_csv(path, client='Equitable Food Initiative'))
+
+    assert {m.client for m in mentions} == {'Equitable Food Initiative'}
+
+
+def test_custom_rules(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text('Link,Date\nhttps://a.com/1,2025-01-02\n', encoding='utf-8')
+    rules = IngestRules(date_column=1, link_column=0, publication_column=2,
+                        title_column=2, topic_column=2, header_cells=frozenset({'date'}))
+
+    [mention] = iter_manual_csv(path, client='EFI', rules=rules)
+
+    assert mention.link == 'https://a.com/1'
+    assert mention.date == date(2025, 1, 2)
+
+
+def test_iter_manual_workbook_uses_sheet_names_as_clients(tmp_path):
+    wb = openpyxl.Workbook()
+    efi = wb.active
+    efi.title = 'EFI'
+    efi.append(['Date', 'Publication Name', 'Title', 'Topic', 'Additional Mentions', 'Link'])
+    efi.append([datetime(2025, 6, 10), 'The Packer', 'First', None, None, 'https://thepacker.com/1'])
+    viva = wb.create_sheet('Viva ')
+    viva.append(['JULY'])
+    viva.append(['7/2/2025', 'Produce News', 'Second', None, None, 'https://producenews.com/2'])
+    path = tmp_path / 'tracking.xlsx'
+    wb.save(path)
+
+    mentions = list(iter_manual_workbook(path))
+
+    assert [(m.client, m.date, m.title) for m in mentions] == [
+        ('EFI', date(2025, 6, 10), 'First'),
+        ('Viva', date(2025, 7, 2), 'Second')
+    ]
+    assert mentions[0].date_str == '2025-06-10'
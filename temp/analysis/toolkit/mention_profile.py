@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Manual-tracking and stored-mention profile
+
+The toolkit version of the counting sections of validate_efi_analysis.py:
+distinct publications and domains, top sources and domains, how many
+manual mentions the system missed and a sample of them, for manual
+tracking and stored mentions in one window.
+
+By default every figure is exact. --approximate switches to fixed-memory
+sketches (HyperLogLog, Count-Min top-N, a Bloom filter of stored mentions
+and a reservoir sample of missed mentions) so profiles over years of
+all-client history stay within a few megabytes. Every figure is printed
+with its error bound.
+
+Usage:
+    python -m toolkit.mention_profile [--workbook tracking.xlsx] [--manual manual-tracking-efi.csv] \\
+        [--client NAME] [--start 2025-06-07] [--end 2025-12-04] [--db PATH] \\
+        [--approximate] [--top 15] [--sample 20] [--json OUT]
+"""
+
+import argparse
+import json
+import math
+from collections import Counter
+from contextlib import closing
+from datetime import date
+from itertools import islice
+
+from .clients import ClientResolver
+from .db import connect
+from .manual import iter_manual_sources
+from .sketches import Z_95, BloomFilter, Estimate, HyperLogLog, Reservoir, TopK, hash64
+from .urls import host_key, url_key
+
+CHUNK_SIZE = 10000
+RESERVOIR_SIZE = 1000
+
+# Source keywords for trade publications (validate_efi_analysis.py)
+TRADE_KEYWORDS = ('produce', 'fresh', 'grower', 'packer', 'food safety', 'agriculture',
+                  'agri', 'farm', 'harvest', 'retail')
+
+
+class ExactTally:
+    """Counter-backed tally; every figure is exact"""
+
+    def __init__(self, top=15):
+        self.counts = Counter()
+        self.k = top
+
+    def add_many(self, keys):
+        self.counts.update(keys)
+
+    def distinct(self):
+        return Estimate(len(self.counts))
+
+    def top(self):
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(key, Estimate(count)) for key, count in ranked[:self.k]]
+
+
+class SketchTally:
+    """HyperLogLog for the distinct count plus Count-Min top-N"""
+
+    def __init__(self, top=15):
+        self.hll = HyperLogLog()
+        self.top_k = TopK(top)
+
+    def add_many(self, keys):
+        keys = list(keys)
+        hashes = hash64(keys)
+        self.hll.add_hashes(hashes)
+        self.top_k.add_many(keys, hashes)
+
+    def distinct(self):
+        return self.hll.estimate()
+
+    def top(self):
+        return self.top_k.top()
+
+
+class ExactKeySet(set):
+    def add_many(self, keys):
+        self.update(keys)
+
+    def contains_many(self, keys):
+        return [key in self for key in keys]
+
+    def fp_rate(self):
+        return 0.0
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_stored(conn, start=None, end=None):
+    """Stream (client, link, source) for stored mentions published in the window"""
+    sql = """
+        SELECT c.name, m.link, m.source
+        FROM mediaMentions m
+        JOIN clients c ON m.clientId = c.id
+        WHERE (:start IS NULL OR substr(m.mentionDate, 1, 10) >= :start)
+          AND (:end IS NULL OR substr(m.mentionDate, 1, 10) <= :end)
+    """
+    params = {'start': start and str(start), 'end': end and str(end)}
+    cursor = conn.execute(sql, params)
+    while rows := cursor.fetchmany(CHUNK_SIZE):
+        yield from rows
+
+
+def count_stored(conn, start=None, end=None):
+    return conn.execute("""
+        SELECT COUNT(*) FROM mediaMentions
+        WHERE (:start IS NULL OR substr(mentionDate, 1, 10) >= :start)
+          AND (:end IS NULL OR substr(mentionDate, 1, 10) <= :end)
+    """, {'start': start and str(start), 'end': end and str(end)}).fetchone()[0]
+
+
+def _scoped_key(client_key, link):
+    key = url_key(link)
+    return f"{client_key}|{key}" if key else None
+
+
+def _in_window(day, start, end):
+    return day is not None and (start is None or day >= start) and (end is None or day <= end)
+
+
+def is_trade(mention):
+    source = (mention.publication or '').lower()
+    return any(keyword in source for keyword in TRADE_KEYWORDS)
+
+
+def build_profile(manual, stored, stored_total, start=None, end=None, approximate=False,
+                  top=15, resolver=None):
+    """Profile manual mentions (iterable) against stored (client, link, source) rows
+
+    Manual labels and stored client names meet through resolver
+    (toolkit.clients); without one they are compared as normalized names.
+    """
+    resolver = resolver or ClientResolver([])
+    client_keys = {}
+
+    def client_key(name):
+        if name not in client_keys:
+            client_keys[name] = resolver.key(name)
+        return client_keys[name]
+
+    tally = SketchTally if approximate else ExactTally
+    stored_domains, stored_sources = tally(top), tally(top)
+    manual_domains, manual_sources = tally(top), tally(top)
+    stored_keys = BloomFilter(stored_total) if approximate else ExactKeySet()
+    missed = Reservoir(RESERVOIR_SIZE if approximate else math.inf)
+
+    stored_count = 0
+    for chunk in chunked(stored):
+        stored_count += len(chunk)
+        stored_domains.add_many(d for d in (host_key(link) for _, link, _ in chunk) if d)
+        stored_sources.add_many((source or '').strip().lower() for _, _, source in chunk
+                                if source)
+        stored_keys.add_many(k for k in (_scoped_key(client_key(c), link) for c, link, _ in chunk) if k)
+
+    manual_count = linked = missed_count = 0
+    for chunk in chunked(m for m in manual if _in_window(m.date, start, end)):
+        manual_count += len(chunk)
+        manual_domains.add_many(d for d in (host_key(m.link) for m in chunk) if d)
+        manual_sources.add_many(m.publication for m in chunk if m.publication)
+        keyed = [(m, k) for m, k in ((m, _scoped_key(client_key(m.client), m.link))
+                                      for m in chunk) if k]
+        linked += len(keyed)
+        found = stored_keys.contains_many([k for _, k in keyed])
+        for (m, _), hit in zip(keyed, found):
+            if not hit:
+                missed_count += 1
+                missed.add(m)
+
+    # A Bloom false positive hides a miss; bound the hidden misses
+    expected_fp = stored_keys.fp_rate() * linked
+    missed_error = expected_fp + Z_95 * math.sqrt(expected_fp) if expected_fp else 0.0
+
+    return {
+        'approximate': approximate,
+        'manual': {
+            'mentions': Estimate(manual_count),
+            'linked': Estimate(linked),
+            'missed': Estimate(missed_count, missed_error, 0.95 if missed_error else 1.0),
+            'distinctPublications': manual_sources.distinct(),
+            'distinctDomains': manual_domains.distinct(),
+            'topPublications': manual_sources.top(),
+            'topDomains': manual_domains.top()
+        },
+        'stored': {
+            'mentions': Estimate(stored_count),
+            'distinctSources': stored_sources.distinct(),
+            'distinctDomains': stored_domains.distinct(),
+            'topSources': stored_sources.top(),
+            'topDomains': stored_domains.top()
+        },
+        'missedSample': missed,
+        'tradeShare': missed.proportion(is_trade)
+    }
+
+
+def _format_share(estimate):
+    text = f'{estimate.value * 100:.1f}%'
+    return text if estimate.exact else f'{text} ±{estimate.error * 100:.1f} pts (95%)'
+
+
+def print_report(profile, sample=20):
+    print('=' * 80)
+    mode = 'APPROXIMATE' if profile['approximate'] else 'EXACT'
+    print(f'MENTION PROFILE ({mode})')
+    print('=' * 80)
+
+    manual, stored = profile['manual'], profile['stored']
+    print(f"\nManual mentions in window: {manual['mentions']} ({manual['linked']} with links)")
+    print(f"  Missed by the system: {manual['missed']}")
+    print(f"  Distinct publications: {manual['distinctPublications']}")
+    print(f"  Distinct domains: {manual['distinctDomains']}")
+    print(f"\nStored mentions in window: {stored['mentions']}")
+    print(f"  Distinct sources: {stored['distinctSources']}")
+    print(f"  Distinct domains: {stored['distinctDomains']}")
+
+    for title, rows in (('TOP MANUAL PUBLICATIONS', manual['topPublications']),
+                        ('TOP MANUAL DOMAINS', manual['topDomains']),
+                        ('TOP STORED SOURCES', stored['topSources']),
+                        ('TOP STORED DOMAINS', stored['topDomains'])):
+        print(f"\n{'=' * 80}\n{title}\n{'=' * 80}")
+        for key, estimate in rows:
+            print(f"{str(key)[:50]:50s}: {estimate}")
+
+    reservoir = profile['missedSample']
+    print(f"\n{'=' * 80}\nSAMPLE MISSED MENTIONS\n{'=' * 80}")
+    print(f"\nTrade publications among missed mentions: {_format_share(profile['tradeShare'])}")
+    shown = sorted(reservoir.items, key=lambda m: m.date, reverse=True)[:sample]
+    label = 'most recent' if reservoir.seen == len(reservoir.items) else 'random sample, newest first'
+    print(f"{len(shown)} of {reservoir.seen} missed mentions ({label}):\n")
+    for idx, m in enumerate(shown, 1):
+        print(f"{idx:2d}. {m.date_str}  {m.publication[:40]}")
+        print(f"    {m.title[:80]}")
+        print(f"    {m.link[:100]}")
+
+
+def profile_to_json(profile, sample=20):
+    def figures(section):
+        return {
+            key: (value.as_dict() if isinstance(value, Estimate)
+                  else [{'key': k, **e.as_dict()} for k, e in value])
+            for key, value in section.items()
+        }
+
+    reservoir = profile['missedSample']
+    return {
+        'approximate': profile['approximate'],
+        'manual': figures(profile['manual']),
+        'stored': figures(profile['stored']),
+        'tradeShare': profile['tradeShare'].as_dict(),
+        'missedSample': [
+            {'client': m.client, 'date': m.date_str, 'publication': m.publication,
+             'title': m.title, 'link': m.link}
+            for m in sorted(reservoir.items, key=lambda m: m.date, reverse=True)[:sample]
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Tracking workbook (one sheet per client); repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports without a title row')
+    parser.add_argument('--start', type=date.fromisoformat, help='Window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Window end (YYYY-MM-DD)')
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--approximate', action='store_true',
+                        help='Use fixed-memory sketches; figures carry error bounds')
+    parser.add_argument('--top', type=int, default=15, help='Rows in each top-N table')
+    parser.add_argument('--sample', type=int, default=20, help='Missed mentions to list')
+    parser.add_argument('--json', help='Write the profile as JSON to this path')
+    args = parser.parse_args(argv)
+
+    if not (args.workbook or args.manual):
+        parser.error('pass at least one --workbook or --manual input')
+
+    manual = iter_manual_sources(args.workbook, args.manual, args.client)
+    with closing(connect(args.db)) as conn:
+        total = count_stored(conn, args.start, args.end)
+        profile = build_profile(manual, iter_stored(conn, args.start, args.end), total,
+                                args.start, args.end, args.approximate, args.top,
+                                ClientResolver.from_db(conn))
+
+    print_report(profile, args.sample)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(profile_to_json(profile, args.sample), f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+from datetime import date
+
+from .clients import ClientResolver
+from .mention_profile import build_profile
+from .records import ManualMention
+
+
+def manual(n, publication, link, client='EFI'):
+    return ManualMention(client, date(2025, 7, n % 28 + 1), f'2025-07-{n % 28 + 1:02d}',
+                         publication, f'Story {n}', '', link, n)
+
+
+def test_exact_and_approximate_profiles_agree_within_bounds():
+    stored = [('EFI', f'https://thepacker.com/{i}', 'The Packer') for i in range(0, 400, 2)]
+    stored += [('Other', 'https://producenews.com/1', 'Produce News')]
+    rows = [manual(i, 'The Packer', f'https://www.thepacker.com/{i}/') for i in range(400)]
+    rows += [manual(500, 'Produce News', 'https://producenews.com/1'),
+             manual(501, 'Fresh Plaza', ''),
+             ManualMention('EFI', None, '', 'Undated', 'Undated', '', 'https://x.com/1', 9)]
+
+    exact = build_profile(rows, stored, len(stored), start=date(2025, 6, 7))
+    approx = build_profile(rows, stored, len(stored), start=date(2025, 6, 7), approximate=True)
+
+    assert exact['manual']['mentions'].value == 402
+    assert exact['manual']['linked'].value == 401
+    # Odd-numbered links and the other client's Produce News story were missed
+    assert exact['manual']['missed'].value == 201
+    assert exact['manual']['distinctDomains'].value == 2
+    assert exact['stored']['topDomains'][0][0] == 'thepacker.com'
+    assert exact['missedSample'].seen == 201 and len(exact['missedSample'].items) == 201
+
+    for section in ('manual', 'stored'):
+        for key, figure in exact[section].items():
+            if key.startswith('top'):
+                assert [k for k, _ in approx[section][key]] == [k for k, _ in figure]
+            else:
+                assert abs(approx[section][key].value - figure.value) <= \
+                    approx[section][key].error + 1e-9, key
+    # Bloom false positives can hide a few misses; the bound covers them
+    assert approx['missedSample'].seen == approx['manual']['missed'].value
+    assert abs(approx['tradeShare'].value - exact['tradeShare'].value) <= \
+        approx['tradeShare'].error + 1e-9
+
+
+def test_manual_labels_match_stored_client_names_through_the_resolver():
+    stored = [('Equitable Food Initiative', 'https://thepacker.com/1', 'The Packer')]
+    rows = [manual(1, 'The Packer', 'https://thepacker.com/1')]
+    resolver = ClientResolver([(1, 'Equitable Food Initiative')])
+
+    assert build_profile(rows, stored, 1)['manual']['missed'].value == 1
+    assert build_profile(rows, stored, 1, resolver=resolver)['manual']['missed'].value == 0
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Publication-name resolver
+
+Manual tracking identifies outlets by free-text names ("The Packer",
+"Produce Blue Book"); the backend identifies them by publications.website
+and the source domain stored with each mention. PublicationIndex maps
+manual names onto publication ids using, in order: exact normalised name,
+compact name (spaces removed, so "FreshFruit Portal" meets
+freshfruitportal.com), domain, longest token prefix (token trie) and
+IDF-weighted token overlap.
+
+Usage:
+    python -m toolkit.publications --csv manual-tracking-efi.csv [--column 1] [--db PATH]
+"""
+
+import argparse
+import math
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from contextlib import closing
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from .db import REPO_ROOT, connect
+from .manual import DEFAULT_RULES, iter_manual_csv
+from .records import load_mentions
+from .urls import host_key
+
+DEFAULT_PUBLICATIONS_JS = REPO_ROOT / 'src' / 'data' / 'defaultPublications.js'
+
+# Minimum IDF-weighted overlap for a token match to be accepted
+DEFAULT_MIN_TOKEN_SCORE = 0.6
+
+# Words that carry no identity on their own
+STOP_TOKENS = frozenset({'the', 'a', 'an', 'of', 'and', 'news', 'online'})
+
+_PUNCTUATION = re.compile(r'[^a-z0-9\s]+')
+_ALIAS_SEPARATORS = re.compile(r'\s[–—\-|:]\s|\s*[()]\s*')
+_JS_ENTRY = re.compile(
+    r"\{\s*name:\s*'((?:[^'\\]|\\.)*)'\s*,\s*website:\s*(?:'((?:[^'\\]|\\.)*)'|null)\s*\}"
+)
+
+
+@dataclass(frozen=True)
+class Publication:
+    id: Optional[int]
+    name: str
+    website: Optional[str]
+
+    @property
+    def domain(self):
+        return host_key(self.website)
+
+
+@dataclass(frozen=True)
+class Match:
+    publication: Publication
+    method: str
+    score: float = 1.0
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, '&' -> 'and', collapse spaces"""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    text = _PUNCTUATION.sub(' ', text.lower().replace('&', ' and '))
+    return ' '.join(text.split())
+
+
+def name_tokens(normalized):
+    return [t for t in normalized.split() if t not in STOP_TOKENS]
+
+
+def load_default_publications(path=DEFAULT_PUBLICATIONS_JS):
+    """Read src/data/defaultPublications.js (not yet seeded entries have no id)"""
+    text = path.read_text(encoding='utf-8')
+    return [
+        Publication(None, name.replace("\\'", "'"), website or None)
+        for name, website in _JS_ENTRY.findall(text)
+    ]
+
+
+def load_publications(conn, include_defaults=True):
+    """Publications from the database, plus defaults missing from it"""
+    publications = [
+        Publication(row['id'], row['name'], row['website'])
+        for row in conn.execute('SELECT id, name, website FROM publications ORDER BY id')
+    ]
+    if include_defaults:
+        known = {p.name.lower() for p in publications}
+        publications += [p for p in load_default_publications() if p.name.lower() not in known]
+    return [p for p in publications if p.name.lower() != 'unknown source']
+
+
+class PublicationIndex:
+    """Normalised-name, domain, token-trie and token index over publications"""
+
+    def __init__(self, publications, min_token_score=DEFAULT_MIN_TOKEN_SCORE):
+        self.publications = list(publications)
+        self.min_token_score = min_token_score
+        self._exact = {}
+        self._compact = {}
+        self._domains = {}
+        self._trie = {}
+        self._postings = defaultdict(set)
+        self._cache = {}
+
+        for pub in self.publications:
+            for alias in self._aliases(pub):
+                self._add_alias(alias, pub)
+            if pub.domain:
+                self._domains.setdefault(pub.domain, pub)
+                label = pub.domain.split('.')[0]
+                self._compact.setdefault(label, pub)
+
+        n = max(len(self.publications), 1)
+        self._idf = {
+            token: math.log(1 + n / len(pubs)) for token, pubs in self._postings.items()
+        }
+        self._weight = {
+            pub: sum(self._idf[t] for t in set(name_tokens(normalize_name(pub.name))))
+            for pub in self.publications
+        }
+
+    @staticmethod
+    def _aliases(pub):
+        """The full name plus each part of names like 'ANUK – And Now You Know'"""
+        aliases = {normalize_name(pub.name)}
+        for part in _ALIAS_SEPARATORS.split(pub.name):
+            normalized = normalize_name(part)
+            if normalized:
+                aliases.add(normalized)
+        return aliases
+
+    def _add_alias(self, alias, pub):
+        alias = sys.intern(alias)
+        self._exact.setdefault(alias, pub)
+        self._compact.setdefault(alias.replace(' ', ''), pub)
+        tokens = name_tokens(alias)
+        if tokens:
+            self._compact.setdefault(''.join(tokens), pub)
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, pub)
+        for token in tokens:
+            self._postings[token].add(pub)
+
+    def resolve_domain(self, value):
+        """Publication whose website matches a URL or domain (subdomains included)"""
+        host = host_key(value)
+        while host and '.' in host:
+            pub = self._domains.get(host)
+            if pub:
+                return pub
+            host = host.split('.', 1)[1]
+        return None
+
+    def _trie_prefix(self, tokens):
+        """Longest indexed name that is a token prefix of the query"""
+        node, best = self._trie, None
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                break
+            best = node.get(None, best)
+        return best
+
+    def _token_match(self, tokens):
+        query = set(tokens)
+        scores = defaultdict(float)
+        for token in query:
+            for pub in self._postings.get(token, ()):
+                scores[pub] += self._idf[token]
+        best, best_score = None, 0.0
+        query_weight = sum(self._idf.get(t, math.log(1 + len(self.publications))) for t in query)
+        for pub, overlap in scores.items():
+            # Dice-style overlap so neither long nor short names dominate
+            score = 2 * overlap / (query_weight + self._weight[pub])
+            if score > best_score:
+                best, best_score = pub, score
+        if best is not None and best_score >= self.min_token_score:
+            return best, best_score
+        return None, best_score
+
+    def resolve(self, name):
+        """Resolve one manual publication name; returns a Match or None"""
+        if not name or not str(name).strip():
+            return None
+        key = sys.intern(str(name).strip())
+        if key in self._cache:
+            return self._cache[key]
+
+        match = None
+        normalized = normalize_name(key)
+        tokens = name_tokens(normalized)
+        if normalized in self._exact:
+            match = Match(self._exact[normalized], 'exact')
+        elif normalized.replace(' ', '') in self._compact:
+            match = Match(self._compact[normalized.replace(' ', '')], 'compact')
+        elif ''.join(tokens) in self._compact:
+            match = Match(self._compact[''.join(tokens)], 'compact')
+        else:
+            pub = self.resolve_domain(key) if '.' in key else None
+            if pub:
+                match = Match(pub, 'domain')
+            else:
+                pub = self._trie_prefix(tokens)
+                if pub:
+                    match = Match(pub, 'prefix')
+                else:
+                    pub, score = self._token_match(tokens)
+                    if pub:
+                        match = Match(pub, 'tokens', score)
+
+        self._cache[key] = match
+        return match
+
+    def resolve_many(self, names):
+        """Resolve names in bulk; repeated names are resolved once"""
+        return {name: self.resolve(name) for name in set(names)}
+
+
+def coverage_gaps(index, manual_names, mentions):
+    """Per-outlet manual counts vs automated mentions by discovery path"""
+    automated = defaultdict(Counter)
+    for mention in mentions:
+        pub = index.resolve_domain(mention.link or mention.source)
+        if pub:
+            automated[pub][mention.discovery_path] += 1
+
+    manual_counts = Counter(manual_names)
+    resolved = index.resolve_many(manual_counts)
+    outlets = defaultdict(lambda: {'manual': 0, 'names': set()})
+    unresolved = Counter()
+    for name, count in manual_counts.items():
+        match = resolved[name]
+        if match is None:
+            unresolved[name] += count
+            continue
+        outlets[match.publication]['manual'] += count
+        outlets[match.publication]['names'].add(name)
+
+    rows = []
+    for pub, info in outlets.items():
+        paths = automated.get(pub, Counter())
+        rows.append({
+            'publicationId': pub.id,
+            'publication': pub.name,
+            'domain': pub.domain,
+            'manualMentions': info['manual'],
+            'manualNames': sorted(info['names']),
+            'searchMentions': paths['google'],
+            'rssMentions': paths['google-alerts-rss'],
+            'otherMentions': sum(paths.values()) - paths['google'] - paths['google-alerts-rss']
+        })
+    rows.sort(key=lambda r: r['manualMentions'], reverse=True)
+    return rows, unresolved
+
+
+def read_manual_names(csv_path, column=DEFAULT_RULES.publication_column):
+    """Yield the publication name of each mention in a manual tracking CSV
+
+    Rows go through the shared manual ingest, so title, header, example,
+    template and section rows are not counted as outlets.
+    """
+    rules = replace(DEFAULT_RULES, publication_column=column)
+    for m in iter_manual_csv(csv_path, rules=rules, undated=True):
+        if m.publication:
+            yield m.publication
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--csv', required=True, help='Manual tracking CSV export')
+    parser.add_argument('--column', type=int, default=1, help='Publication name column')
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    args = parser.parse_args(argv)
+
+    with closing(connect(args.db)) as conn:
+        index = PublicationIndex(load_publications(conn))
+        mentions = load_mentions(conn)
+
+    names = list(read_manual_names(args.csv, args.column))
+    rows, unresolved = coverage_gaps(index, names, mentions)
+
+    print('=' * 80)
+    print('MANUALLY TRACKED OUTLETS vs AUTOMATED COVERAGE')
+    print('=' * 80)
+    for r in rows:
+        flags = []
+        if not r['searchMentions']:
+            flags.append('no search coverage')
+        if not r['rssMentions']:
+            flags.append('no RSS coverage')
+        print(f"{r['publication'][:40]:40s} manual={r['manualMentions']:4d} "
+              f"search={r['searchMentions']:4d} rss={r['rssMentions']:4d}  {', '.join(flags)}")
+
+    print(f"\n{'=' * 80}")
+    print('UNRESOLVED PUBLICATION NAMES (not in the publications table)')
+    print('=' * 80)
+    for name, count in unresolved.most_common():
+        print(f"  {name[:60]:60s}: {count:3d} mentions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+from .publications import (
+    Publication,
+    PublicationIndex,
+    coverage_gaps,
+    load_default_publications,
+    normalize_name,
+    read_manual_names
+)
+from .records import AutoMention
+
+
+def make_index():
+    pubs = [Publication(i + 1, p.name, p.website)
+            for i, p in enumerate(load_default_publications())]
+    return PublicationIndex(pubs)
+
+
+def test_loads_default_publications_from_js():
+    names = {p.name for p in load_default_publications()}
+    assert 'The Packer' in names
+    assert 'ANUK – And Now You Know' in names
+
+
+def test_normalize_name():
+    assert normalize_name('  The  Packer! ') == 'the packer'
+    assert normalize_name('G&R Farms') == 'g and r farms'
+    assert normalize_name('Café Société') == 'cafe societe'
+
+
+def test_resolves_manual_name_variants():
+    index = make_index()
+    cases = {
+        'The Packer': ('The Packer', 'exact'),
+        'the packer': ('The Packer', 'exact'),
+        'And Now You Know': ('ANUK – And Now You Know', 'exact'),
+        'Fresh Fruit Portal': ('FreshFruit Portal', 'compact'),
+        'thepacker.com': ('The Packer', 'domain'),
+        'www.freshplaza.com/article/123': ('Fresh Plaza', 'domain'),
+        'The Packer Magazine': ('The Packer', 'prefix'),
+        'Produce Blue Book': ('Blue Book – Produce Reporter', 'compact'),
+        'Grower News, Fruit': ('Fruit Grower News', 'tokens')
+    }
+    for name, (expected, method) in cases.items():
+        match = index.resolve(name)
+        assert match is not None, name
+        assert (match.publication.name, match.method) == (expected, method), name
+
+    assert index.resolve('Des Moines Register') is None
+    assert index.resolve('') is None
+
+
+def test_coverage_gaps_counts_paths_per_outlet():
+    index = make_index()
+    mentions = [
+        AutoMention(1, 1, 'EFI', 't', 'https://www.thepacker.com/a', 'www.thepacker.com',
+                    None, None, 1, provider='google'),
+        AutoMention(2, 1, 'EFI', 't', 'https://m.thepacker.com/b', 'm.thepacker.com',
+                    None, None, 1, provider='google-alerts-rss')
+    ]
+    rows, unresolved = coverage_gaps(
+        index, ['The Packer', 'the packer', 'Produce Business', 'Local Paper'], mentions
+    )
+
+    by_name = {r['publication']: r for r in rows}
+    assert by_name['The Packer']['manualMentions'] == 2
+    assert by_name['The Packer']['searchMentions'] == 1
+    assert by_name['The Packer']['rssMentions'] == 1
+    assert by_name['Produce Business']['searchMentions'] == 0
+    assert unresolved == {'Local Paper': 1}
+
+
+def test_read_manual_names_skips_non_data_rows(tmp_path):
+    path = tmp_path / 'manual.csv'
+    path.write_text(
+        'EFI Media Mentions,,,,,\n'
+        'Date,Publication Name,Title,Topic,Notes,Link\n'
+        'Example,Example Outlet,Example title,,,https://example.com\n'
+        '5/12/2025,Template Outlet,,,,\n'
+        'JULY,,,,,\n'
+        '7/1/2025,The Packer,Grower story,,,https://thepacker.com/a\n'
+        ',Produce Business,Undated story,,,https://producebusiness.com/b\n',
+        encoding='utf-8'
+    )
+
+    assert list(read_manual_names(path)) == ['The Packer', 'Produce Business']
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Search-query yield and quota-efficiency report
+
+Attributes mentions to the searchJobs row (one per provider call, written by
+runSearchJob in src/services/searchService.js) that produced them, then
+computes verified mentions per query call and per API request for every
+buildQueries variant, per client and per provider. Queries that keep
+running without producing a verified mention are flagged for removal.
+
+Usage:
+    python -m toolkit.query_yield [--db PATH] [--min-calls N] [--json OUT]
+"""
+
+import argparse
+import json
+import math
+from collections import defaultdict
+from contextlib import closing
+
+from .db import column_names, connect
+from .records import load_mentions
+
+# Google CSE returns at most 10 results per request (src/providers/providers.js)
+RESULTS_PER_REQUEST = 10
+
+# A query must have run at least this many times before it is judged
+DEFAULT_MIN_CALLS = 7
+
+
+def load_search_calls(conn):
+    """Load provider calls recorded by the search service
+
+    Rows created through the /search-jobs API have no provider and are not
+    query calls, so they are skipped.
+    """
+    columns = column_names(conn, 'searchJobs')
+    if 'provider' not in columns:
+        return []
+    rows = conn.execute("""
+        SELECT j.id, j.clientId, c.name AS clientName, j.query, j.label, j.provider,
+               j.status, j.resultCount, j.scheduledAt
+        FROM searchJobs j
+        JOIN clients c ON j.clientId = c.id
+        WHERE j.provider IS NOT NULL
+        ORDER BY j.id
+    """)
+    return [dict(row) for row in rows]
+
+
+def api_requests(call):
+    """Estimate CSE requests spent on a call (results are paged 10 at a time)"""
+    if call['status'] != 'completed':
+        return 1
+    return max(1, math.ceil((call['resultCount'] or 0) / RESULTS_PER_REQUEST))
+
+
+def _new_bucket():
+    return {
+        'calls': 0,
+        'failed_calls': 0,
+        'results': 0,
+        'api_requests': 0,
+        'mentions': 0,
+        'verified': 0,
+        'false_positives': 0,
+        'pending': 0
+    }
+
+
+def _add_mention(bucket, mention):
+    bucket['mentions'] += 1
+    if mention.verified == 1:
+        bucket['verified'] += 1
+    elif mention.verified == 0:
+        bucket['false_positives'] += 1
+    else:
+        bucket['pending'] += 1
+
+
+def _finish(bucket):
+    bucket['verified_per_call'] = bucket['verified'] / bucket['calls'] if bucket['calls'] else 0.0
+    bucket['verified_per_request'] = (
+        bucket['verified'] / bucket['api_requests'] if bucket['api_requests'] else 0.0
+    )
+    return bucket
+
+
+def analyze_query_yield(calls, mentions, min_calls=DEFAULT_MIN_CALLS):
+    """Aggregate call and mention counts per query, client and provider"""
+    by_query = defaultdict(_new_bucket)
+    by_client = defaultdict(_new_bucket)
+    by_provider = defaultdict(_new_bucket)
+    query_key_for_call = {}
+
+    for call in calls:
+        key = (call['clientName'], call['label'] or 'base', call['query'], call['provider'])
+        query_key_for_call[call['id']] = key
+        for bucket in (by_query[key], by_client[call['clientName']], by_provider[call['provider']]):
+            bucket['calls'] += 1
+            bucket['results'] += call['resultCount'] or 0
+            bucket['api_requests'] += api_requests(call)
+            if call['status'] != 'completed':
+                bucket['failed_calls'] += 1
+
+    unattributed = 0
+    for mention in mentions:
+        key = query_key_for_call.get(mention.search_job_id)
+        if key is None:
+            if mention.provider in by_provider:
+                unattributed += 1
+            continue
+        client_name, _label, _query, provider = key
+        for bucket in (by_query[key], by_client[client_name], by_provider[provider]):
+            _add_mention(bucket, mention)
+
+    queries = []
+    for (client_name, label, query, provider), bucket in by_query.items():
+        queries.append({
+            'client': client_name,
+            'label': label,
+            'query': query,
+            'provider': provider,
+            **_finish(bucket)
+        })
+    queries.sort(key=lambda q: (q['verified_per_request'], -q['api_requests']))
+
+    zero_yield = [
+        q for q in queries
+        if q['verified'] == 0 and q['calls'] - q['failed_calls'] >= min_calls
+    ]
+
+    return {
+        'calls': len(calls),
+        'api_requests': sum(api_requests(c) for c in calls),
+        'unattributed_mentions': unattributed,
+        'queries': queries,
+        'by_client': {name: _finish(b) for name, b in sorted(by_client.items())},
+        'by_provider': {name: _finish(b) for name, b in sorted(by_provider.items())},
+        'zero_yield': zero_yield,
+        'zero_yield_requests': sum(q['api_requests'] for q in zero_yield),
+        'min_calls': min_calls
+    }
+
+
+def print_report(report):
+    print('=' * 80)
+    print('SEARCH QUERY YIELD')
+    print('=' * 80)
+    print(f"\nQuery calls: {report['calls']}")
+    print(f"Estimated API requests: {report['api_requests']}")
+    if report['unattributed_mentions']:
+        print(f"Mentions from search without a recorded call: {report['unattributed_mentions']}")
+
+    print(f"\n{'=' * 80}")
+    print('BY PROVIDER')
+    print('=' * 80)
+    for name, b in report['by_provider'].items():
+        print(f"{name:30s} calls={b['calls']:5d} requests={b['api_requests']:6d} "
+              f"verified={b['verified']:4d} per request={b['verified_per_request']:.3f}")
+
+    print(f"\n{'=' * 80}")
+    print('BY CLIENT')
+    print('=' * 80)
+    for name, b in report['by_client'].items():
+        print(f"{name[:30]:30s} calls={b['calls']:5d} requests={b['api_requests']:6d} "
+              f"verified={b['verified']:4d} per request={b['verified_per_request']:.3f}")
+
+    print(f"\n{'=' * 80}")
+    print('BY QUERY (lowest yield first)')
+    print('=' * 80)
+    for q in report['queries']:
+        print(f"\n[{q['client']}] {q['label']} ({q['provider']})")
+        print(f"  Query: {q['query'][:100]}")
+        print(f"  Calls: {q['calls']} ({q['failed_calls']} failed), requests: {q['api_requests']}, "
+              f"results: {q['results']}")
+        print(f"  Mentions: {q['mentions']} (verified {q['verified']}, "
+              f"false positives {q['false_positives']}, pending {q['pending']})")
+        print(f"  Verified per call: {q['verified_per_call']:.3f}")
+
+    print(f"\n{'=' * 80}")
+    print(f"ZERO-YIELD QUERIES (>= {report['min_calls']} successful calls, no verified mentions)")
+    print('=' * 80)
+    if not report['zero_yield']:
+        print('\nNone')
+        return
+    for q in report['zero_yield']:
+        print(f"  [{q['client']}] {q['label']}: {q['query'][:80]}")
+    print(f"\nRemoving them would save ~{report['zero_yield_requests']} API requests "
+          f"over the recorded period")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--min-calls', type=int, default=DEFAULT_MIN_CALLS,
+                        help='Calls required before a query can be flagged as zero-yield')
+    parser.add_argument('--json', help='Write the full report as JSON to this path')
+    args = parser.parse_args(argv)
+
+    with closing(connect(args.db)) as conn:
+        report = analyze_query_yield(load_search_calls(conn), load_mentions(conn), args.min_calls)
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
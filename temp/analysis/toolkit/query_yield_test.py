@@ -0,0 +1,49 @@
+from contextlib import closing
+
+from .conftest import insert_mention
+from .db import connect
+from .query_yield import analyze_query_yield, load_search_calls
+from .records import load_mentions
+
+
+def add_call(conn, query, label, status='completed', result_count=10, client_id=1):
+    cur = conn.execute(
+        'INSERT INTO searchJobs (clientId, query, status, scheduledAt, provider, label, resultCount) '
+        "VALUES (?, ?, ?, '2025-11-01T03:00:00Z', 'google', ?, ?)",
+        (client_id, query, status, label, result_count)
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def test_attributes_mentions_and_flags_zero_yield(db, db_path):
+    db.execute("INSERT INTO clients (name, contactEmail) VALUES ('EFI', 'a@b.c')")
+    base_calls = [add_call(db, '"Equitable Food Initiative"', 'base', result_count=25)
+                  for _ in range(3)]
+    for _ in range(3):
+        add_call(db, '"Equitable Food Initiative" (site:thepacker.com)',
+                 'priority-publications', result_count=0)
+    # Manual /search-jobs rows are not provider calls
+    db.execute("INSERT INTO searchJobs (clientId, query, scheduledAt) VALUES (1, 'x', 'now')")
+    db.commit()
+
+    insert_mention(db, link='https://a.com/1', provider='google', verified=1,
+                   searchJobId=base_calls[0])
+    insert_mention(db, link='https://a.com/2', provider='google', verified=0,
+                   searchJobId=base_calls[1])
+    insert_mention(db, link='https://a.com/3', provider='google', verified=1)
+
+    with closing(connect(db_path)) as conn:
+        report = analyze_query_yield(load_search_calls(conn), load_mentions(conn), min_calls=3)
+
+    assert report['calls'] == 6
+    # 3 requests per 25-result call, 1 for an empty call
+    assert report['api_requests'] == 12
+    assert report['unattributed_mentions'] == 1
+
+    by_label = {q['label']: q for q in report['queries']}
+    assert by_label['base']['verified'] == 1
+    assert by_label['base']['false_positives'] == 1
+    assert by_label['base']['verified_per_call'] == 1 / 3
+    assert [q['label'] for q in report['zero_yield']] == ['priority-publications']
+    assert report['by_client']['EFI']['verified'] == 1
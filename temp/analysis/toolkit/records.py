@@ -0,0 +1,78 @@
+"""
+Record types shared across the analysis toolkit
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from .db import column_names
+
+# Snippet stored for mentions created from card-item listing pages
+# (see processDiscoveredArticles in src/scripts/verifyMentions.js)
+CARD_ITEM_SNIPPET = 'Discovered from card-item listing page'
+
+
+@dataclass
+class AutoMention:
+    """A row of mediaMentions joined with its client name"""
+    id: int
+    client_id: int
+    client_name: str
+    title: str
+    link: Optional[str]
+    source: Optional[str]
+    mention_date: Optional[str]
+    created_at: Optional[str]
+    verified: Optional[int]
+    subject_matter: Optional[str] = None
+    provider: Optional[str] = None
+    search_job_id: Optional[int] = None
+
+    @property
+    def discovery_path(self):
+        """How the pipeline found this mention
+
+        Uses the stored provider when present. Older rows predate the
+        provider column, so card-item discoveries are recognised by their
+        placeholder snippet and everything else is reported as 'unknown'.
+        """
+        if self.provider:
+            return self.provider
+        if self.subject_matter == CARD_ITEM_SNIPPET:
+            return 'card-item-discovery'
+        return 'unknown'
+
+
+@dataclass
+class ManualMention:
+    """A mention recorded by hand in the manual tracking sheets"""
+    client: Optional[str]
+    date: Optional[date]
+    date_str: str
+    publication: str
+    title: str
+    topic: str
+    link: str
+    row: int
+
+
+def load_mentions(conn, client_id=None):
+    """Load stored mentions as AutoMention records"""
+    columns = column_names(conn, 'mediaMentions')
+    # Columns added by later migrations read as NULL on older databases
+    provider_col = 'm.provider' if 'provider' in columns else 'NULL'
+    search_job_col = 'm.searchJobId' if 'searchJobId' in columns else 'NULL'
+    sql = f"""
+        SELECT m.id, m.clientId, c.name AS clientName, m.title, m.link, m.source,
+               m.mentionDate, m.createdAt, m.verified, m.subjectMatter,
+               {provider_col} AS provider, {search_job_col} AS searchJobId
+        FROM mediaMentions m
+        JOIN clients c ON m.clientId = c.id
+    """
+    params = []
+    if client_id is not None:
+        sql += ' WHERE m.clientId = ?'
+        params.append(client_id)
+    sql += ' ORDER BY m.id'
+    return [AutoMention(*row) for row in conn.execute(sql, params)]
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Coverage regression across archived database snapshots
+
+Replaces the hand-copied numbers in temp/docs (FIRST_RUN_RESULTS.md,
+BEFORE_AFTER_COMPARISON.md). Runs the coverage comparison from
+toolkit.coverage against the manual baselines once per archived
+mediamentions.db snapshot and writes a per-client time series, so the
+effect of a search-profile or filter change is visible from snapshot to
+snapshot.
+
+The manual inputs are parsed once and published as a shared-memory table
+(toolkit.shared_table). Each worker process attaches to it when it starts
+and decodes only the client, date and link columns (ManualColumns); no
+ManualMention records are rebuilt. It then opens one snapshot at a time,
+read-only, and resolves the manual client labels against its clients. A snapshot is dated by the
+first YYYY-MM-DD (or YYYYMMDD) in its file name, or else by its
+modification time. Unreadable snapshots are reported and skipped.
+
+Usage:
+    python -m toolkit.regression SNAPSHOT_DIR [--workbook tracking.xlsx] \\
+        [--manual manual-tracking-efi.csv --client NAME] [--start 2025-06-07] \\
+        [--end 2025-12-04] [--workers 4] [--csv series.csv] [--json series.json]
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+
+from .clients import ClientResolver
+from .coverage import compare_keyed
+from .db import connect
+from .manual import iter_manual_sources
+from .records import load_mentions
+from .shared_table import SharedMentionTable
+from .urls import url_key
+
+SNAPSHOT_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+_NAME_DATE = re.compile(r'(20\d{2})-?(\d{2})-?(\d{2})')
+
+SERIES_COLUMNS = ['snapshot', 'snapshotDate', 'client', 'manual', 'matched', 'missed',
+                  'autoOnly', 'unlinked', 'coverageRate']
+
+
+@dataclass
+class SnapshotResult:
+    snapshot: str
+    snapshot_date: str
+    mentions: int = 0
+    clients: list = field(default_factory=list)   # CoverageResult.summary() dicts
+    error: str = None
+
+
+def snapshot_date(path):
+    """Date from the file name, falling back to the modification time"""
+    match = _NAME_DATE.search(Path(path).name)
+    if match:
+        try:
+            return date(*map(int, match.groups()))
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(Path(path).stat().st_mtime).date()
+
+
+def find_snapshots(directory):
+    """Snapshot databases in a directory, oldest first (rollup files excluded)"""
+    paths = [p for p in Path(directory).iterdir()
+             if p.is_file() and p.suffix in SNAPSHOT_SUFFIXES and not p.stem.endswith('-rollup')]
+    return sorted(paths, key=lambda p: (snapshot_date(p), p.name))
+
+
+@dataclass
+class ManualColumns:
+    """The manual columns a coverage comparison reads, indexed by row"""
+    clients: dict          # client label -> [row index]
+    dates: list            # datetime.date or None
+    keys: list             # url_key of the link, or None
+
+    @classmethod
+    def from_records(cls, manual):
+        clients = {}
+        for i, m in enumerate(manual):
+            clients.setdefault(m.client, []).append(i)
+        return cls(clients, [m.date for m in manual], [url_key(m.link) for m in manual])
+
+    @classmethod
+    def from_table(cls, table):
+        """Decode the columns of a published manual SharedMentionTable"""
+        clients = {}
+        for rows in table.client_rows().values():
+            clients[table.strings('client', rows[:1])[0]] = rows.tolist()
+        return cls(clients, table.dates(), [url_key(link) for link in table.strings('link')])
+
+
+# Manual columns for the worker process, set once by _init_worker
+_columns = None
+
+
+def _init_worker(spec):
+    global _columns
+    table = SharedMentionTable.attach(spec)
+    try:
+        _columns = ManualColumns.from_table(table)
+    finally:
+        table.close()
+
+
+def run_snapshot(path, start=None, end=None, columns=None):
+    """Coverage for every manual client against one snapshot"""
+    columns = columns if columns is not None else _columns
+    result = SnapshotResult(Path(path).name, snapshot_date(path).isoformat())
+    try:
+        with closing(connect(path)) as conn:
+            auto = load_mentions(conn)
+            resolver = ClientResolver.from_db(conn)
+    except sqlite3.Error as e:
+        result.error = str(e)
+        return result
+    result.mentions = len(auto)
+
+    manual_groups, auto_groups = {}, {}
+    for label, rows in columns.clients.items():
+        name, group = manual_groups.setdefault(resolver.key(label),
+                                               (resolver.name(label), []))
+        group.extend(rows)
+    for a in auto:
+        auto_groups.setdefault(a.client_id, []).append(a)
+    coverage = [
+        compare_keyed(name, ((i, columns.dates[i], columns.keys[i]) for i in sorted(rows)),
+                      auto_groups.get(key, []), start, end)
+        for key, (name, rows) in manual_groups.items()
+    ]
+    result.clients = sorted((c.summary() for c in coverage), key=lambda s: s['client'])
+    return result
+
+
+def run_regression(paths, manual, start=None, end=None, workers=None):
+    """SnapshotResults in snapshot order; workers=1 runs in this process"""
+    paths = list(paths)
+    if workers == 1 or len(paths) <= 1 or not manual:
+        columns = ManualColumns.from_records(manual)
+        return [run_snapshot(p, start, end, columns) for p in paths]
+    with SharedMentionTable.publish(manual) as table, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(table.spec,)) as executor:
+        futures = [executor.submit(run_snapshot, str(p), start, end) for p in paths]
+        return [f.result() for f in futures]
+
+
+def series_rows(results):
+    """Flatten snapshot results into one row per snapshot and client"""
+    for r in results:
+        for summary in r.clients:
+            yield {'snapshot': r.snapshot, 'snapshotDate': r.snapshot_date,
+                   **{key: summary[key] for key in SERIES_COLUMNS[2:]}}
+
+
+def print_report(results):
+    print('=' * 80)
+    print('COVERAGE REGRESSION ACROSS SNAPSHOTS')
+    print('=' * 80)
+    for r in results:
+        status = f"ERROR {r.error}" if r.error else f"{r.mentions} mentions"
+        print(f"  {r.snapshot_date}  {r.snapshot}: {status}")
+
+    good = [r for r in results if not r.error]
+    clients = sorted({s['client'] for r in good for s in r.clients})
+    if not clients:
+        return
+    rates = {(r.snapshot, s['client']): s for r in good for s in r.clients}
+
+    print(f"\n{'Client':<32}" + ''.join(f"{r.snapshot_date:>12}" for r in good) + f"{'Change':>9}")
+    for client in clients:
+        cells, values = [], []
+        for r in good:
+            s = rates.get((r.snapshot, client))
+            cells.append(f"{s['coverageRate'] * 100:>11.1f}%" if s else f"{'-':>12}")
+            if s:
+                values.append(s['coverageRate'])
+        change = (values[-1] - values[0]) * 100 if len(values) > 1 else 0.0
+        print(f"{client[:32]:<32}" + ''.join(cells) + f"{change:>+8.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('snapshots', help='Directory of archived mediamentions.db snapshots')
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Tracking workbook (one sheet per client); repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports without a title row')
+    parser.add_argument('--start', type=date.fromisoformat, help='Window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Window end (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--csv', help='Write the per-client time series to this CSV')
+    parser.add_argument('--json', help='Write the per-snapshot results to this JSON file')
+    args = parser.parse_args(argv)
+
+    if not (args.workbook or args.manual):
+        parser.error('pass at least one --workbook or --manual input')
+    paths = find_snapshots(args.snapshots)
+    if not paths:
+        parser.error(f'no snapshot databases in {args.snapshots}')
+
+    manual = list(iter_manual_sources(args.workbook, args.manual, args.client))
+    results = run_regression(paths, manual, args.start, args.end, args.workers)
+    print_report(results)
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SERIES_COLUMNS)
+            writer.writeheader()
+            writer.writerows(series_rows(results))
+        print(f"\nWrote {args.csv}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
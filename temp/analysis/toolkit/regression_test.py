@@ -0,0 +1,64 @@
+import sqlite3
+from datetime import date
+
+from .conftest import SCHEMA, insert_mention
+from .records import ManualMention
+from .regression import (ManualColumns, find_snapshots, run_regression, run_snapshot,
+                         series_rows, snapshot_date)
+from .shared_table import SharedMentionTable
+
+
+def make_snapshot(path, links):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO clients (id, name, contactEmail) VALUES (1, 'EFI', 'x')")
+    for link in links:
+        insert_mention(conn, link=link, verified=1)
+    conn.close()
+
+
+def manual(link):
+    return ManualMention('EFI', date(2025, 11, 1), '2025-11-01', 'The Packer', 'Story', '',
+                         link, 5)
+
+
+def test_snapshots_are_dated_and_ordered(tmp_path):
+    for name in ('mediamentions-2025-11-01.db', 'mediamentions-20251001.db',
+                 'mediamentions-rollup.db', 'notes.txt'):
+        (tmp_path / name).write_bytes(b'')
+    assert [p.name for p in find_snapshots(tmp_path)] == [
+        'mediamentions-20251001.db', 'mediamentions-2025-11-01.db'
+    ]
+    assert snapshot_date(tmp_path / 'mediamentions-20251001.db') == date(2025, 10, 1)
+
+
+def test_regression_builds_a_coverage_time_series(tmp_path):
+    make_snapshot(tmp_path / 'mm-2025-10-01.db', ['https://thepacker.com/a'])
+    make_snapshot(tmp_path / 'mm-2025-11-01.db',
+                  ['https://thepacker.com/a', 'https://thepacker.com/b'])
+    (tmp_path / 'mm-2025-12-01.db').write_bytes(b'not a database')
+    baseline = [manual('https://thepacker.com/a'), manual('https://thepacker.com/b')]
+
+    results = run_regression(find_snapshots(tmp_path), baseline, workers=2)
+
+    assert [r.snapshot_date for r in results] == ['2025-10-01', '2025-11-01', '2025-12-01']
+    assert results[2].error
+    rows = list(series_rows(results))
+    assert [(row['snapshotDate'], row['matched'], row['coverageRate']) for row in rows] == [
+        ('2025-10-01', 1, 0.5), ('2025-11-01', 2, 1.0)
+    ]
+
+
+def test_workers_read_shared_columns_without_records(tmp_path):
+    make_snapshot(tmp_path / 'mm.db', ['https://thepacker.com/a'])
+    baseline = [manual('https://thepacker.com/a'), manual(''),
+                ManualMention('Viva', None, '', 'Pub', 'Undated', '', 'https://x.com/1', 9)]
+
+    with SharedMentionTable.publish(baseline) as table:
+        shared = ManualColumns.from_table(table)
+    assert shared == ManualColumns.from_records(baseline)
+
+    result = run_snapshot(tmp_path / 'mm.db', columns=shared)
+    assert [(s['client'], s['matched'], s['missed'], s['unlinked']) for s in result.clients] == [
+        ('EFI', 1, 0, 1), ('Viva', 0, 1, 0)
+    ]
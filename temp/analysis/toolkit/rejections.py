@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Indexed reader for the search rejection log
+
+src/utils/rejectionLog.js appends every result rejected by
+filterResultsForClient to data/rejections/YYYY-MM-DD.jsonl.gz. Each append
+is a complete gzip member, with one JSON object per line: loggedAt,
+clientId, client, provider, searchJobId, then the rejectionLog fields
+(reason, title, snippet, url, daysOld, dateSource, nameInSnippet, ...).
+
+This tool keeps a SQLite index next to the segments, indexed by url_key,
+client and reason. A refresh reads only the bytes appended since the last
+run: segments are append-only, so the stored offset of a segment is always
+a gzip member boundary. Lookups then answer "was this URL ever rejected,
+and why?" without decompressing months of logs.
+
+Usage:
+    python -m toolkit.rejections [--dir data/rejections] [--index PATH] [--rebuild] \\
+        [--url URL ...] [--workbook tracking.xlsx] [--manual manual.csv --client NAME] \\
+        [--reason article_too_old] [--start 2025-06-07] [--end 2025-12-04]
+"""
+
+import argparse
+import gzip
+import json
+import sqlite3
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from .clients import ClientResolver
+from .db import REPO_ROOT
+from .manual import iter_manual_sources
+from .urls import url_key
+
+DEFAULT_LOG_DIR = REPO_ROOT / 'data' / 'rejections'
+INDEX_NAME = 'index.sqlite'
+SEGMENT_GLOB = '*.jsonl.gz'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+  name TEXT PRIMARY KEY,
+  indexedBytes INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rejections (
+  id INTEGER PRIMARY KEY,
+  segment TEXT NOT NULL,
+  loggedAt TEXT,
+  clientId INTEGER,
+  client TEXT,
+  clientKey TEXT,
+  reason TEXT,
+  urlKey TEXT,
+  url TEXT,
+  record TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rejections_url ON rejections(urlKey);
+CREATE INDEX IF NOT EXISTS idx_rejections_client_reason ON rejections(clientKey, reason);
+CREATE INDEX IF NOT EXISTS idx_rejections_client_id ON rejections(clientId, reason);
+"""
+
+
+@dataclass
+class Rejection:
+    logged_at: str
+    client: str
+    reason: str
+    url: str
+    record: dict
+
+
+def segment_paths(directory):
+    """Segments in a log directory, oldest first"""
+    return sorted(Path(directory).glob(SEGMENT_GLOB))
+
+
+def iter_records(path, offset=0, end=None):
+    """JSON records in a segment between gzip member boundaries"""
+    with open(path, 'rb') as raw:
+        raw.seek(offset)
+        data = raw.read() if end is None else raw.read(end - offset)
+    for line in gzip.decompress(data).decode('utf-8').splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def _client_key(name):
+    return (name or '').strip().lower()
+
+
+class RejectionIndex:
+    """SQLite index over the rejection log segments"""
+
+    def __init__(self, directory=DEFAULT_LOG_DIR, index_path=None):
+        self.directory = Path(directory)
+        self.index_path = Path(index_path) if index_path else self.directory / INDEX_NAME
+        self.conn = sqlite3.connect(self.index_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self, rebuild=False):
+        """Index new segments and the tail of grown ones; returns rows added"""
+        if rebuild:
+            self.conn.execute('DELETE FROM rejections')
+            self.conn.execute('DELETE FROM segments')
+        indexed = dict(self.conn.execute('SELECT name, indexedBytes FROM segments'))
+        added = 0
+        for path in segment_paths(self.directory):
+            size = path.stat().st_size
+            offset = indexed.get(path.name, 0)
+            if size == offset:
+                continue
+            if size < offset:
+                # Truncated or replaced: index the segment again from the start
+                self.conn.execute('DELETE FROM rejections WHERE segment = ?', (path.name,))
+                offset = 0
+            try:
+                rows = [(path.name, r.get('loggedAt'), r.get('clientId'), r.get('client'),
+                         _client_key(r.get('client')), r.get('reason'), url_key(r.get('url')),
+                         r.get('url'), json.dumps(r))
+                        for r in iter_records(path, offset, size)]
+            except (EOFError, gzip.BadGzipFile):
+                # The backend is mid-append; the next refresh picks the segment up
+                continue
+            self.conn.executemany(
+                'INSERT INTO rejections (segment, loggedAt, clientId, client, clientKey, reason, '
+                'urlKey, url, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self.conn.execute('INSERT OR REPLACE INTO segments (name, indexedBytes) VALUES (?, ?)',
+                              (path.name, size))
+            added += len(rows)
+        self.conn.commit()
+        return added
+
+    def _select(self, where, params):
+        query = f'SELECT loggedAt, client, reason, url, record FROM rejections WHERE {where} ' \
+                'ORDER BY loggedAt, id'
+        return [Rejection(logged_at, client, reason, url, json.loads(record))
+                for logged_at, client, reason, url, record in self.conn.execute(query, params)]
+
+    def _client_filter(self, client):
+        """(where clause, parameter) for one client, given a name or sheet label
+
+        Records carry clients.name and the client id; a label that resolves
+        (toolkit.clients) is matched by id, anything else by name.
+        """
+        resolved = ClientResolver(self.clients()).resolve(client)
+        if resolved is not None:
+            return 'clientId = ?', resolved.id
+        return 'clientKey = ?', _client_key(client)
+
+    def lookup(self, url, client=None):
+        """Every rejection of a URL (matched by url_key), optionally for one client"""
+        key = url_key(url)
+        if key is None:
+            return []
+        if client is None:
+            return self._select('urlKey = ?', (key,))
+        where, param = self._client_filter(client)
+        return self._select(f'urlKey = ? AND {where}', (key, param))
+
+    def lookup_many(self, urls, client=None):
+        """{url_key: [Rejection, ...]} for the URLs that were ever rejected"""
+        keys = sorted({k for k in map(url_key, urls) if k is not None})
+        client_filter = self._client_filter(client) if client is not None else None
+        found = defaultdict(list)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            where = f"urlKey IN ({', '.join('?' for _ in chunk)})"
+            params = list(chunk)
+            if client_filter is not None:
+                where += f' AND {client_filter[0]}'
+                params.append(client_filter[1])
+            for rejection in self._select(where, params):
+                found[url_key(rejection.url)].append(rejection)
+        return dict(found)
+
+    def by_client(self, client, reason=None):
+        where, param = self._client_filter(client)
+        if reason is None:
+            return self._select(where, (param,))
+        return self._select(f'{where} AND reason = ?', (param, reason))
+
+    def by_reason(self, reason):
+        return self._select('reason = ?', (reason,))
+
+    def clients(self):
+        """(client id, client name) pairs seen in the log"""
+        return self.conn.execute('SELECT DISTINCT clientId, client FROM rejections '
+                                 'WHERE clientId IS NOT NULL ORDER BY clientId').fetchall()
+
+    def reason_counts(self):
+        """{(client, reason): rejections}"""
+        return {(client, reason): n for client, reason, n in self.conn.execute(
+            'SELECT client, reason, COUNT(*) FROM rejections GROUP BY clientKey, reason')}
+
+
+def print_summary(index):
+    print('=' * 80)
+    print('REJECTION LOG')
+    print('=' * 80)
+    counts = index.reason_counts()
+    if not counts:
+        print('\nNo rejections indexed.')
+        return
+    totals = Counter()
+    for (client, _), n in counts.items():
+        totals[client] += n
+    for client, total in totals.most_common():
+        print(f"\n{client} ({total} rejections)")
+        for (c, reason), n in sorted(counts.items(), key=lambda item: -item[1]):
+            if c == client:
+                print(f"  {reason:<32} {n:>8}")
+
+
+def print_rejections(label, rejections):
+    print(f"\n{label}")
+    for r in rejections:
+        detail = r.record.get('daysOld')
+        detail = f" ({detail} days old, {r.record.get('dateSource')} date)" if detail else ''
+        print(f"  {(r.logged_at or '')[:10]}  {r.client:<28} {r.reason}{detail}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dir', default=str(DEFAULT_LOG_DIR), help='Rejection log directory')
+    parser.add_argument('--index', help=f'Index file (default: DIR/{INDEX_NAME})')
+    parser.add_argument('--rebuild', action='store_true', help='Re-index every segment')
+    parser.add_argument('--url', action='append', default=[], help='URL to look up; repeatable')
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Check every link in a tracking workbook; repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Check every link in a manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports / restrict lookups to a client')
+    parser.add_argument('--reason', help='List rejections with this reason')
+    parser.add_argument('--start', type=date.fromisoformat, help='Manual window start')
+    parser.add_argument('--end', type=date.fromisoformat, help='Manual window end')
+    args = parser.parse_args(argv)
+
+    with RejectionIndex(args.dir, args.index) as index:
+        added = index.refresh(rebuild=args.rebuild)
+        print(f"Indexed {added} new rejections from {args.dir}")
+
+        for url in args.url:
+            print_rejections(url, index.lookup(url, args.client))
+        if args.reason:
+            rows = (index.by_client(args.client, args.reason) if args.client
+                    else index.by_reason(args.reason))
+            print(f"\n{len(rows)} rejections with reason {args.reason}")
+            for r in rows:
+                print(f"  {(r.logged_at or '')[:10]}  {r.client:<28} {r.url}")
+
+        if args.workbook or args.manual:
+            manual = [m for m in iter_manual_sources(args.workbook, args.manual, args.client)
+                      if m.link and (not args.start or (m.date and m.date >= args.start))
+                      and (not args.end or (m.date and m.date <= args.end))]
+            found = index.lookup_many([m.link for m in manual])
+            # Records carry clients.name; manual labels may be acronyms of it
+            resolver = ClientResolver(index.clients())
+            print('=' * 80)
+            print('MANUAL MENTIONS THAT WERE REJECTED BY SEARCH FILTERS')
+            print('=' * 80)
+            hits = [(m, [r for r in found.get(url_key(m.link), [])
+                         if resolver.key(r.client) == resolver.key(m.client)])
+                    for m in manual]
+            hits = [(m, rejections) for m, rejections in hits if rejections]
+            print(f"\n{len(hits)} of {len(manual)} manual links were rejected at least once")
+            reasons = Counter(r.reason for _, rejections in hits for r in rejections)
+            for reason, n in reasons.most_common():
+                print(f"  {reason:<32} {n:>6}")
+            for m, rejections in hits:
+                print_rejections(f"{m.client} | {m.date_str} | {m.title[:50]} | {m.link}",
+                                 rejections)
+        elif not (args.url or args.reason):
+            print_summary(index)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import gzip
+import json
+
+from .rejections import RejectionIndex, main
+
+
+def append(path, *records):
+    """Append one gzip member, as src/utils/rejectionLog.js does"""
+    lines = ''.join(json.dumps(r) + '\n' for r in records)
+    with open(path, 'ab') as f:
+        f.write(gzip.compress(lines.encode('utf-8')))
+
+
+def rejection(url, reason='name_not_in_snippet', client='EFI', day='2025-11-01', **fields):
+    return {'loggedAt': f'{day}T03:00:00.000Z', 'clientId': 1, 'client': client,
+            'provider': 'google', 'reason': reason, 'title': 'T', 'url': url, **fields}
+
+
+def test_lookups_by_url_client_and_reason(tmp_path):
+    append(tmp_path / '2025-11-01.jsonl.gz',
+           rejection('https://www.thepacker.com/story/?utm_source=x', 'article_too_old',
+                     daysOld=400, dateSource='snippet'),
+           rejection('https://a.com/1', client='Other', clientId=2))
+    append(tmp_path / '2025-11-02.jsonl.gz',
+           rejection('https://thepacker.com/story', 'own_domain', day='2025-11-02'))
+
+    with RejectionIndex(tmp_path) as index:
+        assert index.refresh() == 3
+        hits = index.lookup('https://thepacker.com/story')
+        assert [(h.reason, h.logged_at[:10]) for h in hits] == [
+            ('article_too_old', '2025-11-01'), ('own_domain', '2025-11-02')
+        ]
+        assert hits[0].record['daysOld'] == 400
+        assert index.lookup('https://thepacker.com/story', client='other') == []
+        assert [r.url for r in index.by_reason('name_not_in_snippet')] == ['https://a.com/1']
+        assert len(index.by_client('efi')) == 2
+        found = index.lookup_many(['https://a.com/1', 'https://b.com/none'])
+        assert [[r.url for r in hits] for hits in found.values()] == [['https://a.com/1']]
+
+
+def test_client_filters_resolve_sheet_labels(tmp_path):
+    append(tmp_path / '2025-11-01.jsonl.gz',
+           rejection('https://thepacker.com/story', 'own_domain',
+                     client='Equitable Food Initiative'),
+           rejection('https://thepacker.com/story', client='Other', clientId=2))
+
+    with RejectionIndex(tmp_path) as index:
+        index.refresh()
+        assert [r.client for r in index.lookup('https://thepacker.com/story', client='EFI')] == [
+            'Equitable Food Initiative']
+        assert [r.reason for r in index.by_client('EFI')] == ['own_domain']
+        assert index.by_client('EFI', 'name_not_in_snippet') == []
+        found = index.lookup_many(['https://thepacker.com/story'], client='efi')
+        assert [r.client for hits in found.values() for r in hits] == ['Equitable Food Initiative']
+        assert len(index.by_client('other')) == 1
+        # Labels that resolve to no logged client still match by name
+        assert index.by_client('Viva') == []
+
+
+def test_refresh_reads_only_appended_members(tmp_path):
+    segment = tmp_path / '2025-11-01.jsonl.gz'
+    append(segment, rejection('https://a.com/1'))
+    with RejectionIndex(tmp_path) as index:
+        assert index.refresh() == 1
+        assert index.refresh() == 0
+        append(segment, rejection('https://a.com/2'), rejection('https://a.com/3'))
+        assert index.refresh() == 2
+        assert index.refresh(rebuild=True) == 3
+        assert sum(index.reason_counts().values()) == 3
+
+
+def test_partial_member_is_left_for_the_next_refresh(tmp_path):
+    segment = tmp_path / '2025-11-01.jsonl.gz'
+    append(segment, rejection('https://a.com/1'))
+    member = gzip.compress(json.dumps(rejection('https://a.com/2')).encode() + b'\n')
+    with open(segment, 'ab') as f:
+        f.write(member[:10])
+    with RejectionIndex(tmp_path) as index:
+        assert index.refresh() == 0
+        with open(segment, 'ab') as f:
+            f.write(member[10:])
+        assert index.refresh() == 2
+
+
+def test_main_matches_manual_labels_to_logged_client_names(tmp_path, capsys):
+    append(tmp_path / '2025-11-01.jsonl.gz',
+           rejection('https://thepacker.com/story', client='Equitable Food Initiative'))
+    export = tmp_path / 'manual.csv'
+    export.write_text('EFI Media Mentions,,,,,\n'
+                      '2025-11-01,The Packer,Story,,,https://thepacker.com/story\n')
+
+    main(['--dir', str(tmp_path), '--manual', str(export)])
+
+    assert '1 of 1 manual links were rejected at least once' in capsys.readouterr().out
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Browser-free batch re-verification over cached article text
+
+Replays the decisions of verifyMention (src/scripts/verifyMentions.js) and
+verifyWithBrowser (src/services/browserService.js) against the page text the
+backend cached in data/article-cache (src/utils/articleCache.js). The rules
+are ported from checkClientNameInContent, isBlockedPage and
+isSuspiciouslyShortContent. Block indicators, name variations and the
+minimum content length are read from contentAnalysis.js and config.js, and
+--rules JSON overrides them, so a proposed rule change can be measured
+across the whole history before it is made.
+
+Mentions are scored in chunks on a process pool. Only verdicts that differ
+from mediaMentions.verified are written, and only with --apply. Some
+mentions are never changed:
+- mentions an admin rejected (archived in deletedMentions)
+- mentions with no cache entry
+- card-item listing pages, which need the browser's DOM analysis
+A verdict of "needs review" never replaces a decided value either. The
+cache can fail to confirm a page, but that does not mean the page is wrong.
+
+Rules file: JSON with any of blockIndicators (list), clientNameVariations
+(list of {"from", "to"}) and minContentLength.
+
+Usage:
+    python -m toolkit.reverify [--db PATH] [--cache DIR] [--rules rules.json] \\
+        [--client NAME] [--workers 8] [--apply] [--json changes.json]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+from .db import REPO_ROOT, connect
+
+CONTENT_ANALYSIS_JS = REPO_ROOT / 'src' / 'utils' / 'contentAnalysis.js'
+CONFIG_JS = REPO_ROOT / 'src' / 'config.js'
+DEFAULT_CACHE_DIR = REPO_ROOT / 'data' / 'article-cache'
+
+CHUNK_SIZE = 500
+
+# Mentions read for re-verification (same join as verifyAllMentions)
+MENTIONS_SQL = """
+    SELECT m.id, m.link, m.title, m.subjectMatter, m.verified, c.name AS clientName
+    FROM mediaMentions m
+    JOIN clients c ON m.clientId = c.id
+    WHERE m.link IS NOT NULL AND m.link != ''
+      AND m.id NOT IN (SELECT originalMentionId FROM deletedMentions)
+    ORDER BY m.id
+"""
+
+_JS_STRING = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_JS_INDICATORS = re.compile(r'BLOCK_PAGE_INDICATORS\s*=\s*\[(.*?)\]', re.S)
+_JS_VARIATIONS = re.compile(r'clientNameVariations:\s*\[(.*?)\n\s*\]', re.S)
+_JS_VARIATION = re.compile(r"\{\s*from:\s*'([^']*)'\s*,\s*to:\s*'([^']*)'\s*\}")
+_JS_MIN_LENGTH = re.compile(r'minContentLength:[^\n]*?\|\|\s*(\d+)')
+
+DOCUMENT_TYPES = ('application/pdf', 'application/msword', 'application/vnd.openxmlformats',
+                  'application/vnd.ms-')
+
+
+@dataclass(frozen=True)
+class VerificationRules:
+    block_indicators: tuple
+    name_variations: tuple      # ((from, to), ...)
+    min_content_length: int = 1000
+
+
+@dataclass
+class Verdict:
+    id: int
+    client: str
+    link: str
+    old: object                 # current mediaMentions.verified (1, 0 or None)
+    new: object
+    reason: str
+
+    @property
+    def changed(self):
+        # A pending verdict only means the cache cannot confirm the page
+        return self.new != self.old and (self.new is not None or self.old is None)
+
+
+def load_rules(content_analysis=CONTENT_ANALYSIS_JS, config=CONFIG_JS):
+    """Read the current rules from the backend sources"""
+    indicators = _JS_STRING.findall(
+        _JS_INDICATORS.search(Path(content_analysis).read_text(encoding='utf-8')).group(1))
+    config_text = Path(config).read_text(encoding='utf-8')
+    variations = _JS_VARIATION.findall(_JS_VARIATIONS.search(config_text).group(1))
+    min_length = int(_JS_MIN_LENGTH.search(config_text).group(1))
+    # Number(process.env.VERIFY_MIN_CONTENT_LENGTH) || 1000
+    try:
+        min_length = int(os.environ.get('VERIFY_MIN_CONTENT_LENGTH', '')) or min_length
+    except ValueError:
+        pass
+    return VerificationRules(tuple(indicators), tuple(variations), min_length)
+
+
+def override_rules(rules, path):
+    """Apply a JSON rules file on top of rules"""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    changes = {}
+    if 'blockIndicators' in data:
+        changes['block_indicators'] = tuple(data['blockIndicators'])
+    if 'clientNameVariations' in data:
+        changes['name_variations'] = tuple((v['from'], v['to'])
+                                           for v in data['clientNameVariations'])
+    if 'minContentLength' in data:
+        changes['min_content_length'] = int(data['minContentLength'])
+    return replace(rules, **changes)
+
+
+def check_client_name_in_content(text, client_name, rules):
+    """Port of checkClientNameInContent; text is already lowercase"""
+    if not client_name or not text:
+        return False
+    name = client_name.lower()
+    if name in text:
+        return True
+    for source, target in rules.name_variations:
+        # String.prototype.replace with a string pattern replaces the first match
+        if source in name and name.replace(source, target, 1) in text:
+            return True
+    return False
+
+
+def is_blocked_page(text, rules):
+    return bool(text) and any(indicator in text for indicator in rules.block_indicators)
+
+
+def is_suspiciously_short_content(text, rules):
+    return not text or len(text) < rules.min_content_length
+
+
+def decide(mention, entry, rules):
+    """(verified, reason) for a cached entry, or None when the cache cannot replay it"""
+    client = mention['clientName']
+    snippet = (mention['subjectMatter'] or '').lower()
+
+    def snippet_fallback(reason):
+        if snippet and check_client_name_in_content(snippet, client, rules):
+            return 1, 'verified_snippet'
+        return None, reason
+
+    text = entry.get('text') or ''
+    if entry.get('method') == 'browser':
+        if is_blocked_page(text, rules) or is_suspiciously_short_content(text, rules):
+            return None, 'blocked_page_detected'
+        found = check_client_name_in_content(text, client, rules)
+        if found and entry.get('cardItemSite'):
+            return None     # listing-page detection inspects the DOM
+        return (1, 'verified_browser') if found else (0, 'name_not_found')
+
+    status = entry.get('status') or 0
+    content_type = entry.get('contentType') or ''
+    if status in (401, 403, 429):
+        return snippet_fallback('blocked')
+    if 400 <= status < 500:
+        return 0, 'http_error_4xx'
+    if status >= 500:
+        return snippet_fallback('http_error_5xx')
+    if not 200 <= status < 300:
+        return 0, 'http_error'
+    if 'text/html' in content_type or 'application/xhtml+xml' in content_type:
+        found = check_client_name_in_content(text, client, rules)
+        return (1, 'verified') if found else (0, 'name_not_found')
+    if any(t in content_type for t in DOCUMENT_TYPES):
+        combined = f"{(mention['title'] or '').lower()} {snippet}"
+        if check_client_name_in_content(combined, client, rules):
+            return 1, 'verified_document_title'
+        return None, 'document_type'
+    return 0, 'not_html'
+
+
+def cache_path(cache_dir, link):
+    """Mirror of articleCachePath in src/utils/articleCache.js"""
+    key = hashlib.sha1(link.encode('utf-8')).hexdigest()
+    return Path(cache_dir) / key[:2] / f'{key}.json.gz'
+
+
+def read_cache_entry(cache_dir, link):
+    try:
+        with gzip.open(cache_path(cache_dir, link), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, OSError, json.JSONDecodeError):
+        return None
+
+
+def reverify_chunk(cache_dir, rules, mentions):
+    """Worker: ([Verdict], uncached count, undecidable count) for a chunk of mention dicts"""
+    verdicts, uncached, undecidable = [], 0, 0
+    for mention in mentions:
+        entry = read_cache_entry(cache_dir, mention['link'])
+        if entry is None:
+            uncached += 1
+            continue
+        decision = decide(mention, entry, rules)
+        if decision is None:
+            undecidable += 1
+            continue
+        verdicts.append(Verdict(mention['id'], mention['clientName'], mention['link'],
+                                mention['verified'], *decision))
+    return verdicts, uncached, undecidable
+
+
+@dataclass
+class ReverifyResult:
+    verdicts: list
+    mentions: int = 0
+    uncached: int = 0
+    undecidable: int = 0
+
+    @property
+    def changes(self):
+        return [v for v in self.verdicts if v.changed]
+
+
+def load_candidates(conn, client=None):
+    mentions = [dict(row) for row in conn.execute(MENTIONS_SQL)]
+    if client:
+        mentions = [m for m in mentions if m['clientName'].lower() == client.lower()]
+    return mentions
+
+
+def reverify(mentions, rules, cache_dir=DEFAULT_CACHE_DIR, workers=None, chunk_size=CHUNK_SIZE):
+    """Re-verify mentions from the cache; workers=1 runs in this process"""
+    chunks = [mentions[i:i + chunk_size] for i in range(0, len(mentions), chunk_size)]
+    work = partial(reverify_chunk, str(cache_dir), rules)
+    if workers == 1 or len(chunks) <= 1:
+        outputs = list(map(work, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(work, chunks))
+    result = ReverifyResult([], len(mentions))
+    for verdicts, uncached, undecidable in outputs:
+        result.verdicts.extend(verdicts)
+        result.uncached += uncached
+        result.undecidable += undecidable
+    return result
+
+
+def apply_changes(conn, changes):
+    """Write changed verdicts; rows updated since they were read are left alone"""
+    now = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+    with conn:
+        cursor = conn.executemany(
+            'UPDATE mediaMentions SET verified = ?, updatedAt = ? WHERE id = ? AND verified IS ?',
+            [(v.new, now, v.id, v.old) for v in changes]
+        )
+    return cursor.rowcount
+
+
+def _state(value):
+    return {1: 'verified', 0: 'rejected', None: 'pending'}[value]
+
+
+def print_report(result, applied=None):
+    changes = result.changes
+    print('=' * 80)
+    print('RE-VERIFICATION FROM CACHED ARTICLE TEXT')
+    print('=' * 80)
+    cached = result.mentions - result.uncached
+    print(f"\nMentions with links:  {result.mentions}")
+    print(f"Cached:               {cached}")
+    print(f"Not replayable:       {result.undecidable} (card-item listing sites)")
+    print(f"Verdicts that differ: {len(changes)}")
+
+    if changes:
+        print('\nTransitions:')
+        transitions = Counter((_state(v.old), _state(v.new), v.reason) for v in changes)
+        for (old, new, reason), n in transitions.most_common():
+            print(f"  {old:>8} -> {new:<8} {reason:<24} {n:>6}")
+
+        print('\nBy client:')
+        by_client = {}
+        for v in changes:
+            by_client.setdefault(v.client, Counter())[_state(v.new)] += 1
+        for client, counts in sorted(by_client.items(), key=lambda item: -sum(item[1].values())):
+            breakdown = ', '.join(f"{state} {n}" for state, n in counts.most_common())
+            print(f"  {client}: {sum(counts.values())} changed (now {breakdown})")
+
+    if applied is None:
+        print('\nDry run: pass --apply to write these verdicts')
+    else:
+        print(f"\nUpdated {applied} mentions")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--cache', default=os.environ.get('ARTICLE_CACHE_DIR') or
+                        str(DEFAULT_CACHE_DIR), help='Article text cache directory')
+    parser.add_argument('--rules', help='JSON file overriding the current rules')
+    parser.add_argument('--client', help='Only re-verify one client')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--apply', action='store_true', help='Write changed verdicts')
+    parser.add_argument('--json', help='Write the changed verdicts to this JSON file')
+    args = parser.parse_args(argv)
+
+    rules = load_rules()
+    if args.rules:
+        rules = override_rules(rules, args.rules)
+
+    with closing(connect(args.db, readonly=not args.apply)) as conn:
+        mentions = load_candidates(conn, args.client)
+        result = reverify(mentions, rules, args.cache, args.workers)
+        applied = apply_changes(conn, result.changes) if args.apply else None
+
+    print_report(result, applied)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([{'id': v.id, 'client': v.client, 'link': v.link, 'old': v.old,
+                        'new': v.new, 'reason': v.reason} for v in result.changes], f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
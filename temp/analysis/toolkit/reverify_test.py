@@ -0,0 +1,86 @@
+import gzip
+import json
+from contextlib import closing
+
+from .conftest import insert_mention
+from .db import connect
+from .reverify import (VerificationRules, apply_changes, cache_path, check_client_name_in_content,
+                       decide, load_candidates, load_rules, reverify)
+
+RULES = VerificationRules(('access denied', 'just a moment'), (('sweetpotato', 'sweet potato'),),
+                          min_content_length=40)
+
+
+def write_entry(cache_dir, link, **entry):
+    path = cache_path(cache_dir, link)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump({'url': link, 'method': 'fetch', **entry}, f)
+
+
+def test_load_rules_reads_backend_sources():
+    rules = load_rules()
+    assert 'access denied' in rules.block_indicators
+    assert ('colombia', 'colombian') in rules.name_variations
+    assert rules.min_content_length == 1000
+
+
+def test_name_variations_replace_first_occurrence():
+    name = 'North Carolina SweetPotato Commission'
+    assert check_client_name_in_content('the north carolina sweet potato commission said',
+                                        name, RULES)
+    assert not check_client_name_in_content('sweet potatoes are in season', name, RULES)
+
+
+def test_decide_mirrors_fetch_and_browser_paths():
+    mention = {'clientName': 'Florida Tomato Committee', 'title': 'Report',
+               'subjectMatter': 'Florida Tomato Committee update'}
+    html = {'status': 200, 'contentType': 'text/html'}
+    assert decide(mention, {**html, 'text': 'the florida tomato committee'}, RULES) == \
+        (1, 'verified')
+    assert decide(mention, {**html, 'text': 'nothing here'}, RULES) == (0, 'name_not_found')
+    assert decide(mention, {'status': 404}, RULES) == (0, 'http_error_4xx')
+    assert decide(mention, {'status': 403}, RULES) == (1, 'verified_snippet')
+    assert decide({**mention, 'subjectMatter': ''}, {'status': 503}, RULES) == \
+        (None, 'http_error_5xx')
+
+    page = 'florida tomato committee ' * 3
+    assert decide(mention, {'method': 'browser', 'text': page}, RULES) == (1, 'verified_browser')
+    assert decide(mention, {'method': 'browser', 'text': 'just a moment ' + page}, RULES) == \
+        (None, 'blocked_page_detected')
+    assert decide(mention, {'method': 'browser', 'text': page, 'cardItemSite': True},
+                  RULES) is None
+
+
+def test_reverify_writes_only_changed_verdicts(tmp_path, db_path, db):
+    db.execute("INSERT INTO clients (id, name, contactEmail) "
+               "VALUES (1, 'Florida Tomato Committee', 'x')")
+    db.commit()
+    cache_dir = tmp_path / 'cache'
+    page = {'status': 200, 'contentType': 'text/html'}
+
+    flipped = insert_mention(db, link='https://a.com/1', verified=0)
+    write_entry(cache_dir, 'https://a.com/1', **page, text='florida tomato committee news')
+    unchanged = insert_mention(db, link='https://a.com/2', verified=1)
+    write_entry(cache_dir, 'https://a.com/2', **page, text='florida tomato committee')
+    kept = insert_mention(db, link='https://a.com/3', verified=1)
+    write_entry(cache_dir, 'https://a.com/3', status=503)
+    insert_mention(db, link='https://a.com/uncached', verified=0)
+    rejected = insert_mention(db, link='https://a.com/4', verified=0)
+    write_entry(cache_dir, 'https://a.com/4', **page, text='florida tomato committee')
+    db.execute("INSERT INTO deletedMentions (originalMentionId, title, mentionDate, clientId, "
+               "clientName, publicationId, publicationName) VALUES (?, 't', 'd', 1, 'c', 1, 'p')",
+               (rejected,))
+    db.commit()
+
+    with closing(connect(db_path)) as conn:
+        mentions = load_candidates(conn)
+    result = reverify(mentions, RULES, cache_dir, workers=2, chunk_size=1)
+    assert (result.mentions, result.uncached) == (4, 1)
+    assert [(v.id, v.old, v.new) for v in result.changes] == [(flipped, 0, 1)]
+
+    with closing(connect(db_path, readonly=False)) as conn:
+        assert apply_changes(conn, result.changes) == 1
+    rows = {row['id']: row['verified']
+            for row in db.execute('SELECT id, verified FROM mediaMentions')}
+    assert (rows[flipped], rows[unchanged], rows[kept], rows[rejected]) == (1, 1, 1, 0)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Incrementally maintained coverage rollups
+
+Keeps mention counts per client, publication day, publication and
+verification state in a separate SQLite file next to mediamentions.db, so
+reports over years of data read a few thousand pre-aggregated rows instead
+of scanning mediaMentions. Each refresh only reads mentions whose updatedAt
+is at or after the stored watermark (or whose id is new) and archived
+deletions recorded in deletedMentions since the last run.
+
+A per-mention ledger (rollupMentions) remembers which bucket each mention was
+counted in, so a changed mention moves from its old bucket to its new one,
+and a refresh that sees the same rows twice changes nothing. The watermark
+is compared by day, which covers both timestamp formats the backend writes
+("2025-11-10T00:00:00.000Z" and datetime('now')). Rows removed without an
+archive entry (duplicate cleanup) are only found by --reconcile, which
+anti-joins the whole ledger against mediaMentions.
+
+Usage:
+    python -m toolkit.rollup [--db PATH] [--rollup PATH] [--reconcile] \\
+        [--start 2025-06-07] [--end 2025-12-04] [--by client|month|day|publication]
+"""
+
+import argparse
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from .db import database_path
+
+# verifiedState values (mediaMentions.verified, with NULL stored as PENDING)
+VERIFIED, REJECTED, PENDING = 1, 0, -1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollupState (
+  key TEXT PRIMARY KEY,
+  value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS rollupMentions (
+  id INTEGER PRIMARY KEY,
+  clientId INTEGER NOT NULL,
+  day TEXT NOT NULL,
+  publicationId INTEGER NOT NULL,
+  verifiedState INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS dailyCounts (
+  clientId INTEGER NOT NULL,
+  day TEXT NOT NULL,
+  publicationId INTEGER NOT NULL,
+  verifiedState INTEGER NOT NULL,
+  mentions INTEGER NOT NULL,
+  PRIMARY KEY (clientId, day, publicationId, verifiedState)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_daily_counts_day ON dailyCounts(day);
+"""
+
+# Mentions touched since the watermark whose bucket differs from the ledger
+CHANGED_SQL = """
+    SELECT m.id, m.clientId, COALESCE(substr(m.mentionDate, 1, 10), ''), m.publicationId,
+           COALESCE(m.verified, -1), m.updatedAt,
+           l.clientId, l.day, l.publicationId, l.verifiedState
+    FROM src.mediaMentions m
+    LEFT JOIN rollupMentions l ON l.id = m.id
+    WHERE (m.updatedAt >= :since OR m.id > :max_id)
+      AND (l.id IS NULL OR l.clientId IS NOT m.clientId
+           OR l.day IS NOT COALESCE(substr(m.mentionDate, 1, 10), '')
+           OR l.publicationId IS NOT m.publicationId
+           OR l.verifiedState IS NOT COALESCE(m.verified, -1))
+"""
+
+# Counted mentions that are archived as deleted and no longer exist. Rejected
+# pending-review mentions are archived too but stay in mediaMentions.
+DELETED_SQL = """
+    SELECT l.id, l.clientId, l.day, l.publicationId, l.verifiedState
+    FROM rollupMentions l
+    WHERE l.id IN (SELECT originalMentionId FROM src.deletedMentions WHERE deletedAt >= :since)
+      AND NOT EXISTS (SELECT 1 FROM src.mediaMentions m WHERE m.id = l.id)
+"""
+
+RECONCILE_SQL = """
+    SELECT l.id, l.clientId, l.day, l.publicationId, l.verifiedState
+    FROM rollupMentions l
+    WHERE NOT EXISTS (SELECT 1 FROM src.mediaMentions m WHERE m.id = l.id)
+"""
+
+GROUPINGS = {
+    'client': ('clientId',),
+    'month': ('clientId', 'substr(day, 1, 7) AS month'),
+    'day': ('clientId', 'day'),
+    'publication': ('clientId', 'publicationId')
+}
+
+
+@dataclass
+class RefreshStats:
+    changed: int = 0       # mentions added or moved between buckets
+    deleted: int = 0       # mentions removed from the rollup
+    buckets: int = 0       # dailyCounts rows touched
+
+
+def default_rollup_path(db_path=None):
+    path = Path(db_path or database_path())
+    return path.with_name(f'{path.stem}-rollup.db')
+
+
+class Rollup:
+    """Rollup tables for one mentions database"""
+
+    def __init__(self, path=None, source_path=None):
+        self.source_path = str(source_path or database_path())
+        self.path = str(path or default_rollup_path(self.source_path))
+        self.conn = sqlite3.connect(self.path, uri=True)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        # The source is attached read-only, like every other toolkit analysis
+        self.conn.execute('ATTACH DATABASE ? AS src', (f'file:{self.source_path}?mode=ro',))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _state(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM rollupState WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_state(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO rollupState (key, value) VALUES (?, ?)',
+                          (key, value))
+
+    def refresh(self, reconcile=False):
+        """Bring the rollup up to date with the source database"""
+        stats = RefreshStats()
+        deltas = Counter()
+        updated_watermark = self._state('updatedWatermark', '')
+        deleted_watermark = self._state('deletedWatermark', '')
+        max_id = int(self._state('maxId', 0))
+
+        with self.conn:
+            changed = self.conn.execute(
+                CHANGED_SQL, {'since': updated_watermark[:10], 'max_id': max_id}).fetchall()
+            ledger = []
+            for row in changed:
+                mention_id, bucket, updated_at, old = row[0], tuple(row[1:5]), row[5], row[6:10]
+                if old[0] is not None:
+                    deltas[tuple(old)] -= 1
+                deltas[bucket] += 1
+                ledger.append((mention_id, *bucket))
+                max_id = max(max_id, mention_id)
+                updated_watermark = max(updated_watermark, updated_at or '')
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO rollupMentions '
+                '(id, clientId, day, publicationId, verifiedState) VALUES (?, ?, ?, ?, ?)', ledger)
+            stats.changed = len(ledger)
+
+            if reconcile:
+                deleted = self.conn.execute(RECONCILE_SQL).fetchall()
+            else:
+                deleted = self.conn.execute(DELETED_SQL, {'since': deleted_watermark[:10]}).fetchall()
+            for row in deleted:
+                deltas[tuple(row[1:5])] -= 1
+            self.conn.executemany('DELETE FROM rollupMentions WHERE id = ?',
+                                  [(row[0],) for row in deleted])
+            stats.deleted = len(deleted)
+
+            deltas = [(*bucket, n) for bucket, n in deltas.items() if n]
+            self.conn.executemany("""
+                INSERT INTO dailyCounts (clientId, day, publicationId, verifiedState, mentions)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (clientId, day, publicationId, verifiedState)
+                DO UPDATE SET mentions = mentions + excluded.mentions
+            """, deltas)
+            self.conn.executemany("""
+                DELETE FROM dailyCounts
+                WHERE clientId = ? AND day = ? AND publicationId = ? AND verifiedState = ?
+                  AND mentions <= 0
+            """, [d[:4] for d in deltas])
+            stats.buckets = len(deltas)
+
+            latest_deletion = self.conn.execute(
+                'SELECT MAX(deletedAt) FROM src.deletedMentions').fetchone()[0]
+            self._set_state('updatedWatermark', updated_watermark)
+            self._set_state('deletedWatermark', max(deleted_watermark, latest_deletion or ''))
+            self._set_state('maxId', str(max_id))
+        return stats
+
+    def counts(self, by='client', client_id=None, start=None, end=None):
+        """Mention counts per verification state, grouped by client, month, day or publication
+
+        Returns dicts with the grouping columns plus total, verified,
+        rejected and pending. start/end filter on the publication day.
+        """
+        keys = GROUPINGS[by]
+        where, params = [], []
+        if client_id is not None:
+            where.append('clientId = ?')
+            params.append(client_id)
+        if start is not None:
+            where.append('day >= ?')
+            params.append(str(start))
+        if end is not None:
+            where.append('day <= ?')
+            params.append(str(end))
+        group = ', '.join(k.split(' AS ')[-1] for k in keys)
+        sql = f"""
+            SELECT {', '.join(keys)},
+                   SUM(mentions) AS total,
+                   SUM(CASE WHEN verifiedState = {VERIFIED} THEN mentions ELSE 0 END) AS verified,
+                   SUM(CASE WHEN verifiedState = {REJECTED} THEN mentions ELSE 0 END) AS rejected,
+                   SUM(CASE WHEN verifiedState = {PENDING} THEN mentions ELSE 0 END) AS pending
+            FROM dailyCounts
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            GROUP BY {group}
+            ORDER BY {group}
+        """
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def client_names(self):
+        return {row[0]: row[1] for row in self.conn.execute('SELECT id, name FROM src.clients')}
+
+
+def print_report(rows, names, by):
+    print('=' * 80)
+    print(f"COVERAGE ROLLUP by {by}")
+    print('=' * 80)
+    key = {'client': None, 'month': 'month', 'day': 'day', 'publication': 'publicationId'}[by]
+    print(f"\n{'Client':<36} {key or '':<12} {'Total':>8} {'Verified':>9} "
+          f"{'Rejected':>9} {'Pending':>8}")
+    for row in rows:
+        client = names.get(row['clientId'], f"#{row['clientId']}")
+        label = str(row[key]) if key else ''
+        print(f"{client[:36]:<36} {label:<12} {row['total']:>8} {row['verified']:>9} "
+              f"{row['rejected']:>9} {row['pending']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--rollup', help='Rollup database (default: <db>-rollup.db)')
+    parser.add_argument('--reconcile', action='store_true',
+                        help='Also drop mentions deleted without an archive entry')
+    parser.add_argument('--start', type=date.fromisoformat, help='First publication day')
+    parser.add_argument('--end', type=date.fromisoformat, help='Last publication day')
+    parser.add_argument('--by', choices=sorted(GROUPINGS), default='client')
+    parser.add_argument('--client-id', type=int, help='Only report one client')
+    args = parser.parse_args(argv)
+
+    with Rollup(args.rollup, args.db) as rollup:
+        stats = rollup.refresh(reconcile=args.reconcile)
+        print(f"Refreshed {rollup.path}: {stats.changed} changed, {stats.deleted} deleted, "
+              f"{stats.buckets} buckets updated\n")
+        rows = rollup.counts(args.by, args.client_id, args.start, args.end)
+        print_report(rows, rollup.client_names(), args.by)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+from .conftest import insert_mention
+from .rollup import Rollup
+
+
+def totals(rollup, **kwargs):
+    return {row['clientId']: (row['total'], row['verified'], row['rejected'], row['pending'])
+            for row in rollup.counts(**kwargs)}
+
+
+def test_refresh_is_incremental(tmp_path, db_path, db):
+    first = insert_mention(db, 1, verified=1, mentionDate='2025-06-10T00:00:00.000Z')
+    second = insert_mention(db, 1, mentionDate='2025-07-02T00:00:00.000Z')
+    insert_mention(db, 2, verified=0, mentionDate='2025-07-03T00:00:00.000Z')
+
+    with Rollup(tmp_path / 'rollup.db', db_path) as rollup:
+        assert rollup.refresh().changed == 3
+        assert totals(rollup) == {1: (2, 1, 0, 1), 2: (1, 0, 1, 0)}
+        assert rollup.refresh().changed == 0
+
+        # Verification bumps updatedAt; the mention moves from pending to verified
+        db.execute("UPDATE mediaMentions SET verified = 1, updatedAt = '2025-11-02T08:00:00.000Z' "
+                   "WHERE id = ?", (second,))
+        insert_mention(db, 1, verified=1, mentionDate='2025-07-20T00:00:00.000Z',
+                       createdAt='2025-11-02T09:00:00.000Z')
+        db.commit()
+        stats = rollup.refresh()
+        assert (stats.changed, stats.deleted) == (2, 0)
+        assert totals(rollup) == {1: (3, 3, 0, 0), 2: (1, 0, 1, 0)}
+
+        # An archived deletion is subtracted; an archived rejection that still exists is not
+        db.execute("INSERT INTO deletedMentions (originalMentionId, title, mentionDate, clientId, "
+                   "clientName, publicationId, publicationName) VALUES (?, 't', 'd', 1, 'c', 1, 'p'), "
+                   "(?, 't', 'd', 1, 'c', 1, 'p')", (first, second))
+        db.execute('DELETE FROM mediaMentions WHERE id = ?', (first,))
+        db.commit()
+        assert rollup.refresh().deleted == 1
+        assert totals(rollup) == {1: (2, 2, 0, 0), 2: (1, 0, 1, 0)}
+
+        months = rollup.counts('month', client_id=1)
+        assert [(row['month'], row['total']) for row in months] == [('2025-07', 2)]
+        assert totals(rollup, start='2025-07-03', end='2025-07-31') == {
+            1: (1, 1, 0, 0), 2: (1, 0, 1, 0)}
+
+
+def test_reconcile_finds_unarchived_deletions(tmp_path, db_path, db):
+    mention = insert_mention(db, 1)
+    with Rollup(tmp_path / 'rollup.db', db_path) as rollup:
+        rollup.refresh()
+        db.execute('DELETE FROM mediaMentions WHERE id = ?', (mention,))
+        db.commit()
+
+        assert rollup.refresh().deleted == 0
+        assert rollup.refresh(reconcile=True).deleted == 1
+        assert rollup.counts() == []
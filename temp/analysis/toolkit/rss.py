@@ -0,0 +1,140 @@
+"""
+RSS/Atom parsing ported from src/services/rssService.js
+
+Uses the same regex rules as parseRssXml, cleanGoogleAlertUrl and
+rssItemToResult so offline replays see exactly what live polling sees.
+"""
+
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qs, urlsplit
+
+PROVIDER = 'google-alerts-rss'
+
+_ENTRY = re.compile(r'<entry>([\s\S]*?)</entry>')
+_ITEM = re.compile(r'<item>([\s\S]*?)</item>')
+_LINK_HREF = re.compile(r'<link[^>]*href=["\']([^"\']+)["\'][^>]*>', re.I)
+_HTML_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+_TAG_CACHE = {}
+
+_XML_ENTITIES = (
+    ('&amp;', '&'), ('&lt;', '<'), ('&gt;', '>'),
+    ('&quot;', '"'), ('&#39;', "'"), ('&apos;', "'")
+)
+
+
+def _tag_patterns(tag_name):
+    patterns = _TAG_CACHE.get(tag_name)
+    if patterns is None:
+        patterns = (
+            re.compile(rf'<{tag_name}[^>]*><!\[CDATA\[([\s\S]*?)\]\]></{tag_name}>', re.I),
+            re.compile(rf'<{tag_name}[^>]*>([\s\S]*?)</{tag_name}>', re.I)
+        )
+        _TAG_CACHE[tag_name] = patterns
+    return patterns
+
+
+def extract_tag(xml, tag_name):
+    cdata, plain = _tag_patterns(tag_name)
+    match = cdata.search(xml) or plain.search(xml)
+    return match.group(1).strip() if match else None
+
+
+def extract_link_href(xml):
+    match = _LINK_HREF.search(xml)
+    return match.group(1) if match else None
+
+
+def decode_xml_entities(text):
+    if not text:
+        return text
+    for entity, char in _XML_ENTITIES:
+        text = text.replace(entity, char)
+    return text
+
+
+def decode_html_entities(text):
+    if not text:
+        return text
+    text = decode_xml_entities(text)
+    text = _HTML_TAG.sub(' ', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def clean_google_alert_url(url):
+    """Unwrap https://www.google.com/url?...&url=<target> redirect links"""
+    try:
+        parts = urlsplit(url)
+        target = parse_qs(parts.query).get('url')
+        if parts.hostname and 'google.com' in parts.hostname and target:
+            return target[0]
+    except ValueError:
+        pass
+    return url
+
+
+def _item(title, raw_link, pub_date, description):
+    return {
+        'title': decode_html_entities(title or 'Untitled'),
+        'link': clean_google_alert_url(decode_xml_entities(raw_link)),
+        'pubDate': pub_date,
+        'description': decode_html_entities(description or '')
+    }
+
+
+def parse_rss_xml(xml):
+    """Parse Atom entries, falling back to RSS items when there are none"""
+    items = []
+    for match in _ENTRY.finditer(xml):
+        entry = match.group(1)
+        raw_link = extract_link_href(entry) or extract_tag(entry, 'link')
+        if raw_link:
+            items.append(_item(
+                extract_tag(entry, 'title'),
+                raw_link,
+                extract_tag(entry, 'published') or extract_tag(entry, 'updated'),
+                extract_tag(entry, 'content') or extract_tag(entry, 'summary')
+            ))
+
+    if not items:
+        for match in _ITEM.finditer(xml):
+            item = match.group(1)
+            raw_link = extract_tag(item, 'link')
+            if raw_link:
+                items.append(_item(
+                    extract_tag(item, 'title'),
+                    raw_link,
+                    extract_tag(item, 'pubDate'),
+                    extract_tag(item, 'description')
+                ))
+
+    return items
+
+
+def parse_pub_date(value):
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom) dates to an ISO string, or None"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def rss_item_to_result(item):
+    """Convert a parsed item to the search-result shape used by recordMentions"""
+    return {
+        'title': item['title'],
+        'url': item['link'],
+        'snippet': item['description'],
+        'publishedAt': parse_pub_date(item['pubDate']),
+        'provider': PROVIDER
+    }
@@ -0,0 +1,49 @@
+import gzip
+
+from .manual import read_manual_csv
+from .records import AutoMention
+from .rss_replay import find_feed_files, replay_feeds, replay_report
+
+FEED = """<feed><entry><title>{title}</title><link href="{link}"/>
+<published>2025-11-10T08:00:00Z</published></entry></feed>"""
+
+MANUAL_CSV = """EFI Media Mentions,,,,,
+Date,Publication,Title,Topic,Extra,Link
+example,,,,,
+,,,,,
+2025-11-10,The Packer,EFI story,,,https://www.thepacker.com/news/efi/
+2025-11-11,Produce News,Other story,,,https://producenews.com/other?utm_source=x
+JULY,,,,,
+2025-11-12,Fresh Plaza,Not in feeds,,,https://freshplaza.com/x
+"""
+
+
+def test_replay_reports_extra_coverage_per_feed(tmp_path):
+    feeds_dir = tmp_path / 'feeds'
+    feeds_dir.mkdir()
+    (feeds_dir / 'efi.2025-11-10.xml').write_text(
+        FEED.format(title='EFI story', link='https://thepacker.com/news/efi'))
+    with gzip.open(feeds_dir / 'efi.2025-11-11.xml.gz', 'wt') as f:
+        f.write(FEED.format(title='Other', link='http://producenews.com/other'))
+    (feeds_dir / 'packer.xml').write_text(
+        FEED.format(title='EFI story', link='https://m.thepacker.com/news/efi'))
+    manual_path = tmp_path / 'manual.csv'
+    manual_path.write_text(MANUAL_CSV)
+
+    feeds = replay_feeds(find_feed_files(feeds_dir), workers=2)
+    assert sorted(feeds) == ['efi', 'packer']
+    assert len(feeds['efi']) == 2
+
+    stored = [AutoMention(1, 1, 'EFI', 'EFI story', 'https://thepacker.com/news/efi',
+                          'thepacker.com', None, None, 1)]
+    report = replay_report(feeds, read_manual_csv(manual_path), stored)
+
+    assert report['manualMentions'] == 3
+    assert report['alreadyFound'] == 1
+    assert report['matched'] == 2
+    assert report['extraCoverage'] == 1
+    by_feed = {r['feed']: r for r in report['feeds']}
+    assert by_feed['efi']['manualMatched'] == 2
+    assert by_feed['efi']['extraCoverage'] == 1
+    assert by_feed['efi']['extraMentions'][0].title == 'Other story'
+    assert by_feed['packer']['extraCoverage'] == 0
@@ -0,0 +1,50 @@
+from .rss import parse_pub_date, parse_rss_xml, rss_item_to_result
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+  <item>
+    <title><![CDATA[Article with special characters & entities]]></title>
+    <link>https://www.google.com/url?rct=j&amp;sa=t&amp;url=https%3A%2F%2Factual-site.com%2Farticle%3Fid%3D123&amp;ct=ga</link>
+    <pubDate>Sat, 14 Dec 2024 10:00:00 GMT</pubDate>
+    <description><![CDATA[<b>Bold</b> text with &amp; and <a href="#">links</a>]]></description>
+  </item>
+  <item><title>No Link Article</title></item>
+  <item><link>https://example.com</link></item>
+</channel></rss>"""
+
+ATOM = """<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title type="html">EFI &amp; growers</title>
+    <link href="https://www.google.com/url?rct=j&amp;sa=t&amp;url=https://thepacker.com/news/efi&amp;ct=ga"/>
+    <published>2025-11-10T08:00:00Z</published>
+    <content type="html">Equitable Food Initiative &lt;b&gt;certifies&lt;/b&gt; farm</content>
+  </entry>
+</feed>"""
+
+
+def test_parses_rss_like_rss_service():
+    items = parse_rss_xml(RSS)
+
+    assert len(items) == 2
+    assert items[0]['title'] == 'Article with special characters & entities'
+    assert items[0]['link'] == 'https://actual-site.com/article?id=123'
+    assert items[0]['description'] == 'Bold text with & and links'
+    assert items[1]['title'] == 'Untitled'
+
+
+def test_parses_atom_entries():
+    [item] = parse_rss_xml(ATOM)
+
+    assert item['title'] == 'EFI & growers'
+    assert item['link'] == 'https://thepacker.com/news/efi'
+    assert item['description'] == 'Equitable Food Initiative certifies farm'
+
+    result = rss_item_to_result(item)
+    assert result['provider'] == 'google-alerts-rss'
+    assert result['publishedAt'] == '2025-11-10T08:00:00Z'
+
+
+def test_parse_pub_date():
+    assert parse_pub_date('Sat, 14 Dec 2024 10:00:00 GMT') == '2024-12-14T10:00:00Z'
+    assert parse_pub_date('not a date') is None
+    assert parse_pub_date(None) is None
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Batch sentiment re-scoring of stored mentions
+
+analyzeSentiment (src/utils/mentions.js) labels a mention when it is
+inserted, so a lexicon change leaves every older row with a stale label.
+This module re-scores all stored mentions with the current lexicons. The
+positive and negative lists are read from mentions.js, and --lexicon JSON
+({"positives": [...], "negatives": [...]}) replaces either list, so a
+proposed change can be measured before it is made.
+
+The port keeps the backend's rules. The text is the lowercased
+"title snippet", and a term matches anywhere in it, as a substring
+('win' also matches 'window'). A mention is positive when it has positive
+hits and no negative ones, negative in the opposite case, and neutral
+otherwise. The stored snippet is subjectMatter, which is the cleaned
+snippet (publication dates stripped).
+
+All terms are compiled into one pattern. A lookahead alternation finds the
+longest term starting at each position, and the lexicon terms that are
+prefixes of that term are added to it, so every occurrence is found,
+overlapping ones included. The occurrences form a sparse mention x term
+count matrix. Labels come from two sparse matrix-vector products (positive
+and negative hit counts) for every mention at once.
+
+Only labels that differ from mediaMentions.sentiment are written, and only
+with --apply. Rows changed since they were read are left alone.
+
+Usage:
+    python -m toolkit.sentiment [--db PATH] [--lexicon lexicon.json] [--client NAME] \\
+        [--apply] [--json changes.json]
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .db import REPO_ROOT, connect
+
+MENTIONS_JS = REPO_ROOT / 'src' / 'utils' / 'mentions.js'
+
+LABELS = ('positive', 'neutral', 'negative')
+
+MENTIONS_SQL = """
+    SELECT m.id, c.name AS clientName, m.title, m.subjectMatter, m.sentiment
+    FROM mediaMentions m
+    JOIN clients c ON m.clientId = c.id
+    ORDER BY m.id
+"""
+
+_JS_STRING = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_JS_LIST = r'const {}\s*=\s*\[(.*?)\];'
+
+
+@dataclass(frozen=True)
+class Lexicon:
+    positives: tuple
+    negatives: tuple
+
+
+@dataclass
+class TermMatrix:
+    """Sparse mention x term counts in coordinate form"""
+    rows: np.ndarray
+    cols: np.ndarray
+    counts: np.ndarray
+    shape: tuple
+
+    def dot(self, vector):
+        """Matrix-vector product, one value per mention"""
+        return np.bincount(self.rows, weights=self.counts * vector[self.cols],
+                           minlength=self.shape[0])
+
+
+@dataclass
+class Rescore:
+    id: int
+    client: str
+    old: str                    # stored sentiment (None for rows that never had one)
+    new: str
+
+
+def load_lexicon(path=MENTIONS_JS):
+    """Positive and negative term lists of analyzeSentiment"""
+    text = Path(path).read_text(encoding='utf-8')
+    lists = []
+    for name in ('positives', 'negatives'):
+        body = re.search(_JS_LIST.format(name), text, re.S).group(1)
+        lists.append(tuple(_JS_STRING.findall(body)))
+    return Lexicon(*lists)
+
+
+def override_lexicon(lexicon, path):
+    """Apply a JSON lexicon file on top of lexicon"""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return replace(lexicon, **{key: tuple(data[key]) for key in ('positives', 'negatives')
+                               if key in data})
+
+
+class TermMatcher:
+    """Every lexicon term in one compiled pattern"""
+
+    def __init__(self, lexicon):
+        self.terms = sorted(set(lexicon.positives) | set(lexicon.negatives))
+        index = {term: i for i, term in enumerate(self.terms)}
+        self.positive = np.zeros(len(self.terms))
+        self.positive[[index[t] for t in set(lexicon.positives)]] = 1
+        self.negative = np.zeros(len(self.terms))
+        self.negative[[index[t] for t in set(lexicon.negatives)]] = 1
+        # Terms that also match wherever a longer term does
+        self._matched = {term: [index[p] for p in self.terms if term.startswith(p)]
+                         for term in self.terms}
+        longest_first = sorted(self.terms, key=len, reverse=True)
+        self.pattern = re.compile('(?=({}))'.format('|'.join(map(re.escape, longest_first))))
+
+    def term_matrix(self, texts):
+        """TermMatrix of term occurrences in each (lowercase) text"""
+        rows, cols = [], []
+        for row, text in enumerate(texts if self.terms else ()):
+            for match in self.pattern.finditer(text):
+                ids = self._matched[match.group(1)]
+                cols.extend(ids)
+                rows.extend([row] * len(ids))
+        size = len(self.terms)
+        cells, counts = np.unique(np.asarray(rows, dtype=np.int64) * size +
+                                  np.asarray(cols, dtype=np.int64), return_counts=True)
+        return TermMatrix(cells // size, cells % size, counts.astype(np.float64),
+                          (len(texts), size))
+
+    def score(self, matrix):
+        """Label index into LABELS for every row of a TermMatrix"""
+        positive = matrix.dot(self.positive) > 0
+        negative = matrix.dot(self.negative) > 0
+        return np.select([positive & ~negative, negative & ~positive], [0, 2], default=1)
+
+
+def sentiment_text(title, snippet):
+    """The text analyzeSentiment scores"""
+    return f"{title or ''} {snippet or ''}".lower()
+
+
+def rescore(mentions, lexicon):
+    """(labels, TermMatrix, TermMatcher) for mention rows with title and subjectMatter"""
+    matcher = TermMatcher(lexicon)
+    matrix = matcher.term_matrix([sentiment_text(m['title'], m['subjectMatter'])
+                                  for m in mentions])
+    labels = matcher.score(matrix)
+    return [LABELS[i] for i in labels.tolist()], matrix, matcher
+
+
+def load_mentions_for_scoring(conn, client=None):
+    mentions = [dict(row) for row in conn.execute(MENTIONS_SQL)]
+    if client:
+        mentions = [m for m in mentions if m['clientName'].lower() == client.lower()]
+    return mentions
+
+
+def find_changes(mentions, labels):
+    """(row indexes, Rescore records) of labels that differ from the stored ones"""
+    rows = [i for i, (m, label) in enumerate(zip(mentions, labels)) if m['sentiment'] != label]
+    return rows, [Rescore(mentions[i]['id'], mentions[i]['clientName'], mentions[i]['sentiment'],
+                          labels[i]) for i in rows]
+
+
+def distribution_shift(mentions, labels):
+    """{client: (before Counter, after Counter)} of sentiment labels"""
+    shift = {}
+    for m, label in zip(mentions, labels):
+        before, after = shift.setdefault(m['clientName'], (Counter(), Counter()))
+        before[m['sentiment']] += 1
+        after[label] += 1
+    return shift
+
+
+def changed_terms(matrix, matcher, changed_rows):
+    """Counter of term -> changed mentions containing it"""
+    mask = np.zeros(matrix.shape[0], dtype=np.bool_)
+    mask[changed_rows] = True
+    hits = np.bincount(matrix.cols[mask[matrix.rows]], minlength=len(matcher.terms))
+    return Counter({matcher.terms[i]: int(n) for i, n in enumerate(hits.tolist()) if n})
+
+
+def apply_changes(conn, changes):
+    """Write changed labels; rows updated since they were read are left alone"""
+    now = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+    with conn:
+        cursor = conn.executemany(
+            'UPDATE mediaMentions SET sentiment = ?, updatedAt = ? WHERE id = ? AND sentiment IS ?',
+            [(c.new, now, c.id, c.old) for c in changes]
+        )
+    return cursor.rowcount
+
+
+def _label(value):
+    return value or '(none)'
+
+
+def print_report(mentions, changes, shift, terms, applied=None):
+    print('=' * 80)
+    print('SENTIMENT RE-SCORING')
+    print('=' * 80)
+    print(f"\nMentions scored:   {len(mentions)}")
+    print(f"Labels that differ: {len(changes)}")
+
+    if changes:
+        print('\nTransitions:')
+        for (old, new), n in Counter((_label(c.old), c.new) for c in changes).most_common():
+            print(f"  {old:>8} -> {new:<8} {n:>6}")
+
+        print(f"\n{'Client':<36} " + ' '.join(f"{label:>16}" for label in LABELS))
+        for client, (before, after) in sorted(shift.items(),
+                                              key=lambda item: -sum(item[1][0].values())):
+            total = sum(before.values())
+            cells = []
+            for label in LABELS:
+                delta = (after[label] - before[label]) / total * 100
+                cells.append(f"{after[label] / total * 100:>7.1f}% ({delta:>+5.1f})")
+            print(f"{client[:36]:<36} " + ' '.join(f"{cell:>16}" for cell in cells))
+
+        print('\nTerms in changed mentions:')
+        for term, n in terms.most_common(15):
+            print(f"  {term:<20} {n:>6}")
+
+    if applied is None:
+        print('\nDry run: pass --apply to write these labels')
+    else:
+        print(f"\nUpdated {applied} mentions")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--lexicon', help='JSON file replacing the positive or negative terms')
+    parser.add_argument('--client', help='Only re-score one client')
+    parser.add_argument('--apply', action='store_true', help='Write changed labels')
+    parser.add_argument('--json', help='Write the changed labels to this JSON file')
+    args = parser.parse_args(argv)
+
+    lexicon = load_lexicon()
+    if args.lexicon:
+        lexicon = override_lexicon(lexicon, args.lexicon)
+
+    with closing(connect(args.db, readonly=not args.apply)) as conn:
+        mentions = load_mentions_for_scoring(conn, args.client)
+        labels, matrix, matcher = rescore(mentions, lexicon)
+        changed_rows, changes = find_changes(mentions, labels)
+        applied = apply_changes(conn, changes) if args.apply else None
+
+    print_report(mentions, changes, distribution_shift(mentions, labels),
+                 changed_terms(matrix, matcher, changed_rows), applied)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([{'id': c.id, 'client': c.client, 'old': c.old, 'new': c.new}
+                       for c in changes], f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import json
+from contextlib import closing
+
+import numpy as np
+
+from .conftest import insert_mention
+from .db import connect
+from .sentiment import (Lexicon, TermMatcher, apply_changes, distribution_shift, find_changes,
+                        load_lexicon, load_mentions_for_scoring, override_lexicon, rescore)
+
+LEXICON = Lexicon(('win', 'wins', 'rise', 'award'), ('loss', 'losses', 'recall'))
+
+
+def row(id, title, snippet='', sentiment=None, client='EFI'):
+    return {'id': id, 'clientName': client, 'title': title, 'subjectMatter': snippet,
+            'sentiment': sentiment}
+
+
+def test_load_lexicon_reads_backend_source():
+    lexicon = load_lexicon()
+    assert 'breakthrough' in lexicon.positives
+    assert 'recall' in lexicon.negatives
+    assert 'good' not in lexicon.negatives
+
+
+def test_term_matrix_counts_overlapping_substrings():
+    matcher = TermMatcher(LEXICON)
+    matrix = matcher.term_matrix(['grower wins; losses mount', 'enterprise window', 'nothing'])
+    cells = {(r, matcher.terms[c]): n for r, c, n in
+             zip(matrix.rows.tolist(), matrix.cols.tolist(), matrix.counts.tolist())}
+    # 'wins' also contains 'win', 'losses' also contains 'loss', like String.includes
+    assert cells == {(0, 'win'): 1, (0, 'wins'): 1, (0, 'loss'): 1, (0, 'losses'): 1,
+                     (1, 'rise'): 1, (1, 'win'): 1}
+    assert matrix.shape == (3, 7)
+    assert np.array_equal(matcher.score(matrix), [1, 0, 1])
+
+
+def test_rescore_follows_analyze_sentiment_rules():
+    labels, _, _ = rescore([row(1, 'Growers win award'), row(2, 'Recall issued', 'Losses'),
+                            row(3, 'Award after recall'), row(4, 'Market report', None)],
+                           LEXICON)
+    assert labels == ['positive', 'negative', 'neutral', 'neutral']
+
+
+def test_changes_and_distribution_shift():
+    mentions = [row(1, 'Growers win', sentiment='neutral'), row(2, 'Recall', sentiment='negative'),
+                row(3, 'Report', client='Other')]
+    labels, _, _ = rescore(mentions, LEXICON)
+    rows, changes = find_changes(mentions, labels)
+    assert rows == [0, 2]
+    assert [(c.id, c.old, c.new) for c in changes] == [(1, 'neutral', 'positive'),
+                                                       (3, None, 'neutral')]
+    before, after = distribution_shift(mentions, labels)['EFI']
+    assert before == {'neutral': 1, 'negative': 1}
+    assert after == {'positive': 1, 'negative': 1}
+
+
+def test_override_and_apply_only_touch_changed_rows(db_path, db, tmp_path):
+    db.execute("INSERT INTO clients (name, contactEmail) VALUES ('EFI', 'a@b.c')")
+    first = insert_mention(db, title='Sweet potato harvest', sentiment='positive')
+    second = insert_mention(db, title='Crop report', sentiment='positive')
+    path = tmp_path / 'lexicon.json'
+    path.write_text(json.dumps({'positives': ['growth']}))
+    lexicon = override_lexicon(load_lexicon(), path)
+    assert lexicon.positives == ('growth',)
+
+    with closing(connect(db_path, readonly=False)) as conn:
+        mentions = load_mentions_for_scoring(conn)
+        labels, _, _ = rescore(mentions, lexicon)
+        _, changes = find_changes(mentions, labels)
+        conn.execute("UPDATE mediaMentions SET sentiment = 'negative' WHERE id = ?", (second,))
+        assert apply_changes(conn, changes) == 1
+        stored = dict(conn.execute('SELECT id, sentiment FROM mediaMentions').fetchall())
+    assert stored == {first: 'neutral', second: 'negative'}
@@ -0,0 +1,194 @@
+"""
+Shared-memory mention tables for parallel analysis workers
+
+A list of ManualMention or AutoMention records is published once into a
+single multiprocessing.shared_memory block:
+- fixed-width numpy arrays for ids, dates and verification state
+- one packed UTF-8 string heap, with an offset table and a null mask per
+  text column
+
+Workers receive only the small TableSpec, attach to the block by name and
+read through zero-copy, read-only views. The record lists are not pickled
+to every worker and not copied per process. Records are rebuilt only when
+a worker asks for them.
+
+Dates are stored as days since 1970-01-01 in int32, and NULL_INT marks a
+missing value in every integer column.
+
+    with SharedMentionTable.publish(manual) as table:      # parent
+        ... start workers with table.spec ...
+    table = SharedMentionTable.attach(spec)                  # worker
+    links = table.strings('link')
+"""
+
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .records import AutoMention, ManualMention
+
+NULL_INT = np.iinfo(np.int32).min
+EPOCH = date(1970, 1, 1)
+ALIGN = 8
+
+# Column types per record kind: 'str', 'date' or a numpy integer dtype
+RECORD_TYPES = {'manual': ManualMention, 'auto': AutoMention}
+COLUMN_TYPES = {
+    'manual': {'client': 'str', 'date': 'date', 'date_str': 'str', 'publication': 'str',
+               'title': 'str', 'topic': 'str', 'link': 'str', 'row': 'int32'},
+    'auto': {'id': 'int64', 'client_id': 'int64', 'client_name': 'str', 'title': 'str',
+             'link': 'str', 'source': 'str', 'mention_date': 'str', 'created_at': 'str',
+             'verified': 'int8', 'subject_matter': 'str', 'provider': 'str',
+             'search_job_id': 'int64'}
+}
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Everything a worker needs to attach: block name and array layout"""
+    shm_name: str
+    kind: str
+    rows: int
+    arrays: tuple      # ((array name, dtype, byte offset, length), ...)
+
+
+def _kind_of(records):
+    for kind, cls in RECORD_TYPES.items():
+        if isinstance(records[0], cls):
+            return kind
+    raise TypeError(f'Cannot share {type(records[0]).__name__} records')
+
+
+def _int_column(values, dtype):
+    null = max(NULL_INT, np.iinfo(dtype).min)
+    return np.fromiter((null if v is None else v for v in values), dtype=dtype,
+                       count=len(values))
+
+
+def _date_column(values):
+    return np.fromiter((NULL_INT if v is None else (v - EPOCH).days for v in values),
+                       dtype=np.int32, count=len(values))
+
+
+def _decode_dates(days):
+    return [None if d == NULL_INT else EPOCH + timedelta(days=d) for d in days]
+
+
+def _string_column(values):
+    """(offsets relative to the column's heap start, null mask, encoded bytes)"""
+    encoded = [b'' if v is None else str(v).encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    nulls = np.fromiter((v is None for v in values), dtype=np.bool_, count=len(values))
+    return offsets, nulls, b''.join(encoded)
+
+
+class SharedMentionTable:
+    """Column-oriented, shared-memory view of a list of mention records"""
+
+    def __init__(self, shm, spec, owner):
+        self._shm = shm
+        self.spec = spec
+        self.owner = owner
+        self._arrays = {}
+        for name, dtype, offset, length in spec.arrays:
+            array = np.ndarray((length,), dtype=dtype, buffer=shm.buf, offset=offset)
+            if not owner:
+                array.flags.writeable = False
+            self._arrays[name] = array
+
+    @classmethod
+    def publish(cls, records):
+        """Copy records into a new shared block; the caller owns and unlinks it"""
+        records = list(records)
+        if not records:
+            raise ValueError('No records to share')
+        kind = _kind_of(records)
+        arrays, heaps, heap_size = [], [], 0
+        for name, column_type in COLUMN_TYPES[kind].items():
+            values = [getattr(r, name) for r in records]
+            if column_type == 'str':
+                offsets, nulls, heap = _string_column(values)
+                arrays += [(f'{name}.offsets', offsets + heap_size), (f'{name}.nulls', nulls)]
+                heaps.append(heap)
+                heap_size += len(heap)
+            elif column_type == 'date':
+                arrays.append((name, _date_column(values)))
+            else:
+                arrays.append((name, _int_column(values, np.dtype(column_type))))
+        arrays.append(('heap', np.frombuffer(b''.join(heaps), dtype=np.uint8)))
+
+        layout, size = [], 0
+        for name, array in arrays:
+            layout.append((name, array.dtype.str, size, len(array)))
+            size += -(-array.nbytes // ALIGN) * ALIGN
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        spec = TableSpec(shm.name, kind, len(records), tuple(layout))
+        table = cls(shm, spec, owner=True)
+        for name, array in arrays:
+            table._arrays[name][:] = array
+        return table
+
+    @classmethod
+    def attach(cls, spec):
+        """Open a published table read-only (from a worker process)"""
+        return cls(shared_memory.SharedMemory(name=spec.shm_name), spec, owner=False)
+
+    def close(self):
+        self._arrays.clear()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.spec.rows
+
+    def array(self, name):
+        """Zero-copy numpy view of an integer or date column"""
+        return self._arrays[name]
+
+    def dates(self, name='date'):
+        """A date column as datetime.date values (None where missing)"""
+        return _decode_dates(self._arrays[name].tolist())
+
+    def strings(self, name, rows=None):
+        """Decode a text column (optionally only the given row indices)"""
+        offsets = self._arrays[f'{name}.offsets'].tolist()
+        nulls = self._arrays[f'{name}.nulls']
+        heap = memoryview(self._arrays['heap'])
+        rows = range(self.spec.rows) if rows is None else rows
+        return [None if nulls[i] else str(heap[offsets[i]:offsets[i + 1]], 'utf-8')
+                for i in rows]
+
+    def records(self, rows=None):
+        """Rebuild ManualMention or AutoMention records"""
+        rows = list(range(self.spec.rows)) if rows is None else list(rows)
+        cls = RECORD_TYPES[self.spec.kind]
+        columns = {}
+        for name, column_type in COLUMN_TYPES[self.spec.kind].items():
+            if column_type == 'str':
+                columns[name] = self.strings(name, rows)
+            elif column_type == 'date':
+                columns[name] = _decode_dates(self._arrays[name][rows].tolist())
+            else:
+                array = self._arrays[name]
+                null = max(NULL_INT, np.iinfo(array.dtype).min)
+                columns[name] = [None if v == null else v for v in array[rows].tolist()]
+        names = [f.name for f in fields(cls)]
+        return [cls(**{n: columns[n][j] for n in names}) for j in range(len(rows))]
+
+    def client_rows(self):
+        """{lowercased client name: row index array} for per-client fan-out"""
+        column = 'client' if self.spec.kind == 'manual' else 'client_name'
+        groups = {}
+        for i, name in enumerate(self.strings(column)):
+            groups.setdefault((name or '').lower(), []).append(i)
+        return {key: np.asarray(rows, dtype=np.int64) for key, rows in groups.items()}
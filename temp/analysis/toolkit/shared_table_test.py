@@ -0,0 +1,58 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pytest
+
+from .records import AutoMention, ManualMention
+from .shared_table import SharedMentionTable
+
+
+def manual_rows():
+    return [
+        ManualMention('EFI', date(2025, 11, 1), '11/1/2025', 'The Packer', 'Café story', '',
+                      'https://thepacker.com/a', 5),
+        ManualMention(None, None, '', '', '', '', '', 6),
+        ManualMention('Viva', date(1969, 12, 31), '12/31/1969', 'Produce News', 'Old', 'Topic',
+                      'https://producenews.com/b', 7)
+    ]
+
+
+def links_in_worker(spec):
+    table = SharedMentionTable.attach(spec)
+    try:
+        return table.strings('link'), table.array('row').flags.writeable
+    finally:
+        table.close()
+
+
+def test_manual_records_round_trip():
+    rows = manual_rows()
+    with SharedMentionTable.publish(rows) as table:
+        assert len(table) == 3
+        assert table.records() == rows
+        assert table.records([2]) == rows[2:]
+        assert table.dates() == [date(2025, 11, 1), None, date(1969, 12, 31)]
+        assert {k: v.tolist() for k, v in table.client_rows().items()} == \
+            {'efi': [0], '': [1], 'viva': [2]}
+
+
+def test_auto_records_keep_nulls():
+    rows = [AutoMention(1, 3, 'EFI', 'T', None, 'src', '2025-11-01', None, None, provider='rss'),
+            AutoMention(2, 3, 'EFI', 'U', 'https://a.com', None, None, None, 1,
+                        search_job_id=9)]
+    with SharedMentionTable.publish(rows) as table:
+        assert table.records() == rows
+        assert table.array('verified').dtype.itemsize == 1
+
+
+def test_workers_attach_read_only():
+    with SharedMentionTable.publish(manual_rows()) as table:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            links, writeable = executor.submit(links_in_worker, table.spec).result()
+    assert links == ['https://thepacker.com/a', '', 'https://producenews.com/b']
+    assert writeable is False
+
+
+def test_publish_rejects_empty_input():
+    with pytest.raises(ValueError):
+        SharedMentionTable.publish([])
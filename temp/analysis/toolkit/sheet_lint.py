@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Data-quality linter for manual-tracking sheets
+
+Coverage numbers are only as good as the manual baselines. This linter
+streams every client sheet of the tracking workbooks (laid out by
+toolkit.sheet_schema) and every CSV export once, then reports:
+- exact duplicate rows, by a hash of the normalized row
+- near-duplicates: the same article under another link variant (url_key)
+  or the same headline (hash of its word set)
+- blank, truncated or malformed links, and redirect or shortener links
+  that hide the real article
+- missing dates (rows with a title or link but no date), unparseable
+  dates, future dates, dates outside --start/--end, and dates
+  more than a year from the client's median (wrong-year typos)
+- column-type anomalies: text dates in a workbook date column, a URL or a
+  date in the title, and links sitting in the wrong column
+
+Only the per-client median check needs state beyond the row itself, so it
+runs over the day numbers kept during the pass. Issues are written as
+machine-readable JSON or CSV with code, severity, source, client, row and
+value. With --fail-on the tool exits with status 1 when issues at that
+severity or worse exist, so an audit can stop on a bad baseline.
+
+Usage:
+    python -m toolkit.sheet_lint [--workbook tracking.xlsx] [--manual manual.csv --client NAME] \\
+        [--start 2025-06-07] [--end 2025-12-04] [--json issues.json] [--csv issues.csv] \\
+        [--fail-on error|warning]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import re
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .domains import domain_parts
+from .manual import iter_manual_csv, iter_manual_workbook
+from .sheet_schema import SchemaCache, detect_workbook
+from .urls import url_key
+
+SEVERITIES = ('error', 'warning', 'info')
+
+# code -> (severity, message)
+ISSUES = {
+    'duplicate_row': ('error', 'Exact duplicate of row {related}'),
+    'duplicate_link': ('warning', 'Same article as row {related} (link variant)'),
+    'duplicate_title': ('warning', 'Same headline as row {related}'),
+    'blank_link': ('warning', 'No link'),
+    'truncated_link': ('error', 'Link looks truncated'),
+    'malformed_link': ('error', 'Link is not an absolute http(s) URL'),
+    'redirect_link': ('warning', 'Redirect or shortener link; store the article URL'),
+    'missing_date': ('error', 'No date'),
+    'unparseable_date': ('error', 'Date cannot be parsed'),
+    'future_date': ('error', 'Date is in the future'),
+    'outside_window': ('info', 'Date is outside the audit window'),
+    'suspect_year': ('warning', 'Date is over a year from the client median ({related})'),
+    'text_date': ('info', 'Date is stored as text, not a date cell'),
+    'url_in_title': ('error', 'Title column holds a URL'),
+    'date_in_title': ('error', 'Title column holds a date'),
+    'misplaced_link': ('error', 'Link is in the {related} column'),
+    'blank_title': ('warning', 'No title'),
+}
+
+# Hosts whose links redirect to the real article
+REDIRECT_DOMAINS = frozenset({
+    'bit.ly', 'buff.ly', 'dlvr.it', 'goo.gl', 'lnkd.in', 'ow.ly', 't.co', 'tinyurl.com',
+    'trib.al', 'urldefense.com', 'safelinks.protection.outlook.com'
+})
+REDIRECT_HOSTS = frozenset({
+    'news.google.com', 'feedproxy.google.com', 'l.facebook.com', 'lm.facebook.com'
+})
+REDIRECT_PARAMS = frozenset({'url', 'u', 'q', 'target', 'redirect', 'dest'})
+
+_CELL_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATE_TEXT = re.compile(r'[\d/\-.: ]+')
+_WORD = re.compile(r'[a-z0-9]+')
+_TRUNCATED = ('...', '…')
+
+SUSPECT_DAYS = 365
+MIN_TITLE_WORDS = 4
+
+
+@dataclass
+class Issue:
+    code: str
+    severity: str
+    message: str
+    source: str
+    client: str
+    row: int
+    value: str = ''
+
+
+def _digest(*parts):
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=12).digest()
+
+
+def title_signature(title):
+    """Hash of a headline's word set, or None for headlines too short to compare"""
+    words = sorted(set(_WORD.findall((title or '').lower())))
+    return _digest(*words) if len(words) >= MIN_TITLE_WORDS else None
+
+
+def link_problem(link):
+    """Issue code for a link, or None when it looks like a direct article URL"""
+    link = (link or '').strip()
+    if not link:
+        return 'blank_link'
+    if link.endswith(_TRUNCATED):
+        return 'truncated_link'
+    try:
+        parts = urlsplit(link)
+    except ValueError:
+        return 'malformed_link'
+    if parts.scheme not in ('http', 'https') or not parts.hostname or \
+            '.' not in parts.hostname or any(c.isspace() for c in link):
+        return 'malformed_link'
+    domain = domain_parts(link)
+    if domain and (domain.registered_domain in REDIRECT_DOMAINS or
+                   parts.hostname.lower() in REDIRECT_HOSTS):
+        return 'redirect_link'
+    if any(k.lower() in REDIRECT_PARAMS and v.startswith(('http://', 'https://'))
+           for k, v in parse_qsl(parts.query)):
+        return 'redirect_link'
+    return None
+
+
+def _where(first, source):
+    """'12' for a row in the same source, 'other.csv row 12' otherwise"""
+    return str(first[1]) if first[0] == source else f'{first[0]} row {first[1]}'
+
+
+def _looks_like_url(text):
+    return text.strip().lower().startswith(('http://', 'https://', 'www.'))
+
+
+class SheetLinter:
+    """Single-pass linter; feed ManualMention records with lint(), then finish()"""
+
+    def __init__(self, start=None, end=None, today=None):
+        self.start, self.end = start, end
+        self.today = today or date.today()
+        self.issues = []
+        self.rows = 0
+        self._exact = {}       # row digest -> (source, row)
+        self._links = {}       # (client, url_key) -> (source, row)
+        self._titles = {}      # (client, title signature) -> (source, row)
+        self._dates = {}       # client -> [(day ordinal, source, ManualMention)]
+
+    def _add(self, code, source, mention, value='', related=''):
+        severity, message = ISSUES[code]
+        self.issues.append(Issue(code, severity, message.format(related=related), source,
+                                 mention.client or '', mention.row, value))
+
+    def lint(self, mention, source, workbook=False):
+        self.rows += 1
+        client = (mention.client or '').strip().lower()
+
+        # Duplicates: exact row hash first, then link variant, then headline
+        here = (source, mention.row)
+        exact = _digest(client, mention.date_str, mention.publication.strip().lower(),
+                        ' '.join(mention.title.lower().split()), mention.link.strip())
+        first = self._exact.setdefault(exact, here)
+        if first != here:
+            self._add('duplicate_row', source, mention, mention.title, _where(first, source))
+        else:
+            key, signature = url_key(mention.link), title_signature(mention.title)
+            first_link = self._links.setdefault((client, key), here) if key else here
+            first_title = (self._titles.setdefault((client, signature), here)
+                           if signature else here)
+            if first_link != here:
+                self._add('duplicate_link', source, mention, mention.link,
+                          _where(first_link, source))
+            elif first_title != here:
+                self._add('duplicate_title', source, mention, mention.title,
+                          _where(first_title, source))
+
+        # Links, including links that landed in another column
+        problem = link_problem(mention.link)
+        if problem in ('blank_link', 'malformed_link'):
+            for column in ('title', 'publication', 'topic'):
+                if _looks_like_url(getattr(mention, column)):
+                    self._add('misplaced_link', source, mention, getattr(mention, column),
+                              column)
+                    break
+            else:
+                self._add(problem, source, mention, mention.link)
+        elif problem:
+            self._add(problem, source, mention, mention.link)
+
+        # Titles
+        if not mention.title.strip():
+            self._add('blank_title', source, mention)
+        elif _looks_like_url(mention.title):
+            if problem not in ('blank_link', 'malformed_link'):
+                self._add('url_in_title', source, mention, mention.title)
+        elif _DATE_TEXT.fullmatch(mention.title.strip()):
+            self._add('date_in_title', source, mention, mention.title)
+
+        # Dates
+        if mention.date is None:
+            if mention.date_str:
+                self._add('unparseable_date', source, mention, mention.date_str)
+            else:
+                self._add('missing_date', source, mention, mention.title or mention.link)
+            return
+        if workbook and not _CELL_DATE.match(mention.date_str):
+            # Date cells read as ISO text; anything else was typed as text
+            self._add('text_date', source, mention, mention.date_str)
+        if mention.date > self.today:
+            self._add('future_date', source, mention, mention.date.isoformat())
+        elif (self.start and mention.date < self.start) or (self.end and mention.date > self.end):
+            self._add('outside_window', source, mention, mention.date.isoformat())
+        self._dates.setdefault(client, []).append(
+            (mention.date.toordinal(), source, mention))
+
+    def finish(self):
+        """Run the per-client date check and return every issue"""
+        for entries in self._dates.values():
+            ordinals = np.fromiter((o for o, _, _ in entries), dtype=np.int64, count=len(entries))
+            median = int(np.median(ordinals))
+            for index in np.flatnonzero(np.abs(ordinals - median) > SUSPECT_DAYS).tolist():
+                _, source, mention = entries[index]
+                self._add('suspect_year', source, mention, mention.date.isoformat(),
+                          date.fromordinal(median).isoformat())
+        return self.issues
+
+
+def lint_sources(workbooks=(), csvs=(), client=None, start=None, end=None, schema_cache=None):
+    """(issues, rows linted, skipped-row stats) for every workbook sheet and CSV export"""
+    linter = SheetLinter(start, end)
+    stats = Counter()
+    for path in workbooks:
+        schemas = detect_workbook(path, schema_cache)
+        rules = {title: schema.rules() for title, schema in schemas.items()}
+        for mention in iter_manual_workbook(path, rules, stats, undated=True):
+            linter.lint(mention, Path(path).name, workbook=True)
+    for path in csvs:
+        for mention in iter_manual_csv(path, client, stats=stats, undated=True):
+            linter.lint(mention, Path(path).name)
+    return linter.finish(), linter.rows, stats
+
+
+def print_report(issues, rows):
+    print('=' * 80)
+    print('MANUAL SHEET DATA QUALITY')
+    print('=' * 80)
+    by_severity = Counter(i.severity for i in issues)
+    print(f"\n{rows} rows, {len(issues)} issues (" +
+          ', '.join(f"{by_severity[s]} {s}" for s in SEVERITIES) + ')')
+    if not issues:
+        return
+
+    codes = Counter((i.client, i.code) for i in issues)
+    clients = Counter(i.client for i in issues)
+    for client, total in clients.most_common():
+        print(f"\n{client or '(no client)'}: {total} issues")
+        for (c, code), n in sorted(codes.items(), key=lambda item: -item[1]):
+            if c == client:
+                print(f"  {ISSUES[code][0]:<8} {code:<20} {n:>5}")
+
+    errors = [i for i in issues if i.severity == 'error']
+    if errors:
+        print('\nErrors:')
+        for i in errors[:50]:
+            print(f"  {i.source} row {i.row} [{i.client}] {i.code}: {i.message}  {i.value[:60]}")
+        if len(errors) > 50:
+            print(f"  ... {len(errors) - 50} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Tracking workbook (one sheet per client); repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports without a title row')
+    parser.add_argument('--start', type=date.fromisoformat, help='Audit window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Audit window end (YYYY-MM-DD)')
+    parser.add_argument('--json', help='Write the issue list to this JSON file')
+    parser.add_argument('--csv', help='Write the issue list to this CSV')
+    parser.add_argument('--fail-on', choices=SEVERITIES[:2],
+                        help='Exit with status 1 when issues at this severity or worse exist')
+    args = parser.parse_args(argv)
+
+    if not (args.workbook or args.manual):
+        parser.error('pass at least one --workbook or --manual input')
+
+    issues, rows, _ = lint_sources(args.workbook, args.manual, args.client, args.start, args.end,
+                                   SchemaCache())
+    print_report(issues, rows)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(i) for i in issues], f, indent=2)
+        print(f"\nWrote {args.json}")
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(Issue.__dataclass_fields__))
+            writer.writeheader()
+            writer.writerows(asdict(i) for i in issues)
+        print(f"\nWrote {args.csv}")
+
+    if args.fail_on:
+        failing = SEVERITIES[:SEVERITIES.index(args.fail_on) + 1]
+        if any(i.severity in failing for i in issues):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+from datetime import date, datetime
+
+import openpyxl
+
+from .records import ManualMention
+from .sheet_lint import SheetLinter, link_problem, lint_sources
+from .sheet_schema import SchemaCache
+
+
+def mention(row, title='Growers adopt new labor standards', link='https://thepacker.com/a',
+            day=date(2025, 11, 1), date_str=None, publication='The Packer', client='EFI'):
+    return ManualMention(client, day, date_str or (day.isoformat() if day else 'soon'),
+                         publication, title, '', link, row)
+
+
+def codes(issues):
+    return sorted((i.row, i.code) for i in issues)
+
+
+def test_link_problems():
+    assert link_problem('') == 'blank_link'
+    assert link_problem('https://thepacker.com/news/growers-adopt...') == 'truncated_link'
+    assert link_problem('thepacker.com/a') == 'malformed_link'
+    assert link_problem('https://bit.ly/3xYz') == 'redirect_link'
+    assert link_problem('https://www.google.com/url?q=https://thepacker.com/a') == 'redirect_link'
+    assert link_problem('https://www.thepacker.com/news/a?id=3') is None
+
+
+def test_duplicates_exact_and_near():
+    linter = SheetLinter(today=date(2025, 12, 1))
+    for m in (
+        mention(5),
+        mention(6),                                                    # exact copy
+        mention(7, title='Other words here entirely', link='http://www.thepacker.com/a/'),
+        mention(8, title='New labor standards: growers adopt', link='https://b.com/x'),
+        mention(9, client='Viva'),                                     # other client
+    ):
+        linter.lint(m, 'export.csv')
+    assert codes(linter.finish()) == [
+        (6, 'duplicate_row'), (7, 'duplicate_link'), (8, 'duplicate_title')
+    ]
+
+
+def test_dates_and_column_anomalies():
+    linter = SheetLinter(start=date(2025, 6, 7), end=date(2025, 12, 4), today=date(2025, 12, 1))
+    rows = [mention(n, title=f'Story number {n} about growers', link=f'https://a.com/{n}',
+                    day=date(2025, 9, n)) for n in range(1, 6)]
+    rows += [
+        mention(10, title='Typo year story about growers', link='https://a.com/10',
+                day=date(2023, 9, 1)),
+        mention(11, title='Future story about the growers', link='https://a.com/11',
+                day=date(2026, 1, 5)),
+        mention(12, title='Bad date story about growers', link='https://a.com/12', day=None,
+                date_str='Sept ?'),
+        mention(13, title='https://a.com/13', link=''),
+        mention(14, title='11/03/2025', link='https://a.com/14'),
+        mention(15, title='Text date story about growers', link='https://a.com/15',
+                date_str='9/15/2025', day=date(2025, 9, 15)),
+    ]
+    for m in rows:
+        linter.lint(m, 'tracking.xlsx', workbook=True)
+    assert codes(linter.finish()) == [
+        (10, 'outside_window'), (10, 'suspect_year'), (11, 'future_date'),
+        (12, 'unparseable_date'), (13, 'misplaced_link'), (14, 'date_in_title'),
+        (15, 'text_date')
+    ]
+
+
+def test_lints_workbook_sheets_in_one_pass(tmp_path):
+    path = tmp_path / 'tracking.xlsx'
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = 'EFI'
+    sheet.append(['Date', 'Publication Name', 'Title', 'Topic', 'Additional Mentions', 'Link'])
+    for _ in range(2):
+        sheet.append([datetime(2025, 6, 10), 'The Packer', 'First story', None, None,
+                      'https://thepacker.com/1'])
+    wb.save(path)
+
+    issues, rows, _ = lint_sources([path], schema_cache=SchemaCache(tmp_path / 'schemas.json'))
+    assert rows == 2
+    assert [(i.source, i.client, i.row, i.code) for i in issues] == [
+        ('tracking.xlsx', 'EFI', 3, 'duplicate_row')
+    ]
+
+
+def test_rows_without_a_date_are_reported_not_skipped(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text('EFI Media Mentions,,,,,\n'
+                    'Date,Publication Name,Title,Topic,Additional Mentions,Link\n'
+                    ',The Packer,Growers adopt new labor standards,,,https://thepacker.com/a\n'
+                    ',,,,,\n'
+                    ',,,,,https://producenews.com/b\n', encoding='utf-8')
+
+    issues, rows, stats = lint_sources(csvs=[path])
+
+    assert rows == 2 and stats['blank'] == 1
+    assert [(i.row, i.value) for i in issues if i.code == 'missing_date'] == [
+        (3, 'Growers adopt new labor standards'), (5, 'https://producenews.com/b')
+    ]
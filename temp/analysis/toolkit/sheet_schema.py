@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Sheet-schema detection for the tracking workbook
+
+Replaces inspect_efi_excel.py and the hard-coded layout (headers on row 2,
+data from row 5, date in column 0, link in column 5) in the analysis
+scripts. For every sheet the detector streams the first rows once to find
+the header row by role keywords, fills in roles the headers do not name
+from the cell values (dates, URLs), and takes the first row that looks like
+a real mention as the data start.
+
+Results are cached under a fingerprint of the header cells. A later run
+reads only each sheet's rows up to the cached header row. If the
+fingerprint still matches, it reuses the mapping. If it does not, it
+re-detects and reports the sheet as drifted, showing the old and new
+headers.
+
+Usage:
+    python -m toolkit.sheet_schema WORKBOOK [--cache PATH] [--refresh] [--fail-on-drift] [--json]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+import openpyxl
+
+from .db import REPO_ROOT
+from .manual import DEFAULT_RULES, IngestRules, cell_text, classify_row, parse_manual_date
+
+DEFAULT_CACHE_PATH = REPO_ROOT / 'data' / 'sheet-schemas.json'
+
+# Rows read per sheet when detecting; the header and first mentions are near the top
+SCAN_ROWS = 40
+
+# Header keywords per role, matched against lowercased header cells
+ROLE_KEYWORDS = {
+    'date': ('date', 'published'),
+    'publication': ('publication', 'source', 'outlet', 'publisher'),
+    'title': ('title', 'headline'),
+    'topic': ('topic', 'type', 'category'),
+    'additional': ('additional',),
+    'link': ('link', 'url')
+}
+
+
+@dataclass
+class SheetSchema:
+    sheet: str
+    header_row: int            # 0 when the sheet has no header row
+    data_start: int
+    columns: dict              # role -> column index
+    header_cells: list = field(default_factory=list)
+    fingerprint: str = ''
+    source: str = 'detected'   # detected | cache
+    drift: dict = None         # previous header cells and columns when the layout changed
+
+    def rules(self):
+        """IngestRules for reading this sheet with toolkit.manual"""
+        return IngestRules(
+            date_column=self.columns.get('date', DEFAULT_RULES.date_column),
+            publication_column=self.columns.get('publication'),
+            title_column=self.columns.get('title'),
+            topic_column=self.columns.get('topic'),
+            link_column=self.columns.get('link'),
+            first_data_row=self.data_start
+        )
+
+
+def normalize_header(value):
+    return ' '.join(cell_text(value).lower().split())
+
+
+def header_fingerprint(cells):
+    """Stable fingerprint of a header row (trailing empty cells ignored)"""
+    cells = [normalize_header(c) for c in cells]
+    while cells and not cells[-1]:
+        cells.pop()
+    return hashlib.blake2b('\x1f'.join(cells).encode(), digest_size=12).hexdigest()
+
+
+def header_roles(cells):
+    """Map roles to columns from header text; the first matching column wins"""
+    roles = {}
+    for index, cell in enumerate(cells):
+        text = normalize_header(cell)
+        if not text:
+            continue
+        for role, keywords in ROLE_KEYWORDS.items():
+            if role not in roles and any(k in text for k in keywords):
+                roles[role] = index
+                break
+    return roles
+
+
+def _looks_like_date(value):
+    return isinstance(value, datetime) or (
+        isinstance(value, str) and any(c.isdigit() for c in value) and
+        parse_manual_date(value) is not None)
+
+
+def _looks_like_url(value):
+    return isinstance(value, str) and value.strip().lower().startswith(('http://', 'https://'))
+
+
+def value_roles(rows, known):
+    """Fill date, link and title roles the headers missed from sample values"""
+    roles = dict(known)
+    width = max((len(r) for r in rows), default=0)
+
+    def best(score):
+        taken = set(roles.values())
+        scores = [(score(i), i) for i in range(width) if i not in taken]
+        scores = [(s, i) for s, i in scores if s > 0]
+        return max(scores)[1] if scores else None
+
+    def column(i):
+        return [r[i] for r in rows if len(r) > i and r[i] not in (None, '')]
+
+    for role, test in (('date', _looks_like_date), ('link', _looks_like_url)):
+        if role not in roles:
+            index = best(lambda i: sum(1 for v in column(i) if test(v)))
+            if index is not None:
+                roles[role] = index
+    if 'title' not in roles:
+        # Titles are the longest free-text cells
+        index = best(lambda i: sum(len(str(v)) for v in column(i)
+                                   if isinstance(v, str) and not _looks_like_url(v)))
+        if index is not None:
+            roles['title'] = index
+    return roles
+
+
+def detect_schema(sheet_title, rows):
+    """Detect the layout from the first rows of a sheet (a list of value tuples)"""
+    scored = [(len(header_roles(r)), n) for n, r in enumerate(rows, start=1)]
+    score, header_row = max(scored, key=lambda s: (s[0], -s[1]), default=(0, 0))
+    if score < 2:
+        header_row = 0
+    header_cells = [normalize_header(c) for c in rows[header_row - 1]] if header_row else []
+    while header_cells and not header_cells[-1]:
+        header_cells.pop()
+
+    body = rows[header_row:]
+    columns = value_roles(body, header_roles(header_cells))
+    date_column = columns.get('date', 0)
+    rules = IngestRules(date_column=date_column)
+
+    data_start = header_row + 1
+    for n, row in enumerate(body, start=header_row + 1):
+        cells = [cell_text(v) for v in row]
+        if classify_row(cells, rules) == 'data' and len(row) > date_column and \
+                _looks_like_date(row[date_column]):
+            data_start = n
+            break
+
+    return SheetSchema(sheet_title, header_row, data_start, columns, header_cells,
+                       header_fingerprint(header_cells))
+
+
+class SchemaCache:
+    """JSON cache of detected layouts keyed by header fingerprint"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self.layouts = data.get('layouts', {})   # fingerprint -> layout
+        self.sheets = data.get('sheets', {})     # "workbook::sheet" -> fingerprint
+        self.dirty = False
+
+    def layout(self, fingerprint):
+        return self.layouts.get(fingerprint)
+
+    def remember(self, key, schema):
+        self.layouts[schema.fingerprint] = {
+            'header_row': schema.header_row, 'data_start': schema.data_start,
+            'columns': schema.columns, 'header_cells': schema.header_cells
+        }
+        self.sheets[key] = schema.fingerprint
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'layouts': self.layouts, 'sheets': self.sheets}, indent=2))
+        tmp.replace(self.path)
+        self.dirty = False
+
+
+def _cached_schema(cache, key, sheet, rows_iter):
+    """Reuse the cached layout when the sheet's header row still matches"""
+    previous = cache.sheets.get(key)
+    layout = cache.layout(previous) if previous else None
+    if not layout or not layout['header_row']:
+        return None, []
+    head = list(islice(rows_iter, layout['header_row']))
+    if len(head) == layout['header_row'] and \
+            header_fingerprint(head[-1]) == previous:
+        return SheetSchema(sheet, layout['header_row'], layout['data_start'],
+                           {k: int(v) for k, v in layout['columns'].items()},
+                           layout['header_cells'], previous, source='cache'), head
+    return None, head
+
+
+def detect_workbook(path, cache=None, refresh=False):
+    """Return {sheet title: SheetSchema} for every sheet, using and updating cache"""
+    cache = cache if cache is not None else SchemaCache()
+    workbook_key = Path(path).name
+    schemas = {}
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in wb.worksheets:
+            key = f'{workbook_key}::{sheet.title}'
+            rows_iter = sheet.iter_rows(values_only=True)
+            schema, head = (None, []) if refresh else _cached_schema(cache, key, sheet.title,
+                                                                     rows_iter)
+            if schema is None:
+                rows = head + list(islice(rows_iter, SCAN_ROWS - len(head)))
+                schema = detect_schema(sheet.title, rows)
+                previous = cache.sheets.get(key)
+                if previous and previous != schema.fingerprint and cache.layout(previous):
+                    old = cache.layout(previous)
+                    schema.drift = {'header_cells': old['header_cells'], 'columns': old['columns']}
+                cached = cache.layout(schema.fingerprint)
+                if cached and not refresh:
+                    # Same headers seen on another sheet or workbook: reuse its mapping
+                    schema.columns = {k: int(v) for k, v in cached['columns'].items()}
+                    schema.source = 'cache'
+                cache.remember(key, schema)
+            schemas[sheet.title] = schema
+    finally:
+        wb.close()
+    cache.save()
+    return schemas
+
+
+def print_report(schemas):
+    print('=' * 80)
+    print('SHEET SCHEMAS')
+    print('=' * 80)
+    for schema in schemas.values():
+        print(f"\n{schema.sheet} ({schema.source})")
+        print(f"  Header row: {schema.header_row or 'none'}  Data starts: row {schema.data_start}")
+        roles = ', '.join(f"{role}={index}" for role, index in
+                          sorted(schema.columns.items(), key=lambda item: item[1]))
+        print(f"  Columns: {roles}")
+        if schema.drift:
+            print(f"  LAYOUT CHANGED: was {schema.drift['header_cells']}")
+            print(f"                  now {schema.header_cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('workbook', help='Tracking workbook (.xlsx)')
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE_PATH), help='Schema cache file')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached layouts')
+    parser.add_argument('--fail-on-drift', action='store_true',
+                        help='Exit with status 1 when a sheet layout changed')
+    parser.add_argument('--json', action='store_true', help='Print schemas as JSON')
+    args = parser.parse_args(argv)
+
+    schemas = detect_workbook(args.workbook, SchemaCache(args.cache), args.refresh)
+    if args.json:
+        print(json.dumps([asdict(s) for s in schemas.values()], indent=2))
+    else:
+        print_report(schemas)
+
+    if args.fail_on_drift and any(s.drift for s in schemas.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import openpyxl
+
+from .manual import iter_manual_workbook
+from .sheet_schema import SchemaCache, detect_workbook
+
+
+def write_workbook(path, viva_header):
+    wb = openpyxl.Workbook()
+    efi = wb.active
+    efi.title = 'EFI'
+    efi.append(['EFI Media Mentions'])
+    efi.append(['Date', 'Publication Name', 'Title', 'Topic', 'Additional Mentions', 'Link'])
+    efi.append(['example', 'The Packer', 'Example title', None, None, 'https://example.com'])
+    efi.append(['5/12/2025', 'Template'])
+    efi.append([datetime(2025, 6, 10), 'The Packer', 'First', 'Certification', None,
+                'https://thepacker.com/1'])
+    viva = wb.create_sheet('Viva')
+    viva.append(viva_header)
+    viva.append(['Viva Fresh Expo returns to Houston', 'https://producenews.com/2',
+                 '2025-07-02', 'Produce News'])
+    wb.save(path)
+
+
+def test_detects_layouts_and_reuses_cache(tmp_path):
+    path = tmp_path / 'tracking.xlsx'
+    write_workbook(path, ['Headline', 'URL', 'Published', 'Outlet'])
+    cache = SchemaCache(tmp_path / 'schemas.json')
+
+    schemas = detect_workbook(path, cache)
+
+    efi, viva = schemas['EFI'], schemas['Viva']
+    assert (efi.header_row, efi.data_start, efi.source) == (2, 5, 'detected')
+    assert efi.columns == {'date': 0, 'publication': 1, 'title': 2, 'topic': 3,
+                           'additional': 4, 'link': 5}
+    assert (viva.header_row, viva.data_start) == (1, 2)
+    assert viva.columns == {'title': 0, 'link': 1, 'date': 2, 'publication': 3}
+
+    mentions = list(iter_manual_workbook(path, {s.sheet: s.rules() for s in schemas.values()}))
+    assert [(m.client, m.date_str, m.publication, m.link) for m in mentions] == [
+        ('EFI', '2025-06-10', 'The Packer', 'https://thepacker.com/1'),
+        ('Viva', '2025-07-02', 'Produce News', 'https://producenews.com/2')
+    ]
+
+    again = detect_workbook(path, SchemaCache(tmp_path / 'schemas.json'))
+    assert [s.source for s in again.values()] == ['cache', 'cache']
+    assert again['Viva'].columns == viva.columns
+
+
+def test_reports_layout_drift(tmp_path):
+    path = tmp_path / 'tracking.xlsx'
+    write_workbook(path, ['Headline', 'URL', 'Published', 'Outlet'])
+    detect_workbook(path, SchemaCache(tmp_path / 'schemas.json'))
+
+    write_workbook(path, ['Published', 'Headline', 'URL', 'Outlet'])
+    schemas = detect_workbook(path, SchemaCache(tmp_path / 'schemas.json'))
+
+    assert schemas['EFI'].drift is None
+    viva = schemas['Viva']
+    assert viva.drift['header_cells'] == ['headline', 'url', 'published', 'outlet']
+    assert viva.columns['date'] == 0 and viva.source == 'detected'
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Missed-mention attribution by TF-IDF similarity
+
+Explains why a manual mention is missing from mediaMentions. The index
+covers every title the pipeline has seen:
+- stored mentions
+- false positives (verified = 0)
+- archived deletions in deletedMentions
+- rejected search results, from --rejections JSONL logs (rows with client,
+  title, url and reason; .gz files and rejection log directories written by
+  src/utils/rejectionLog.js are read too)
+
+All missed manual titles are scored against the index in batched sparse
+top-k cosine queries, restricted to the same client. A URL match is taken
+first. Otherwise the best title match at or above --min-score is used.
+
+Each miss is attributed as one of:
+- never_retrieved: nothing similar was ever seen
+- retrieved_but_rejected: the best match was a false positive, a deletion
+  or a rejection
+- retrieved_other_url: the article was stored under a different URL, such
+  as a syndicated copy
+
+Usage:
+    python -m toolkit.similarity [--workbook tracking.xlsx] [--manual manual-tracking-efi.csv \\
+        --client NAME] [--start 2025-06-07] [--end 2025-12-04] [--db PATH] \\
+        [--rejections rejections.jsonl ...] [--min-score 0.5] [--top-k 3] [--csv misses.csv]
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import math
+import re
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from .clients import ClientResolver
+from .coverage import compare_by_client
+from .db import connect
+from .manual import iter_manual_sources
+from .records import load_mentions
+from .rejections import segment_paths
+from .urls import url_key
+
+DEFAULT_MIN_SCORE = 0.5
+DEFAULT_TOP_K = 3
+QUERY_BATCH = 256
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'with'
+})
+
+REJECTED_KINDS = ('false_positive', 'deleted', 'rejected')
+
+DELETED_SQL = """
+    SELECT d.originalMentionId, d.clientName, d.title, d.link
+    FROM deletedMentions d
+    WHERE NOT EXISTS (SELECT 1 FROM mediaMentions m WHERE m.id = d.originalMentionId)
+"""
+
+
+@dataclass
+class Candidate:
+    """A title the pipeline saw: stored, false_positive, deleted or rejected"""
+    kind: str
+    client: str
+    title: str
+    link: str
+    ref: str = ''          # mention id or rejection reason
+
+
+def tokenize(text):
+    words = [w for w in TOKEN_RE.findall((text or '').lower()) if w not in STOP_WORDS]
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+class TfidfIndex:
+    """L2-normalised TF-IDF vectors with an inverted index for batched cosine top-k"""
+
+    def __init__(self, texts, groups=None):
+        self.vocabulary = {}
+        rows, terms, counts = [], [], []
+        for row, text in enumerate(texts):
+            for term, n in Counter(tokenize(text)).items():
+                rows.append(row)
+                terms.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(n)
+        self.n_docs = len(texts)
+        rows, terms = np.asarray(rows, dtype=np.int64), np.asarray(terms, dtype=np.int64)
+        df = np.bincount(terms, minlength=len(self.vocabulary))
+        self.idf = np.log((1 + self.n_docs) / (1 + df)) + 1
+        self.unseen_idf = math.log(1 + self.n_docs) + 1
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float64))) * self.idf[terms]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=self.n_docs))
+        weights /= np.where(norms > 0, norms, 1)[rows]
+
+        # Postings sorted by term: term_ptr[t]:term_ptr[t + 1] are the docs containing t
+        order = np.argsort(terms, kind='stable')
+        self.post_docs, self.post_weights = rows[order], weights[order]
+        self.term_ptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(df, out=self.term_ptr[1:])
+        self.groups = None if groups is None else np.asarray(groups, dtype=np.int64)
+
+    def _vectorize(self, texts):
+        rows, terms, weights = [], [], []
+        for row, text in enumerate(texts):
+            counted = Counter(tokenize(text))
+            vector = {}
+            for term, n in counted.items():
+                index = self.vocabulary.get(term)
+                idf = self.idf[index] if index is not None else self.unseen_idf
+                vector[term] = (index, (1 + math.log(n)) * idf)
+            norm = math.sqrt(sum(w * w for _, w in vector.values())) or 1.0
+            for index, weight in vector.values():
+                if index is not None:   # unseen terms only lower the norm
+                    rows.append(row)
+                    terms.append(index)
+                    weights.append(weight / norm)
+        return (np.asarray(rows, dtype=np.int64), np.asarray(terms, dtype=np.int64),
+                np.asarray(weights, dtype=np.float64))
+
+    def query(self, texts, groups=None, k=DEFAULT_TOP_K, min_score=0.0, batch=QUERY_BATCH):
+        """Top-k (doc index, cosine) per query text, best first
+
+        With groups, a query only matches documents in the same group.
+        """
+        results = [[] for _ in texts]
+        for start in range(0, len(texts), batch):
+            chunk = texts[start:start + batch]
+            q_rows, q_terms, q_weights = self._vectorize(chunk)
+            if not len(q_rows):
+                continue
+            # Expand each query term into its postings
+            starts = self.term_ptr[q_terms]
+            lengths = self.term_ptr[q_terms + 1] - starts
+            owner = np.repeat(np.arange(len(q_terms)), lengths)
+            within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            postings = starts[owner] + within
+            docs = self.post_docs[postings]
+            rows = q_rows[owner]
+            contributions = q_weights[owner] * self.post_weights[postings]
+            if groups is not None and self.groups is not None:
+                query_groups = np.asarray(groups[start:start + batch], dtype=np.int64)
+                keep = self.groups[docs] == query_groups[rows]
+                docs, rows, contributions = docs[keep], rows[keep], contributions[keep]
+
+            # Sum contributions per (query, doc) pair
+            pairs, inverse = np.unique(rows * self.n_docs + docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=contributions)
+            pair_rows, pair_docs = pairs // self.n_docs, pairs % self.n_docs
+
+            order = np.lexsort((-scores, pair_rows))
+            pair_rows, pair_docs, scores = pair_rows[order], pair_docs[order], scores[order]
+            first = np.searchsorted(pair_rows, pair_rows, side='left')
+            rank = np.arange(len(pair_rows)) - first
+            keep = (rank < k) & (scores >= min_score)
+            for row, doc, score in zip(pair_rows[keep].tolist(), pair_docs[keep].tolist(),
+                                       scores[keep].tolist()):
+                results[start + row].append((doc, score))
+        return results
+
+
+def load_candidates(conn, rejection_paths=()):
+    """Every title the pipeline has seen, as Candidates"""
+    candidates = []
+    for m in load_mentions(conn):
+        kind = 'false_positive' if m.verified == 0 else 'stored'
+        candidates.append(Candidate(kind, m.client_name, m.title, m.link, str(m.id)))
+    for mention_id, client, title, link in conn.execute(DELETED_SQL):
+        candidates.append(Candidate('deleted', client, title, link, str(mention_id)))
+    for path in rejection_paths:
+        segments = segment_paths(path) if Path(path).is_dir() else [path]
+        for segment in segments:
+            candidates.extend(iter_rejections(segment))
+    return candidates
+
+
+def iter_rejections(path):
+    """Candidates from a JSONL rejection log (optionally gzipped)"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            yield Candidate('rejected', row.get('client') or row.get('clientName') or '',
+                            row.get('title') or '', row.get('url') or row.get('link'),
+                            row.get('reason') or '')
+
+
+@dataclass
+class Attribution:
+    missed: object          # ManualMention
+    attribution: str        # never_retrieved | retrieved_but_rejected | retrieved_other_url
+    match: Candidate = None
+    score: float = 0.0
+    method: str = ''        # url | title
+
+
+def attribute_misses(missed, candidates, min_score=DEFAULT_MIN_SCORE, k=DEFAULT_TOP_K,
+                     resolver=None):
+    """Attribute every missed ManualMention in one batched pass
+
+    Manual labels and candidate client names are grouped by the client they
+    resolve to (toolkit.clients); without a resolver, by normalized name.
+    """
+    resolver = resolver or ClientResolver([])
+    client_ids = {}
+
+    def group(name):
+        return client_ids.setdefault(resolver.key(name), len(client_ids))
+
+    by_url = {}
+    for index, c in enumerate(candidates):
+        key = url_key(c.link)
+        if key is not None:
+            # Prefer evidence of rejection over a stored copy of the same URL
+            previous = by_url.get((group(c.client), key))
+            if previous is None or c.kind in REJECTED_KINDS:
+                by_url[(group(c.client), key)] = index
+
+    index = TfidfIndex([c.title for c in candidates], [group(c.client) for c in candidates])
+    matches = index.query([m.title for m in missed], [group(m.client) for m in missed],
+                          k=k, min_score=min_score)
+
+    attributions = []
+    for m, hits in zip(missed, matches):
+        url_hit = by_url.get((group(m.client), url_key(m.link)))
+        if url_hit is not None:
+            best, score, method = candidates[url_hit], 1.0, 'url'
+        elif hits:
+            # Among near-equal hits, a rejection explains the miss better than a stored copy
+            top = hits[0][1]
+            doc, score = next(((d, s) for d, s in hits
+                               if candidates[d].kind in REJECTED_KINDS and s >= top - 0.05),
+                              hits[0])
+            best, method = candidates[doc], 'title'
+        else:
+            attributions.append(Attribution(m, 'never_retrieved'))
+            continue
+        kind = 'retrieved_but_rejected' if best.kind in REJECTED_KINDS else 'retrieved_other_url'
+        attributions.append(Attribution(m, kind, best, score, method))
+    return attributions
+
+
+def print_report(attributions):
+    print('=' * 80)
+    print('MISSED MENTIONS: Never retrieved vs retrieved but rejected')
+    print('=' * 80)
+    by_client = {}
+    for a in attributions:
+        by_client.setdefault(a.missed.client or '', Counter())[a.attribution] += 1
+    labels = ('never_retrieved', 'retrieved_but_rejected', 'retrieved_other_url')
+    print(f"\n{'Client':<36} {'Missed':>7} {'Never':>7} {'Rejected':>9} {'Other URL':>10}")
+    for client, counts in sorted(by_client.items(), key=lambda item: -sum(item[1].values())):
+        print(f"{client[:36]:<36} {sum(counts.values()):>7} " +
+              ' '.join(f"{counts[label]:>{w}}" for label, w in zip(labels, (7, 9, 10))))
+
+    reasons = Counter(f"{a.match.kind}:{a.match.ref}" if a.match.kind == 'rejected'
+                      else a.match.kind
+                      for a in attributions if a.attribution == 'retrieved_but_rejected')
+    if reasons:
+        print('\nRejected by:')
+        for reason, n in reasons.most_common():
+            print(f"  {reason:<40} {n:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Tracking workbook (one sheet per client); repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports without a title row')
+    parser.add_argument('--start', type=date.fromisoformat, help='Window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Window end (YYYY-MM-DD)')
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--rejections', nargs='*', default=[],
+                        help='Rejection log directories or JSONL files (client, title, url, '
+                             'reason)')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help='Cosine similarity needed for a title match')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    parser.add_argument('--csv', help='Write one row per missed mention to this CSV')
+    args = parser.parse_args(argv)
+
+    if not (args.workbook or args.manual):
+        parser.error('pass at least one --workbook or --manual input')
+
+    manual = list(iter_manual_sources(args.workbook, args.manual, args.client))
+    with closing(connect(args.db)) as conn:
+        auto = load_mentions(conn)
+        candidates = load_candidates(conn, args.rejections)
+        resolver = ClientResolver.from_db(conn)
+    results = compare_by_client(manual, auto, args.start, args.end, resolver).values()
+    missed = [m for r in results for m in r.missed]
+
+    attributions = attribute_misses(missed, candidates, args.min_score, args.top_k, resolver)
+    print_report(attributions)
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['client', 'date', 'title', 'link', 'attribution', 'method',
+                             'score', 'matchKind', 'matchRef', 'matchTitle', 'matchLink'])
+            for a in attributions:
+                m, c = a.missed, a.match
+                writer.writerow([m.client, m.date_str, m.title, m.link, a.attribution, a.method,
+                                 round(a.score, 3), c and c.kind, c and c.ref, c and c.title,
+                                 c and c.link])
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import gzip
+import json
+from datetime import date
+
+from .clients import ClientResolver
+from .records import ManualMention
+from .similarity import Candidate, TfidfIndex, attribute_misses, iter_rejections
+
+
+def missed(title, link='', client='EFI'):
+    return ManualMention(client, date(2025, 11, 1), '2025-11-01', 'Pub', title, '', link, 2)
+
+
+def test_index_ranks_by_cosine_within_group():
+    texts = ['Florida tomato growers face tariff pressure',
+             'Tomato growers in Florida warn of tariff pressure',
+             'Blueberry harvest starts early in Georgia',
+             'Florida tomato growers face tariff pressure']
+    index = TfidfIndex(texts, groups=[0, 0, 0, 1])
+    [hits] = index.query(['Florida tomato growers face tariff pressure'], groups=[0], k=2)
+    assert [doc for doc, _ in hits] == [0, 1]
+    assert abs(hits[0][1] - 1.0) < 1e-9
+    assert hits[0][1] > hits[1][1] > 0
+    assert index.query(['nothing shared here'], groups=[0]) == [[]]
+
+
+def test_misses_are_attributed_by_url_then_title():
+    candidates = [
+        Candidate('stored', 'EFI', 'Tractor safety tips for harvest season',
+                  'https://syndicated.com/tractor-safety', '1'),
+        Candidate('rejected', 'EFI', 'Growers meet to discuss labor shortages',
+                  'https://news.com/labor', 'article_too_old'),
+        Candidate('deleted', 'EFI', 'Irrelevant story', 'https://farm.com/x', '7'),
+        Candidate('rejected', 'Other', 'Drone spraying gains ground in orchards',
+                  'https://b.com/drones', 'own_domain'),
+    ]
+    result = attribute_misses([
+        missed('Tractor safety tips for the harvest season', 'https://origin.com/tractor'),
+        missed('Growers meet to discuss labor shortages', 'https://elsewhere.com/labor'),
+        missed('Completely different headline', 'https://www.farm.com/x/'),
+        missed('Drone spraying gains ground in orchards', 'https://c.com/drones'),
+    ], candidates)
+
+    assert [(a.attribution, a.method) for a in result] == [
+        ('retrieved_other_url', 'title'),
+        ('retrieved_but_rejected', 'title'),
+        ('retrieved_but_rejected', 'url'),
+        ('never_retrieved', ''),
+    ]
+    assert result[1].match.ref == 'article_too_old'
+
+
+def test_rejection_logs_read_gzipped_jsonl(tmp_path):
+    path = tmp_path / '2025-11-01.jsonl.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps({'client': 'EFI', 'title': 'T', 'url': 'https://a.com/t',
+                            'reason': 'social_media'}) + '\n\n')
+    assert list(iter_rejections(path)) == [
+        Candidate('rejected', 'EFI', 'T', 'https://a.com/t', 'social_media')
+    ]
+
+
+def test_manual_labels_group_with_resolved_client_names():
+    candidates = [Candidate('rejected', 'Equitable Food Initiative', 'Story',
+                            'https://a.com/story', 'article_too_old')]
+    resolver = ClientResolver([(1, 'Equitable Food Initiative')])
+
+    [unresolved] = attribute_misses([missed('Story', 'https://a.com/story')], candidates)
+    [resolved] = attribute_misses([missed('Story', 'https://a.com/story')], candidates,
+                                  resolver=resolver)
+
+    assert unresolved.attribution == 'never_retrieved'
+    assert (resolved.attribution, resolved.method) == ('retrieved_but_rejected', 'url')
@@ -0,0 +1,220 @@
+"""
+Fixed-memory sketches for approximate analytics
+
+Every sketch reports its figures as an Estimate carrying an error bound, so
+approximate reports say how far off they can be:
+
+- HyperLogLog: distinct counts, relative standard error 1.04 / sqrt(2**p)
+- CountMinSketch / TopK: frequencies and top-N, overestimate at most
+  epsilon * N with probability 1 - delta
+- BloomFilter: set membership with a bounded false-positive rate
+- Reservoir: uniform fixed-size sample, with proportions bounded by a
+  normal approximation
+
+Keys are hashed with 64-bit blake2b, so sketches built in different
+processes agree and can be merged.
+"""
+
+import hashlib
+import math
+import random
+from dataclasses import dataclass
+
+import numpy as np
+
+Z_95 = 1.96
+
+
+@dataclass(frozen=True)
+class Estimate:
+    value: float
+    error: float = 0.0          # half-width of the bound; 0 for exact figures
+    confidence: float = 1.0
+
+    @property
+    def exact(self):
+        return self.error == 0
+
+    def __str__(self):
+        if self.exact:
+            return f'{self.value:,.0f}'
+        return f'{self.value:,.0f} ±{self.error:,.0f} ({self.confidence:.0%})'
+
+    def as_dict(self):
+        return {'value': self.value, 'error': self.error, 'confidence': self.confidence}
+
+
+def hash64(keys):
+    """Stable 64-bit hashes of string keys as a uint64 array"""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(str(k).encode(), digest_size=8).digest(), 'little')
+         for k in keys),
+        dtype=np.uint64
+    )
+
+
+def _split_hashes(hashes):
+    # Two independent 32-bit halves for double hashing (Kirsch-Mitzenmacher)
+    return hashes & np.uint64(0xFFFFFFFF), (hashes >> np.uint64(32)) | np.uint64(1)
+
+
+class HyperLogLog:
+    """Distinct-count sketch using 2**p one-byte registers"""
+
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_many(self, keys):
+        self.add_hashes(hash64(keys))
+
+    def add_hashes(self, hashes):
+        if not len(hashes):
+            return
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - p bits;
+        # frexp gives the exact bit length because rest < 2**53
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (64 - self.p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            raw = m * math.log(m / zeros)   # linear counting for small cardinalities
+        return Estimate(raw, Z_95 * 1.04 / math.sqrt(m) * raw, 0.95)
+
+
+class CountMinSketch:
+    """Frequency sketch; estimates never undercount"""
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.epsilon, self.delta = epsilon, delta
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes):
+        h1, h2 = _split_hashes(hashes)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def add_hashes(self, hashes):
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], 1)
+        self.total += len(hashes)
+
+    def add_many(self, keys):
+        self.add_hashes(hash64(keys))
+
+    def counts(self, hashes):
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def error(self):
+        return self.epsilon * self.total
+
+    def estimate(self, key):
+        value = int(self.counts(hash64([key]))[0])
+        return Estimate(value, self.error(), 1 - self.delta)
+
+
+class TopK:
+    """Heavy hitters: a Count-Min sketch plus a bounded candidate set"""
+
+    def __init__(self, k=15, epsilon=0.001, delta=0.01, capacity=None):
+        self.k = k
+        self.capacity = capacity or max(4 * k, 64)
+        self.sketch = CountMinSketch(epsilon, delta)
+        self.candidates = {}
+
+    def add_many(self, keys, hashes=None):
+        keys = list(keys)
+        if not keys:
+            return
+        hashes = hash64(keys) if hashes is None else hashes
+        self.sketch.add_hashes(hashes)
+        unique = dict(zip(keys, hashes))
+        counts = self.sketch.counts(np.fromiter(unique.values(), dtype=np.uint64))
+        self.candidates.update(zip(unique, counts.tolist()))
+        if len(self.candidates) > self.capacity:
+            keep = sorted(self.candidates.items(), key=lambda item: -item[1])[:self.capacity]
+            self.candidates = dict(keep)
+
+    def top(self, n=None):
+        """[(key, Estimate)] for the n most frequent keys seen"""
+        error, confidence = self.sketch.error(), 1 - self.sketch.delta
+        ranked = sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))
+        return [(key, Estimate(count, error, confidence)) for key, count in ranked[:n or self.k]]
+
+
+class BloomFilter:
+    """Set membership with false-positive rate fp_rate at the expected size"""
+
+    def __init__(self, expected, fp_rate=0.01):
+        expected = max(expected, 1)
+        self.bits = max(64, math.ceil(-expected * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / expected * math.log(2)))
+        self.array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, hashes):
+        h1, h2 = _split_hashes(hashes)
+        rows = np.arange(self.hashes, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.bits)).astype(np.int64)
+
+    def add_many(self, keys):
+        hashes = hash64(keys)
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.array, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.count += len(hashes)
+
+    def contains_many(self, keys):
+        positions = self._positions(hash64(keys))
+        hits = (self.array[positions >> 3] >> (positions & 7)) & 1
+        return hits.all(axis=0)
+
+    def fp_rate(self):
+        """False-positive probability at the current fill"""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+
+class Reservoir:
+    """Uniform sample of at most size items from a stream (Algorithm R)"""
+
+    def __init__(self, size=20, seed=0):
+        self.size = size
+        self.items = []
+        self.seen = 0
+        self._random = random.Random(seed)
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        slot = self._random.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = item
+
+    def proportion(self, predicate):
+        """Share of the stream matching predicate, estimated from the sample"""
+        n = len(self.items)
+        if not n:
+            return Estimate(0.0)
+        share = sum(1 for item in self.items if predicate(item)) / n
+        if n == self.seen:
+            return Estimate(share)
+        # Normal approximation with finite population correction
+        fpc = math.sqrt((self.seen - n) / (self.seen - 1))
+        return Estimate(share, Z_95 * math.sqrt(share * (1 - share) / n) * fpc, 0.95)
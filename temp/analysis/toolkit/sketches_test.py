@@ -0,0 +1,77 @@
+import numpy as np
+
+from .sketches import BloomFilter, CountMinSketch, HyperLogLog, Reservoir, TopK
+
+
+def test_hyperloglog_is_within_its_bound():
+    hll = HyperLogLog(p=12)
+    for start in range(0, 50000, 10000):
+        hll.add_many(f'domain{i}.com' for i in range(start, start + 10000))
+    hll.add_many(f'domain{i}.com' for i in range(1000))  # repeats do not count
+
+    estimate = hll.estimate()
+    assert abs(estimate.value - 50000) <= estimate.error
+
+    small = HyperLogLog()
+    small.add_many(['a', 'b', 'c', 'a'])
+    assert round(small.estimate().value) == 3
+
+
+def test_hyperloglog_merge():
+    left, right = HyperLogLog(p=10), HyperLogLog(p=10)
+    left.add_many(str(i) for i in range(3000))
+    right.add_many(str(i) for i in range(2000, 5000))
+    left.merge(right)
+    estimate = left.estimate()
+    assert abs(estimate.value - 5000) <= estimate.error
+
+
+def test_count_min_never_undercounts():
+    sketch = CountMinSketch(epsilon=0.01, delta=0.01)
+    keys = [f'k{i % 500}' for i in range(20000)]
+    sketch.add_many(keys)
+
+    estimate = sketch.estimate('k7')
+    assert 40 <= estimate.value <= 40 + estimate.error
+    assert estimate.confidence == 0.99
+
+
+def test_top_k_finds_heavy_hitters():
+    rng = np.random.default_rng(1)
+    top = TopK(k=3, capacity=20)
+    background = [f'site{i}.com' for i in rng.integers(0, 5000, 20000)]
+    heavy = ['thepacker.com'] * 900 + ['producenews.com'] * 600 + ['freshplaza.com'] * 400
+    stream = background + heavy
+    rng.shuffle(stream)
+    for start in range(0, len(stream), 1000):
+        top.add_many(stream[start:start + 1000])
+
+    ranked = top.top()
+    assert [key for key, _ in ranked] == ['thepacker.com', 'producenews.com', 'freshplaza.com']
+    assert ranked[0][1].value >= 900
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(10000, fp_rate=0.01)
+    bloom.add_many(f'in{i}' for i in range(10000))
+
+    assert bloom.contains_many([f'in{i}' for i in range(10000)]).all()
+    false_positives = bloom.contains_many([f'out{i}' for i in range(10000)]).mean()
+    assert false_positives < 0.02
+    assert 0.005 < bloom.fp_rate() < 0.02
+
+
+def test_reservoir_sample_and_proportion():
+    reservoir = Reservoir(size=200, seed=3)
+    for i in range(10000):
+        reservoir.add(i)
+
+    assert len(reservoir.items) == 200 and reservoir.seen == 10000
+    share = reservoir.proportion(lambda i: i % 2 == 0)
+    assert abs(share.value - 0.5) <= share.error
+    assert share.confidence == 0.95
+
+    small = Reservoir(size=10)
+    for i in range(4):
+        small.add(i)
+    assert small.proportion(lambda i: i < 1).exact
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Snippet date extraction accuracy and the recall lost to bad dates
+
+Search results have dates read from their snippets in two places:
+- RULE 0 of filterResultsForClient (src/utils/searchFilters.js) rejects
+  results older than articleAgeDays as "article_too_old". It uses
+  extractSnippetDate, which reads an "Nov 21, 2024 —" or "3 days ago —"
+  prefix.
+- recordMentions (src/utils/mentions.js) falls back to
+  extractDateFromSnippet for mentionDate. That function reads the first
+  "Month DD, YYYY", then the first "YYYY-MM-DD", anywhere in the snippet.
+
+Both are ported here as scanners: an ordered list of compiled formats,
+where the first format that matches and yields a valid date wins. The port
+keeps the quirks of V8's Date parser that decide what these functions
+return:
+- a month word matches on its first three letters, so "Mayor 3, 2024 —"
+  reads as May 3
+- days up to 31 roll over into the next month
+- years 0-49 and 50-99 map to 2000-2049 and 1950-1999
+
+Dates whose month word is not a real month name are flagged as suspect.
+
+The scanners run over every logged rejection (the raw snippet, with
+loggedAt as "now" for relative dates) and every stored subjectMatter. The
+backend strips dates from stored snippets, so a date found there is a
+date cleanSnippet missed. Results are joined to the manual tracking sheets
+by client and canonical URL, and the report gives:
+- the parse error rate per scanner and format: parsed dates more than
+  --tolerance days from the manual date
+- the error rate of stored mentionDate values, for rows where a date was
+  found (mentionDate equal to createdAt means no date was found)
+- the port's agreement with the date RULE 0 logged
+- the recall lost to bad dates: manual mentions rejected as too old while
+  their manual date was inside the window, split into those that were
+  never stored and those that were stored by a later search
+
+Usage:
+    python -m toolkit.snippet_dates [--db PATH] [--rejections data/rejections] \\
+        [--workbook tracking.xlsx] [--manual manual.csv --client NAME] \\
+        [--start 2025-06-07] [--end 2025-12-04] [--tolerance 1] [--csv lost.csv]
+"""
+
+import argparse
+import csv
+import os
+import re
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from .clients import ClientResolver
+from .db import REPO_ROOT, connect, parse_timestamp
+from .manual import iter_manual_sources
+from .records import load_mentions
+from .rejections import DEFAULT_LOG_DIR, iter_records, segment_paths
+from .urls import url_key
+
+CONFIG_JS = REPO_ROOT / 'src' / 'config.js'
+DEFAULT_TOLERANCE_DAYS = 1
+DEFAULT_ARTICLE_AGE_DAYS = 180
+
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+MONTH_NAMES = frozenset(
+    MONTHS + ('january', 'february', 'march', 'april', 'june', 'july', 'august', 'sept',
+              'september', 'october', 'november', 'december'))
+
+# Milliseconds per unit in extractSnippetDate (months are 30 days, years 365)
+RELATIVE_SECONDS = {
+    'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400,
+    'month': 30 * 86400, 'year': 365 * 86400
+}
+
+# JS \b and \d are ASCII-only; JS \s also matches non-breaking spaces, like Python's
+_B = r'(?<![A-Za-z0-9_])'
+_E = r'(?![A-Za-z0-9_])'
+_DASH = r'\s*[—\-–]'
+_MONTH_WORDS = ('Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|'
+                'Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?')
+_JS_ARTICLE_AGE = re.compile(r'articleAgeDays:[^\n]*?\|\|\s*(\d+)')
+
+
+@dataclass(frozen=True)
+class SnippetDate:
+    date: date
+    format: str             # name of the format that matched
+    text: str               # matched snippet text
+    suspect: bool = False   # month word is not a month name
+
+
+def v8_month(word):
+    """Month number V8 reads from a word (its first three letters), or None"""
+    prefix = word[:3].lower()
+    return MONTHS.index(prefix) + 1 if prefix in MONTHS else None
+
+
+def v8_date(year, month, day):
+    """Calendar date of new Date(...) for numeric parts, or None when V8 rejects them"""
+    if 0 <= year <= 49:
+        year += 2000
+    elif 50 <= year <= 99:
+        year += 1900
+    if month is None or not 1 <= month <= 12 or not 1 <= day <= 31 or year < 1:
+        return None
+    # MakeDay rolls days past the end of the month into the next one
+    return date(year, month, 1) + timedelta(days=day - 1)
+
+
+def _absolute(match, now):
+    word, day, year = match.groups()
+    parsed = v8_date(int(year), v8_month(word), int(day))
+    if parsed is None:
+        return None
+    return SnippetDate(parsed, 'absolute', match.group(0), word.lower() not in MONTH_NAMES)
+
+
+def _relative(match, now):
+    if now is None:
+        return None
+    amount, unit = match.groups()
+    then = now - timedelta(seconds=int(amount) * RELATIVE_SECONDS[unit.lower()])
+    return SnippetDate(then.astimezone(timezone.utc).date(), 'relative', match.group(0))
+
+
+def _month_day_year(match, now):
+    word, day, year = match.groups()
+    parsed = v8_date(int(year), v8_month(word), int(day))
+    if parsed is None:
+        return None
+    return SnippetDate(parsed, 'month_day_year', match.group(0))
+
+
+def _iso(match, now):
+    # Date-only ISO strings are parsed as UTC and keep their 4-digit year
+    year, month, day = map(int, match.groups())
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= 31:
+        return None
+    return SnippetDate(date(year, month, 1) + timedelta(days=day - 1), 'iso', match.group(0))
+
+
+class DateScanner:
+    """Ordered formats; the first that matches and gives a valid date wins"""
+
+    def __init__(self, name, formats):
+        self.name = name
+        self.formats = [(re.compile(pattern, flags), convert)
+                        for pattern, flags, convert in formats]
+
+    def scan(self, snippet, now=None):
+        """SnippetDate or None; now (an aware datetime) resolves relative dates"""
+        if not snippet:
+            return None
+        for pattern, convert in self.formats:
+            match = pattern.search(snippet)
+            if match:
+                found = convert(match, now)
+                if found:
+                    return found
+        return None
+
+
+# extractSnippetDate in src/utils/searchFilters.js
+SNIPPET_PREFIX = DateScanner('extractSnippetDate', [
+    (r'^([A-Z][a-z]{2,8})\s+([0-9]{1,2}),?\s+([0-9]{4})' + _DASH, 0, _absolute),
+    (r'^([0-9]+)\s+(second|minute|hour|day|week|month|year)s?\s+ago' + _DASH, re.I, _relative),
+])
+
+# extractDateFromSnippet in src/utils/mentions.js
+SNIPPET_BODY = DateScanner('extractDateFromSnippet', [
+    (_B + f'({_MONTH_WORDS})' + r'\s+([0-9]{1,2}),?\s+([0-9]{4})' + _E, re.I, _month_day_year),
+    (_B + r'([0-9]{4})-([0-9]{2})-([0-9]{2})' + _E, 0, _iso),
+])
+
+SCANNERS = (SNIPPET_PREFIX, SNIPPET_BODY)
+
+
+def article_age_days(path=CONFIG_JS):
+    """config.filters.articleAgeDays: ARTICLE_AGE_DAYS or the config.js default"""
+    match = _JS_ARTICLE_AGE.search(path.read_text(encoding='utf-8'))
+    default = int(match.group(1)) if match else DEFAULT_ARTICLE_AGE_DAYS
+    # Number(process.env.ARTICLE_AGE_DAYS) || 180
+    try:
+        return int(os.environ.get('ARTICLE_AGE_DAYS', '')) or default
+    except ValueError:
+        return default
+
+
+def _moment(value):
+    seconds = parse_timestamp(value)
+    return datetime.fromtimestamp(seconds, timezone.utc) if seconds is not None else None
+
+
+def _key(resolver, client, link):
+    return resolver.key(client), url_key(link)
+
+
+@dataclass
+class Observation:
+    """One snippet: where it came from, what each scanner read, the manual date"""
+    origin: str               # 'rejection' or 'stored'
+    client: str
+    link: str
+    seen: datetime            # loggedAt or createdAt
+    parsed: dict              # scanner name -> SnippetDate or None
+    manual: date = None
+    record: dict = field(default_factory=dict)
+
+
+@dataclass
+class FormatStats:
+    scanned: int = 0
+    parsed: int = 0
+    suspect: int = 0
+    joined: int = 0
+    wrong: int = 0
+    errors_days: list = field(default_factory=list)
+
+    @property
+    def error_rate(self):
+        return self.wrong / self.joined if self.joined else 0.0
+
+
+@dataclass
+class LostMention:
+    client: str
+    title: str
+    link: str
+    manual: date
+    rejected_at: date
+    logged_date: date         # date RULE 0 used
+    date_source: str          # 'snippet' or 'meta'
+    snippet: str
+    stored: bool              # a later search stored it anyway
+
+
+def load_observations(conn, rejection_dir=DEFAULT_LOG_DIR):
+    """Observations for every logged rejection and stored mention, scanned by both scanners"""
+    observations = []
+    for path in segment_paths(rejection_dir):
+        for record in iter_records(path):
+            seen = _moment(record.get('loggedAt'))
+            snippet = record.get('snippet')
+            observations.append(Observation(
+                'rejection', record.get('client'), record.get('url'), seen,
+                {s.name: s.scan(snippet, seen) for s in SCANNERS}, record=record))
+    for m in load_mentions(conn):
+        seen = _moment(m.created_at)
+        observations.append(Observation(
+            'stored', m.client_name, m.link, seen,
+            {s.name: s.scan(m.subject_matter, seen) for s in SCANNERS},
+            record={'title': m.title, 'mentionDate': m.mention_date,
+                    'createdAt': m.created_at}))
+    return observations
+
+
+def join_manual(observations, manual, resolver=None):
+    """Set Observation.manual from manual mentions with a date, by client and canonical URL
+
+    Manual labels meet the logged and stored client names through resolver
+    (toolkit.clients); without one they are compared as normalized names.
+    """
+    resolver = resolver or ClientResolver([])
+    dates = {_key(resolver, m.client, m.link): m.date for m in manual if m.link and m.date}
+    for o in observations:
+        o.manual = dates.get(_key(resolver, o.client, o.link))
+    return dates
+
+
+def format_stats(observations, tolerance=DEFAULT_TOLERANCE_DAYS):
+    """{(scanner, origin, format): FormatStats}"""
+    stats, offsets = {}, {}
+    for scanner in SCANNERS:
+        for o in observations:
+            found = o.parsed[scanner.name]
+            group = (scanner.name, o.origin, found.format if found else '(none)')
+            s = stats.setdefault(group, FormatStats())
+            s.scanned += 1
+            if found:
+                s.parsed += 1
+                s.suspect += found.suspect
+                if o.manual:
+                    offsets.setdefault(group, []).append((found.date - o.manual).days)
+    for group, days in offsets.items():
+        off = np.asarray(days, dtype=np.int64)
+        wrong = np.abs(off) > tolerance
+        s = stats[group]
+        s.joined = len(off)
+        s.wrong = int(wrong.sum())
+        s.errors_days = off[wrong].tolist()
+    return stats
+
+
+def stored_date_errors(observations, tolerance=DEFAULT_TOLERANCE_DAYS):
+    """(joined, found, wrong) for stored mentionDate values against the manual date
+
+    mentionDate equal to createdAt means recordMentions found no date and
+    used the insert time.
+    """
+    joined = found = wrong = 0
+    for o in observations:
+        if o.origin != 'stored' or not o.manual:
+            continue
+        joined += 1
+        mention_date = o.record.get('mentionDate')
+        if not mention_date or mention_date == o.record.get('createdAt'):
+            continue
+        moment = _moment(mention_date)
+        if moment is None:
+            continue
+        found += 1
+        wrong += abs((moment.date() - o.manual).days) > tolerance
+    return joined, found, wrong
+
+
+def port_agreement(observations, tolerance=DEFAULT_TOLERANCE_DAYS):
+    """(checked, agreeing) article_too_old rejections whose logged snippet date the port matches"""
+    checked = agreeing = 0
+    for o in observations:
+        r = o.record
+        if o.origin != 'rejection' or r.get('reason') != 'article_too_old' or \
+                r.get('dateSource') != 'snippet':
+            continue
+        logged = _moment(r.get('publishedAt'))
+        found = o.parsed[SNIPPET_PREFIX.name]
+        if logged is None:
+            continue
+        checked += 1
+        agreeing += bool(found) and abs((found.date - logged.date()).days) <= tolerance
+    return checked, agreeing
+
+
+def lost_recall(observations, manual, max_age_days, resolver=None):
+    """LostMention for every manual mention wrongly rejected as too old
+
+    A rejection is wrong when the manual date was within max_age_days of
+    the time the result was rejected.
+    """
+    resolver = resolver or ClientResolver([])
+    titles = {_key(resolver, m.client, m.link): m.title for m in manual if m.link}
+    stored = {_key(resolver, o.client, o.link) for o in observations if o.origin == 'stored'}
+    lost = {}
+    for o in observations:
+        r = o.record
+        if o.origin != 'rejection' or r.get('reason') != 'article_too_old' or not o.manual \
+                or o.seen is None:
+            continue
+        if (o.seen.date() - o.manual).days > max_age_days:
+            continue
+        key = _key(resolver, o.client, o.link)
+        logged = _moment(r.get('publishedAt'))
+        lost.setdefault(key, LostMention(
+            o.client, titles.get(key, r.get('title') or ''), o.link, o.manual, o.seen.date(),
+            logged.date() if logged else None, r.get('dateSource') or 'unknown',
+            r.get('snippet') or '', key in stored))
+    return sorted(lost.values(), key=lambda m: (m.client or '', m.manual))
+
+
+def print_report(observations, manual_dates, stats, stored_errors, agreement, lost,
+                 tolerance=DEFAULT_TOLERANCE_DAYS):
+    print('=' * 80)
+    print('SNIPPET DATE EXTRACTION')
+    print('=' * 80)
+    origins = Counter(o.origin for o in observations)
+    joined = sum(1 for o in observations if o.manual)
+    print(f"\nSnippets scanned: {origins['rejection']} logged rejections, "
+          f"{origins['stored']} stored mentions")
+    print(f"Joined to a manual date: {joined} (of {len(manual_dates)} dated manual links)")
+
+    print(f"\n{'Scanner':<24} {'Origin':<10} {'Format':<15} {'Parsed':>7} {'Suspect':>8} "
+          f"{'Joined':>7} {'Wrong':>6} {'Error':>7}")
+    for (name, origin, fmt), s in sorted(stats.items()):
+        if fmt == '(none)':
+            continue
+        print(f"{name:<24} {origin:<10} {fmt:<15} {s.parsed:>7} {s.suspect:>8} {s.joined:>7} "
+              f"{s.wrong:>6} {s.error_rate * 100:>6.1f}%")
+        if s.errors_days:
+            off = np.abs(s.errors_days)
+            print(f"{'':<51} median {np.median(off):.0f} days off, max {off.max()} days")
+
+    stored_joined, stored_found, stored_wrong = stored_errors
+    if stored_joined:
+        rate = stored_wrong / stored_found * 100 if stored_found else 0.0
+        print(f"\nStored mentionDate vs manual date (±{tolerance} days):")
+        print(f"  {stored_joined} joined, {stored_found} with a found date, "
+              f"{stored_wrong} wrong ({rate:.1f}%)")
+
+    checked, agreeing = agreement
+    if checked:
+        print(f"\nPort vs logged RULE 0 snippet dates: {agreeing} of {checked} agree "
+              f"({agreeing / checked * 100:.1f}%)")
+
+    print('\nRecall lost to bad dates (manual mentions rejected as article_too_old '
+          'inside the window):')
+    if not lost:
+        print('  None')
+        return
+    never = [m for m in lost if not m.stored]
+    print(f"  {len(lost)} wrongly rejected, {len(never)} never stored "
+          f"({len(never) / len(manual_dates) * 100 if manual_dates else 0:.1f}% of dated "
+          f"manual links)")
+    for source, n in Counter(m.date_source for m in never).most_common():
+        print(f"    {source:<10} {n:>6}")
+    for m in never[:20]:
+        print(f"  {m.client} | manual {m.manual} | read {m.logged_date} ({m.date_source}) | "
+              f"{m.snippet[:40]!r} | {m.link}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--rejections', default=str(DEFAULT_LOG_DIR),
+                        help='Rejection log directory')
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Manual tracking workbook; repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports')
+    parser.add_argument('--start', type=date.fromisoformat, help='Manual window start')
+    parser.add_argument('--end', type=date.fromisoformat, help='Manual window end')
+    parser.add_argument('--tolerance', type=int, default=DEFAULT_TOLERANCE_DAYS,
+                        help='Days a parsed date may differ from the manual date')
+    parser.add_argument('--max-age-days', type=int,
+                        help='RULE 0 window (default: articleAgeDays from config.js)')
+    parser.add_argument('--csv', help='Write the wrongly rejected manual mentions to this CSV')
+    args = parser.parse_args(argv)
+
+    manual = [m for m in iter_manual_sources(args.workbook, args.manual, args.client)
+              if (not args.start or (m.date and m.date >= args.start))
+              and (not args.end or (m.date and m.date <= args.end))]
+    with closing(connect(args.db)) as conn:
+        observations = load_observations(conn, args.rejections)
+        resolver = ClientResolver.from_db(conn)
+    manual_dates = join_manual(observations, manual, resolver)
+    lost = lost_recall(observations, manual, args.max_age_days or article_age_days(), resolver)
+    print_report(observations, manual_dates, format_stats(observations, args.tolerance),
+                 stored_date_errors(observations, args.tolerance),
+                 port_agreement(observations, args.tolerance), lost, args.tolerance)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['client', 'manual_date', 'rejected_at', 'read_date', 'date_source',
+                             'stored_later', 'title', 'link', 'snippet'])
+            for m in lost:
+                writer.writerow([m.client, m.manual, m.rejected_at, m.logged_date, m.date_source,
+                                 int(m.stored), m.title, m.link, m.snippet])
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
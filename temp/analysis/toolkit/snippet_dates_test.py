@@ -0,0 +1,98 @@
+import gzip
+import json
+from contextlib import closing
+from datetime import date, datetime, timezone
+
+from .clients import ClientResolver
+from .conftest import insert_mention
+from .db import connect
+from .records import ManualMention
+from .snippet_dates import (SNIPPET_BODY, SNIPPET_PREFIX, Observation, format_stats,
+                            join_manual, load_observations, lost_recall, port_agreement,
+                            stored_date_errors)
+
+NOW = datetime(2025, 11, 10, 12, tzinfo=timezone.utc)
+
+
+def manual(link, day, client='EFI', title='Manual story'):
+    return ManualMention(client, day, day.isoformat(), 'Outlet', title, '', link, 2)
+
+
+def test_prefix_scanner_follows_extract_snippet_date():
+    found = SNIPPET_PREFIX.scan('Nov 21, 2024 — Growers said', NOW)
+    assert (found.date, found.format, found.suspect) == (date(2024, 11, 21), 'absolute', False)
+    assert SNIPPET_PREFIX.scan('3 days ago – Growers said', NOW).date == date(2025, 11, 7)
+    assert SNIPPET_PREFIX.scan('2 Weeks ago - x', NOW).date == date(2025, 10, 27)
+    # V8 reads any word by its first three letters and rolls day overflow forward
+    assert SNIPPET_PREFIX.scan('Mayor 3, 2024 — said', NOW).suspect
+    assert SNIPPET_PREFIX.scan('Feb 30, 2024 — x', NOW).date == date(2024, 3, 1)
+    assert SNIPPET_PREFIX.scan('Updated 3, 2024 — x', NOW) is None
+    assert SNIPPET_PREFIX.scan('Growers said on Nov 21, 2024 — x', NOW) is None
+    assert SNIPPET_PREFIX.scan('3 days ago — x') is None
+
+
+def test_body_scanner_follows_extract_date_from_snippet():
+    assert SNIPPET_BODY.scan('The nov 3 2024 report').date == date(2024, 11, 3)
+    # Month-day-year wins over an earlier ISO date
+    found = SNIPPET_BODY.scan('Posted 2024-01-05, updated December 3, 2024')
+    assert (found.date, found.format) == (date(2024, 12, 3), 'month_day_year')
+    assert SNIPPET_BODY.scan('filed 2024-02-05 x').format == 'iso'
+    assert SNIPPET_BODY.scan('Sept 5, 2024 said') is None
+    assert SNIPPET_BODY.scan('ref 12024-02-05 and 2024-13-01') is None
+
+
+def test_reports_errors_and_lost_recall(db_path, db, tmp_path):
+    db.execute("INSERT INTO clients (name, contactEmail) VALUES ('EFI', 'a@b.c')")
+    insert_mention(db, link='https://thepacker.com/later', subjectMatter='Growers said',
+                   mentionDate='2025-10-01T00:00:00.000Z')
+    # No date found: recordMentions used the insert time
+    insert_mention(db, link='https://thepacker.com/none', subjectMatter='x',
+                   mentionDate='2025-11-01T12:00:00.000Z')
+    rejections = [
+        # Real date Oct 1 2025, but the snippet prefix is a stale "updated" date
+        {'reason': 'article_too_old', 'url': 'https://www.thepacker.com/later/',
+         'snippet': 'Jan 5, 2024 — EFI', 'publishedAt': '2024-01-05T05:00:00.000Z',
+         'dateSource': 'snippet'},
+        {'reason': 'article_too_old', 'url': 'https://agweb.com/lost',
+         'snippet': 'Mayor 3, 2024 — EFI', 'publishedAt': '2024-05-03T04:00:00.000Z',
+         'dateSource': 'snippet'},
+        {'reason': 'article_too_old', 'url': 'https://agweb.com/old',
+         'snippet': 'Mar 1, 2024 — EFI', 'publishedAt': '2024-03-01T05:00:00.000Z',
+         'dateSource': 'snippet'},
+        {'reason': 'name_not_in_snippet', 'url': 'https://agweb.com/other',
+         'snippet': '2 days ago — x'},
+    ]
+    lines = '\n'.join(json.dumps({'loggedAt': '2025-11-10T12:00:00.000Z', 'client': 'EFI', **r})
+                      for r in rejections)
+    (tmp_path / 'rejections').mkdir()
+    (tmp_path / 'rejections' / '2025-11-10.jsonl.gz').write_bytes(gzip.compress(lines.encode()))
+
+    sheet = [manual('https://thepacker.com/later', date(2025, 10, 1)),
+             manual('https://agweb.com/lost', date(2025, 9, 20)),
+             manual('https://agweb.com/old', date(2024, 3, 1)),
+             manual('https://thepacker.com/none', date(2025, 11, 1))]
+    with closing(connect(db_path)) as conn:
+        observations = load_observations(conn, tmp_path / 'rejections')
+    assert len(join_manual(observations, sheet)) == 4
+
+    stats = format_stats(observations)
+    absolute = stats[('extractSnippetDate', 'rejection', 'absolute')]
+    assert (absolute.parsed, absolute.suspect, absolute.joined, absolute.wrong) == (3, 1, 3, 2)
+    assert stats[('extractSnippetDate', 'rejection', 'relative')].parsed == 1
+    assert stored_date_errors(observations) == (2, 1, 0)
+    assert port_agreement(observations) == (3, 3)
+
+    lost = lost_recall(observations, sheet, max_age_days=180)
+    assert [(m.link, m.stored, m.logged_date) for m in lost] == [
+        ('https://agweb.com/lost', False, date(2024, 5, 3)),
+        ('https://www.thepacker.com/later/', True, date(2024, 1, 5))]
+
+
+def test_join_manual_resolves_sheet_labels_to_client_names():
+    observation = Observation('stored', 'Equitable Food Initiative', 'https://a.com/1', NOW, {})
+    sheet = [manual('https://a.com/1', date(2025, 11, 1))]
+
+    join_manual([observation], sheet)
+    assert observation.manual is None
+    join_manual([observation], sheet, ClientResolver([(1, 'Equitable Food Initiative')]))
+    assert observation.manual == date(2025, 11, 1)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Fingerprint-keyed on-disk cache for analysis stage results
+
+Expensive stages (manual ingest plus coverage comparison, gap
+classification) are re-run many times a day on unchanged inputs. A stage
+result is stored under a fingerprint of everything it depends on:
+- the stage name and its parameters (client, window, thresholds, ...)
+- the content hash of every input file (workbooks, CSV exports)
+- the database watermark: row counts and highest id / updatedAt of the
+  tables the toolkit reads
+- the toolkit source, so a code change never returns a stale result
+
+A stage with the same fingerprint returns the pickled result immediately.
+Entries are gzipped pickles in one directory. Hits refresh an entry's
+modification time, and writes evict the least recently used entries until
+the directory fits in the size budget. Entries can also be invalidated by
+stage, or all at once.
+
+The directory defaults to data/analysis-cache (ANALYSIS_CACHE_DIR) and the
+budget to 256 MB (ANALYSIS_CACHE_MAX_MB).
+
+Usage:
+    python -m toolkit.stage_cache [--dir PATH] [--invalidate STAGE ...] [--clear]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import pickle
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from .db import REPO_ROOT, column_names, connect, database_path
+
+DEFAULT_CACHE_DIR = REPO_ROOT / 'data' / 'analysis-cache'
+DEFAULT_MAX_MB = 256
+ENTRY_SUFFIX = '.pkl.gz'
+TOOLKIT_DIR = Path(__file__).resolve().parent
+
+# Tables whose contents feed the toolkit's stages
+WATERMARK_TABLES = ('mediaMentions', 'deletedMentions', 'clients', 'publications')
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path, size, mtime_ns):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    """sha256 of a file's contents (re-hashed only when size or mtime change)"""
+    stat = os.stat(path)
+    return _file_digest(str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def toolkit_hash():
+    """Hash of the toolkit's Python sources"""
+    digest = hashlib.sha256()
+    for path in sorted(TOOLKIT_DIR.glob('*.py')):
+        if not path.name.endswith('_test.py'):
+            digest.update(path.name.encode())
+            digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+def db_watermark(path=None):
+    """Counts and highest id / updatedAt per table; changes whenever their rows do"""
+    watermark = {}
+    with closing(connect(path or database_path())) as conn:
+        for table in WATERMARK_TABLES:
+            columns = column_names(conn, table)
+            if not columns:
+                continue
+            updated = 'MAX(updatedAt)' if 'updatedAt' in columns else 'NULL'
+            row = conn.execute(f'SELECT COUNT(*), MAX(id), {updated} FROM {table}').fetchone()
+            watermark[table] = list(row)
+    return watermark
+
+
+def _jsonable(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f'Cannot fingerprint {type(value).__name__}')
+
+
+def fingerprint(stage, files=(), db=False, db_path=None, **params):
+    """Hex key for a stage run
+
+    files are hashed by content. With db=True the database watermark is part
+    of the key. params must be JSON-serializable (dates and paths are fine).
+    """
+    material = {
+        'stage': stage,
+        'code': toolkit_hash(),
+        'files': [file_hash(p) for p in files],
+        'db': db_watermark(db_path) if db else None,
+        'params': params
+    }
+    encoded = json.dumps(material, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    stage: str
+    key: str
+    path: Path
+    size: int
+    used: float
+
+
+class StageCache:
+    """Size-bounded LRU store of stage results on disk"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = Path(directory or os.environ.get('ANALYSIS_CACHE_DIR')
+                              or DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_mb = float(os.environ.get('ANALYSIS_CACHE_MAX_MB') or DEFAULT_MAX_MB)
+            max_bytes = int(max_mb * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, stage, key):
+        return self.directory / f'{stage}--{key}{ENTRY_SUFFIX}'
+
+    def entries(self):
+        """Cached entries, least recently used first"""
+        found = []
+        for path in self.directory.glob(f'*{ENTRY_SUFFIX}'):
+            stage, _, key = path.name[:-len(ENTRY_SUFFIX)].rpartition('--')
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append(CacheEntry(stage, key, path, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda e: e.used)
+
+    def get(self, stage, key):
+        """(True, result) on a hit, (False, None) on a miss or unreadable entry"""
+        path = self._path(stage, key)
+        try:
+            with gzip.open(path, 'rb') as f:
+                result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.misses += 1
+            return False, None
+        os.utime(path)   # mark as recently used
+        self.hits += 1
+        return True, result
+
+    def put(self, stage, key, result):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(stage, key)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with gzip.open(tmp, 'wb', compresslevel=1) as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self.evict(keep=path)
+
+    def run(self, stage, compute, files=(), db=False, db_path=None, **params):
+        """Cached result of compute() for this stage and fingerprint"""
+        key = fingerprint(stage, files, db, db_path, **params)
+        hit, result = self.get(stage, key)
+        if not hit:
+            result = compute()
+            self.put(stage, key, result)
+        return result
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits; returns bytes freed"""
+        entries = self.entries()
+        total = sum(e.size for e in entries)
+        freed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry.path == keep:
+                continue
+            entry.path.unlink(missing_ok=True)
+            total -= entry.size
+            freed += entry.size
+        return freed
+
+    def invalidate(self, stage=None):
+        """Remove every entry (or every entry of one stage); returns entries removed"""
+        removed = 0
+        for entry in self.entries():
+            if stage is None or entry.stage == stage:
+                entry.path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dir', help='Cache directory (default: ANALYSIS_CACHE_DIR)')
+    parser.add_argument('--invalidate', nargs='+', metavar='STAGE',
+                        help='Remove the cached results of these stages')
+    parser.add_argument('--clear', action='store_true', help='Remove every cached result')
+    args = parser.parse_args(argv)
+
+    cache = StageCache(args.dir)
+    if args.clear:
+        print(f"Removed {cache.invalidate()} cached results")
+    for stage in args.invalidate or []:
+        print(f"Removed {cache.invalidate(stage)} cached results for {stage}")
+
+    entries = cache.entries()
+    print('=' * 80)
+    print(f"STAGE CACHE: {cache.directory}")
+    print('=' * 80)
+    total = sum(e.size for e in entries)
+    print(f"\n{len(entries)} entries, {total / 1024 / 1024:.1f} of "
+          f"{cache.max_bytes / 1024 / 1024:.0f} MB")
+    by_stage = {}
+    for e in entries:
+        count, size = by_stage.get(e.stage, (0, 0))
+        by_stage[e.stage] = (count + 1, size + e.size)
+    for stage, (count, size) in sorted(by_stage.items()):
+        print(f"  {stage:<32} {count:>5} entries {size / 1024:>10.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
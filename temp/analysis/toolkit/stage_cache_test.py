@@ -0,0 +1,66 @@
+import os
+from datetime import date
+
+from .conftest import insert_mention
+from .stage_cache import StageCache, fingerprint
+
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+    return compute, calls
+
+
+def test_fingerprint_tracks_files_database_and_params(tmp_path, db, db_path):
+    export = tmp_path / 'export.csv'
+    export.write_text('Link,Date\n', encoding='utf-8')
+
+    def key(**params):
+        return fingerprint('coverage', [export], db=True, db_path=db_path,
+                           client='EFI', start=date(2025, 6, 7), **params)
+
+    base = key()
+    assert key() == base
+    assert key(end=date(2025, 12, 4)) != base
+
+    export.write_text('Link,Date\nhttps://a.com/1,2025-01-02\n', encoding='utf-8')
+    edited = key()
+    assert edited != base
+    insert_mention(db, link='https://a.com/1')
+    assert key() != edited
+
+
+def test_hits_skip_the_stage_until_invalidated(tmp_path):
+    cache = StageCache(tmp_path / 'cache')
+    compute, calls = counting({'rate': 0.5})
+
+    assert cache.run('coverage', compute, client='EFI') == {'rate': 0.5}
+    assert cache.run('coverage', compute, client='EFI') == {'rate': 0.5}
+    assert len(calls) == 1 and cache.hits == 1
+    cache.run('gaps', compute, client='EFI')
+
+    assert cache.invalidate('coverage') == 1
+    cache.run('coverage', compute, client='EFI')
+    assert len(calls) == 3
+    assert cache.invalidate() == 2
+
+
+def test_writes_evict_least_recently_used_entries(tmp_path):
+    cache = StageCache(tmp_path / 'cache', max_bytes=10 ** 9)
+    paths = []
+    for n in range(3):
+        cache.run('stage', lambda: os.urandom(2000), n=n)
+        [path] = set(e.path for e in cache.entries()) - set(paths)
+        os.utime(path, (1000 + n, 1000 + n))
+        paths.append(path)
+
+    cache.run('stage', lambda: None, n=0)            # hit: n=0 becomes most recent
+    cache.max_bytes = sum(e.size for e in cache.entries()) - 1
+    cache.run('stage', lambda: 'small', n=3)
+
+    remaining = {e.path for e in cache.entries()}
+    assert paths[1] not in remaining
+    assert {paths[0], paths[2]} <= remaining
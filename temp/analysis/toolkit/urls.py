@@ -0,0 +1,79 @@
+"""
+URL helpers shared by the analysis toolkit
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Host prefixes that point at the same outlet as the bare domain
+HOST_PREFIXES = ('www.', 'm.', 'amp.', 'mobile.')
+
+# Same list as normalizeUrlForComparison in src/utils/mentions.js
+TRACKING_PARAMS = frozenset({
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_content', 'utm_term',
+    'fbclid', 'gclid', 'ref', 'source'
+})
+
+
+def canonical_url(url):
+    """Python port of normalizeUrlForComparison (src/utils/mentions.js)
+
+    Forces https, lowercases, drops tracking params and the trailing slash.
+    This is the form stored in mediaMentions.link. Returns None for
+    values that are not absolute URLs.
+    """
+    if not url:
+        return None
+    try:
+        parts = urlsplit(str(url).strip())
+        host = parts.hostname
+    except ValueError:
+        return None
+    if not parts.scheme or not host:
+        return None
+
+    path = parts.path or '/'
+    normalized = f'https://{host}{path}'
+    if normalized.endswith('/') and path != '/':
+        normalized = normalized[:-1]
+
+    params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+              if k not in TRACKING_PARAMS]
+    if params:
+        normalized += '?' + urlencode(params)
+    return normalized.lower()
+
+
+def url_key(url):
+    """Join key for matching manual links to stored mentions
+
+    The canonical URL without scheme and without www./m./amp. host
+    prefixes, so http/https and mobile variants of one article meet.
+    """
+    canonical = canonical_url(url)
+    if canonical is None:
+        return None
+    host, sep, tail = canonical[len('https://'):].partition('/')
+    return f'{host_key(host)}{sep}{tail}'.rstrip('/')
+
+
+def host_key(value):
+    """Lowercased host of a URL or bare domain, without www./m./amp. prefixes
+
+    Returns None when no host can be found.
+    """
+    if not value:
+        return None
+    value = str(value).strip().lower()
+    if '://' not in value:
+        value = f'//{value}'
+    try:
+        host = urlsplit(value).hostname
+    except ValueError:
+        return None
+    if not host or '.' not in host:
+        return None
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count('.') > 1:
+            host = host[len(prefix):]
+            break
+    return host
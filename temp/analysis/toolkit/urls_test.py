@@ -0,0 +1,21 @@
+from .urls import canonical_url, host_key, url_key
+
+
+def test_canonical_url_matches_backend_normalization():
+    assert (canonical_url('http://www.ThePacker.com/News/X/?utm_source=a&id=2')
+            == 'https://www.thepacker.com/news/x?id=2')
+    assert canonical_url('https://example.com/') == 'https://example.com/'
+    assert canonical_url('example.com/x') is None
+    assert canonical_url('') is None
+
+
+def test_url_key_joins_scheme_and_mobile_variants():
+    assert url_key('https://m.thepacker.com/a/') == url_key('http://www.thepacker.com/a')
+    assert url_key('https://thepacker.com/') == 'thepacker.com'
+
+
+def test_host_key():
+    assert host_key('https://www.freshplaza.com/article') == 'freshplaza.com'
+    assert host_key('amp.thepacker.com') == 'thepacker.com'
+    assert host_key('www.com') == 'www.com'
+    assert host_key('not a host') is None
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Per-domain verification latency and block rates
+
+Reads the verification attempt log that src/utils/verificationEvents.js
+writes to data/verification-events/YYYY-MM-DD.jsonl.gz. There is one event
+per attempt, with these fields: domain, method (snippet, fetch, browser,
+none), durationMs, status, fetchStatus, blocked, retry, reason and
+verified. blocked describes the attempt's final method. A browser attempt
+that followed a refused fetch carries the fetch status in fetchStatus, and
+it also counts as a fetch attempt (blocked by that status, with no
+duration of its own). The attempts are aggregated per domain and method:
+- attempt counts
+- latency percentiles
+- block rate
+- review rate (attempts left at verified = NULL)
+- retry rate
+
+Each domain with enough attempts gets a recommendation:
+- skip: fetch and browser are both refused almost every time, so mentions
+  from the domain should go straight to manual review (or the domain
+  should be blocked)
+- browser_first: fetch is usually refused but the browser gets through, so
+  the fetch attempt is wasted time
+
+Percentiles are computed for every group at once over one sorted array.
+
+Usage:
+    python -m toolkit.verify_events [--dir data/verification-events] [--since 2025-11-01] \\
+        [--min-attempts 5] [--top 30] [--json domains.json]
+"""
+
+import argparse
+import json
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import date
+
+import numpy as np
+
+from .db import REPO_ROOT
+from .rejections import segment_paths
+from .urls import host_key
+
+DEFAULT_LOG_DIR = REPO_ROOT / 'data' / 'verification-events'
+DEFAULT_PERCENTILES = (50, 90, 99)
+DEFAULT_MIN_ATTEMPTS = 5
+SKIP_BLOCK_RATE = 0.8
+BROWSER_FIRST_FETCH_BLOCK_RATE = 0.5
+BROWSER_FIRST_BROWSER_BLOCK_RATE = 0.2
+
+METHODS = ('fetch', 'browser', 'snippet', 'none')
+
+# HTTP statuses that mean the site refused us (verificationEvents.js)
+BLOCKED_STATUSES = (401, 403, 429)
+
+
+@dataclass
+class MethodStats:
+    attempts: int
+    blocked: int
+    needs_review: int
+    retries: int
+    percentiles_ms: dict      # {50: ms, 90: ms, ...}
+
+    @property
+    def block_rate(self):
+        return self.blocked / self.attempts if self.attempts else 0.0
+
+
+@dataclass
+class DomainStats:
+    domain: str
+    attempts: int = 0
+    total_ms: int = 0
+    methods: dict = field(default_factory=dict)    # method -> MethodStats
+    recommendation: str = None
+
+    @property
+    def block_rate(self):
+        blocked = sum(m.blocked for m in self.methods.values())
+        return blocked / self.attempts if self.attempts else 0.0
+
+
+def complete_members(data):
+    """Decompressed bytes of the complete gzip members at the start of data
+
+    verificationEvents.js appends one member per batch; a member it is still
+    writing is left out, so the next run picks it up.
+    """
+    out = []
+    while data:
+        member = zlib.decompressobj(wbits=31)
+        try:
+            text = member.decompress(data)
+        except zlib.error:
+            break
+        if not member.eof:
+            break
+        out.append(text)
+        data = member.unused_data
+    return b''.join(out)
+
+
+def load_events(directory=DEFAULT_LOG_DIR, since=None):
+    """Attempt events from every segment on or after `since`"""
+    events = []
+    for path in segment_paths(directory):
+        if since and path.name[:10] < since.isoformat():
+            continue
+        text = complete_members(path.read_bytes()).decode('utf-8')
+        events.extend(json.loads(line) for line in text.splitlines() if line.strip())
+    return events
+
+
+def group_percentiles(groups, values, percentiles=DEFAULT_PERCENTILES):
+    """{group: [percentile values]} with linear interpolation, for all groups at once"""
+    if not len(values):
+        return {}
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order].astype(np.float64)
+    unique, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    q = np.asarray(percentiles, dtype=np.float64) / 100
+    position = starts[:, None] + (counts[:, None] - 1) * q[None, :]
+    lo = np.floor(position).astype(np.int64)
+    hi = np.ceil(position).astype(np.int64)
+    result = values[lo] + (values[hi] - values[lo]) * (position - lo)
+    return dict(zip(unique.tolist(), result.tolist()))
+
+
+def recommend(stats, min_attempts=DEFAULT_MIN_ATTEMPTS):
+    fetch = stats.methods.get('fetch')
+    browser = stats.methods.get('browser')
+    if stats.attempts < min_attempts:
+        return None
+    if stats.block_rate >= SKIP_BLOCK_RATE and (browser is None or
+                                                browser.block_rate >= SKIP_BLOCK_RATE):
+        return 'skip'
+    if (fetch and browser and fetch.block_rate >= BROWSER_FIRST_FETCH_BLOCK_RATE
+            and browser.block_rate <= BROWSER_FIRST_BROWSER_BLOCK_RATE):
+        return 'browser_first'
+    return None
+
+
+def attempt_legs(events):
+    """(domain, method, durationMs, blocked, needs review, retried) per method tried
+
+    A browser event with a fetchStatus yields a fetch leg first. That leg is
+    blocked when the status is a refusal. It has no duration, because the
+    event's durationMs covers both legs, and it is never left for review,
+    because the browser took over.
+    """
+    for e in events:
+        domain = host_key(e.get('domain')) or '(none)'
+        retried = (e.get('retry') or 0) > 0
+        if e.get('method') == 'browser' and e.get('fetchStatus') is not None:
+            yield domain, 'fetch', None, e['fetchStatus'] in BLOCKED_STATUSES, False, retried
+        method = e.get('method') if e.get('method') in METHODS else 'none'
+        yield (domain, method, e.get('durationMs') or 0, bool(e.get('blocked')),
+               e.get('verified') is None, retried)
+
+
+def analyze(events, percentiles=DEFAULT_PERCENTILES, min_attempts=DEFAULT_MIN_ATTEMPTS):
+    """DomainStats per domain, busiest first"""
+    legs = list(attempt_legs(events))
+    if not legs:
+        return []
+    domains, methods, durations, blocked, review, retried = zip(*legs)
+    domain_ids = {name: i for i, name in enumerate(sorted(set(domains)))}
+    domain_codes = np.fromiter((domain_ids[d] for d in domains), dtype=np.int64,
+                               count=len(legs))
+    method_codes = np.fromiter((METHODS.index(m) for m in methods), dtype=np.int64,
+                               count=len(legs))
+    timed = np.fromiter((d is not None for d in durations), dtype=np.bool_, count=len(legs))
+    durations = np.fromiter((d or 0 for d in durations), dtype=np.int64, count=len(legs))
+    blocked = np.array(blocked, dtype=np.bool_)
+    review = np.array(review, dtype=np.bool_)
+    retried = np.array(retried, dtype=np.bool_)
+
+    # One group per (domain, method)
+    groups = domain_codes * len(METHODS) + method_codes
+    size = len(domain_ids) * len(METHODS)
+    attempts = np.bincount(groups, minlength=size)
+    blocked_n = np.bincount(groups, weights=blocked, minlength=size).astype(np.int64)
+    review_n = np.bincount(groups, weights=review, minlength=size).astype(np.int64)
+    retried_n = np.bincount(groups, weights=retried, minlength=size).astype(np.int64)
+    total_ms = np.bincount(domain_codes, weights=durations, minlength=len(domain_ids))
+    quantiles = group_percentiles(groups[timed], durations[timed], percentiles)
+
+    results = []
+    for name, d in domain_ids.items():
+        stats = DomainStats(name, total_ms=int(total_ms[d]))
+        for m, method in enumerate(METHODS):
+            g = d * len(METHODS) + m
+            if not attempts[g]:
+                continue
+            stats.methods[method] = MethodStats(
+                int(attempts[g]), int(blocked_n[g]), int(review_n[g]), int(retried_n[g]),
+                dict(zip(percentiles, (round(v) for v in quantiles.get(g, ())))))
+            stats.attempts += int(attempts[g])
+        stats.recommendation = recommend(stats, min_attempts)
+        results.append(stats)
+    return sorted(results, key=lambda s: (-s.total_ms, s.domain))
+
+
+def print_report(results, top=30):
+    print('=' * 80)
+    print('VERIFICATION LATENCY AND BLOCK RATE BY DOMAIN')
+    print('=' * 80)
+    if not results:
+        print('\nNo verification events.')
+        return
+    attempts = sum(s.attempts for s in results)
+    total_s = sum(s.total_ms for s in results) / 1000
+    print(f"\n{attempts} attempts across {len(results)} domains, {total_s:,.0f}s total")
+
+    print(f"\n{'Domain':<34} {'Method':<8} {'Tries':>6} {'p50':>7} {'p90':>7} {'p99':>7} "
+          f"{'Blocked':>8} {'Review':>7}")
+    for s in results[:top]:
+        for method, m in s.methods.items():
+            p = list(m.percentiles_ms.values()) + [None] * 3
+            cells = ' '.join(f"{v / 1000:>6.1f}s" if v is not None else f"{'-':>7}"
+                             for v in p[:3])
+            print(f"{s.domain[:34]:<34} {method:<8} {m.attempts:>6} {cells} "
+                  f"{m.block_rate * 100:>7.0f}% {m.needs_review / m.attempts * 100:>6.0f}%")
+
+    flagged = [s for s in results if s.recommendation]
+    if flagged:
+        print('\nRecommendations:')
+        for s in flagged:
+            print(f"  {s.recommendation:<14} {s.domain} ({s.attempts} attempts, "
+                  f"{s.block_rate * 100:.0f}% blocked)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dir', default=str(DEFAULT_LOG_DIR), help='Attempt log directory')
+    parser.add_argument('--since', type=date.fromisoformat, help='First day to read (YYYY-MM-DD)')
+    parser.add_argument('--min-attempts', type=int, default=DEFAULT_MIN_ATTEMPTS,
+                        help='Attempts a domain needs before it gets a recommendation')
+    parser.add_argument('--top', type=int, default=30, help='Domains to show')
+    parser.add_argument('--json', help='Write per-domain statistics to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = analyze(load_events(args.dir, args.since), min_attempts=args.min_attempts)
+    print_report(results, args.top)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([{**asdict(s), 'blockRate': s.block_rate} for s in results], f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import gzip
+import json
+from datetime import date
+
+import numpy as np
+
+from .verify_events import analyze, group_percentiles, load_events
+
+
+def event(domain, method, ms, status=200, fetch_status=None, blocked=False, verified=1,
+          retry=0, reason='verified'):
+    """An event as recordVerificationAttempt (src/utils/verificationEvents.js) writes it"""
+    return {'at': '2025-11-01T03:00:00.000Z', 'mentionId': 1, 'clientId': 1, 'domain': domain,
+            'method': method, 'durationMs': ms, 'status': status, 'fetchStatus': fetch_status,
+            'blocked': blocked, 'retry': retry, 'reason': reason, 'verified': verified}
+
+
+def test_group_percentiles_interpolate_per_group():
+    groups = np.array([1, 0, 1, 0, 1])
+    values = np.array([30, 5, 10, 15, 20])
+    result = group_percentiles(groups, values, (50, 100))
+    assert result == {0: [10.0, 15.0], 1: [20.0, 30.0]}
+
+
+def test_domains_get_latency_block_rate_and_recommendation():
+    events = (
+        # Fetch refused, the browser fallback verified: one event per attempt
+        [event('www.guarded.com', 'browser', 8000 + i * 1000, fetch_status=403,
+               reason='verified_browser') for i in range(5)] +
+        [event('wall.com', 'fetch', 100, status=403, blocked=True, verified=None,
+               reason='blocked') for _ in range(4)] +
+        [event('wall.com', 'browser', 9000, status=403, fetch_status=403, blocked=True,
+               verified=None, retry=1, reason='blocked')] +
+        [event('easy.com', 'fetch', 300 + i) for i in range(6)]
+    )
+    results = {s.domain: s for s in analyze(events)}
+
+    guarded = results['guarded.com']
+    assert guarded.attempts == 10
+    assert guarded.methods['fetch'].block_rate == 1.0
+    assert guarded.methods['fetch'].percentiles_ms == {}
+    assert guarded.methods['browser'].block_rate == 0.0
+    assert guarded.methods['browser'].percentiles_ms[50] == 10000
+    assert guarded.recommendation == 'browser_first'
+    wall = results['wall.com']
+    assert (wall.methods['fetch'].attempts, wall.methods['fetch'].needs_review) == (5, 4)
+    assert wall.recommendation == 'skip'
+    assert wall.methods['browser'].retries == 1
+    assert results['easy.com'].recommendation is None
+    assert list(results) == ['guarded.com', 'wall.com', 'easy.com']
+
+
+def test_reads_segments_since_a_day(tmp_path):
+    for day in ('2025-10-31', '2025-11-01'):
+        with open(tmp_path / f'{day}.jsonl.gz', 'ab') as f:
+            f.write(gzip.compress((json.dumps(event(f'{day}.com', 'fetch', 1)) + '\n').encode()))
+    assert [e['domain'] for e in load_events(tmp_path, since=date(2025, 11, 1))] == \
+        ['2025-11-01.com']
+
+
+def test_partial_member_is_left_for_the_next_run(tmp_path):
+    segment = tmp_path / '2025-11-01.jsonl.gz'
+    with open(segment, 'ab') as f:
+        f.write(gzip.compress((json.dumps(event('a.com', 'fetch', 1)) + '\n').encode()))
+        f.write(gzip.compress((json.dumps(event('b.com', 'fetch', 1)) + '\n').encode())[:-6])
+
+    assert [e['domain'] for e in load_events(tmp_path)] == ['a.com']
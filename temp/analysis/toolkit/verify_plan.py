@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Historical-yield priority planner for the verification queue
+
+verifyAllMentions walks every unverified mention in id order. Long runs
+therefore spend browser time on outlets that almost never verify before
+they reach the ones that usually do. This planner orders the queue by the
+expected verifications per second of verification time.
+
+For each pending mention (verified is not 1):
+- verify probability: the verified rate of the mention's domain in
+  mediaMentions and deletedMentions. Archived deletions count as failures,
+  and undecided rows (verified = NULL) are left out. Small domains are
+  shrunk toward their provider's rate, and providers toward the global
+  rate, with PRIOR_WEIGHT pseudo-observations at each level.
+- cost: seconds of verification time per mention, from the attempt log
+  that src/utils/verificationEvents.js writes. The cost includes retries
+  and the rate-limit pause, and is shrunk the same way (domain, then
+  provider, then global). Without a log every mention costs
+  DEFAULT_SECONDS.
+
+Mentions are ranked by probability / cost. With a deadline, the budget is
+the run length times the worker count. Mentions are taken greedily in
+rank order while they fit, so a costly mention never blocks cheaper ones
+behind it. Everything that does not fit follows in rank order. The report
+compares the expected verifications within the deadline with the current
+id order.
+
+--work-order writes {"ids": [...]} for VERIFY_WORK_ORDER, which makes
+verifyAllMentions process mentions in that order.
+
+Usage:
+    python -m toolkit.verify_plan [--db PATH] [--events data/verification-events] \\
+        [--since 2025-11-01] [--deadline-minutes 30] [--concurrency 5] \\
+        [--client-id N] [--top 30] [--csv plan.csv] [--work-order work-order.json]
+"""
+
+import argparse
+import csv
+import json
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from .db import connect
+from .records import load_mentions
+from .urls import host_key
+from .verify_events import DEFAULT_LOG_DIR, load_events
+
+PRIOR_WEIGHT = 10.0
+DEFAULT_SECONDS = 6.0
+RATE_LIMIT_SECONDS = 0.5     # config.verification.rateLimitMs
+DEFAULT_CONCURRENCY = 5      # config.verification.concurrentRequests
+
+# Archived deletions whose mention is gone; rejected pending-review
+# mentions are archived but keep their mediaMentions row
+DELETED_SQL = """
+    SELECT d.link, d.source FROM deletedMentions d
+    WHERE NOT EXISTS (SELECT 1 FROM mediaMentions m WHERE m.id = d.originalMentionId)
+"""
+
+
+@dataclass
+class PlannedMention:
+    id: int
+    client_name: str
+    title: str
+    link: str
+    domain: str
+    provider: str
+    probability: float
+    seconds: float
+    in_deadline: bool = True
+
+    @property
+    def score(self):
+        """Expected verifications per second"""
+        return self.probability / self.seconds
+
+
+@dataclass
+class Plan:
+    items: list                # PlannedMention, work order first
+    budget_seconds: float      # worker-seconds, or None without a deadline
+    planned: float             # expected verifications within the budget
+    baseline: float            # same for id order
+    baseline_count: int        # mentions id order gets through in the budget
+
+
+def _codes(values):
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64,
+                        count=len(values))
+    return codes, index
+
+
+def shrink(successes, totals, prior, weight=PRIOR_WEIGHT):
+    """Rate of each group pulled toward its prior by `weight` pseudo-observations"""
+    return (successes + weight * prior) / (totals + weight)
+
+
+def mention_domain(link, source=None):
+    return host_key(link) or host_key(source) or '(none)'
+
+
+def estimate_probability(history, queue, weight=PRIOR_WEIGHT):
+    """Verify probability for each queued (domain, provider) pair
+
+    history is [(domain, provider or None, verified)] with verified 0 or 1;
+    provider None (archived deletions) counts toward the domain and global
+    rates only.
+    """
+    domains, domain_index = _codes([d for d, _, _ in history] + [d for d, _ in queue])
+    providers, provider_index = _codes([p for _, p, _ in history] + [p for _, p in queue])
+    n = len(history)
+    outcome = np.fromiter((v for _, _, v in history), dtype=np.float64, count=n)
+    known = np.fromiter((p is not None for _, p, _ in history), dtype=np.bool_, count=n)
+
+    global_rate = (outcome.sum() + 1) / (n + 2)
+    by_provider = shrink(
+        np.bincount(providers[:n][known], outcome[known], minlength=len(provider_index)),
+        np.bincount(providers[:n][known], minlength=len(provider_index)),
+        global_rate, weight)
+    domain_hits = np.bincount(domains[:n], outcome, minlength=len(domain_index))
+    domain_totals = np.bincount(domains[:n], minlength=len(domain_index))
+
+    q_domain, q_provider = domains[n:], providers[n:]
+    return shrink(domain_hits[q_domain], domain_totals[q_domain], by_provider[q_provider], weight)
+
+
+def estimate_cost(events, mentions, queue, weight=PRIOR_WEIGHT,
+                  rate_limit=RATE_LIMIT_SECONDS, default=DEFAULT_SECONDS):
+    """Expected seconds per mention for each queued (domain, provider) pair
+
+    The cost is measured per verification run of a mention. A run starts at
+    an attempt with retry 0, and its retries are added to it, so retries
+    and the browser fallback count toward the cost. A mention verified
+    again in later runs adds one sample per run, so its cost is not summed
+    across runs. Events are joined to mentions by id for the provider.
+    """
+    if not events:
+        return np.full(len(queue), default)
+    provider_of = {m.id: m.discovery_path for m in mentions}
+    rows, current = [], {}        # [domain, provider, seconds] per run; mention id -> its run
+    for e in events:
+        key = e.get('mentionId')
+        if key is None:
+            continue
+        run = current.get(key)
+        if run is None or not e.get('retry'):
+            run = current[key] = [host_key(e.get('domain')) or '(none)', provider_of.get(key),
+                                  0.0]
+            rows.append(run)
+        run[2] += (e.get('durationMs') or 0) / 1000
+    if not rows:
+        return np.full(len(queue), default)
+
+    domains, domain_index = _codes([d for d, _, _ in rows] + [d for d, _ in queue])
+    providers, provider_index = _codes([p for _, p, _ in rows] + [p for _, p in queue])
+    n = len(rows)
+    cost = np.fromiter((s for _, _, s in rows), dtype=np.float64, count=n) + rate_limit
+    known = np.fromiter((p is not None for _, p, _ in rows), dtype=np.bool_, count=n)
+
+    by_provider = shrink(
+        np.bincount(providers[:n][known], cost[known], minlength=len(provider_index)),
+        np.bincount(providers[:n][known], minlength=len(provider_index)),
+        cost.mean(), weight)
+    domain_cost = np.bincount(domains[:n], cost, minlength=len(domain_index))
+    domain_totals = np.bincount(domains[:n], minlength=len(domain_index))
+
+    q_domain, q_provider = domains[n:], providers[n:]
+    return shrink(domain_cost[q_domain], domain_totals[q_domain], by_provider[q_provider], weight)
+
+
+def _fit(seconds, budget):
+    """Greedy fill: take each item in order if it still fits the budget"""
+    taken = np.zeros(len(seconds), dtype=np.bool_)
+    used = 0.0
+    for i, s in enumerate(seconds):
+        if used + s <= budget:
+            taken[i] = True
+            used += s
+    return taken
+
+
+def plan(mentions, deleted, events=(), budget_seconds=None, weight=PRIOR_WEIGHT,
+         client_id=None):
+    """Plan for the pending mentions
+
+    mentions are AutoMention records (all of mediaMentions, so verified
+    rows count as history); deleted is [(link, source)] of archived
+    deletions. With client_id the history stays global and only the queue
+    is limited to that client.
+    """
+    history = [(mention_domain(m.link, m.source), m.discovery_path, m.verified)
+               for m in mentions if m.verified is not None]
+    history += [(mention_domain(link, source), None, 0) for link, source in deleted]
+    pending = [m for m in mentions if m.verified != 1
+               and (client_id is None or m.client_id == client_id)]
+    if not pending:
+        return Plan([], budget_seconds, 0.0, 0.0, 0)
+
+    queue = [(mention_domain(m.link, m.source), m.discovery_path) for m in pending]
+    probability = estimate_probability(history, queue, weight)
+    seconds = estimate_cost(events, mentions, queue, weight)
+    score = probability / seconds
+
+    # Highest yield first; ties keep id order like verifyAllMentions
+    order = np.lexsort((np.arange(len(pending)), -score))
+    if budget_seconds is None:
+        taken = np.ones(len(pending), dtype=np.bool_)
+        baseline_taken = taken
+    else:
+        taken = _fit(seconds[order], budget_seconds)
+        order = np.concatenate([order[taken], order[~taken]])
+        taken = np.sort(taken)[::-1]
+        # id order stops at the first mention that no longer fits
+        baseline_taken = np.cumsum(seconds) <= budget_seconds
+
+    items = [PlannedMention(pending[i].id, pending[i].client_name, pending[i].title,
+                            pending[i].link, queue[i][0], queue[i][1],
+                            float(probability[i]), float(seconds[i]), bool(t))
+             for i, t in zip(order.tolist(), taken.tolist())]
+    return Plan(items, budget_seconds,
+                float(probability[order][taken].sum()),
+                float(probability[baseline_taken].sum()),
+                int(baseline_taken.sum()))
+
+
+def print_report(result, top=30):
+    print('=' * 80)
+    print('VERIFICATION WORK ORDER')
+    print('=' * 80)
+    items = result.items
+    if not items:
+        print('\nNo mentions pending verification.')
+        return
+    total_s = sum(p.seconds for p in items)
+    expected = sum(p.probability for p in items)
+    print(f"\n{len(items)} pending mentions, {expected:.1f} expected to verify, "
+          f"{total_s / 60:,.1f} worker-minutes")
+
+    if result.budget_seconds is not None:
+        fitted = [p for p in items if p.in_deadline]
+        print(f"\nWithin {result.budget_seconds / 60:,.0f} worker-minutes:")
+        print(f"  Planned order: {len(fitted):>6} mentions, "
+              f"{result.planned:>7.1f} expected verified")
+        print(f"  Id order:      {result.baseline_count:>6} mentions, "
+              f"{result.baseline:>7.1f} expected verified")
+        if result.baseline:
+            print(f"  Gain:          {result.planned / result.baseline:.2f}x")
+
+    print(f"\n{'#':>5} {'Id':>7} {'Domain':<30} {'Provider':<14} {'P(ver)':>7} {'Cost':>7} "
+          f"{'Ver/min':>8}")
+    for rank, p in enumerate(items[:top], 1):
+        print(f"{rank:>5} {p.id:>7} {p.domain[:30]:<30} {p.provider[:14]:<14} "
+              f"{p.probability:>7.2f} {p.seconds:>6.1f}s {p.score * 60:>8.2f}")
+
+    by_domain = {}
+    for p in items:
+        count, seconds, hits = by_domain.get(p.domain, (0, 0.0, 0.0))
+        by_domain[p.domain] = (count + 1, seconds + p.seconds, hits + p.probability)
+    worst = sorted(by_domain.items(), key=lambda kv: (kv[1][2] / kv[1][1], -kv[1][1]))
+    print('\nLowest-yield domains (verified per minute, pending mentions):')
+    for domain, (count, seconds, hits) in worst[:10]:
+        print(f"  {domain[:40]:<40} {hits / seconds * 60:>6.2f}/min {count:>6} pending")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--events', default=str(DEFAULT_LOG_DIR),
+                        help='Verification attempt log directory (for costs)')
+    parser.add_argument('--since', type=date.fromisoformat,
+                        help='First day of attempt log to read (YYYY-MM-DD)')
+    parser.add_argument('--deadline-minutes', type=float,
+                        help='Length of the verification run')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Concurrent verification workers')
+    parser.add_argument('--client-id', type=int, help='Only plan this client\'s mentions')
+    parser.add_argument('--prior-weight', type=float, default=PRIOR_WEIGHT,
+                        help='Pseudo-observations pulling small domains toward their provider')
+    parser.add_argument('--top', type=int, default=30, help='Work order rows to show')
+    parser.add_argument('--csv', help='Write the full work order to this CSV file')
+    parser.add_argument('--work-order', help='Write {"ids": [...]} for VERIFY_WORK_ORDER')
+    args = parser.parse_args(argv)
+
+    with closing(connect(args.db)) as conn:
+        mentions = load_mentions(conn)
+        deleted = [tuple(row) for row in conn.execute(DELETED_SQL)]
+    budget = (args.deadline_minutes * 60 * args.concurrency
+              if args.deadline_minutes is not None else None)
+    result = plan(mentions, deleted, load_events(args.events, args.since), budget,
+                  args.prior_weight, args.client_id)
+    print_report(result, args.top)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rank', 'id', 'client', 'domain', 'provider', 'probability',
+                             'seconds', 'in_deadline', 'title', 'link'])
+            for rank, p in enumerate(result.items, 1):
+                writer.writerow([rank, p.id, p.client_name, p.domain, p.provider,
+                                 f'{p.probability:.4f}', f'{p.seconds:.2f}', int(p.in_deadline),
+                                 p.title, p.link])
+        print(f"\nWrote {args.csv}")
+
+    if args.work_order:
+        with open(args.work_order, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'budgetSeconds': budget,
+                'ids': [p.id for p in result.items]
+            }, f, indent=2)
+        print(f"Wrote {args.work_order}")
+
+
+if __name__ == '__main__':
+    main()
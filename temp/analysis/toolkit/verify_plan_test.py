@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from .conftest import insert_mention
+from .records import AutoMention
+from .verify_plan import estimate_cost, estimate_probability, main, plan
+
+
+def mention(id, link, verified, provider='google'):
+    return AutoMention(id, 1, 'Acme', f'Story {id}', link, None, None, None, verified,
+                       provider=provider)
+
+
+def test_small_domains_shrink_toward_their_provider():
+    history = ([('good.com', 'rss', 1)] * 20 + [('rare.com', 'rss', 1)] +
+               [('bad.com', 'google', 0)] * 20 + [('gone.com', None, 0)] * 3)
+    queue = [('rare.com', 'rss'), ('new.com', 'rss'), ('new.com', 'google'), ('gone.com', 'rss')]
+    p = estimate_probability(history, queue, weight=10)
+
+    rss = (21 + 10 * 22 / 46) / 31
+    assert p[1] == pytest.approx(rss)
+    assert p[0] == pytest.approx((1 + 10 * rss) / 11)
+    assert p[2] == pytest.approx(10 * (22 / 46) / 30)
+    # Archived deletions only count against their domain
+    assert p[3] == pytest.approx(10 * rss / 13)
+
+
+def test_cost_is_averaged_per_verification_run():
+    events = [
+        # Mention 1: one run with a retry, then verified again in a later run
+        {'mentionId': 1, 'domain': 'a.com', 'durationMs': 4000, 'retry': 0},
+        {'mentionId': 1, 'domain': 'a.com', 'durationMs': 2000, 'retry': 1},
+        {'mentionId': 2, 'domain': 'a.com', 'durationMs': 3000, 'retry': 0},
+        {'mentionId': 1, 'domain': 'a.com', 'durationMs': 3000, 'retry': 0},
+    ]
+    [cost] = estimate_cost(events, [], [('a.com', None)], rate_limit=0)
+    assert cost == pytest.approx((6 + 3 + 3) / 3)
+
+
+def test_orders_by_yield_per_second_and_fills_the_deadline():
+    mentions = (
+        [mention(i, f'https://good.com/{i}', 1) for i in range(1, 11)] +
+        [mention(i, f'https://slow.com/{i}', 1) for i in range(11, 21)] +
+        [mention(i, f'https://bad.com/{i}', 0) for i in range(21, 31)] +
+        [mention(31, 'https://bad.com/x', None), mention(32, 'https://slow.com/x', None),
+         mention(33, 'https://good.com/x', None)]
+    )
+    events = (
+        [{'mentionId': i, 'domain': 'www.good.com', 'durationMs': 1500} for i in range(1, 11)] +
+        [{'mentionId': i, 'domain': 'slow.com', 'durationMs': 60000} for i in range(11, 21)]
+    )
+    items = plan(mentions, [], events).items
+    assert [p.id for p in items[:3]] == [33, 32, 21]
+    assert items[0].seconds < items[2].seconds < items[1].seconds
+    assert all(p.in_deadline for p in items)
+
+    # slow.com does not fit after good.com, so the next mention that does goes first
+    result = plan(mentions, [], events, budget_seconds=50)
+    assert [p.id for p in result.items[:3]] == [33, 21, 32]
+    assert [p.in_deadline for p in result.items[:3]] == [True, True, False]
+    assert result.baseline_count == 1
+    assert result.planned == pytest.approx(items[0].probability + items[2].probability)
+    assert result.planned > result.baseline
+
+
+def test_writes_work_order(db_path, db, tmp_path, capsys):
+    db.execute("INSERT INTO clients (name, contactEmail) VALUES ('EFI', 'a@b.c')")
+    insert_mention(db, link='https://good.com/a', verified=1)
+    first = insert_mention(db, link='https://bad.com/a', verified=0)
+    second = insert_mention(db, link='https://good.com/b', verified=None)
+    out = tmp_path / 'work-order.json'
+
+    main(['--db', str(db_path), '--events', str(tmp_path / 'none'), '--deadline-minutes', '1',
+          '--work-order', str(out)])
+    assert json.loads(out.read_text())['ids'] == [second, first]
+    assert 'VERIFICATION WORK ORDER' in capsys.readouterr().out
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Coverage watch mode
+
+Polls the tracking workbook, manual CSV exports and the mentions database
+(including its -wal file) and recomputes coverage only for the clients whose
+inputs changed. A file whose timestamp moved but whose rows for a client did
+not change does not trigger a recompute for that client, and database changes
+are narrowed to clients with a different mention count, last id, last update
+or verified count.
+
+Refreshed summaries are written to --out as one JSON file per client and, with
+--broadcast, posted to the backend's /admin/coverage endpoint, which relays
+them to dashboards as a "coverage_update" websocket message.
+
+Usage:
+    python -m toolkit.watch [--workbook tracking.xlsx] [--manual manual-tracking-efi.csv] \\
+        [--client NAME] [--start 2025-06-07] [--end 2025-12-04] [--db PATH] \\
+        [--out coverage/] [--broadcast http://localhost:3000] [--interval 5] [--once]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from contextlib import closing
+from datetime import date, datetime, timezone
+from functools import partial
+from pathlib import Path
+
+from .clients import ClientResolver
+from .coverage import compare
+from .db import connect, database_path
+from .manual import iter_manual_csv, iter_manual_workbook
+from .records import load_mentions
+
+# Per-client database state; a change in any column marks the client changed
+CLIENT_STATE_SQL = """
+    SELECT c.id, c.name, COUNT(m.id), MAX(m.id), MAX(m.updatedAt), SUM(m.verified = 1)
+    FROM clients c
+    LEFT JOIN mediaMentions m ON m.clientId = c.id
+    GROUP BY c.id
+"""
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None when it does not exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def database_signature(path):
+    """Signature of the database file and its write-ahead log"""
+    return file_signature(path), file_signature(f'{path}-wal')
+
+
+def manual_digest(mentions):
+    """Content hash of one client's manual rows (row numbers excluded)"""
+    h = hashlib.blake2b(digest_size=16)
+    for m in mentions:
+        h.update(repr((m.date_str, m.publication, m.title, m.topic, m.link)).encode())
+    return h.hexdigest()
+
+
+def diff_keys(old, new):
+    """Keys whose value was added, removed or changed between two dicts"""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+class CoverageWatcher:
+    """Tracks input state between polls and recomputes changed clients"""
+
+    def __init__(self, db_path=None, workbooks=(), csvs=(), client=None, start=None, end=None):
+        self.db_path = str(db_path or database_path())
+        self.start, self.end = start, end
+        self.sources = [(str(p), iter_manual_workbook) for p in workbooks]
+        self.sources += [(str(p), partial(iter_manual_csv, client=client)) for p in csvs]
+        self._file_state = {}       # path -> file signature
+        self._source_rows = {}      # path -> {manual label: [ManualMention]}
+        self._manual = {}           # client key -> [ManualMention] across all sources
+        self._manual_digests = {}   # client key -> manual_digest
+        self._db_state = None
+        self._client_state = {}     # client id -> CLIENT_STATE_SQL row
+        self._resolver = ClientResolver([])
+
+    def _read_source(self, path, reader):
+        groups = {}
+        for m in reader(path):
+            groups.setdefault(m.client, []).append(m)
+        return groups
+
+    def _read_sources(self):
+        """Re-read manual inputs whose file changed; True when any did"""
+        touched = False
+        for path, reader in self.sources:
+            signature = file_signature(path)
+            if signature == self._file_state.get(path):
+                continue
+            self._file_state[path] = signature
+            self._source_rows[path] = self._read_source(path, reader) if signature else {}
+            touched = True
+        return touched
+
+    def _manual_changes(self):
+        """Regroup manual rows by resolved client; return the keys whose rows changed"""
+        merged = {}
+        for groups in self._source_rows.values():
+            for label, mentions in groups.items():
+                merged.setdefault(self._resolver.key(label), []).extend(mentions)
+        digests = {key: manual_digest(mentions) for key, mentions in merged.items()}
+        changed = diff_keys(self._manual_digests, digests)
+        self._manual, self._manual_digests = merged, digests
+        return changed
+
+    def _database_changes(self, conn):
+        rows = conn.execute(CLIENT_STATE_SQL).fetchall()
+        self._resolver = ClientResolver([(row[0], row[1]) for row in rows])
+        state = {row[0]: tuple(row[1:]) for row in rows}
+        changed = diff_keys(self._client_state, state)
+        self._client_state = state
+        return changed
+
+    def poll(self):
+        """Check every input once; return a CoverageResult per changed client"""
+        files_touched = self._read_sources()
+        db_signature = database_signature(self.db_path)
+        db_touched = db_signature != self._db_state
+
+        # Coverage is measured against the manual rows, so only clients
+        # that appear in the manual inputs are reported
+        if not (files_touched or db_touched) or not any(self._source_rows.values()):
+            return []
+        self._db_state = db_signature
+        with closing(connect(self.db_path)) as conn:
+            # Manual labels are resolved against the current clients, so the
+            # database is read first
+            changed = self._database_changes(conn) if db_touched else set()
+            changed |= self._manual_changes()
+            results = []
+            for key in sorted(changed & self._manual.keys(), key=str):
+                manual = self._manual[key]
+                auto = load_mentions(conn, key) if key in self._client_state else []
+                results.append(compare(self._resolver.name(manual[0].client), manual, auto,
+                                       self.start, self.end))
+        return results
+
+
+def summary_filename(client):
+    return re.sub(r'[^a-z0-9]+', '-', client.lower()).strip('-') + '.json'
+
+
+def write_summaries(out_dir, summaries):
+    """Write one JSON file per client, replacing each file atomically"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for summary in summaries:
+        path = out_dir / summary_filename(summary['client'])
+        tmp = path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(summary, indent=2))
+        os.replace(tmp, path)
+
+
+def broadcast_summaries(base_url, summaries, generated_at, api_key=None, timeout=10):
+    """POST summaries to the backend, which relays them over the websocket"""
+    body = json.dumps({'clients': summaries, 'generatedAt': generated_at}).encode()
+    request = urllib.request.Request(
+        f"{base_url.rstrip('/')}/admin/coverage", data=body, method='POST',
+        headers={'Content-Type': 'application/json'}
+    )
+    if api_key:
+        request.add_header('x-api-key', api_key)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status
+
+
+def publish(results, out_dir=None, broadcast_url=None, api_key=None):
+    generated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    summaries = [{**r.summary(), 'generatedAt': generated_at} for r in results]
+    for s in summaries:
+        print(f"[watch] {generated_at} {s['client']}: {s['matched']}/{s['manual']} matched "
+              f"({s['coverageRate'] * 100:.1f}%), {s['autoOnly']} auto only")
+    if out_dir:
+        write_summaries(out_dir, summaries)
+    if broadcast_url:
+        try:
+            broadcast_summaries(broadcast_url, summaries, generated_at, api_key)
+        except (urllib.error.URLError, OSError) as e:
+            # The backend may be restarting; the next change is sent again
+            print(f"[watch] Broadcast failed: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--workbook', action='append', default=[],
+                        help='Tracking workbook (one sheet per client); repeatable')
+    parser.add_argument('--manual', action='append', default=[],
+                        help='Manual tracking CSV export; repeatable')
+    parser.add_argument('--client', help='Client for CSV exports without a title row')
+    parser.add_argument('--start', type=date.fromisoformat, help='Window start (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Window end (YYYY-MM-DD)')
+    parser.add_argument('--db', help='Path to mediamentions.db (default: DATABASE_URL)')
+    parser.add_argument('--out', help='Directory for per-client JSON summaries')
+    parser.add_argument('--broadcast', metavar='URL',
+                        help='Backend base URL; summaries are relayed to the dashboard')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls')
+    parser.add_argument('--once', action='store_true', help='Poll once and exit')
+    args = parser.parse_args(argv)
+
+    if not (args.workbook or args.manual):
+        parser.error('pass at least one --workbook or --manual input')
+
+    watcher = CoverageWatcher(args.db, args.workbook, args.manual, args.client,
+                              args.start, args.end)
+    api_key = os.environ.get('API_KEY')
+    print(f"[watch] Watching {len(watcher.sources)} manual input(s) and {watcher.db_path}")
+    try:
+        while True:
+            results = watcher.poll()
+            if results:
+                publish(results, args.out, args.broadcast, api_key)
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
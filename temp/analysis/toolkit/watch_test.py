@@ -0,0 +1,71 @@
+import json
+import os
+
+from .conftest import insert_mention
+from .watch import CoverageWatcher, write_summaries
+
+EFI_EXPORT = """EFI Media Mentions,,,,,
+Date,Publication Name,Title,Topic,Additional Mentions,Link
+2025-06-10,The Packer,First,,,https://thepacker.com/1
+2025-06-12,Produce News,Second,,,https://producenews.com/2
+"""
+
+VIVA_EXPORT = """Viva Fresh Media Mentions,,,,,
+2025-06-11,The Packer,Viva story,,,https://thepacker.com/viva
+"""
+
+
+def touch(path):
+    """Move the mtime forward so coarse filesystem clocks still register a change"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_poll_recomputes_only_changed_clients(tmp_path, db_path, db):
+    db.execute("INSERT INTO clients (id, name, contactEmail) VALUES (1, 'EFI', 'a@x'), "
+               "(2, 'Viva Fresh', 'b@x')")
+    db.commit()
+    insert_mention(db, 1, link='https://thepacker.com/1', verified=1)
+    efi, viva = tmp_path / 'efi.csv', tmp_path / 'viva.csv'
+    efi.write_text(EFI_EXPORT)
+    viva.write_text(VIVA_EXPORT)
+    watcher = CoverageWatcher(db_path, csvs=[efi, viva])
+
+    first = {r.client: r.summary() for r in watcher.poll()}
+    assert first['EFI']['matched'] == 1 and first['EFI']['missed'] == 1
+    assert first['Viva Fresh']['matched'] == 0
+    assert watcher.poll() == []
+
+    # Saving a file without changing its rows does not trigger a recompute
+    touch(viva)
+    assert watcher.poll() == []
+
+    insert_mention(db, 1, link='https://producenews.com/2', verified=1)
+    touch(db_path)
+    [result] = watcher.poll()
+    assert result.client == 'EFI' and result.coverage_rate == 1.0
+
+    viva.write_text(VIVA_EXPORT + '2025-06-20,Fresh Plaza,Another,,,https://freshplaza.com/3\n')
+    touch(viva)
+    assert [r.client for r in watcher.poll()] == ['Viva Fresh']
+
+
+def test_manual_labels_resolve_to_database_clients(tmp_path, db_path, db):
+    db.execute("INSERT INTO clients (id, name, contactEmail) VALUES "
+               "(1, 'Equitable Food Initiative', 'a@x')")
+    db.commit()
+    insert_mention(db, 1, link='https://thepacker.com/1', verified=1)
+    efi = tmp_path / 'efi.csv'
+    efi.write_text(EFI_EXPORT)
+
+    [result] = CoverageWatcher(db_path, csvs=[efi]).poll()
+
+    assert result.client == 'Equitable Food Initiative'
+    assert result.summary()['matched'] == 1
+
+
+def test_write_summaries(tmp_path):
+    write_summaries(tmp_path, [{'client': 'Viva Fresh', 'coverageRate': 0.5}])
+
+    assert json.loads((tmp_path / 'viva-fresh.json').read_text())['coverageRate'] == 0.5
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,155 @@
+"""
+Streaming multi-sheet .xlsx writer for analysis reports
+
+Wraps openpyxl's write-only mode: each sheet is serialised row by row to a
+temporary file and the workbook is assembled on close, so memory stays
+constant however many rows are written. Header styling follows the
+SpreadsheetML export in src/routes/exports.js.
+"""
+
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Font, PatternFill
+
+# Excel limits sheet titles to 31 characters and forbids these characters
+MAX_SHEET_TITLE = 31
+_INVALID_TITLE_CHARS = str.maketrans({c: ' ' for c in '[]:*?/\\'})
+
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(fill_type='solid', start_color='E8EDF5', end_color='E8EDF5')
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+LINK_FONT = Font(color='0563C1', underline='single')
+DATE_FORMAT = 'mmm d, yyyy'
+
+# Excel's HYPERLINK() rejects link targets longer than this
+MAX_HYPERLINK_LENGTH = 255
+
+
+def _cell_value(value):
+    if value is None or isinstance(value, (int, float, date, datetime)):
+        return value
+    if isinstance(value, (list, tuple, set)):
+        value = ', '.join(str(v) for v in value)
+    return ILLEGAL_CHARACTERS_RE.sub('', str(value))
+
+
+def _hyperlink_formula(url):
+    """Clickable link as a formula
+
+    Cell hyperlinks (cell.hyperlink) are kept in memory until the sheet is
+    closed, which would make memory grow with the row count; a HYPERLINK()
+    formula is written out with the row like any other value.
+    """
+    if len(url) > MAX_HYPERLINK_LENGTH or not url.lower().startswith(('http://', 'https://')):
+        return url
+    escaped = url.replace('"', '""')
+    return f'=HYPERLINK("{escaped}","{escaped}")'
+
+
+def _row_values(row, keys):
+    if is_dataclass(row):
+        row = asdict(row)
+    if isinstance(row, dict):
+        return [row.get(key) for key in keys]
+    return list(row)
+
+
+class SheetWriter:
+    """Appends rows to one write-only worksheet"""
+
+    def __init__(self, worksheet, columns, link_columns=()):
+        self._ws = worksheet
+        # columns: list of (header, key) pairs or plain keys
+        self.headers = [c[0] if isinstance(c, tuple) else c for c in columns]
+        self.keys = [c[1] if isinstance(c, tuple) else c for c in columns]
+        self._link_indexes = {self.keys.index(k) for k in link_columns if k in self.keys}
+        self.rows = 0
+
+        header_cells = []
+        for header in self.headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            cell.alignment = HEADER_ALIGNMENT
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+        worksheet.freeze_panes = 'A2'
+
+    def write(self, row):
+        """Append one row: a dict, dataclass or sequence in column order"""
+        values = []
+        for i, value in enumerate(_row_values(row, self.keys)):
+            value = _cell_value(value)
+            if i in self._link_indexes and isinstance(value, str) and value:
+                cell = WriteOnlyCell(self._ws, value=_hyperlink_formula(value))
+                cell.font = LINK_FONT
+                values.append(cell)
+            elif isinstance(value, str) and value.startswith('='):
+                # Free text (titles, snippets) must not be stored as a formula
+                cell = WriteOnlyCell(self._ws, value=value)
+                cell.data_type = 's'
+                values.append(cell)
+            elif isinstance(value, (date, datetime)):
+                cell = WriteOnlyCell(self._ws, value=value)
+                cell.number_format = DATE_FORMAT
+                values.append(cell)
+            else:
+                values.append(value)
+        self._ws.append(values)
+        self.rows += 1
+
+    def write_all(self, rows):
+        """Append every row of an iterable (consumed lazily)"""
+        for row in rows:
+            self.write(row)
+        return self.rows
+
+
+class ReportWorkbook:
+    """A multi-sheet report workbook written in a single streaming pass
+
+    Sheets must be filled one after another; write-only worksheets cannot be
+    revisited once the next one is created.
+
+        with ReportWorkbook('efi-coverage.xlsx') as wb:
+            wb.add_sheet('Missed', [('Date', 'date'), ('Title', 'title')]).write_all(missed)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._wb = Workbook(write_only=True)
+        self._titles = set()
+
+    def _unique_title(self, title):
+        base = str(title).translate(_INVALID_TITLE_CHARS).strip()[:MAX_SHEET_TITLE] or 'Sheet'
+        candidate, n = base, 2
+        while candidate.lower() in self._titles:
+            suffix = f' ({n})'
+            candidate = base[:MAX_SHEET_TITLE - len(suffix)] + suffix
+            n += 1
+        self._titles.add(candidate.lower())
+        return candidate
+
+    def add_sheet(self, title, columns, widths=None, link_columns=('link',)):
+        """Create a sheet and return its SheetWriter"""
+        ws = self._wb.create_sheet(self._unique_title(title))
+        if widths:
+            for letter, width in zip('ABCDEFGHIJKLMNOPQRSTUVWXYZ', widths):
+                ws.column_dimensions[letter].width = width
+        return SheetWriter(ws, columns, link_columns)
+
+    def close(self):
+        if not self._titles:
+            self._wb.create_sheet('Empty')
+        self._wb.save(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
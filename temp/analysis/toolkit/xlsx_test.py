@@ -0,0 +1,50 @@
+from datetime import date
+
+import openpyxl
+
+from .xlsx import MAX_HYPERLINK_LENGTH, ReportWorkbook
+
+
+def test_sheet_titles_are_sanitised_and_deduplicated(tmp_path):
+    path = tmp_path / 'report.xlsx'
+    long_title = 'Equitable Food Initiative coverage report'
+    with ReportWorkbook(path) as wb:
+        for title in ('Missed: 2025/11 [EFI]', long_title, long_title, 'missed  2025 11  EFI',
+                      '  '):
+            wb.add_sheet(title, ['title']).write({'title': title})
+
+    titles = openpyxl.load_workbook(path).sheetnames
+    assert titles[0] == 'Missed  2025 11  EFI'
+    assert titles[1] == long_title[:31]
+    assert titles[2] == long_title[:27] + ' (2)' and len(titles[2]) == 31
+    # Titles are unique ignoring case, as Excel requires
+    assert titles[3] == 'missed  2025 11  EFI (2)'
+    assert titles[4] == 'Sheet'
+
+
+def test_links_become_hyperlinks_unless_too_long(tmp_path):
+    path = tmp_path / 'report.xlsx'
+    short = 'https://thepacker.com/a?x="1"'
+    too_long = 'https://thepacker.com/' + 'a' * MAX_HYPERLINK_LENGTH
+    with ReportWorkbook(path) as wb:
+        sheet = wb.add_sheet('Links', [('Title', 'title'), ('Date', 'date'), ('Link', 'link')])
+        sheet.write_all([{'title': '=SUM(A1)', 'date': date(2025, 11, 1), 'link': short},
+                         {'title': 'Long', 'link': too_long},
+                         {'title': 'Relative', 'link': 'thepacker.com/b'}])
+
+    ws = openpyxl.load_workbook(path)['Links']
+    rows = [[cell.value for cell in row] for row in ws.iter_rows(min_row=2)]
+    escaped = 'https://thepacker.com/a?x=""1""'
+    assert rows[0][2] == f'=HYPERLINK("{escaped}","{escaped}")'
+    assert ws['A2'].data_type == 's' and rows[0][0] == '=SUM(A1)'
+    assert ws['B2'].number_format == 'mmm d, yyyy'
+    assert rows[1][2] == too_long
+    assert rows[2][2] == 'thepacker.com/b'
+
+
+def test_empty_workbook_gets_a_placeholder_sheet(tmp_path):
+    path = tmp_path / 'report.xlsx'
+    with ReportWorkbook(path):
+        pass
+
+    assert openpyxl.load_workbook(path).sheetnames == ['Empty']
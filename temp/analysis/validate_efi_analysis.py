@@ -7,7 +7,8 @@ Analyzes manual tracking data vs automated search results
 import openpyxl
 from datetime import datetime, timedelta
 from collections import defaultdict
-import re
+
+from toolkit.domains import outlet_counts
 
 # File paths
 EXCEL_FILE = "/Users/jaredhensley/Downloads/Media Mentions - All Clients (1).xlsx"
@@ -212,21 +213,12 @@ def analyze_efi_sheet():
     else:
         print(f"\nNo mentions found in date range - cannot perform pattern analysis")
 
-    # Analyze URLs for patterns
-    url_patterns = defaultdict(int)
-    for mention in mentions_in_range:
-        if mention['url']:
-            url_str = str(mention['url'])
-            # Extract domain
-            import re
-            domain_match = re.search(r'https?://(?:www\.)?([^/]+)', url_str)
-            if domain_match:
-                domain = domain_match.group(1)
-                url_patterns[domain] += 1
+    # Analyze URLs for patterns (mobile, AMP and regional editions count as one outlet)
+    url_patterns = outlet_counts(mention['url'] and str(mention['url'])
+                                 for mention in mentions_in_range)
 
     print(f"\nTop URL Domains:")
-    sorted_domains = sorted(url_patterns.items(), key=lambda x: x[1], reverse=True)
-    for domain, count in sorted_domains[:10]:
+    for domain, count in url_patterns.most_common(10):
         print(f"  {domain:40s}: {count:3d} mentions")
 
     # Coverage analysis